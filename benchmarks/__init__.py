@@ -0,0 +1,24 @@
+"""Benchmarks.
+
+Benchmarks measure the time and memory costs of moviedb's hot paths. They are
+not tests and are not collected by pytest. Run each module from the project
+directory. For example:
+    python -m benchmarks.bench_movieinteger
+
+The suite module times the public functions of database.tables, the DBv0
+upgrade, and TMDB conversion against synthetic catalogues created by the
+catalogue module. It writes JSON results and compares them with a baseline:
+    python -m benchmarks.suite --movies 10000 --output results.json
+"""
+
+#  Copyright© 2026. Stephen Rigden.
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
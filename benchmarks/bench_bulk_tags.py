@@ -0,0 +1,100 @@
+"""Benchmark tagging, untagging, and retagging many movies at once.
+
+A synthetic catalogue is searched with criteria which select every movie.
+The time taken to tag, untag, and merge a tag for the whole selection is
+reported as movies per second. For comparison a sample of the selection is
+tagged one movie at a time with edit_movie_by_id as the edit form would.
+
+Usage:
+    python -m benchmarks.bench_bulk_tags [movies]
+"""
+
+#  Copyright© 2026. Stephen Rigden.
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from benchmarks import catalogue
+from database import schema, tables
+from moviebag import MovieBag, MovieInteger
+
+MOVIES = 10_000
+SAMPLE = 200
+EVERY_MOVIE = MovieBag(year=MovieInteger(f"{schema.MUYBRIDGE + 1}-2025"))
+
+
+def report(name: str, movies: int, seconds: float):
+    """Prints the time taken and the movies per second."""
+    print(f"    {name:24} {seconds * 1000:9.1f} ms {movies / seconds:12,.0f} movies/s")
+
+
+def timed(func, **kwargs) -> tuple[int, float]:
+    """Returns a call's result and the seconds it took."""
+    start = time.perf_counter()
+    result = func(**kwargs)
+    return result, time.perf_counter() - start
+
+
+def main(argv: list[str] = None) -> int:
+    """Runs the bulk tag benchmark."""
+    parser = argparse.ArgumentParser(prog="bench_bulk_tags")
+    parser.add_argument("movies", type=int, nargs="?", default=MOVIES)
+    args = parser.parse_args(argv)
+    with tempfile.TemporaryDirectory() as directory:
+        database_fn = Path(directory) / "bulk_tags.sqlite3"
+        spec = catalogue.CatalogueSpec(movies=args.movies, people=args.movies // 2)
+        catalogue.write_dbv1(database_fn, spec)
+        engine = create_engine(f"sqlite+pysqlite:///{database_fn}")
+        tables.session_factory = sessionmaker(engine)
+        tables.add_tags(tag_texts={"bulk", "merged"})
+        print(f"{args.movies:,} movies selected")
+
+        count, seconds = timed(tables.tag_movies, match=EVERY_MOVIE, tag_text="bulk")
+        report("tag_movies", count, seconds)
+        count, seconds = timed(tables.untag_movies, match=EVERY_MOVIE, tag_text="bulk")
+        report("untag_movies", count, seconds)
+        tables.tag_movies(match=EVERY_MOVIE, tag_text="bulk")
+        count, seconds = timed(
+            tables.merge_tags, old_tag_text="bulk", new_tag_text="merged"
+        )
+        report("merge_tags", count, seconds)
+
+        sample = tables.match_movies(MovieBag(title="1"))[:SAMPLE]
+        start = time.perf_counter()
+        for movie_bag in sample:
+            tables.edit_movie_by_id(
+                movie_id=movie_bag["id"],
+                updated=None,
+                replacement_fields=MovieBag(
+                    title=movie_bag["title"],
+                    year=movie_bag["year"],
+                    tags=movie_bag["tags"] | {"merged"},
+                ),
+            )
+        report(
+            f"edit_movie_by_id x {len(sample)}",
+            len(sample),
+            time.perf_counter() - start,
+        )
+        engine.dispose()
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
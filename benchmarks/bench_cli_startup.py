@@ -0,0 +1,80 @@
+"""Benchmark the cold start of the headless command line interface.
+
+Each run is a new interpreter process which lists the tags of a small
+database. The wall time includes interpreter start-up and all imports. The
+GUI program's import of its main window module is timed for comparison.
+"""
+
+#  Copyright© 2026. Stephen Rigden.
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks import catalogue
+
+REPEAT = 10
+ROOT = Path(__file__).parents[1]
+
+
+def time_process(args: list[str], cwd: Path) -> list[float]:
+    """Returns the wall times of REPEAT runs of a new interpreter."""
+    times = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, *args], cwd=cwd, check=True, capture_output=True
+        )
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def report(name: str, times: list[float]):
+    """Prints the median and minimum wall time in milliseconds."""
+    print(
+        f"{name:40} median {statistics.median(times) * 1000:8.1f} ms"
+        f"   min {min(times) * 1000:8.1f} ms"
+    )
+
+
+def main() -> int:
+    """Runs the start-up benchmarks."""
+    with tempfile.TemporaryDirectory() as directory:
+        database_fn = Path(directory) / "bench.sqlite3"
+        catalogue.write_dbv1(database_fn, catalogue.CatalogueSpec(movies=100))
+        report("interpreter only", time_process(["-c", "pass"], ROOT))
+        report(
+            "moviedb_cli tag list",
+            time_process(
+                [
+                    str(ROOT / "moviedb_cli.py"),
+                    "--database",
+                    str(database_fn),
+                    "tag",
+                    "list",
+                ],
+                Path(directory),
+            ),
+        )
+        report(
+            "import gui.mainwindow (for comparison)",
+            time_process(["-c", "import gui.mainwindow"], ROOT),
+        )
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
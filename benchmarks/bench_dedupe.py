@@ -0,0 +1,127 @@
+"""Benchmark the whole-catalogue duplicate search.
+
+One movie and one person in a hundred is copied with a moved article, a
+reversed name, or a year which is out by one. The search is timed in this
+process and across a process pool. The number of comparisons made is
+reported against the number a search of every pair would make, together
+with the share of the copies which were found.
+
+Usage:
+    python -m benchmarks.bench_dedupe [--workers N] [movies ...]
+"""
+
+#  Copyright© 2026. Stephen Rigden.
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from contextlib import closing
+from pathlib import Path
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from benchmarks import catalogue
+from database import dedupe, tables
+
+SIZES = (10_000, 100_000)
+COPY_EVERY = 100
+
+
+def add_copies(database_fn: Path, rows: catalogue.Catalogue) -> int:
+    """Adds near-duplicate copies of some movies and people.
+
+    Returns:
+        The number of copies added.
+    """
+    rng = random.Random(3)
+    movies, people = [], []
+    for movie in rows.movies[::COPY_EVERY]:
+        if rng.random() < 0.5:
+            movies.append((f"{movie['title']}, The", movie["year"]))
+        else:
+            movies.append((movie["title"], movie["year"] + 1))
+    for person in rows.people[::COPY_EVERY]:
+        forenames, _, surname = person["name"].partition(" ")
+        people.append((f"{surname}, {forenames}",))
+    with closing(sqlite3.connect(database_fn)) as conn:
+        conn.executemany(
+            "INSERT INTO movie (created, updated, title, year) "
+            "VALUES (datetime(), datetime(), ?, ?)",
+            movies,
+        )
+        conn.executemany(
+            "INSERT INTO person (created, updated, name) "
+            "VALUES (datetime(), datetime(), ?)",
+            people,
+        )
+        conn.commit()
+    return len(movies) + len(people)
+
+
+def comparisons(max_block: int) -> int:
+    """Returns the number of pairs in the blocks which are scored."""
+    with tables.session_factory() as session:
+        movie_blocks, people_blocks = dedupe._select_blocks(session)
+    return sum(
+        len(block) * (len(block) - 1) // 2
+        for blocks in (movie_blocks, people_blocks)
+        for block in blocks.values()
+        if len(block) <= max_block
+    )
+
+
+def bench_size(directory: Path, movies: int, workers: int):
+    """Runs the duplicate search against a catalogue of the given size."""
+    database_fn = directory / f"dedupe_{movies}.sqlite3"
+    spec = catalogue.CatalogueSpec(movies=movies, people=movies // 2)
+    rows = catalogue.write_dbv1(database_fn, spec)
+    copies = add_copies(database_fn, rows)
+    engine = create_engine(f"sqlite+pysqlite:///{database_fn}")
+    tables.session_factory = sessionmaker(engine)
+
+    records = movies + movies // 2 + copies
+    print(
+        f"{movies:,} movies: {comparisons(dedupe.MAX_BLOCK):,} comparisons "
+        f"instead of {records * (records - 1) // 2:,}"
+    )
+    for worker_count in sorted({1, workers}):
+        start = time.perf_counter()
+        pairs = dedupe.find_duplicates(workers=worker_count)
+        seconds = time.perf_counter() - start
+        exact = sum(pair.score == 1.0 for pair in pairs)
+        print(
+            f"{movies:,} movies: {worker_count} worker(s) {seconds:8.2f} s   "
+            f"{len(pairs):,} pairs, {exact:,} of {copies:,} copies scored 1.0"
+        )
+    engine.dispose()
+
+
+def main(argv: list[str] = None) -> int:
+    """Runs the duplicate search benchmarks."""
+    parser = argparse.ArgumentParser(prog="bench_dedupe")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("movies", type=int, nargs="*")
+    args = parser.parse_args(argv)
+    with tempfile.TemporaryDirectory() as directory:
+        for movies in args.movies or SIZES:
+            bench_size(Path(directory), movies, args.workers)
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
@@ -0,0 +1,157 @@
+"""Benchmark probable duplicate detection.
+
+The title similarity index is compared with a naive scan which scores every
+movie in the catalogue. Queries are variations of catalogue titles: a moved
+article, a typing mistake, and a year which is out by one. Cold lookups
+compute the trigrams of the titles they compare. Warm lookups follow
+TitleIndex.warm, which the program runs in the background when the add movie
+form opens. The times to load and warm the index are reported too.
+
+Usage:
+    python -m benchmarks.bench_duplicates [movies ...]
+"""
+
+#  Copyright© 2026. Stephen Rigden.
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import argparse
+import random
+import statistics
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+
+from benchmarks import catalogue
+from database import schema, similarity, tables
+
+SIZES = (10_000, 100_000)
+QUERIES = 200
+
+
+def variations(rows: catalogue.Catalogue, count: int) -> list[tuple[str, int]]:
+    """Returns titles and years which are near misses of catalogue movies."""
+    rng = random.Random(1)
+    queries = []
+    for movie in rng.sample(rows.movies, count):
+        title, year = movie["title"], movie["year"]
+        match rng.randrange(3):
+            case 0:
+                title = f"{title}, The"
+            case 1:
+                ix = rng.randrange(len(title) - 1)
+                title = title[:ix] + title[ix + 1] + title[ix] + title[ix + 2 :]
+            case _:
+                year += rng.choice((-1, 1))
+        queries.append((title, year))
+    return queries
+
+
+def naive_scan(
+    movies: list[tuple[str, int]], title: str, year: int
+) -> list[similarity.Candidate]:
+    """Scores every movie without an index."""
+    grams = similarity.trigrams(similarity.title_key(title))
+    candidates = []
+    for other_title, other_year in movies:
+        if abs(other_year - year) > similarity.YEAR_TOLERANCE:
+            continue
+        other_grams = similarity.trigrams(similarity.title_key(other_title))
+        score = len(grams & other_grams) / len(grams | other_grams)
+        if score >= similarity.THRESHOLD:
+            candidates.append(similarity.Candidate(other_title, other_year, score))
+    candidates.sort(key=lambda item: (-item.score, abs(item.year - year), item.title))
+    return candidates[: similarity.LIMIT]
+
+
+def report(name: str, func: Callable, queries: list[tuple[str, int]]) -> list:
+    """Prints the median and p99 time of each query and returns the results."""
+    times, results = [], []
+    for title, year in queries:
+        start = time.perf_counter()
+        results.append(func(title, year))
+        times.append(time.perf_counter() - start)
+    p99 = statistics.quantiles(times, n=100)[98]
+    print(
+        f"{name:40} median {statistics.median(times) * 1000:8.2f} ms"
+        f"   p99 {p99 * 1000:8.2f} ms"
+    )
+    return results
+
+
+def bench_size(directory: Path, movies: int):
+    """Loads the index and runs the queries against a catalogue."""
+    database_fn = directory / f"duplicates_{movies}.sqlite3"
+    rows = catalogue.write_dbv1(
+        database_fn, catalogue.CatalogueSpec(movies=movies, people=movies // 2)
+    )
+    engine = create_engine(f"sqlite+pysqlite:///{database_fn}")
+    tables.session_factory = sessionmaker(engine)
+    queries = variations(rows, min(QUERIES, movies))
+
+    start = time.perf_counter()
+    similarity.title_index.ensure_loaded()
+    print(f"{movies:,} movies: load index {time.perf_counter() - start:13.2f} s")
+
+    report(
+        f"{movies:,} movies: cold index lookup",
+        similarity.probable_duplicates,
+        queries,
+    )
+    similarity.invalidate()
+    start = time.perf_counter()
+    similarity.title_index.warm()
+    print(
+        f"{movies:,} movies: load and warm index "
+        f"{time.perf_counter() - start:5.2f} s"
+    )
+    indexed = report(
+        f"{movies:,} movies: warm index lookup",
+        similarity.probable_duplicates,
+        queries,
+    )
+    with tables.session_factory() as session:
+        all_movies = session.execute(
+            select(schema.Movie.title, schema.Movie.year)
+        ).all()
+    scanned = report(
+        f"{movies:,} movies: naive scan",
+        lambda title, year: naive_scan(all_movies, title, year),
+        queries,
+    )
+    found = sum(bool(result) for result in indexed)
+    print(
+        f"{movies:,} movies: {found} of {len(queries)} near misses found. "
+        f"Index and scan agree: {indexed == scanned}"
+    )
+
+    similarity.invalidate()
+    engine.dispose()
+
+
+def main(argv: list[str] = None) -> int:
+    """Runs the duplicate detection benchmarks."""
+    parser = argparse.ArgumentParser(prog="bench_duplicates")
+    parser.add_argument("movies", type=int, nargs="*", default=SIZES)
+    args = parser.parse_args(argv)
+    with tempfile.TemporaryDirectory() as directory:
+        for movies in args.movies:
+            bench_size(Path(directory), movies)
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
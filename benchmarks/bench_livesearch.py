@@ -0,0 +1,127 @@
+"""Benchmark search-as-you-type against the local catalogue.
+
+Each query is typed one letter at a time and every keystroke is searched
+as the movie form would search it. The time taken to load the index is
+reported with the median, 99th percentile, and slowest keystroke. A plain
+scan of every movie and its people is timed for comparison.
+
+Usage:
+    python -m benchmarks.bench_livesearch [movies ...]
+"""
+
+#  Copyright© 2026. Stephen Rigden.
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import argparse
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from benchmarks import catalogue
+from database import livesearch, similarity, tables
+
+SIZES = (10_000, 100_000)
+QUERIES = 50
+BUDGET_MS = 16.0
+
+
+def keystrokes(rows: catalogue.Catalogue) -> list[str]:
+    """Returns every prefix of some queries taken from the catalogue.
+
+    Queries are a title, a word of a title followed by a person's surname,
+    or the middle of a person's name.
+    """
+    rng = random.Random(5)
+    queries = []
+    for _ in range(QUERIES):
+        movie = rng.choice(rows.movies)["title"]
+        person = rng.choice(rows.people)["name"]
+        queries.append(
+            rng.choice(
+                (
+                    movie,
+                    f"{rng.choice(movie.split())} {person.split()[-1]}",
+                    person[1:-1],
+                )
+            )
+        )
+    return [query[:end] for query in queries for end in range(1, len(query) + 1)]
+
+
+def naive_search(rows: list[tuple[str, str]], text: str) -> int:
+    """Returns the number of movies whose text holds every query word."""
+    query_words = similarity.words(text)
+    return sum(all(word in key for word in query_words) for _, key in rows)
+
+
+def bench_size(directory: Path, movies: int):
+    """Times the local search against a catalogue of the given size."""
+    database_fn = directory / f"livesearch_{movies}.sqlite3"
+    spec = catalogue.CatalogueSpec(movies=movies, people=movies // 2)
+    rows = catalogue.write_dbv1(database_fn, spec)
+    engine = create_engine(f"sqlite+pysqlite:///{database_fn}")
+    tables.session_factory = sessionmaker(engine)
+    livesearch.invalidate()
+
+    start = time.perf_counter()
+    livesearch.catalogue_index.ensure_loaded()
+    load_seconds = time.perf_counter() - start
+
+    texts = keystrokes(rows)
+    timings = []
+    for text in texts:
+        start = time.perf_counter()
+        livesearch.search(text)
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    p99 = timings[int(len(timings) * 0.99)]
+    print(
+        f"{movies:,} movies: load {load_seconds:6.2f} s   "
+        f"{len(texts):,} keystrokes: median {statistics.median(timings):6.2f} ms  "
+        f"p99 {p99:6.2f} ms  max {timings[-1]:6.2f} ms  "
+        f"over {BUDGET_MS:.0f} ms {sum(ms > BUDGET_MS for ms in timings)}"
+    )
+
+    # Titles only: a scan which also joined people would be slower still.
+    scan_rows = [
+        (movie["title"], " ".join(similarity.words(movie["title"])))
+        for movie in rows.movies
+    ]
+    sample = texts[:: max(1, len(texts) // 100)]
+    start = time.perf_counter()
+    for text in sample:
+        naive_search(scan_rows, text)
+    scan_ms = (time.perf_counter() - start) * 1000 / len(sample)
+    print(f"{movies:,} movies: title scan {scan_ms:6.2f} ms per keystroke")
+    livesearch.invalidate()
+    engine.dispose()
+
+
+def main(argv: list[str] = None) -> int:
+    """Runs the local search benchmarks."""
+    parser = argparse.ArgumentParser(prog="bench_livesearch")
+    parser.add_argument("movies", type=int, nargs="*")
+    args = parser.parse_args(argv)
+    with tempfile.TemporaryDirectory() as directory:
+        for movies in args.movies or SIZES:
+            bench_size(Path(directory), movies)
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
@@ -0,0 +1,118 @@
+"""Benchmark the cost of logging on the calling thread.
+
+The plain file handler formerly configured by moviedb.start_logger is compared
+with the queued pipeline in text and JSON lines formats. Only the time spent
+by the logging thread is measured because that is the time a Tk callback
+would wait. The listener thread's file writes are not included.
+"""
+
+#  Copyright© 2026. Stephen Rigden.
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import logging
+import statistics
+import sys
+import tempfile
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+from sqlalchemy.exc import IntegrityError
+
+from logpipeline import LogPipeline, TEXT_FORMAT
+
+NUMBER = 20_000
+
+
+@contextmanager
+def direct_file(filename: Path) -> Iterator:
+    """Logs with a synchronous file handler on the calling thread."""
+    handler = logging.FileHandler(filename, mode="w")
+    handler.setFormatter(logging.Formatter(TEXT_FORMAT, style="{"))
+    root = logging.getLogger()
+    root.addHandler(handler)
+    root.setLevel("INFO")
+    try:
+        yield
+    finally:
+        root.removeHandler(handler)
+        handler.close()
+
+
+@contextmanager
+def pipeline(filename: Path, json_lines: bool = False) -> Iterator:
+    """Logs with the queued pipeline."""
+    with LogPipeline(filename, json_lines=json_lines):
+        yield
+
+
+def info_call():
+    """An informational message of the kind logged by database.environment."""
+    logging.info("The database file was found at /home/user/Movies-Database.")
+
+
+def error_call():
+    """An error message of the kind logged by database.tables."""
+    exc = IntegrityError("INSERT INTO movie", {}, Exception("UNIQUE failed"))
+    logging.error(exc)
+
+
+def exception_call():
+    """An error with a traceback."""
+    try:
+        raise ValueError("A test exception")
+    except ValueError:
+        logging.exception("A failed call")
+
+
+def time_calls(call: Callable, number: int) -> list[float]:
+    """Returns the latency in seconds of each call."""
+    latencies = []
+    for _ in range(number):
+        start = time.perf_counter()
+        call()
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def report(name: str, latencies: list[float]):
+    """Prints the mean and 99th percentile latency in microseconds."""
+    p99 = statistics.quantiles(latencies, n=100)[98]
+    print(
+        f"{name:40} mean {statistics.fmean(latencies) * 1_000_000:9.2f} µs"
+        f"   p99 {p99 * 1_000_000:9.2f} µs"
+    )
+
+
+def main() -> int:
+    """Runs the logging benchmarks."""
+    with tempfile.TemporaryDirectory() as directory:
+        filename = Path(directory) / "bench.log"
+        for name, handler in (
+            ("direct file", lambda: direct_file(filename)),
+            ("queued pipeline, text", lambda: pipeline(filename)),
+            ("queued pipeline, JSON lines", lambda: pipeline(filename, True)),
+        ):
+            for call_name, call, number in (
+                ("info", info_call, NUMBER),
+                ("error", error_call, NUMBER),
+                ("exception", exception_call, NUMBER // 10),
+            ):
+                with handler():
+                    latencies = time_calls(call, number)
+                report(f"{name}: {call_name}", latencies)
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
@@ -0,0 +1,64 @@
+"""Benchmark the idle-time maintenance tasks.
+
+A catalogue is written and a fraction of its movies are deleted to leave
+free pages and stale statistics. Each maintenance task is then run and its
+report is printed with the time it took, the bytes it returned to the file
+system, and the change in the time taken by the probe queries.
+
+Usage:
+    python -m benchmarks.bench_maintenance [movies] [--delete FRACTION]
+"""
+
+#  Copyright© 2026. Stephen Rigden.
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import argparse
+import sqlite3
+import sys
+import tempfile
+from contextlib import closing
+from pathlib import Path
+
+from benchmarks import catalogue
+from database import maintenance
+
+MOVIES = 20_000
+DELETE = 0.3
+
+
+def main(argv: list[str] = None) -> int:
+    """Runs the maintenance benchmark."""
+    parser = argparse.ArgumentParser(prog="bench_maintenance")
+    parser.add_argument("movies", type=int, nargs="?", default=MOVIES)
+    parser.add_argument("--delete", type=float, default=DELETE)
+    args = parser.parse_args(argv)
+    with tempfile.TemporaryDirectory() as directory:
+        database_fn = Path(directory) / "maintenance.sqlite3"
+        spec = catalogue.CatalogueSpec(movies=args.movies, people=args.movies // 2)
+        catalogue.write_dbv1(database_fn, spec)
+        step = max(1, round(1 / args.delete)) if args.delete else 0
+        with closing(sqlite3.connect(database_fn)) as conn, conn:
+            if step:
+                for table in ("movie_star_table", "movie_director_table"):
+                    conn.execute(f"DELETE FROM {table} WHERE movie_id % {step} = 0")
+                conn.execute(f"DELETE FROM movie_tag_table WHERE movie_id % {step} = 0")
+                conn.execute(f"DELETE FROM movie WHERE id % {step} = 0")
+        size = database_fn.stat().st_size
+        print(f"{args.movies:,} movies, {size:,} bytes, deleted 1 in {step or '-'}")
+        for report in maintenance.run_due(database_fn, force=True):
+            print(f"    {report}")
+        print(f"{database_fn.stat().st_size:,} bytes after maintenance")
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
@@ -0,0 +1,86 @@
+"""Benchmark repeated match_movies searches with the result cache.
+
+A synthetic catalogue is searched with a mix of tag, director, title, and
+decade criteria. Each search is timed once with an empty cache and then
+repeated. The cache statistics are printed at the end.
+
+Usage:
+    python -m benchmarks.bench_match_cache [movies]
+"""
+
+#  Copyright© 2026. Stephen Rigden.
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from benchmarks import catalogue
+from database import tables
+from moviebag import MovieBag, MovieInteger
+
+MOVIES = 10_000
+REPEATS = 20
+
+
+def searches(rows: catalogue.Catalogue) -> list[MovieBag]:
+    """Returns searches of the kind a user repeats."""
+    return [
+        MovieBag(tags={rows.tags[0]["text"]}),
+        MovieBag(tags={rows.tags[1]["text"], rows.tags[2]["text"]}),
+        MovieBag(directors={rows.people[0]["name"].split()[-1]}),
+        MovieBag(title=rows.movies[0]["title"].split()[0]),
+        MovieBag(year=MovieInteger("1950-1959")),
+    ]
+
+
+def time_ms(match: MovieBag) -> tuple[int, float]:
+    """Returns the number of movies found and the time taken."""
+    start = time.perf_counter()
+    count = len(tables.match_movies(match))
+    return count, (time.perf_counter() - start) * 1000
+
+
+def main(argv: list[str] = None) -> int:
+    """Runs the match cache benchmark."""
+    parser = argparse.ArgumentParser(prog="bench_match_cache")
+    parser.add_argument("movies", type=int, nargs="?", default=MOVIES)
+    args = parser.parse_args(argv)
+    with tempfile.TemporaryDirectory() as directory:
+        database_fn = Path(directory) / "match_cache.sqlite3"
+        spec = catalogue.CatalogueSpec(movies=args.movies, people=args.movies // 2)
+        rows = catalogue.write_dbv1(database_fn, spec)
+        engine = create_engine(f"sqlite+pysqlite:///{database_fn}")
+        tables.session_factory = sessionmaker(engine)
+        tables.clear_match_cache()
+
+        print(f"{args.movies:,} movies: movies found, first search, repeat median")
+        for match in searches(rows):
+            count, first = time_ms(match)
+            repeats = [time_ms(match)[1] for _ in range(REPEATS)]
+            print(
+                f"    {str(dict(match)):48.48} {count:6,} "
+                f"{first:9.2f} ms {statistics.median(repeats):9.2f} ms"
+            )
+        print(f"    {tables.match_cache_stats()}")
+        engine.dispose()
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
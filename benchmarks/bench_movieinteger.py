@@ -0,0 +1,124 @@
+"""Benchmark MovieInteger parsing, membership, and query cost.
+
+The interval implementation is compared with the expanded set of integers
+which MovieInteger used to hold and with the IN clause which was built from it.
+"""
+
+#  Copyright© 2026. Stephen Rigden.
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import random
+import sys
+import timeit
+
+from sqlalchemy import create_engine, insert, or_, select
+from sqlalchemy.orm import Session
+
+from database import schema
+from moviebag import MovieInteger
+
+PATTERN = f"{schema.MUYBRIDGE}-{schema.MAX_YEAR}"
+MOVIE_COUNT = 20_000
+
+
+def expanded_set(pattern: str) -> set[int]:
+    """Returns the expanded set of integers formerly held by MovieInteger."""
+    low, high = (int(limit) for limit in pattern.split("-"))
+    return set(range(low, high + 1))
+
+
+def report(name: str, seconds: float, number: int):
+    """Prints the mean time per call in microseconds."""
+    print(f"{name:40} {seconds / number * 1_000_000:12.2f} µs")
+
+
+def bench_parse(number: int = 1000):
+    """Times the creation of a wide search pattern."""
+    report(
+        "parse: interval",
+        timeit.timeit(lambda: MovieInteger(PATTERN), number=number),
+        number,
+    )
+    report(
+        "parse: expanded set",
+        timeit.timeit(lambda: expanded_set(PATTERN), number=number),
+        number,
+    )
+
+
+def bench_membership(number: int = 100_000):
+    """Times membership tests against a multi-range search pattern."""
+    mint = MovieInteger("1920-1929, 1940-1949, 1960-1969, 2000-2025")
+    ints = set(mint)
+    report(
+        "membership: interval",
+        timeit.timeit(lambda: 1965 in mint, number=number),
+        number,
+    )
+    report(
+        "membership: expanded set",
+        timeit.timeit(lambda: 1965 in ints, number=number),
+        number,
+    )
+
+
+def interval_clause(mint: MovieInteger):
+    """Returns a year clause of one BETWEEN test per interval of mint."""
+    return or_(*(schema.Movie.year.between(low, high) for low, high in mint.intervals))
+
+
+def bench_query(number: int = 20):
+    """Times a year search of an in-memory database with MOVIE_COUNT movies."""
+    engine = create_engine("sqlite+pysqlite:///:memory:")
+    schema.Base.metadata.create_all(engine)
+    rng = random.Random(42)
+    with Session(engine) as session:
+        session.execute(
+            insert(schema.Movie),
+            [
+                dict(title=f"Movie {ix}", year=rng.randint(schema.MUYBRIDGE + 1, 2025))
+                for ix in range(MOVIE_COUNT)
+            ],
+        )
+        session.commit()
+
+        mint = MovieInteger("1950-1959, 1970-1979")
+        interval_statement = select(schema.Movie.id).where(interval_clause(mint))
+        in_statement = select(schema.Movie.id).where(schema.Movie.year.in_(list(mint)))
+        wide_interval_statement = select(schema.Movie.id).where(
+            interval_clause(MovieInteger(PATTERN))
+        )
+        wide_in_statement = select(schema.Movie.id).where(
+            schema.Movie.year.in_(list(expanded_set(PATTERN)))
+        )
+
+        for name, statement in (
+            ("query: BETWEEN two decades", interval_statement),
+            ("query: IN two decades", in_statement),
+            ("query: BETWEEN all years", wide_interval_statement),
+            ("query: IN all years", wide_in_statement),
+        ):
+            seconds = timeit.timeit(
+                lambda: session.execute(statement).all(), number=number
+            )
+            report(name, seconds, number)
+
+
+def main():
+    """Runs all MovieInteger benchmarks."""
+    bench_parse()
+    bench_membership()
+    bench_query()
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
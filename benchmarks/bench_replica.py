@@ -0,0 +1,118 @@
+"""Benchmark reads from the in-memory replica against reads from the file.
+
+A catalogue is written and a set of typical reads is timed twice, first with
+the tables module reading the database file and then with the replica
+enabled. The caches of the tables module are cleared before every read. The
+replica's load time and size are printed, as is the time taken by a write
+which commits and so reloads the replica.
+
+Usage:
+    python -m benchmarks.bench_replica [movies]
+"""
+
+#  Copyright© 2026. Stephen Rigden.
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from benchmarks import catalogue
+from database import environment, replica, tables
+from moviebag import MovieBag, MovieInteger
+
+MOVIES = 20_000
+REPEATS = 10
+
+
+def reads(rows: catalogue.Catalogue) -> dict[str, Callable]:
+    """Returns the reads which are timed."""
+    title = rows.movies[0]["title"]
+    year = MovieInteger(rows.movies[0]["year"])
+    return {
+        "select_movie": lambda: tables.select_movie(
+            movie_bag=MovieBag(title=title, year=year)
+        ),
+        "select_movie_by_id": lambda: tables.select_movie_by_id(movie_id=1),
+        "match_movies_compact title": lambda: tables.match_movies_compact(
+            MovieBag(title=title.split()[0])
+        ),
+        "match_movies_compact tag": lambda: tables.match_movies_compact(
+            MovieBag(tags={rows.tags[0]["text"]})
+        ),
+        "select_movie_summaries": tables.select_movie_summaries,
+        "select_all_tags": tables.select_all_tags,
+    }
+
+
+def time_ms(read: Callable) -> float:
+    """Returns the median time taken by a read with empty caches."""
+    times = []
+    for _ in range(REPEATS):
+        tables.clear_identity_cache()
+        tables.clear_match_cache()
+        start = time.perf_counter()
+        read()
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+
+def write_ms() -> float:
+    """Returns the time taken by a write which commits."""
+    start = time.perf_counter()
+    tables.add_tag(tag_text=f"bench {time.perf_counter_ns()}")
+    return (time.perf_counter() - start) * 1000
+
+
+def main(argv: list[str] = None) -> int:
+    """Runs the replica benchmark."""
+    parser = argparse.ArgumentParser(prog="bench_replica")
+    parser.add_argument("movies", type=int, nargs="?", default=MOVIES)
+    args = parser.parse_args(argv)
+    with tempfile.TemporaryDirectory() as directory:
+        database_fn = Path(directory) / "replica.sqlite3"
+        spec = catalogue.CatalogueSpec(movies=args.movies, people=args.movies // 2)
+        rows = catalogue.write_dbv1(database_fn, spec)
+        engine = create_engine(
+            f"sqlite+pysqlite:///{database_fn}",
+            query_cache_size=environment.QUERY_CACHE_SIZE,
+        )
+        tables.session_factory = sessionmaker(engine)
+
+        timed_reads = reads(rows)
+        disk = {name: time_ms(read) for name, read in timed_reads.items()}
+        disk_write = write_ms()
+        replica.enable(query_cache_size=environment.QUERY_CACHE_SIZE)
+        load = replica.stats()
+        memory = {name: time_ms(read) for name, read in timed_reads.items()}
+        memory_write = write_ms()
+        replica.disable()
+        engine.dispose()
+
+        print(f"{args.movies:,} movies, {database_fn.stat().st_size:,} byte file")
+        print(f"    replica load {load.seconds * 1000:.1f} ms, {load.size:,} bytes")
+        print(f"    {'median of ' + str(REPEATS):28} {'file':>10} {'replica':>10}")
+        for name in timed_reads:
+            print(f"    {name:28} {disk[name]:7.2f} ms {memory[name]:7.2f} ms")
+        print(f"    {'add_tag':28} {disk_write:7.2f} ms {memory_write:7.2f} ms")
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
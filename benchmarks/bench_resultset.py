@@ -0,0 +1,79 @@
+"""Benchmark the memory cost of a list of movie bags and a MovieResultSet."""
+
+#  Copyright© 2026. Stephen Rigden.
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import random
+import sys
+import tracemalloc
+from collections.abc import Callable
+from datetime import datetime, timedelta
+
+from moviebag import MovieBag, MovieInteger
+from movieresultset import MovieResultSet
+
+MOVIE_COUNT = 50_000
+PEOPLE_COUNT = 20_000
+TAG_COUNT = 50
+
+
+def movie_bags(count: int) -> list[MovieBag]:
+    """Returns movie bags shaped like those of tables.select_all_movies.
+
+    The names are built at runtime, as they would be when read from the
+    database, so that equal names are not shared objects.
+    """
+    rng = random.Random(42)
+    start = datetime(2024, 1, 1)
+    bags = []
+    for ix in range(count):
+        timestamp = start + timedelta(minutes=ix)
+        bags.append(
+            MovieBag(
+                id=ix + 1,
+                created=timestamp,
+                updated=timestamp,
+                title=f"Movie {ix}",
+                year=MovieInteger(rng.randint(1900, 2025)),
+                duration=MovieInteger(rng.randint(70, 200)),
+                directors={f"Person {rng.randrange(PEOPLE_COUNT)}"},
+                stars={f"Person {rng.randrange(PEOPLE_COUNT)}" for _ in range(3)},
+                synopsis=f"Synopsis of movie {ix}",
+                tags={f"Tag {rng.randrange(TAG_COUNT)}" for _ in range(2)},
+            )
+        )
+    return bags
+
+
+def traced(build: Callable) -> tuple[object, int]:
+    """Returns the built object and the bytes it holds."""
+    tracemalloc.start()
+    obj = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return obj, size
+
+
+def main():
+    """Compares the memory held by each container for MOVIE_COUNT movies."""
+    _, list_size = traced(lambda: movie_bags(MOVIE_COUNT))
+    # The movie bags are discarded once they are loaded into the result set.
+    _, total_size = traced(
+        lambda: MovieResultSet.from_movie_bags(movie_bags(MOVIE_COUNT))
+    )
+    print(f"{MOVIE_COUNT} movies")
+    print(f"{'list[MovieBag]':30} {list_size / 2**20:10.1f} MiB")
+    print(f"{'MovieResultSet':30} {total_size / 2**20:10.1f} MiB")
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
@@ -0,0 +1,121 @@
+"""Benchmark re-sorting the movie selection table.
+
+Each column of SelectMovieGUI is sorted twice. The first click computes the
+column's sort keys and the second reverses the order with the cached keys.
+Both are timed for a list of movie bags and for a MovieResultSet.
+
+If a display is available the treeview is filled and a re-sort which moves
+the existing items is timed against deleting and inserting every item.
+
+Usage:
+    python -m benchmarks.bench_sort [movies]
+"""
+
+#  Copyright© 2026. Stephen Rigden.
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import argparse
+import sys
+import time
+import tkinter as tk
+import tkinter.ttk as ttk
+from dataclasses import dataclass
+
+from benchmarks.bench_resultset import movie_bags
+from gui import tviewselect
+from moviebag import MovieBag
+from movieresultset import MovieResultSet
+
+MOVIES = 50_000
+
+
+class _NullTree:
+    """Stands in for a treeview when there is no display."""
+
+    def set_children(self, item: str, *iids: str):
+        """Discards the new order."""
+
+
+@dataclass
+class _HeadlessSelectMovieGUI(tviewselect.SelectMovieGUI):
+    """A SelectMovieGUI without widgets."""
+
+    def __post_init__(self):
+        self.titles = [
+            tviewselect.TITLE,
+            tviewselect.YEAR,
+            tviewselect.DIRECTORS,
+            tviewselect.DURATION,
+            tviewselect.SYNOPSIS,
+        ]
+        self.widths = [0] * len(self.titles)
+
+
+def time_ms(func, *args) -> float:
+    """Returns the time taken by one call in milliseconds."""
+    start = time.perf_counter()
+    func(*args)
+    return (time.perf_counter() - start) * 1000
+
+
+def bench_keys(name: str, rows: list[MovieBag] | MovieResultSet):
+    """Times the first and second click of each column heading."""
+    gui = _HeadlessSelectMovieGUI(None, selection_callback=print, rows=rows)
+    tree = _NullTree()
+    print(f"{name}: first click, second click")
+    for column, title in enumerate(gui.titles):
+        first = time_ms(gui.sort_by, tree, column)
+        second = time_ms(gui.sort_by, tree, column)
+        print(f"    {title:12} {first:8.1f} ms {second:8.1f} ms")
+
+
+def bench_treeview(rows: list[MovieBag]):
+    """Times moving the existing items against rebuilding the treeview."""
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        print("Treeview: skipped, no display")
+        return
+    tree = ttk.Treeview(root, columns=("year",))
+    for ix, movie in enumerate(rows):
+        tree.insert("", "end", iid=ix, text=movie["title"], values=(movie["year"],))
+    gui = _HeadlessSelectMovieGUI(root, selection_callback=print, rows=rows)
+    gui.sort_by(tree, 1)
+
+    def rebuild():
+        """Deletes every item and inserts them again in year order."""
+        tree.delete(*tree.get_children())
+        for ix in sorted(range(len(rows)), key=gui.sort_keys[1].__getitem__):
+            movie = rows[ix]
+            tree.insert("", "end", iid=ix, text=movie["title"], values=(movie["year"],))
+
+    print(f"Treeview: move items {time_ms(gui.sort_by, tree, 1):8.1f} ms")
+    print(f"Treeview: rebuild    {time_ms(rebuild):8.1f} ms")
+    root.destroy()
+
+
+def main(argv: list[str] = None) -> int:
+    """Runs the sort benchmarks."""
+    parser = argparse.ArgumentParser(prog="bench_sort")
+    parser.add_argument("movies", type=int, nargs="?", default=MOVIES)
+    args = parser.parse_args(argv)
+    rows = movie_bags(args.movies)
+    rows.sort(key=lambda movie_bag: movie_bag["title"])
+    print(f"{args.movies:,} movies")
+    bench_keys("list[MovieBag]", rows)
+    bench_keys("MovieResultSet", MovieResultSet.from_movie_bags(rows))
+    bench_treeview(rows)
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
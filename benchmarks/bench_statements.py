@@ -0,0 +1,169 @@
+"""Benchmark the per-call overhead of the hot tables statements.
+
+Each lookup is timed three ways: with a statement built on every call and
+no compiled cache, with a statement built on every call and the engine's
+compiled cache, and with the pre-built parameterised statement which the
+tables module now uses. The catalogue is small so that the time is mostly
+spent in Python rather than in SQLite.
+
+Usage:
+    python -m benchmarks.bench_statements [calls]
+"""
+
+#  Copyright© 2026. Stephen Rigden.
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import argparse
+import sys
+import time
+from collections.abc import Callable
+
+from sqlalchemy import create_engine, intersect, or_, select
+from sqlalchemy.orm import Session, sessionmaker
+
+from database import environment, schema, tables
+from moviebag import MovieBag, MovieInteger
+
+CALLS = 5_000
+MOVIES = 200
+
+
+def built_select_movie(session: Session, *, movie_bag: MovieBag) -> schema.Movie:
+    """Returns a movie with a statement built for the call."""
+    statement = (
+        select(schema.Movie)
+        .where(schema.Movie.title == movie_bag["title"])
+        .where(schema.Movie.year == int(movie_bag["year"]))
+    )
+    return session.scalars(statement).one()
+
+
+def built_select_person(session: Session, *, name: str) -> schema.Person:
+    """Returns a person with a statement built for the call."""
+    statement = select(schema.Person).where(schema.Person.name == name)
+    return session.scalars(statement).one()
+
+
+def built_select_tag(session: Session, *, text: str) -> schema.Tag:
+    """Returns a tag with a statement built for the call."""
+    statement = select(schema.Tag).where(schema.Tag.text == text)
+    return session.scalars(statement).one()
+
+
+def built_match_movies(session: Session, *, match: MovieBag) -> set[schema.Movie]:
+    """Returns matching movies with statements built for the call."""
+    intersection = intersect(
+        select(schema.Movie).where(schema.Movie.title.like(f"%{match['title']}%")),
+        select(schema.Movie).where(
+            or_(
+                *(
+                    schema.Movie.year.between(low, high)
+                    for low, high in match["year"].intervals
+                )
+            )
+        ),
+        select(schema.Movie)
+        .select_from(schema.Movie)
+        .join(schema.Movie.stars)
+        .where(schema.Person.name.like(f"%{next(iter(match['stars']))}%")),
+    )
+    statement = select(schema.Movie).from_statement(intersection)
+    return set(session.scalars(statement).all())
+
+
+def lookups(
+    select_movie: Callable, select_person: Callable, select_tag: Callable
+) -> list[tuple[str, Callable[[Session, int], object]]]:
+    """Returns the named lookups made by each timed call."""
+    return [
+        (
+            "select movie",
+            lambda session, ix: select_movie(
+                session,
+                movie_bag=MovieBag(
+                    title=f"Movie {ix % MOVIES}", year=MovieInteger(1950 + ix % MOVIES)
+                ),
+            ),
+        ),
+        (
+            "select person",
+            lambda session, ix: select_person(session, name=f"Person {ix % MOVIES}"),
+        ),
+        (
+            "select tag",
+            lambda session, ix: select_tag(session, text=f"tag {ix % 10}"),
+        ),
+    ]
+
+
+def time_calls(engine, call: Callable, calls: int) -> float:
+    """Returns the mean time of a call in microseconds."""
+    with Session(engine) as session:
+        call(session, 0)
+        start = time.perf_counter()
+        for ix in range(calls):
+            call(session, ix)
+        return (time.perf_counter() - start) / calls * 1_000_000
+
+
+def load(engine):
+    """Adds MOVIES movies, each with one star, and ten tags."""
+    tables.session_factory = sessionmaker(engine)
+    schema.Base.metadata.create_all(engine)
+    tables.add_tags(tag_texts={f"tag {ix}" for ix in range(10)})
+    for ix in range(MOVIES):
+        tables.add_movie(
+            movie_bag=MovieBag(
+                title=f"Movie {ix}",
+                year=MovieInteger(1950 + ix),
+                stars={f"Person {ix}"},
+            )
+        )
+
+
+def main(argv: list[str] = None) -> int:
+    """Runs the statement overhead benchmarks."""
+    parser = argparse.ArgumentParser(prog="bench_statements")
+    parser.add_argument("calls", type=int, nargs="?", default=CALLS)
+    args = parser.parse_args(argv)
+
+    uncached = create_engine("sqlite+pysqlite:///:memory:", query_cache_size=0)
+    cached = create_engine(
+        "sqlite+pysqlite:///:memory:",
+        query_cache_size=environment.QUERY_CACHE_SIZE,
+    )
+    for engine in (uncached, cached):
+        load(engine)
+
+    match = MovieBag(title="Movie 1", year=MovieInteger("1950-1960"), stars={"son 1"})
+    built = lookups(built_select_movie, built_select_person, built_select_tag)
+    built.append(
+        ("match movies", lambda session, ix: built_match_movies(session, match=match))
+    )
+    prebuilt = lookups(tables._select_movie, tables._select_person, tables._select_tag)
+    prebuilt.append(
+        ("match movies", lambda session, ix: tables._match_movies(session, match=match))
+    )
+
+    print(f"{'':16}{'no cache':>12}{'built':>12}{'pre-built':>12}   µs per call")
+    for (name, built_call), (_, prebuilt_call) in zip(built, prebuilt):
+        timings = (
+            time_calls(uncached, built_call, args.calls),
+            time_calls(cached, built_call, args.calls),
+            time_calls(cached, prebuilt_call, args.calls),
+        )
+        print(f"{name:16}" + "".join(f"{timing:12.1f}" for timing in timings))
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
@@ -0,0 +1,100 @@
+"""Benchmark the movie summary table against the joined selects.
+
+A catalogue is written and the movie list is read in three ways: as movie
+bags by select_all_movies, as a compact result set by
+select_all_movies_compact, and as one summary row per movie by
+select_movie_summaries. The time taken to write the catalogue is also
+printed with and without the triggers which keep the summaries current,
+and so is the time taken to rebuild every summary.
+
+Usage:
+    python -m benchmarks.bench_summary [movies]
+"""
+
+#  Copyright© 2026. Stephen Rigden.
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from benchmarks import catalogue
+from database import schema, tables
+
+MOVIES = 10_000
+REPEATS = 3
+
+
+def time_ms(select) -> tuple[int, float]:
+    """Returns the number of movies selected and the median time taken."""
+    times = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        count = len(select())
+        times.append((time.perf_counter() - start) * 1000)
+    return count, statistics.median(times)
+
+
+def write_ms(database_fn: Path, spec: catalogue.CatalogueSpec) -> float:
+    """Returns the time taken to write a catalogue."""
+    start = time.perf_counter()
+    catalogue.write_dbv1(database_fn, spec)
+    return (time.perf_counter() - start) * 1000
+
+
+def main(argv: list[str] = None) -> int:
+    """Runs the movie summary benchmark."""
+    parser = argparse.ArgumentParser(prog="bench_summary")
+    parser.add_argument("movies", type=int, nargs="?", default=MOVIES)
+    args = parser.parse_args(argv)
+    spec = catalogue.CatalogueSpec(movies=args.movies, people=args.movies // 2)
+    with tempfile.TemporaryDirectory() as directory:
+        event.remove(
+            schema.Base.metadata, "after_create", schema._create_summary_triggers
+        )
+        try:
+            untriggered = write_ms(Path(directory) / "untriggered.sqlite3", spec)
+        finally:
+            event.listen(
+                schema.Base.metadata, "after_create", schema._create_summary_triggers
+            )
+        database_fn = Path(directory) / "summary.sqlite3"
+        triggered = write_ms(database_fn, spec)
+
+        print(f"{args.movies:,} movies")
+        print(f"    {'write without triggers':36} {untriggered:9.1f} ms")
+        print(f"    {'write with triggers':36} {triggered:9.1f} ms")
+        tables.session_factory = sessionmaker(
+            create_engine(f"sqlite+pysqlite:///{database_fn}")
+        )
+        for name, select in (
+            ("select_all_movies", tables.select_all_movies),
+            ("select_all_movies_compact", tables.select_all_movies_compact),
+            ("select_movie_summaries", tables.select_movie_summaries),
+        ):
+            count, median = time_ms(select)
+            print(f"    {name:28} {count:7,} {median:9.1f} ms")
+        start = time.perf_counter()
+        tables.rebuild_movie_summaries()
+        rebuild = (time.perf_counter() - start) * 1000
+        print(f"    {'rebuild_movie_summaries':36} {rebuild:9.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
@@ -0,0 +1,107 @@
+"""Benchmark streaming catalogue export and import.
+
+A synthetic catalogue is exported to JSON Lines and CSV and then imported into
+an empty database. The time of each step is reported for two catalogue sizes.
+With --memory the peak traced memory is reported instead. It should not grow
+with the size of the catalogue. Tracing slows the steps several times over so
+times from a traced run are not comparable.
+
+Usage:
+    python -m benchmarks.bench_transfer [--memory] [movies ...]
+"""
+
+#  Copyright© 2026. Stephen Rigden.
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import argparse
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from benchmarks import catalogue
+from database import schema, tables, transfer
+
+SIZES = (10_000, 100_000)
+
+
+def measure(name: str, func: Callable, memory: bool):
+    """Prints the time or the peak traced memory of a call."""
+    if memory:
+        tracemalloc.start()
+        result = func()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"{name:40} {peak / 2**20:8.2f} MiB peak   {result}")
+    else:
+        start = time.perf_counter()
+        result = func()
+        seconds = time.perf_counter() - start
+        print(f"{name:40} {seconds:8.2f} s   {result}")
+
+
+def use_database(path: Path):
+    """Points the tables module at a database file."""
+    engine = create_engine(f"sqlite+pysqlite:///{path}")
+    schema.Base.metadata.create_all(engine)
+    tables.session_factory = sessionmaker(engine)
+    return engine
+
+
+def bench_size(directory: Path, movies: int, memory: bool):
+    """Exports and imports a catalogue of the given size."""
+    spec = catalogue.CatalogueSpec(movies=movies, people=movies // 2, tags=50)
+    source = directory / f"source_{movies}.sqlite3"
+    catalogue.write_dbv1(source, spec)
+
+    for fmt in transfer.FORMATS:
+        export_fn = directory / f"export_{movies}.{fmt}"
+        engine = use_database(source)
+        with open(export_fn, "w", newline="") as fp:
+            measure(
+                f"{movies:,} movies: export {fmt}",
+                lambda: transfer.export_movies(fp, fmt=fmt),
+                memory,
+            )
+        engine.dispose()
+
+        engine = use_database(directory / f"import_{movies}_{fmt}.sqlite3")
+        with open(export_fn, newline="") as fp:
+            measure(
+                f"{movies:,} movies: import {fmt}",
+                lambda: transfer.import_movies(fp, fmt=fmt).added,
+                memory,
+            )
+        engine.dispose()
+
+
+def main(argv: list[str] = None) -> int:
+    """Runs the transfer benchmarks."""
+    parser = argparse.ArgumentParser(prog="bench_transfer")
+    parser.add_argument(
+        "--memory", action="store_true", help="Report peak traced memory."
+    )
+    parser.add_argument("movies", type=int, nargs="*", default=SIZES)
+    args = parser.parse_args(argv)
+    with tempfile.TemporaryDirectory() as directory:
+        for movies in args.movies:
+            bench_size(Path(directory), movies, args.memory)
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
@@ -0,0 +1,80 @@
+"""Benchmark adding movies with a commit per call and in one unit of work.
+
+The same movies and tags are added to a new file database twice. First each
+tables call commits its own transaction. Then every call is made within a
+single tables.unit_of_work.
+
+Usage:
+    python -m benchmarks.bench_unit_of_work [movies]
+"""
+
+#  Copyright© 2026. Stephen Rigden.
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import argparse
+import contextlib
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from database import schema, tables
+from moviebag import MovieBag, MovieInteger
+
+MOVIES = 1_000
+TAGS = {f"tag {ix}" for ix in range(10)}
+
+
+def add_movies(movies: int, unit) -> float:
+    """Returns the seconds taken to add the tags and movies."""
+    start = time.perf_counter()
+    with unit():
+        tables.add_tags(tag_texts=TAGS)
+        for ix in range(movies):
+            tables.add_movie(
+                movie_bag=MovieBag(
+                    title=f"Movie {ix}",
+                    year=MovieInteger(1950 + ix % 70),
+                    stars={f"Person {ix % (movies // 2 + 1)}"},
+                    tags={f"tag {ix % 10}"},
+                )
+            )
+    return time.perf_counter() - start
+
+
+def main(argv: list[str] = None) -> int:
+    """Runs the unit of work benchmark."""
+    parser = argparse.ArgumentParser(prog="bench_unit_of_work")
+    parser.add_argument("movies", type=int, nargs="?", default=MOVIES)
+    args = parser.parse_args(argv)
+    print(f"{args.movies:,} movies")
+    with tempfile.TemporaryDirectory() as directory:
+        for name, unit in (
+            ("commit per call", contextlib.nullcontext),
+            ("one unit of work", tables.unit_of_work),
+        ):
+            engine = create_engine(
+                f"sqlite+pysqlite:///{Path(directory) / name}.sqlite3"
+            )
+            schema.Base.metadata.create_all(engine)
+            tables.session_factory = sessionmaker(engine)
+            seconds = add_movies(args.movies, unit)
+            print(f"    {name:18} {seconds:8.2f} s")
+            engine.dispose()
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
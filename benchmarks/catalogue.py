@@ -0,0 +1,275 @@
+"""A deterministic generator of synthetic movie catalogues.
+
+Catalogues can be written as a current DBv1 database or as a legacy DBv0
+database for timing the upgrade. The same seed and sizes always produce the
+same catalogue.
+"""
+
+#  Copyright© 2026. Stephen Rigden.
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import random
+from dataclasses import dataclass
+from pathlib import Path
+
+from sqlalchemy import (
+    create_engine,
+    insert,
+    Column,
+    Integer,
+    MetaData,
+    String,
+    Table,
+)
+
+from database import schema
+
+WORDS = (
+    "Bridge River Kwai Third Man Night Day Return Dark City Last Train Lady "
+    "Shadow Empire Seven Samurai Stranger Window Rear North Northwest Sunset "
+    "Boulevard Grand Hotel Silent Storm Golden Age Lost Island Red River"
+).split()
+FORENAMES = (
+    "Akira Alfred Billy Carol David Edith Fanny Grace Howard Ingrid Jean "
+    "Katharine Lauren Marlon Orson Peter Rita Stanley Vivien Yasujiro"
+).split()
+SURNAMES = (
+    "Kurosawa Hitchcock Wilder Reed Lean Head Fullworthy Kelly Hawks Bergman "
+    "Renoir Hepburn Bacall Brando Welles Lorre Hayworth Kubrick Leigh Ozu"
+).split()
+
+
+@dataclass(frozen=True)
+class CatalogueSpec:
+    """The size and shape of a synthetic catalogue.
+
+    Link counts are the number of people or tags linked to each movie. The
+    actual number for any movie is chosen at random between zero and twice
+    the given count so the mean is the given count.
+    """
+
+    movies: int = 1000
+    people: int = 500
+    tags: int = 20
+    directors_per_movie: float = 1
+    stars_per_movie: float = 3
+    tags_per_movie: float = 2
+    seed: int = 42
+
+
+@dataclass
+class Catalogue:
+    """The rows of a synthetic catalogue in schema DBv1 form."""
+
+    movies: list[dict]
+    people: list[dict]
+    tags: list[dict]
+    movie_directors: list[dict]
+    movie_stars: list[dict]
+    movie_tags: list[dict]
+
+
+def generate(spec: CatalogueSpec) -> Catalogue:
+    """Returns the rows of a synthetic catalogue.
+
+    Args:
+        spec:
+    """
+    rng = random.Random(spec.seed)
+
+    names = set()
+    while len(names) < spec.people:
+        names.add(
+            f"{rng.choice(FORENAMES)} {rng.choice(SURNAMES)} {len(names) + 1}"
+            if len(names) >= len(FORENAMES) * len(SURNAMES)
+            else f"{rng.choice(FORENAMES)} {rng.choice(SURNAMES)}"
+        )
+    people = [dict(id=ix, name=name) for ix, name in enumerate(sorted(names), 1)]
+    tags = [dict(id=ix, text=f"Tag {ix:03d}") for ix in range(1, spec.tags + 1)]
+
+    movies = []
+    movie_directors, movie_stars, movie_tags = [], [], []
+    for movie_id in range(1, spec.movies + 1):
+        title = " ".join(rng.sample(WORDS, rng.randint(1, 4)))
+        movies.append(
+            dict(
+                id=movie_id,
+                # The movie id keeps the title and year key unique.
+                title=f"{title} {movie_id}",
+                year=rng.randint(schema.MUYBRIDGE + 1, 2025),
+                duration=rng.randint(60, 240),
+                synopsis=f"A synopsis of {title.lower()}.",
+                notes=rng.choice(("", "Seen at the cinema.", "Blu-ray")) or None,
+            )
+        )
+        movie_directors += _links(
+            rng, movie_id, "person_id", len(people), spec.directors_per_movie
+        )
+        movie_stars += _links(
+            rng, movie_id, "person_id", len(people), spec.stars_per_movie
+        )
+        movie_tags += _links(rng, movie_id, "tag_id", len(tags), spec.tags_per_movie)
+
+    return Catalogue(movies, people, tags, movie_directors, movie_stars, movie_tags)
+
+
+def _links(
+    rng: random.Random, movie_id: int, key: str, population: int, mean: float
+) -> list[dict]:
+    """Returns association rows linking a movie to distinct random ids.
+
+    Args:
+        rng:
+        movie_id:
+        key: The association table's column name for the linked id.
+        population: The number of linkable ids.
+        mean: The mean number of links per movie.
+    """
+    if not population:
+        return []
+    count = min(population, round(rng.uniform(0, 2 * mean)))
+    return [
+        {"movie_id": movie_id, key: linked_id}
+        for linked_id in rng.sample(range(1, population + 1), count)
+    ]
+
+
+def write_dbv1(path: Path, spec: CatalogueSpec) -> Catalogue:
+    """Writes a synthetic catalogue to a new DBv1 database.
+
+    Args:
+        path: The SQLite database file. It must not already exist.
+        spec:
+
+    Returns:
+        The catalogue which was written.
+    """
+    catalogue = generate(spec)
+    engine = create_engine(f"sqlite+pysqlite:///{path}")
+    schema.Base.metadata.create_all(engine)
+    with engine.begin() as connection:
+        for table, rows in (
+            (schema.Person.__table__, catalogue.people),
+            (schema.Tag.__table__, catalogue.tags),
+            (schema.Movie.__table__, catalogue.movies),
+            (schema.movie_director_table, catalogue.movie_directors),
+            (schema.movie_star_table, catalogue.movie_stars),
+            (schema.movie_tag_table, catalogue.movie_tags),
+        ):
+            if rows:
+                connection.execute(insert(table), rows)
+    engine.dispose()
+    return catalogue
+
+
+def write_dbv0(path: Path, spec: CatalogueSpec) -> Catalogue:
+    """Writes a synthetic catalogue to a new legacy DBv0 database.
+
+    DBv0 has no person table or stars. Directors are held as a comma
+    delimited string in the movies table and the synopsis is held in the
+    notes column.
+
+    Args:
+        path: The SQLite database file. It must not already exist.
+        spec:
+
+    Returns:
+        The catalogue which was written in its DBv1 form.
+    """
+    catalogue = generate(spec)
+    names = {person["id"]: person["name"] for person in catalogue.people}
+    directors = {}
+    for link in catalogue.movie_directors:
+        directors.setdefault(link["movie_id"], []).append(names[link["person_id"]])
+
+    metadata_obj = MetaData()
+    tags_table = Table(
+        "tags",
+        metadata_obj,
+        Column("id", Integer, primary_key=True),
+        Column("tag", String),
+    )
+    movies_table = Table(
+        "movies",
+        metadata_obj,
+        Column("id", Integer, primary_key=True),
+        Column("title", String),
+        Column("director", String),
+        Column("minutes", Integer),
+        Column("year", Integer),
+        Column("notes", String),
+    )
+    movie_tag_table = Table(
+        "movie_tag",
+        metadata_obj,
+        Column("movies_id", Integer),
+        Column("tag_id", Integer),
+    )
+
+    engine = create_engine(f"sqlite+pysqlite:///{path}")
+    metadata_obj.create_all(engine)
+    with engine.begin() as connection:
+        if catalogue.tags:
+            connection.execute(
+                insert(tags_table),
+                [dict(id=tag["id"], tag=tag["text"]) for tag in catalogue.tags],
+            )
+        connection.execute(
+            insert(movies_table),
+            [
+                dict(
+                    id=movie["id"],
+                    title=movie["title"],
+                    director=", ".join(directors.get(movie["id"], [])),
+                    minutes=movie["duration"],
+                    year=movie["year"],
+                    notes=movie["synopsis"],
+                )
+                for movie in catalogue.movies
+            ],
+        )
+        if catalogue.movie_tags:
+            connection.execute(
+                insert(movie_tag_table),
+                [
+                    dict(movies_id=link["movie_id"], tag_id=link["tag_id"])
+                    for link in catalogue.movie_tags
+                ],
+            )
+    engine.dispose()
+    return catalogue
+
+
+def tmdb_movies(spec: CatalogueSpec) -> list[dict]:
+    """Returns synthetic TMDB movie mappings of the kind returned by
+    tmdb._get_tmdb_movie_info.
+
+    Args:
+        spec:
+    """
+    catalogue = generate(spec)
+    names = {person["id"]: person["name"] for person in catalogue.people}
+    directors = {}
+    for link in catalogue.movie_directors:
+        directors.setdefault(link["movie_id"], []).append(names[link["person_id"]])
+    return [
+        dict(
+            id=movie["id"],
+            title=movie["title"],
+            release_date=f"{movie['year']}-06-15",
+            runtime=movie["duration"],
+            directors=directors.get(movie["id"], []),
+            overview=movie["synopsis"],
+            original_language="en",
+        )
+        for movie in catalogue.movies
+    ]
@@ -0,0 +1,70 @@
+"""A minimal keep-alive HTTP/1.1 client for the movie database server.
+
+It reads Content-Length and chunked responses, which is all the server sends.
+"""
+
+#  Copyright© 2026. Stephen Rigden.
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import asyncio
+import json
+from dataclasses import dataclass
+
+
+@dataclass
+class Connection:
+    """A keep-alive connection to the server."""
+
+    reader: asyncio.StreamReader
+    writer: asyncio.StreamWriter
+
+    @classmethod
+    async def open(cls, host: str, port: int) -> "Connection":
+        """Returns a new connection."""
+        return cls(*await asyncio.open_connection(host, port))
+
+    async def request(
+        self, method: str, target: str, body: object = None
+    ) -> tuple[int, bytes]:
+        """Sends a request and returns the status and the body.
+
+        Args:
+            method:
+            target: The path and query.
+            body: A JSON compatible object.
+        """
+        data = json.dumps(body).encode() if body is not None else b""
+        self.writer.write(
+            f"{method} {target} HTTP/1.1\r\n"
+            f"Host: localhost\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(data)}\r\n\r\n".encode() + data
+        )
+        await self.writer.drain()
+
+        status = int((await self.reader.readline()).split()[1])
+        headers = {}
+        while (line := await self.reader.readline()) != b"\r\n":
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        if headers.get("transfer-encoding") == "chunked":
+            chunks = []
+            while size := int(await self.reader.readline(), 16):
+                chunks.append(await self.reader.readexactly(size + 2))
+            await self.reader.readline()
+            return status, b"".join(chunk[:-2] for chunk in chunks)
+        return status, await self.reader.readexactly(int(headers["content-length"]))
+
+    async def close(self):
+        """Closes the connection."""
+        self.writer.close()
+        await self.writer.wait_closed()
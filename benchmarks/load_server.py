@@ -0,0 +1,165 @@
+"""Load test the movie database server on localhost.
+
+The server is started in a separate process with a synthetic catalogue. A
+number of keep-alive clients then send a mix of select, match, and tag
+requests for a fixed time. Requests per second and latency percentiles are
+reported for each kind of request and overall.
+
+Usage:
+    python -m benchmarks.load_server [--movies N] [--clients N]
+        [--seconds S] [--workers N]
+"""
+
+#  Copyright© 2026. Stephen Rigden.
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import argparse
+import asyncio
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from urllib.parse import quote_plus
+
+from benchmarks import catalogue
+from benchmarks.httpclient import Connection
+
+HOST = "127.0.0.1"
+ROOT = Path(__file__).parents[1]
+
+
+def free_port() -> int:
+    """Returns a port which is free now."""
+    with socket.socket() as sock:
+        sock.bind((HOST, 0))
+        return sock.getsockname()[1]
+
+
+async def wait_for_server(port: int, timeout: float = 10):
+    """Waits until the server accepts connections."""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            conn = await Connection.open(HOST, port)
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            await asyncio.sleep(0.05)
+        else:
+            await conn.close()
+            return
+
+
+async def client(
+    port: int,
+    rows: catalogue.Catalogue,
+    deadline: float,
+    latencies: dict[str, list[float]],
+    seed: int,
+):
+    """Sends requests until the deadline and records their latencies."""
+    rng = random.Random(seed)
+    conn = await Connection.open(HOST, port)
+    try:
+        while time.monotonic() < deadline:
+            movie = rng.choice(rows.movies)
+            kind = rng.choices(("select", "match", "tags"), weights=(6, 3, 1))[0]
+            start = time.perf_counter()
+            match kind:
+                case "select":
+                    status, _ = await conn.request(
+                        "GET",
+                        f"/movies?title={quote_plus(movie['title'])}"
+                        f"&year={movie['year']}",
+                    )
+                case "match":
+                    status, _ = await conn.request(
+                        "POST",
+                        "/movies/match",
+                        dict(year=str(movie["year"]), title=movie["title"][:4]),
+                    )
+                case _:
+                    status, _ = await conn.request("GET", "/tags")
+            latencies[kind].append(time.perf_counter() - start)
+            assert status == 200, status
+    finally:
+        await conn.close()
+
+
+async def load(port: int, rows: catalogue.Catalogue, clients: int, seconds: float):
+    """Runs the clients and prints the report."""
+    await wait_for_server(port)
+    latencies = dict(select=[], match=[], tags=[])
+    deadline = time.monotonic() + seconds
+    start = time.perf_counter()
+    await asyncio.gather(
+        *(client(port, rows, deadline, latencies, seed) for seed in range(clients))
+    )
+    elapsed = time.perf_counter() - start
+
+    every = [latency for kind in latencies.values() for latency in kind]
+    for name, values in (*latencies.items(), ("all", every)):
+        if len(values) < 2:
+            continue
+        p50 = statistics.median(values)
+        p99 = statistics.quantiles(values, n=100)[98]
+        print(
+            f"{name:8} {len(values) / elapsed:9.1f} req/s"
+            f"   p50 {p50 * 1000:8.2f} ms   p99 {p99 * 1000:8.2f} ms"
+        )
+
+
+def main(argv: list[str] = None) -> int:
+    """Starts the server and runs the load test."""
+    parser = argparse.ArgumentParser(prog="load_server")
+    parser.add_argument("--movies", type=int, default=10_000)
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        database_fn = Path(directory) / "load.sqlite3"
+        spec = catalogue.CatalogueSpec(movies=args.movies, people=args.movies // 2)
+        rows = catalogue.write_dbv1(database_fn, spec)
+        port = free_port()
+        server = subprocess.Popen(
+            [
+                sys.executable,
+                str(ROOT / "moviedb_server.py"),
+                "--database",
+                str(database_fn),
+                "--port",
+                str(port),
+                "--workers",
+                str(args.workers),
+            ],
+            cwd=directory,
+        )
+        try:
+            print(
+                f"{args.movies:,} movies, {args.clients} clients, "
+                f"{args.workers} workers, {args.seconds:g} s"
+            )
+            asyncio.run(load(port, rows, args.clients, args.seconds))
+        finally:
+            server.terminate()
+            server.wait()
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
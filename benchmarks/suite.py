@@ -0,0 +1,463 @@
+"""The benchmark suite for the database.tables, database.update, and tmdb
+modules.
+
+Each scenario runs against a fresh copy of a synthetic catalogue. Results are
+written as JSON and compared with a stored baseline. For example:
+    python -m benchmarks.suite --movies 5000 --save-baseline
+    python -m benchmarks.suite --movies 5000 --output results.json
+
+The exit status is 1 if any scenario is slower than its baseline by more
+than the tolerance.
+"""
+
+#  Copyright© 2026. Stephen Rigden.
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import argparse
+import json
+import logging
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, asdict, field
+from pathlib import Path
+
+from sqlalchemy import create_engine, Engine
+from sqlalchemy.orm import sessionmaker
+
+import tmdb
+from benchmarks import catalogue
+from database import environment, schema, tables
+from moviebag import MovieBag, MovieInteger
+
+BASELINE_FN = Path(__file__).parent / "baseline.json"
+TOLERANCE = 0.25
+NO_BASELINE_MSG = "No baseline was found. Save one with --save-baseline."
+REGRESSION_MSG = "REGRESSION"
+
+
+@dataclass
+class Scenario:
+    """A timed benchmark.
+
+    setup is called before each repetition and is not timed. run is timed.
+    Both are called with the repetition number.
+    """
+
+    name: str
+    run: Callable[[int], None]
+    setup: Callable[[int], None] = None
+    repeat: int = 5
+
+
+@dataclass
+class Result:
+    """The timings of one scenario in seconds."""
+
+    name: str
+    repeat: int
+    min: float
+    median: float
+    max: float
+
+
+scenarios: dict[str, Callable[["Workspace"], Scenario]] = {}
+
+
+def scenario(func: Callable[["Workspace"], Scenario]):
+    """Registers a scenario factory in the suite."""
+    scenarios[func.__name__] = func
+    return func
+
+
+@dataclass
+class Workspace:
+    """The catalogues and temporary directory shared by the scenarios."""
+
+    spec: catalogue.CatalogueSpec
+    directory: Path
+    dbv1_fn: Path = None
+    dbv0_fn: Path = None
+    rows: catalogue.Catalogue = None
+    engines: list[Engine] = field(default_factory=list)
+
+    def __post_init__(self):
+        self.dbv1_fn = self.directory / "template_DBv1.sqlite3"
+        self.rows = catalogue.write_dbv1(self.dbv1_fn, self.spec)
+        self.dbv0_fn = self.directory / "template_DBv0.sqlite3"
+        catalogue.write_dbv0(self.dbv0_fn, self.spec)
+
+    def fresh_database(self, name: str):
+        """Registers a session factory for a fresh copy of the DBv1 catalogue.
+
+        Args:
+            name: The scenario name which is used for the copy's file name.
+        """
+        database_fn = self.directory / f"{name}.sqlite3"
+        shutil.copyfile(self.dbv1_fn, database_fn)
+        self.register_engine(database_fn)
+
+    def register_engine(self, database_fn: Path):
+        """Registers a session factory for the database file."""
+        engine = create_engine(f"sqlite+pysqlite:///{database_fn}")
+        self.engines.append(engine)
+        tables.session_factory = sessionmaker(engine)
+
+    def dispose(self):
+        """Closes the connections of every registered engine."""
+        for engine in self.engines:
+            engine.dispose()
+
+    def movie_key(self, ix: int) -> MovieBag:
+        """Returns the title and year key of a catalogue movie."""
+        movie = self.rows.movies[ix % len(self.rows.movies)]
+        return MovieBag(title=movie["title"], year=MovieInteger(movie["year"]))
+
+
+def run_scenario(item: Scenario) -> Result:
+    """Runs a scenario and returns its timings."""
+    timings = []
+    for ix in range(item.repeat):
+        if item.setup:
+            item.setup(ix)
+        start = time.perf_counter()
+        item.run(ix)
+        timings.append(time.perf_counter() - start)
+    return Result(
+        item.name,
+        item.repeat,
+        min(timings),
+        statistics.median(timings),
+        max(timings),
+    )
+
+
+def compare(results: dict, baseline: dict, tolerance: float = TOLERANCE) -> list[str]:
+    """Returns the names of scenarios which have regressed.
+
+    A scenario has regressed if its median time exceeds the baseline median
+    by more than the tolerance. Scenarios missing from either run are ignored.
+
+    Args:
+        results: The results of this run indexed by scenario name.
+        baseline: The baseline results indexed by scenario name.
+        tolerance: The permitted fractional slowdown.
+    """
+    return [
+        name
+        for name, result in results.items()
+        if name in baseline
+        and result["median"] > baseline[name]["median"] * (1 + tolerance)
+    ]
+
+
+@scenario
+def select_movie(workspace: Workspace) -> Scenario:
+    """tables.select_movie"""
+    workspace.fresh_database("select_movie")
+    return Scenario(
+        "tables.select_movie",
+        lambda ix: tables.select_movie(movie_bag=workspace.movie_key(ix)),
+        repeat=50,
+    )
+
+
+@scenario
+def select_all_movies(workspace: Workspace) -> Scenario:
+    """tables.select_all_movies"""
+    workspace.fresh_database("select_all_movies")
+    return Scenario("tables.select_all_movies", lambda ix: tables.select_all_movies())
+
+
+@scenario
+def select_all_movies_compact(workspace: Workspace) -> Scenario:
+    """tables.select_all_movies_compact"""
+    workspace.fresh_database("select_all_movies_compact")
+    return Scenario(
+        "tables.select_all_movies_compact",
+        lambda ix: tables.select_all_movies_compact(),
+    )
+
+
+@scenario
+def match_movies(workspace: Workspace) -> Scenario:
+    """tables.match_movies with a broad year range and a tag."""
+    workspace.fresh_database("match_movies")
+    criteria = MovieBag(year=MovieInteger("1930-1980"), tags={"Tag 00"})
+    # The result cache is cleared so each repetition times the query.
+    return Scenario(
+        "tables.match_movies",
+        lambda ix: tables.match_movies(criteria),
+        lambda ix: tables.clear_match_cache(),
+    )
+
+
+@scenario
+def match_movies_compact(workspace: Workspace) -> Scenario:
+    """tables.match_movies_compact with a broad year range and a tag."""
+    workspace.fresh_database("match_movies_compact")
+    criteria = MovieBag(year=MovieInteger("1930-1980"), tags={"Tag 00"})
+    return Scenario(
+        "tables.match_movies_compact",
+        lambda ix: tables.match_movies_compact(criteria),
+    )
+
+
+@scenario
+def add_movie(workspace: Workspace) -> Scenario:
+    """tables.add_movie with new and existing people and tags."""
+    workspace.fresh_database("add_movie")
+    people = workspace.rows.people
+    tags = workspace.rows.tags
+
+    def run(ix: int):
+        tables.add_movie(
+            movie_bag=MovieBag(
+                title=f"Benchmark Movie {ix}",
+                year=MovieInteger(2000),
+                duration=MovieInteger(100),
+                directors={people[ix % len(people)]["name"], f"New Director {ix}"},
+                stars={people[(ix + 1) % len(people)]["name"], f"New Star {ix}"},
+                tags={tags[ix % len(tags)]["text"]} if tags else set(),
+            )
+        )
+
+    return Scenario("tables.add_movie", run, repeat=20)
+
+
+@scenario
+def edit_movie(workspace: Workspace) -> Scenario:
+    """tables.edit_movie changing the notes."""
+    workspace.fresh_database("edit_movie")
+
+    def run(ix: int):
+        key = workspace.movie_key(ix)
+        tables.edit_movie(
+            old_movie_bag=key,
+            replacement_fields=MovieBag(key, notes=f"Edited {ix}"),
+        )
+
+    return Scenario("tables.edit_movie", run, repeat=20)
+
+
+@scenario
+def delete_movie(workspace: Workspace) -> Scenario:
+    """tables.delete_movie"""
+    workspace.fresh_database("delete_movie")
+    return Scenario(
+        "tables.delete_movie",
+        lambda ix: tables.delete_movie(movie_bag=workspace.movie_key(ix)),
+        repeat=20,
+    )
+
+
+@scenario
+def delete_all_orphans(workspace: Workspace) -> Scenario:
+    """tables.delete_all_orphans"""
+    workspace.fresh_database("delete_all_orphans")
+    return Scenario(
+        "tables.delete_all_orphans", lambda ix: tables.delete_all_orphans(), repeat=3
+    )
+
+
+@scenario
+def select_all_tags(workspace: Workspace) -> Scenario:
+    """tables.select_all_tags"""
+    workspace.fresh_database("select_all_tags")
+    return Scenario(
+        "tables.select_all_tags", lambda ix: tables.select_all_tags(), repeat=50
+    )
+
+
+@scenario
+def match_tags(workspace: Workspace) -> Scenario:
+    """tables.match_tags"""
+    workspace.fresh_database("match_tags")
+    return Scenario(
+        "tables.match_tags", lambda ix: tables.match_tags(match="0"), repeat=50
+    )
+
+
+@scenario
+def add_tag(workspace: Workspace) -> Scenario:
+    """tables.add_tag"""
+    workspace.fresh_database("add_tag")
+    return Scenario(
+        "tables.add_tag",
+        lambda ix: tables.add_tag(tag_text=f"Benchmark tag {ix}"),
+        repeat=20,
+    )
+
+
+@scenario
+def add_tags(workspace: Workspace) -> Scenario:
+    """tables.add_tags adding ten tags."""
+    workspace.fresh_database("add_tags")
+    return Scenario(
+        "tables.add_tags",
+        lambda ix: tables.add_tags(
+            tag_texts={f"Benchmark tag {ix}.{n}" for n in range(10)}
+        ),
+        repeat=20,
+    )
+
+
+@scenario
+def edit_tag(workspace: Workspace) -> Scenario:
+    """tables.edit_tag renaming a tag and back again."""
+    workspace.fresh_database("edit_tag")
+    tags = workspace.rows.tags
+    text = tags[0]["text"] if tags else "Benchmark tag"
+    if not tags:
+        tables.add_tag(tag_text=text)
+
+    def run(ix: int):
+        old, new = (text, text + " edited") if ix % 2 == 0 else (text + " edited", text)
+        tables.edit_tag(old_tag_text=old, new_tag_text=new)
+
+    return Scenario("tables.edit_tag", run, repeat=20)
+
+
+@scenario
+def delete_tag(workspace: Workspace) -> Scenario:
+    """tables.delete_tag of a tag used by the catalogue's movies."""
+    workspace.fresh_database("delete_tag")
+    tags = workspace.rows.tags
+    return Scenario(
+        "tables.delete_tag",
+        lambda ix: tables.delete_tag(tag_text=tags[ix % len(tags)]["text"]),
+        repeat=min(len(tags), 20) or 1,
+    )
+
+
+@scenario
+def upgrade_dbv0(workspace: Workspace) -> Scenario:
+    """The DBv0 to DBv1 upgrade of environment._update_database."""
+    data_dir = workspace.directory / "upgrade"
+
+    def setup(ix: int):
+        shutil.rmtree(data_dir, ignore_errors=True)
+        old_dir = data_dir / (environment.DATABASE_STEM + "DBv0")
+        old_dir.mkdir(parents=True)
+        shutil.copyfile(
+            workspace.dbv0_fn, old_dir / (environment.DATABASE_STEM + "DBv0.sqlite3")
+        )
+        with open(data_dir / (environment.SAVED_VERSION + ".json"), "w") as fp:
+            json.dump({environment.SAVED_VERSION: "DBv0"}, fp)
+        workspace.register_engine(data_dir / "DBv1.sqlite3")
+        schema.Base.metadata.create_all(tables.session_factory.kw["bind"])
+
+    return Scenario(
+        "environment.upgrade_dbv0",
+        lambda ix: environment._update_database("DBv0", data_dir),
+        setup,
+        repeat=3,
+    )
+
+
+@scenario
+def tmdb_conversion(workspace: Workspace) -> Scenario:
+    """tmdb._data_conversion of every catalogue movie."""
+    tmdb_movies = catalogue.tmdb_movies(workspace.spec)
+    return Scenario(
+        "tmdb.data_conversion",
+        lambda ix: [tmdb._data_conversion(movie) for movie in tmdb_movies],
+    )
+
+
+def run_suite(spec: catalogue.CatalogueSpec, names: list[str] = None) -> dict:
+    """Runs the selected scenarios against a synthetic catalogue.
+
+    Args:
+        spec:
+        names: Scenario names. All scenarios are run if this is empty.
+
+    Returns:
+        Results indexed by scenario name.
+    """
+    hold_session_factory = tables.session_factory
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        workspace = Workspace(spec, Path(directory))
+        for name, factory in scenarios.items():
+            if names and name not in names:
+                continue
+            result = run_scenario(factory(workspace))
+            results[result.name] = asdict(result)
+        workspace.dispose()
+    tables.session_factory = hold_session_factory
+    return results
+
+
+def main(argv: list[str] = None) -> int:
+    """Runs the suite from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--movies", type=int, default=catalogue.CatalogueSpec.movies)
+    parser.add_argument("--people", type=int, default=catalogue.CatalogueSpec.people)
+    parser.add_argument("--tags", type=int, default=catalogue.CatalogueSpec.tags)
+    parser.add_argument(
+        "--link-density",
+        type=float,
+        default=1.0,
+        help="Multiplies the mean number of directors, stars, and tags per movie.",
+    )
+    parser.add_argument("--seed", type=int, default=catalogue.CatalogueSpec.seed)
+    parser.add_argument("--scenario", action="append", choices=sorted(scenarios))
+    parser.add_argument("--output", type=Path, help="Write the results as JSON.")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_FN)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE)
+    args = parser.parse_args(argv)
+
+    default = catalogue.CatalogueSpec()
+    spec = catalogue.CatalogueSpec(
+        movies=args.movies,
+        people=args.people,
+        tags=args.tags,
+        directors_per_movie=default.directors_per_movie * args.link_density,
+        stars_per_movie=default.stars_per_movie * args.link_density,
+        tags_per_movie=default.tags_per_movie * args.link_density,
+        seed=args.seed,
+    )
+    # The tables module logs expected errors such as missing movies.
+    logging.disable(logging.CRITICAL)
+    results = run_suite(spec, args.scenario)
+    report = dict(spec=asdict(spec), results=results)
+
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2))
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(report, indent=2))
+
+    baseline = {}
+    if args.baseline.exists() and not args.save_baseline:
+        baseline = json.loads(args.baseline.read_text())["results"]
+    elif not args.save_baseline:
+        print(NO_BASELINE_MSG)
+    regressions = compare(results, baseline, args.tolerance)
+
+    for name, result in results.items():
+        base = baseline.get(name, {}).get("median")
+        change = f"{result['median'] / base - 1:+8.1%}" if base else ""
+        flag = REGRESSION_MSG if name in regressions else ""
+        print(
+            f"{name:36} {result['median'] * 1000:10.3f} ms median"
+            f" {result['min'] * 1000:10.3f} ms min {change} {flag}"
+        )
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
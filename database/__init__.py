@@ -13,4 +13,17 @@
 #  You should have received a copy of the GNU General Public License
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
-from . import schema, environment, tables, update
+from . import (
+    schema,
+    instrumentation,
+    replica,
+    environment,
+    tables,
+    similarity,
+    livesearch,
+    dedupe,
+    backup,
+    maintenance,
+    transfer,
+    update,
+)
@@ -0,0 +1,240 @@
+"""Online backup of the movie database.
+
+Snapshots are taken with the SQLite online backup API. The database is copied a
+few pages at a time with a short pause between steps so the program can keep
+reading and writing while a backup is in progress. Copying the database file
+directly while it is being written can produce a corrupt copy.
+
+Snapshots are kept in DATA_DIR_NAME / schema.VERSION / BACKUP_DIR_NAME. Their
+names hold a timestamp so they sort oldest first. Only the newest KEEP
+snapshots are kept.
+"""
+
+#  Copyright© 2026. Stephen Rigden.
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import concurrent.futures
+import logging
+import sqlite3
+from collections.abc import Callable
+from contextlib import closing
+from datetime import datetime
+from pathlib import Path
+
+import config
+from database import livesearch, replica, schema, similarity, tables
+
+BACKUP_DIR_NAME = "Backups"
+SNAPSHOT_SUFFIX = ".sqlite3"
+PARTIAL_SUFFIX = ".partial"
+KEEP = 7
+PAGES_PER_STEP = 256
+STEP_PAUSE = 0.005
+BACKUP_COMPLETE_MSG = "The database backup is complete."
+BACKUP_FAILED_MSG = "The database backup failed its integrity check."
+RESTORE_COMPLETE_MSG = "The database was restored from"
+RESTORE_FAILED_MSG = "The backup is damaged and was not restored."
+
+
+class BackupIntegrityError(Exception):
+    """A snapshot failed verification."""
+
+
+def database_path() -> Path:
+    """Returns the path of the database used by the tables module."""
+    return Path(tables.session_factory.kw["bind"].url.database)
+
+
+def backup_dir() -> Path:
+    """Returns the snapshot directory of the database used by the tables
+    module."""
+    return database_path().parent / BACKUP_DIR_NAME
+
+
+def create_snapshot(
+    source: Path = None,
+    directory: Path = None,
+    *,
+    keep: int | None = KEEP,
+    pages: int = PAGES_PER_STEP,
+    pause: float = STEP_PAUSE,
+    progress: Callable[[int, int], None] = None,
+) -> Path:
+    """Takes a snapshot of a database and deletes the oldest snapshots.
+
+    The snapshot is written to a partial file and verified before it is given
+    its final name, so an interrupted backup never looks like a snapshot.
+
+    Args:
+        source: Defaults to database_path().
+        directory: Defaults to backup_dir().
+        keep: The number of snapshots to keep. None keeps every snapshot.
+        pages: The number of pages copied in each step.
+        pause: The pause in seconds between steps.
+        progress: Called after each step with the number of pages remaining
+            and the total number of pages.
+
+    Returns:
+        The snapshot path.
+
+    Raises and logs:
+        BackupIntegrityError if the snapshot fails verification. The partial
+        file is deleted. The added note list will contain:
+            BACKUP_FAILED_MSG literal,
+            the problems found by verify.
+    """
+    source = source or database_path()
+    directory = directory or backup_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    timestamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+    snapshot = directory / f"{source.stem}_{timestamp}{SNAPSHOT_SUFFIX}"
+    partial = snapshot.with_suffix(PARTIAL_SUFFIX)
+
+    # noinspection PyUnusedLocal
+    def on_step(status: int, remaining: int, total: int):
+        if progress:
+            progress(remaining, total)
+
+    with (
+        closing(sqlite3.connect(source)) as source_conn,
+        closing(sqlite3.connect(partial)) as snapshot_conn,
+    ):
+        source_conn.backup(snapshot_conn, pages=pages, progress=on_step, sleep=pause)
+
+    if problems := verify(partial):
+        partial.unlink()
+        logging.error(f"{BACKUP_FAILED_MSG} {problems}")
+        exc = BackupIntegrityError(BACKUP_FAILED_MSG)
+        exc.add_note(BACKUP_FAILED_MSG)
+        for problem in problems:
+            exc.add_note(problem)
+        raise exc
+    partial.rename(snapshot)
+    if keep is not None:
+        _rotate(directory, keep=keep)
+    logging.info(f"{BACKUP_COMPLETE_MSG} {snapshot}")
+    return snapshot
+
+
+def start_snapshot(**kwargs) -> concurrent.futures.Future:
+    """Takes a snapshot in a thread from the pool.
+
+    Args:
+        **kwargs: The arguments of create_snapshot.
+
+    Returns:
+        A future whose result is the snapshot path.
+    """
+    executor = config.current.threadpool_executor
+    return executor.submit(create_snapshot, **kwargs)
+
+
+def list_snapshots(directory: Path = None) -> list[Path]:
+    """Returns the snapshots oldest first.
+
+    Args:
+        directory: Defaults to backup_dir().
+    """
+    directory = directory or backup_dir()
+    return sorted(directory.glob(f"*{SNAPSHOT_SUFFIX}"))
+
+
+def verify(snapshot: Path) -> list[str]:
+    """Checks the integrity of a snapshot.
+
+    Args:
+        snapshot:
+
+    Returns:
+        A list of problems. It is empty if the snapshot is sound.
+    """
+    uri = f"{snapshot.resolve().as_uri()}?mode=ro"
+    try:
+        with closing(sqlite3.connect(uri, uri=True)) as conn:
+            problems = [
+                row[0]
+                for row in conn.execute("PRAGMA integrity_check")
+                if row[0] != "ok"
+            ]
+            table_names = {
+                row[0]
+                for row in conn.execute(
+                    "SELECT name FROM sqlite_master WHERE type='table'"
+                )
+            }
+    except sqlite3.DatabaseError as exc:
+        return [str(exc)]
+    problems += [
+        f"Missing table: {table}"
+        for table in sorted(schema.Base.metadata.tables.keys() - table_names)
+    ]
+    return problems
+
+
+def restore(snapshot: Path, destination: Path = None, *, keep: int = KEEP):
+    """Replaces the contents of a database with a snapshot.
+
+    A snapshot of the database is taken first so the restore can be undone.
+    Old snapshots are not deleted until the restore is complete.
+    The restore is copied in a single step and pooled connections to the
+    database are discarded so no session sees a mixture of old and new pages.
+
+    Args:
+        snapshot:
+        destination: Defaults to database_path().
+        keep: The number of snapshots to keep.
+
+    Raises and logs:
+        BackupIntegrityError if the snapshot fails verification. The
+        database is not changed. The added note list will contain:
+            RESTORE_FAILED_MSG literal,
+            the problems found by verify.
+    """
+    destination = destination or database_path()
+    if problems := verify(snapshot):
+        logging.error(f"{RESTORE_FAILED_MSG} {snapshot} {problems}")
+        exc = BackupIntegrityError(RESTORE_FAILED_MSG)
+        exc.add_note(RESTORE_FAILED_MSG)
+        for problem in problems:
+            exc.add_note(problem)
+        raise exc
+
+    if destination.exists():
+        create_snapshot(destination, snapshot.parent, keep=None)
+    with (
+        closing(sqlite3.connect(snapshot)) as snapshot_conn,
+        closing(sqlite3.connect(destination)) as destination_conn,
+    ):
+        snapshot_conn.backup(destination_conn)
+
+    if tables.session_factory and database_path() == destination:
+        tables.session_factory.kw["bind"].dispose()
+        similarity.invalidate()
+        livesearch.invalidate()
+        tables.clear_identity_cache()
+        tables.clear_match_cache()
+        if replica.is_enabled():
+            replica.reload()
+    _rotate(snapshot.parent, keep=keep)
+    logging.info(f"{RESTORE_COMPLETE_MSG} {snapshot}")
+
+
+def _rotate(directory: Path, *, keep: int):
+    """Deletes all but the newest snapshots.
+
+    Args:
+        directory:
+        keep: The number of snapshots to keep.
+    """
+    snapshots = list_snapshots(directory)
+    for snapshot in snapshots[: max(0, len(snapshots) - keep)]:
+        snapshot.unlink()
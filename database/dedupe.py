@@ -0,0 +1,401 @@
+"""Whole-catalogue duplicate detection and merging.
+
+Near-duplicate movies and people are found without comparing every pair.
+Each record is given a few blocking keys and only records which share a key
+are compared. Blocks are scored across a process pool. Blocks larger than
+MAX_BLOCK are skipped because a key shared by that many records says little
+about any pair of them.
+
+Movie keys hold the year and the year after it, so only movies within one
+year of each other are compared. Movies are scored by the trigram similarity
+of their title_key. People are scored by the trigram similarity of their
+name_key, so "Kurosawa, Akira" and "Akira Kurosawa" score 1.0.
+
+Duplicates are merged by reassigning their association rows to the record
+which is kept. Duplicate people are then orphans and are deleted by the
+orphan sweep.
+"""
+
+#  Copyright© 2026. Stephen Rigden.
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import concurrent.futures
+import csv
+import itertools
+import logging
+import os
+import time
+from collections import defaultdict
+from collections.abc import Iterable
+from typing import NamedTuple, TextIO
+
+from sqlalchemy import delete, insert, literal, select, Table
+from sqlalchemy.orm import Session
+
+from database import schema, similarity, tables
+from moviebag import MovieBag
+
+THRESHOLD = 0.6
+MAX_BLOCK = 500
+CHUNKS_PER_WORKER = 4
+REPORT_FIELDNAMES = (
+    "rank",
+    "kind",
+    "score",
+    "first_id",
+    "first",
+    "second_id",
+    "second",
+)
+PERSON_NOT_FOUND = "The person was not found."
+DUPLICATES_FOUND_MSG = "Duplicate search complete."
+MERGE_COMPLETE_MSG = "Duplicates were merged into"
+
+
+class Pair(NamedTuple):
+    """Two records which are probably the same.
+
+    The first record has the lower id so it is usually the older entry.
+    """
+
+    kind: str
+    score: float
+    first_id: int
+    first: str
+    second_id: int
+    second: str
+
+
+# A record for scoring: (id, label, normalised key)
+_Record = tuple[int, str, str]
+
+
+def name_key(name: str) -> str:
+    """Returns the normalised form of a person's name.
+
+    A 'Surname, Forenames' name is turned around. Case, accents, and
+    punctuation are removed and the words are sorted.
+
+    Args:
+        name:
+
+    Returns:
+        The sorted words of the name separated by single spaces.
+    """
+    surname, comma, forenames = name.partition(",")
+    if comma:
+        name = f"{forenames} {surname}"
+    return " ".join(sorted(similarity.words(name)))
+
+
+def movie_blocking_keys(title: str, year: int) -> set[tuple]:
+    """Returns the blocking keys of a movie.
+
+    The keys are the sorted words of the title, the first five letters, and
+    the last five letters of its title_key. Each is paired with the year
+    and with the next year.
+
+    Args:
+        title:
+        year:
+    """
+    key = similarity.title_key(title)
+    texts = (
+        ("words", " ".join(sorted(key.split()))),
+        ("prefix", key[:5]),
+        ("suffix", key[-5:]),
+    )
+    return {
+        (kind, block_year, text)
+        for kind, text in texts
+        for block_year in (year, year + 1)
+    }
+
+
+def person_blocking_keys(name: str) -> set[tuple]:
+    """Returns the blocking keys of a person.
+
+    The keys are the name_key and the first three letters of each pair of
+    its words.
+
+    Args:
+        name:
+    """
+    key = name_key(name)
+    name_words = key.split()
+    keys = {("name", key)}
+    if len(name_words) == 1:
+        keys.add(("prefix", key[:4]))
+    for first, second in itertools.combinations(name_words, 2):
+        keys.add(("prefixes", first[:3], second[:3]))
+    return keys
+
+
+def find_duplicates(
+    *,
+    threshold: float = THRESHOLD,
+    workers: int = None,
+    max_block: int = MAX_BLOCK,
+) -> list[Pair]:
+    """Finds probable duplicate movies and people.
+
+    Args:
+        threshold: The lowest score reported.
+        workers: The number of worker processes. None uses one per CPU. One
+            scores the blocks in this process.
+        max_block: Blocks with more records are skipped.
+
+    Returns:
+        Pairs ordered by descending score, kind, and first label.
+    """
+    start = time.perf_counter()
+    with tables.session_factory() as session:
+        movie_blocks, people_blocks = _select_blocks(session)
+
+    jobs = []
+    skipped = 0
+    for kind, blocks in (("movie", movie_blocks), ("person", people_blocks)):
+        for block in blocks.values():
+            if len(block) > max_block:
+                skipped += 1
+            elif len(block) > 1:
+                jobs.append((kind, block))
+
+    pairs = {}
+    for chunk_pairs in _score_jobs(jobs, threshold, workers):
+        for pair in chunk_pairs:
+            pairs[pair.kind, pair.first_id, pair.second_id] = pair
+    ranked = sorted(
+        pairs.values(), key=lambda pair: (-pair.score, pair.kind, pair.first)
+    )
+    logging.info(
+        f"{DUPLICATES_FOUND_MSG} {len(ranked)} pairs in {len(jobs)} blocks. "
+        f"{skipped} blocks larger than {max_block} were skipped. "
+        f"{time.perf_counter() - start:.1f} s."
+    )
+    return ranked
+
+
+def write_report(fp: TextIO, pairs: Iterable[Pair]) -> int:
+    """Writes a ranked CSV report of duplicate pairs.
+
+    Args:
+        fp: A text file opened with newline="".
+        pairs: Pairs in rank order.
+
+    Returns:
+        The number of pairs written.
+    """
+    writer = csv.writer(fp)
+    writer.writerow(REPORT_FIELDNAMES)
+    count = 0
+    for count, pair in enumerate(pairs, 1):
+        writer.writerow((count, pair.kind, f"{pair.score:.3f}", *pair[2:]))
+    return count
+
+
+def merge_people(*, keep: str, duplicates: set[str]):
+    """Merges duplicate people into one person.
+
+    The duplicates' director and star rows are reassigned to the person who
+    is kept. The duplicates are then orphans and are deleted.
+
+    Args:
+        keep: The name of the person to keep.
+        duplicates: The names of the people to merge into keep.
+
+    Raises and logs:
+        NoResultFound if a person was not found. The added note list will
+        contain:
+            PERSON_NOT_FOUND literal,
+            names.
+    """
+    duplicates = set(duplicates) - {keep}
+    with tables._session() as session:
+        people = tables._select_people(session, names=duplicates | {keep})
+        found = {person.name: person for person in people}
+        if missing := (duplicates | {keep}) - found.keys():
+            logging.error(f"{PERSON_NOT_FOUND} {sorted(missing)}")
+            exc = tables.NoResultFound(PERSON_NOT_FOUND)
+            exc.add_note(PERSON_NOT_FOUND)
+            exc.add_note(", ".join(sorted(missing)))
+            raise exc
+
+        duplicate_ids = [found[name].id for name in duplicates]
+        for table in (schema.movie_director_table, schema.movie_star_table):
+            _reassign(session, table, "person_id", duplicate_ids, found[keep].id)
+        session.expire_all()
+        tables._delete_orphans(session, candidates={found[name] for name in duplicates})
+        tables._commit(session)
+    logging.info(f"{MERGE_COMPLETE_MSG} {keep}: {sorted(duplicates)}")
+
+
+def merge_movies(*, keep: MovieBag, duplicate: MovieBag):
+    """Merges a duplicate movie into another movie.
+
+    The duplicate's director, star, and tag rows are reassigned to the movie
+    which is kept and the duplicate is deleted.
+
+    Args:
+        keep: The title and year of the movie to keep.
+        duplicate: The title and year of the movie to merge into keep.
+
+    Raises and logs:
+        NoResultFound if a movie was not found. The added note list will
+        contain:
+            MOVIE_NOT_FOUND literal,
+            movie title,
+            movie year.
+    """
+    with tables._session() as session:
+        movies = []
+        for movie_bag in (keep, duplicate):
+            try:
+                movies.append(tables._select_movie(session, movie_bag=movie_bag))
+            except tables.NoResultFound as exc:
+                title, year = movie_bag["title"], int(movie_bag["year"])
+                logging.error(f"{tables.MOVIE_NOT_FOUND} {title}, {year}.")
+                exc.add_note(tables.MOVIE_NOT_FOUND)
+                exc.add_note(title)
+                exc.add_note(str(year))
+                raise
+        kept, merged = movies
+
+        for table in (
+            schema.movie_director_table,
+            schema.movie_star_table,
+            schema.movie_tag_table,
+        ):
+            _reassign(session, table, "movie_id", [merged.id], kept.id)
+        session.expire_all()
+        tables._delete_movie(session, movie=merged)
+        tables._commit(session)
+    logging.info(
+        f"{MERGE_COMPLETE_MSG} {keep['title']}, {int(keep['year'])}: "
+        f"{duplicate['title']}, {int(duplicate['year'])}"
+    )
+
+
+def _select_blocks(
+    session: Session,
+) -> tuple[dict[tuple, list[_Record]], dict[tuple, list[_Record]]]:
+    """Returns the movie blocks and the people blocks.
+
+    Args:
+        session:
+    """
+    movie_blocks = defaultdict(list)
+    statement = select(schema.Movie.id, schema.Movie.title, schema.Movie.year)
+    for movie_id, title, year in session.execute(statement):
+        record = (movie_id, f"{title} ({year})", similarity.title_key(title))
+        for key in movie_blocking_keys(title, year):
+            movie_blocks[key].append(record)
+
+    people_blocks = defaultdict(list)
+    for person_id, name in session.execute(
+        select(schema.Person.id, schema.Person.name)
+    ):
+        record = (person_id, name, name_key(name))
+        for key in person_blocking_keys(name):
+            people_blocks[key].append(record)
+    return movie_blocks, people_blocks
+
+
+def _score_jobs(
+    jobs: list[tuple[str, list[_Record]]], threshold: float, workers: int | None
+) -> Iterable[list[Pair]]:
+    """Scores blocks in chunks of about equal numbers of comparisons.
+
+    Args:
+        jobs: (kind, block) tuples.
+        threshold:
+        workers: See find_duplicates.
+
+    Returns:
+        The pairs found in each chunk.
+    """
+    if workers == 1 or not jobs:
+        return [_score_blocks(jobs, threshold)]
+
+    workers = workers or os.cpu_count() or 1
+    with concurrent.futures.ProcessPoolExecutor(workers) as executor:
+        chunk_count = workers * CHUNKS_PER_WORKER
+        chunks = [[] for _ in range(chunk_count)]
+        loads = [0] * chunk_count
+        # The largest blocks are placed first so the chunks end up even.
+        for job in sorted(jobs, key=lambda item: -len(item[1])):
+            ix = loads.index(min(loads))
+            chunks[ix].append(job)
+            loads[ix] += len(job[1]) ** 2
+        futures = [
+            executor.submit(_score_blocks, chunk, threshold)
+            for chunk in chunks
+            if chunk
+        ]
+        return [future.result() for future in futures]
+
+
+def _score_blocks(
+    jobs: list[tuple[str, list[_Record]]], threshold: float
+) -> list[Pair]:
+    """Scores every pair of records within each block.
+
+    This runs in a worker process.
+
+    Args:
+        jobs: (kind, block) tuples.
+        threshold:
+
+    Returns:
+        Pairs whose score is at least threshold.
+    """
+    grams = {}
+    pairs = []
+    for kind, block in jobs:
+        for record in block:
+            if record[2] not in grams:
+                grams[record[2]] = similarity.trigrams(record[2])
+        for first, second in itertools.combinations(sorted(block), 2):
+            first_grams, second_grams = grams[first[2]], grams[second[2]]
+            shared = len(first_grams & second_grams)
+            score = shared / (len(first_grams) + len(second_grams) - shared)
+            if score >= threshold:
+                pairs.append(
+                    Pair(kind, score, first[0], first[1], second[0], second[1])
+                )
+    return pairs
+
+
+def _reassign(
+    session: Session, table: Table, column: str, from_ids: list[int], to_id: int
+):
+    """Moves association rows from some records to another in bulk.
+
+    Rows which the record being kept already has are dropped.
+
+    Args:
+        session:
+        table: An association table.
+        column: The column which holds the ids being changed.
+        from_ids:
+        to_id:
+    """
+    other = next(col for col in table.c if col.name != column)
+    session.execute(
+        insert(table)
+        .prefix_with("OR IGNORE")
+        .from_select(
+            [other.name, column],
+            select(other, literal(to_id)).where(table.c[column].in_(from_ids)),
+        )
+    )
+    session.execute(delete(table).where(table.c[column].in_(from_ids)))
@@ -13,22 +13,30 @@
 #  You should have received a copy of the GNU General Public License
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+import hashlib
 import json
 import logging
+import os
 from pathlib import Path
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, Engine
+from sqlalchemy.dialects import sqlite
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.schema import CreateIndex, CreateTable
 
-from database import schema, tables, update
+from database import schema, instrumentation, replica, tables, update
 
 DATA_DIR_NAME = "Movies-Database"
 SAVED_VERSION = "saved_version"
+SCHEMA_FINGERPRINT = "schema_fingerprint"
 DATABASE_STEM = "movie_database_"
 NO_MOVIE_DATA_DIRECTORY_MSG = "Missing movie data directory."
 NO_DATABASE_DIRECTORY_MSG = "Missing database directory."
 UPDATE_SUCCESSFUL_MSG = "The database was successfully updated to "
 DATABASE_REOPENED_MSG = "The database has been opened for use: Version "
+# The number of compiled statements held by the engine. SQLAlchemy's default
+# of 500 is too small for the match templates of a long search session.
+QUERY_CACHE_SIZE = 1200
 
 
 def start_engine():
@@ -63,22 +71,47 @@ def start_engine():
         DATA_DIR_NAME / schema.VERSION
         DATA_DIR_NAME / schema.VERSION / movie_database_DBv1.sqlite3
         DATA_DIR_NAME / saved_version.json
-            with one dict entry → {SAVED_VERSION: schema.VERSION}
+            with the dict entries → {SAVED_VERSION: schema.VERSION,
+                SCHEMA_FINGERPRINT: schema_fingerprint()}
+        DATA_DIR_NAME / maintenance.json
+            written by the maintenance module.
 
         Note: 'movie_database_DBv1' will change depending on the actual
         version.
+
+    The tables and indexes are created only if the database is new or the
+    schema fingerprint saved in 'saved_version.json' does not match the
+    schema. Otherwise, no connection is made to the database until the
+    first query.
+
+    Setting the environment variable MOVIEDB_INSTRUMENT enables the
+    statistics of the instrumentation module. Setting MOVIEDB_REPLICA serves
+    reads from an in-memory replica of the database. See the replica module.
     """
+    if os.environ.get(instrumentation.ENVIRONMENT_VARIABLE):
+        instrumentation.enable()
+
     data_dir_path, database_dir_path = _getcreate_directories(
         DATA_DIR_NAME, DATABASE_STEM + schema.VERSION
     )
-    saved_version = _getcreate_metadata(data_dir_path)
-    _register_session_factory(database_dir_path)
+    metadata = _getcreate_metadata(data_dir_path)
+    saved_version = metadata[SAVED_VERSION]
+    saved_fingerprint = metadata.get(SCHEMA_FINGERPRINT)
+    fingerprint = _register_session_factory(
+        database_dir_path, saved_fingerprint=saved_fingerprint
+    )
+    if fingerprint != saved_fingerprint:
+        metadata[SCHEMA_FINGERPRINT] = fingerprint
+        _write_metadata(data_dir_path, metadata)
 
     if saved_version != schema.VERSION:
         _update_database(saved_version, data_dir_path)
     else:
         logging.info(DATABASE_REOPENED_MSG + schema.VERSION)
 
+    if os.environ.get(replica.ENVIRONMENT_VARIABLE):
+        replica.enable(query_cache_size=QUERY_CACHE_SIZE)
+
 
 def _getcreate_directories(
     data_dir_name: str, database_dir_name: str
@@ -111,47 +144,99 @@ def _getcreate_directories(
     return movie_data_path, database_dir_path
 
 
-def _getcreate_metadata(data_dir: Path) -> str:
-    """Returns the version of the saved SQL database.
+def _getcreate_metadata(data_dir: Path) -> dict:
+    """Returns the metadata of the saved SQL database.
 
-    This gets the database version from the metadata file. If it is not
-    present the file will be created with a version_text equal to the
-    current version.
+    This reads the metadata file. If it is not present the file will be
+    created with a version equal to the current version.
 
     Args:
         data_dir: The directory containing the database data files.
 
     Returns:
-        The version of the saved database.
+        The metadata. The SAVED_VERSION entry is the version of the saved
+        database.
     """
     saved_version_fn = data_dir / (SAVED_VERSION + ".json")
     try:
         with open(saved_version_fn) as fp:
-            from_json = json.load(fp)
+            return json.load(fp)
     except FileNotFoundError:
-        data = {SAVED_VERSION: schema.VERSION}
-        with open(saved_version_fn, "w") as fp:
-            # noinspection PyTypeChecker
-            json.dump(data, fp)
-        with open(saved_version_fn) as fp:
-            from_json = json.load(fp)
-    return from_json[SAVED_VERSION]
+        metadata = {SAVED_VERSION: schema.VERSION}
+        _write_metadata(data_dir, metadata)
+        return metadata
+
+
+def _write_metadata(data_dir: Path, metadata: dict):
+    """Writes the metadata of the saved SQL database.
+
+    Args:
+        data_dir: The directory containing the database data files.
+        metadata:
+    """
+    saved_version_fn = data_dir / (SAVED_VERSION + ".json")
+    with open(saved_version_fn, "w") as fp:
+        # noinspection PyTypeChecker
+        json.dump(metadata, fp)
+
 
+def schema_fingerprint() -> str:
+    """Returns a hash of the DDL of every table and index in the schema."""
+    dialect = sqlite.dialect()
+    statements = []
+    for table in schema.Base.metadata.sorted_tables:
+        statements.append(str(CreateTable(table).compile(dialect=dialect)))
+        for index in sorted(table.indexes, key=lambda index_: index_.name):
+            statements.append(str(CreateIndex(index).compile(dialect=dialect)))
+    return hashlib.sha256("\n".join(statements).encode()).hexdigest()
 
-def _register_session_factory(database_dir: Path):
+
+def _register_session_factory(
+    database_dir: Path, *, saved_fingerprint: str = None
+) -> str:
     """Registers a session factory for the database.
 
-    This creates the SQL engine, creates all the tables from the schema, and
-    registers a session factory.
+    This creates the SQL engine and registers a session factory. The tables
+    and indexes are created from the schema unless the database exists and
+    the saved fingerprint matches the schema. In that case no connection is
+    made until the first query.
 
     Args:
         database_dir:
+        saved_fingerprint: The schema fingerprint saved when the tables were
+            last created.
+
+    Returns:
+        The schema fingerprint.
     """
     database_name = DATABASE_STEM + schema.VERSION + ".sqlite3"
     database_fn = database_dir / database_name
-    engine = create_engine(f"sqlite+pysqlite:///{database_fn}", echo=False)
+    engine = create_engine(
+        f"sqlite+pysqlite:///{database_fn}",
+        echo=False,
+        query_cache_size=QUERY_CACHE_SIZE,
+    )
     tables.session_factory = sessionmaker(engine)
-    schema.Base.metadata.create_all(engine)
+    fingerprint = schema_fingerprint()
+    if fingerprint != saved_fingerprint or not database_fn.exists():
+        schema.Base.metadata.create_all(engine)
+        _create_indexes(engine)
+    return fingerprint
+
+
+def _create_indexes(engine: Engine):
+    """Creates any schema indexes which are missing from the database.
+
+    create_all skips tables which already exist, so an index added to the
+    schema after the database was first created would otherwise never be
+    built.
+
+    Args:
+        engine:
+    """
+    for table in schema.Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(engine, checkfirst=True)
 
 
 def _update_database(old_version: str, data_dir_path: Path):
@@ -171,18 +256,16 @@ def _update_database(old_version: str, data_dir_path: Path):
     old_database_fn = data_dir_path / old_database_dir / old_database_name
 
     movies, tags = update.update_old_database(old_version, old_database_fn)
-    tables.add_tags(tag_texts=tags)
-    for movie in movies:
-        tables.add_movie(movie_bag=movie)
+    # The update is committed only if every movie is added.
+    with tables.unit_of_work():
+        tables.add_tags(tag_texts=tags)
+        for movie in movies:
+            tables.add_movie(movie_bag=movie)
 
     # Update saved version file with new version number.
-    saved_version_fn = data_dir_path / (SAVED_VERSION + ".json")
-    with open(saved_version_fn) as fp:
-        data = json.load(fp)
-    data[SAVED_VERSION] = schema.VERSION
-    with open(saved_version_fn, "w") as fp:
-        # noinspection PyTypeChecker
-        json.dump(data, fp)
+    metadata = _getcreate_metadata(data_dir_path)
+    metadata[SAVED_VERSION] = schema.VERSION
+    _write_metadata(data_dir_path, metadata)
 
     # Log the update as being successfully completed.
     logging.info(UPDATE_SUCCESSFUL_MSG + schema.VERSION)
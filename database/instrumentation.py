@@ -0,0 +1,287 @@
+"""Opt-in instrumentation of the database.tables functions.
+
+When enabled, every call of a public tables function records:
+    The number of SQL statements executed.
+    The time spent executing SQL.
+    The number of rows or items returned.
+    The time spent converting ORM objects into movie bags. SQL executed
+        during conversion, such as lazy relationship loads, is counted
+        separately.
+    The total time of the call.
+
+Each call is logged at DEBUG level. Calls are also aggregated per function
+into histograms which can be logged or sent to config.current.safeprint.
+
+Instrumentation is disabled by default and costs one flag test per call. It is
+enabled at startup by setting the environment variable MOVIEDB_INSTRUMENT or by
+calling enable().
+"""
+
+#  Copyright© 2026. Stephen Rigden.
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import functools
+import logging
+import threading
+import time
+from collections.abc import Callable, Sized
+from dataclasses import dataclass, field
+
+from sqlalchemy import Engine, event
+
+import config
+
+ENVIRONMENT_VARIABLE = "MOVIEDB_INSTRUMENT"
+REPORT_TITLE = "Database call statistics"
+NO_CALLS_MSG = "No database calls have been recorded."
+
+enabled: bool = False
+statistics: dict[str, "FunctionStats"] = {}
+_lock = threading.Lock()
+_local = threading.local()
+
+
+@dataclass
+class CallRecord:
+    """The measurements of a single call."""
+
+    name: str
+    queries: int = 0
+    sql_time: float = 0.0
+    rows: int = 0
+    conversion_time: float = 0.0
+    conversion_queries: int = 0
+    total_time: float = 0.0
+
+
+@dataclass
+class Histogram:
+    """A histogram of durations with power of two millisecond buckets.
+
+    Bucket n counts durations d where 2**(n-1) <= d < 2**n milliseconds.
+    Bucket 0 counts durations under one millisecond.
+    """
+
+    buckets: dict[int, int] = field(default_factory=dict)
+
+    def add(self, seconds: float):
+        """Adds a duration to the histogram."""
+        bucket = max(0, int(seconds * 1000)).bit_length()
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+
+    def lines(self) -> list[str]:
+        """Returns a text bar chart of the non-empty buckets."""
+        if not self.buckets:
+            return []
+        largest = max(self.buckets.values())
+        lines = []
+        for bucket in sorted(self.buckets):
+            label = f"< {2**bucket} ms"
+            bar = "#" * max(1, round(40 * self.buckets[bucket] / largest))
+            lines.append(f"    {label:>12} {self.buckets[bucket]:8d} {bar}")
+        return lines
+
+
+@dataclass
+class FunctionStats:
+    """The aggregated measurements of all calls of one function."""
+
+    name: str
+    calls: int = 0
+    queries: int = 0
+    sql_time: float = 0.0
+    rows: int = 0
+    conversion_time: float = 0.0
+    conversion_queries: int = 0
+    total_time: float = 0.0
+    total_histogram: Histogram = field(default_factory=Histogram)
+    sql_histogram: Histogram = field(default_factory=Histogram)
+
+    def add(self, record: CallRecord):
+        """Adds a call's measurements."""
+        self.calls += 1
+        self.queries += record.queries
+        self.sql_time += record.sql_time
+        self.rows += record.rows
+        self.conversion_time += record.conversion_time
+        self.conversion_queries += record.conversion_queries
+        self.total_time += record.total_time
+        self.total_histogram.add(record.total_time)
+        self.sql_histogram.add(record.sql_time)
+
+    def lines(self) -> list[str]:
+        """Returns a text summary with histograms."""
+        return [
+            f"{self.name}: {self.calls} calls, "
+            f"{self.queries / self.calls:.1f} queries/call "
+            f"({self.conversion_queries / self.calls:.1f} during conversion), "
+            f"{self.rows / self.calls:.1f} rows/call",
+            f"  mean total {self.total_time / self.calls * 1000:.3f} ms, "
+            f"SQL {self.sql_time / self.calls * 1000:.3f} ms, "
+            f"conversion {self.conversion_time / self.calls * 1000:.3f} ms, "
+            f"other {self._other_time() / self.calls * 1000:.3f} ms",
+            "  Total time",
+            *self.total_histogram.lines(),
+            "  SQL time",
+            *self.sql_histogram.lines(),
+        ]
+
+    def _other_time(self) -> float:
+        """Returns time not spent executing SQL or converting to movie bags.
+
+        This is mostly ORM overhead such as identity map and relationship
+        handling.
+        """
+        return self.total_time - self.sql_time - self.conversion_time
+
+
+def enable():
+    """Starts recording the statistics of instrumented calls."""
+    global enabled
+    if not enabled:
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+        enabled = True
+
+
+def disable():
+    """Stops recording statistics. Recorded statistics are kept."""
+    global enabled
+    if enabled:
+        event.remove(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.remove(Engine, "after_cursor_execute", _after_cursor_execute)
+        enabled = False
+
+
+def reset():
+    """Discards the recorded statistics."""
+    with _lock:
+        statistics.clear()
+
+
+def instrument(func: Callable) -> Callable:
+    """Decorates a public tables function so its calls are recorded."""
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not enabled:
+            return func(*args, **kwargs)
+
+        record = CallRecord(func.__name__)
+        stack = _records()
+        stack.append(record)
+        start = time.perf_counter()
+        try:
+            result = func(*args, **kwargs)
+        finally:
+            record.total_time = time.perf_counter() - start
+            stack.pop()
+        if isinstance(result, Sized):
+            record.rows = len(result)
+        _store(record)
+        return result
+
+    return wrapper
+
+
+def conversion(func: Callable) -> Callable:
+    """Decorates a conversion function so its time is recorded against the
+    current instrumented call.
+
+    SQL executed during conversion is excluded from the conversion time. Its
+    statements are counted as conversion queries.
+    """
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not enabled or not (stack := _records()):
+            return func(*args, **kwargs)
+
+        record = stack[-1]
+        queries, sql_time = record.queries, record.sql_time
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            record.conversion_time += elapsed - (record.sql_time - sql_time)
+            record.conversion_queries += record.queries - queries
+
+    return wrapper
+
+
+def report() -> str:
+    """Returns a text report of the recorded statistics."""
+    with _lock:
+        function_stats = sorted(
+            statistics.values(), key=lambda stats: stats.total_time, reverse=True
+        )
+        lines = [line for stats in function_stats for line in stats.lines()]
+    return "\n".join([REPORT_TITLE, *lines] if lines else [NO_CALLS_MSG])
+
+
+def log_report():
+    """Logs the report at INFO level."""
+    logging.info(report())
+
+
+def print_report(safeprint: Callable = None):
+    """Prints the report with a thread safe printer.
+
+    Args:
+        safeprint: Defaults to config.current.safeprint.
+    """
+    if safeprint is None:
+        safeprint = config.current.safeprint
+    safeprint(report(), timestamp=False)
+
+
+def _records() -> list[CallRecord]:
+    """Returns this thread's stack of in-progress call records."""
+    try:
+        return _local.records
+    except AttributeError:
+        _local.records = []
+        return _local.records
+
+
+def _store(record: CallRecord):
+    """Logs a call record and adds it to the aggregated statistics."""
+    logging.debug(
+        f"{record.name}: {record.queries} queries, "
+        f"SQL {record.sql_time * 1000:.3f} ms, {record.rows} rows, "
+        f"conversion {record.conversion_time * 1000:.3f} ms "
+        f"with {record.conversion_queries} queries, "
+        f"total {record.total_time * 1000:.3f} ms"
+    )
+    with _lock:
+        try:
+            stats = statistics[record.name]
+        except KeyError:
+            stats = statistics[record.name] = FunctionStats(record.name)
+        stats.add(record)
+
+
+# noinspection PyUnusedLocal
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    """Notes the start time of a statement."""
+    if _records():
+        conn.info.setdefault("instrumentation_start", []).append(time.perf_counter())
+
+
+# noinspection PyUnusedLocal
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    """Adds the statement's time to the current call record."""
+    if stack := _records():
+        start = conn.info["instrumentation_start"].pop()
+        stack[-1].queries += 1
+        stack[-1].sql_time += time.perf_counter() - start
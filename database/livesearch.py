@@ -0,0 +1,435 @@
+"""Search-as-you-type against the local catalogue.
+
+An in-memory index of every movie's title and the names of its directors
+and stars. A query is split into words and a movie matches if it matches
+every word. Words of PREFIX_LENGTH letters or fewer match the start of a
+word. Longer words match anywhere in the title or a name.
+
+Short words are looked up in a table of word prefixes. Longer words are
+looked up in trigram postings and the candidates are checked. When a query
+extends the previous one, as it does while the user types, its movies are
+found by filtering the previous result instead of the whole index.
+
+The index is loaded from the database on first use and discarded by any
+commit which changes a movie or a person. Bulk writes which bypass the ORM
+must call invalidate.
+"""
+
+#  Copyright© 2026. Stephen Rigden.
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import bisect
+import concurrent.futures
+import itertools
+import logging
+import threading
+import time
+from array import array
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import NamedTuple
+
+from sqlalchemy import event, select, union_all, Engine
+from sqlalchemy.orm import Session
+
+import config
+from database import schema, similarity, tables
+
+LIMIT = 20
+PREFIX_LENGTH = 2
+INDEX_LOADED_MSG = "The live search index was loaded."
+
+_CHANGED_KEY = "livesearch_changed"
+
+
+class Match(NamedTuple):
+    """A movie which matches a query."""
+
+    title: str
+    year: int
+
+
+class SearchResult(NamedTuple):
+    """The movies which match a query.
+
+    Movies whose titles start with the query come first. The others follow
+    in title order.
+    """
+
+    count: int
+    movies: list[Match]
+
+
+@dataclass
+class CatalogueIndex:
+    """An index of the titles and people of the movies in a database.
+
+    Movies are numbered by their position in title order. Every list of
+    positions in the index is in ascending order.
+
+    All methods are thread safe.
+    """
+
+    # The engine of the database which was loaded. None if not loaded.
+    bind: Engine | None = field(default=None, init=False, repr=False)
+    # position: title
+    titles: list[str] = field(default_factory=list, init=False, repr=False)
+    # Every position. Compressing this list with a mask is quicker than
+    #  compressing a range because no ints are made.
+    positions: list[int] = field(default_factory=list, init=False, repr=False)
+    # position: year
+    years: array = field(default_factory=lambda: array("i"), init=False, repr=False)
+    # position: the words of the title separated by single spaces.
+    title_keys: list[str] = field(default_factory=list, init=False, repr=False)
+    # position: the words of the title and every name, each with a leading
+    #  space.
+    keys: list[str] = field(default_factory=list, init=False, repr=False)
+    # A word start of up to PREFIX_LENGTH letters: positions.
+    prefixes: dict[str, array] = field(default_factory=dict, init=False, repr=False)
+    # trigram: positions of titles which contain it.
+    title_grams: dict[str, array] = field(default_factory=dict, init=False, repr=False)
+    # person index: the words of the name separated by single spaces.
+    name_keys: list[str] = field(default_factory=list, init=False, repr=False)
+    # trigram: indexes of names which contain it.
+    name_grams: dict[str, array] = field(default_factory=dict, init=False, repr=False)
+    # person index: positions of the person's movies.
+    person_movies: list[array] = field(default_factory=list, init=False, repr=False)
+    # The mean number of movies per person.
+    movies_per_person: float = field(default=0.0, init=False, repr=False)
+    # The words and positions of the last query.
+    last_words: list[str] = field(default_factory=list, init=False, repr=False)
+    last_positions: list[int] | None = field(default=None, init=False, repr=False)
+    lock: threading.RLock = field(
+        default_factory=threading.RLock, init=False, repr=False
+    )
+
+    def load(self):
+        """Loads every movie in the database used by the tables module.
+
+        Lists of positions are held in arrays. Unlike lists of ints they
+        are not tracked by the garbage collector, which would otherwise
+        spend most of the load time scanning them.
+        """
+        start = time.perf_counter()
+        bind = tables.session_factory.kw["bind"]
+        with tables.session_factory() as session:
+            movie_rows = session.execute(
+                select(schema.Movie.id, schema.Movie.title, schema.Movie.year)
+            ).all()
+            person_rows = session.execute(
+                select(schema.Person.id, schema.Person.name)
+            ).all()
+            link_rows = session.execute(
+                union_all(
+                    *(
+                        select(table.c.person_id, table.c.movie_id)
+                        for table in (
+                            schema.movie_director_table,
+                            schema.movie_star_table,
+                        )
+                    )
+                )
+            ).all()
+
+        title_keys = {
+            movie_id: " ".join(similarity.words(title))
+            for movie_id, title, _ in movie_rows
+        }
+        movie_rows.sort(key=lambda row: (title_keys[row[0]], row[2]))
+        positions = {row[0]: position for position, row in enumerate(movie_rows)}
+        person_ids = {row[0]: ix for ix, row in enumerate(person_rows)}
+        del title_keys
+
+        name_keys = [" ".join(similarity.words(name)) for _, name in person_rows]
+        person_movies = [array("i") for _ in person_rows]
+        movie_names = [[] for _ in movie_rows]
+        for person_id, movie_id in link_rows:
+            ix = person_ids[person_id]
+            person_movies[ix].append(positions[movie_id])
+            movie_names[positions[movie_id]].append(name_keys[ix])
+        movies_per_person = len(link_rows) / max(len(person_rows), 1)
+        del link_rows, positions, person_ids
+        for movies in person_movies:
+            movies[:] = array("i", sorted(movies))
+
+        title_grams = defaultdict(lambda: array("i"))
+        prefixes = defaultdict(lambda: array("i"))
+        sorted_keys = []
+        keys = []
+        for position, (_, title, _) in enumerate(movie_rows):
+            title_key = " ".join(similarity.words(title))
+            sorted_keys.append(title_key)
+            for gram in _grams(title_key):
+                title_grams[gram].append(position)
+            key = " ".join([title_key] + movie_names[position])
+            for prefix in {
+                word[:length]
+                for word in key.split()
+                for length in range(1, PREFIX_LENGTH + 1)
+            }:
+                prefixes[prefix].append(position)
+            keys.append(f" {key}")
+        del movie_names
+        name_grams = defaultdict(lambda: array("i"))
+        for ix, name_key in enumerate(name_keys):
+            for gram in _grams(name_key):
+                name_grams[gram].append(ix)
+
+        with self.lock:
+            self.titles = [title for _, title, _ in movie_rows]
+            self.positions = list(range(len(movie_rows)))
+            self.years = array("i", [year for _, _, year in movie_rows])
+            self.title_keys = sorted_keys
+            self.keys = keys
+            self.prefixes = dict(prefixes)
+            self.title_grams = dict(title_grams)
+            self.name_keys = name_keys
+            self.name_grams = dict(name_grams)
+            self.person_movies = person_movies
+            self.movies_per_person = movies_per_person
+            self.last_words, self.last_positions = [], None
+            self.bind = bind
+        logging.info(
+            f"{INDEX_LOADED_MSG} {len(movie_rows)} movies in "
+            f"{(time.perf_counter() - start) * 1000:.0f} ms."
+        )
+
+    def ensure_loaded(self):
+        """Loads the index if it is not loaded or if the tables module has
+        changed to another database."""
+        with self.lock:
+            if not self.is_current():
+                self.load()
+
+    def is_current(self) -> bool:
+        """Returns True if the index holds the tables module's database."""
+        return (
+            self.bind is not None
+            and tables.session_factory is not None
+            and self.bind is tables.session_factory.kw["bind"]
+        )
+
+    def invalidate(self):
+        """Discards the index. It will be reloaded when it is next used."""
+        with self.lock:
+            self.bind = None
+            self.titles, self.positions, self.years = [], [], array("i")
+            self.title_keys, self.keys = [], []
+            self.prefixes, self.title_grams, self.name_grams = {}, {}, {}
+            self.name_keys, self.person_movies = [], []
+            self.last_words, self.last_positions = [], None
+
+    def search(self, text: str, *, limit: int = LIMIT) -> SearchResult:
+        """Returns the movies which match every word of text.
+
+        Args:
+            text: The query.
+            limit: The largest number of movies returned.
+
+        Returns:
+            The number of matching movies and up to limit of them.
+        """
+        query_words = similarity.words(text)
+        with self.lock:
+            self.ensure_loaded()
+            if not query_words:
+                self.last_words, self.last_positions = [], None
+                return SearchResult(0, [])
+
+            estimates = {word: self._estimate(word) for word in query_words}
+            first = min(query_words, key=estimates.get)
+            if (
+                self.last_positions is not None
+                and len(self.last_positions) <= estimates[first]
+                and _narrows(self.last_words, query_words)
+            ):
+                positions = self.last_positions
+                remaining = [w for w in query_words if w not in self.last_words]
+            else:
+                positions = self._lookup(first)
+                remaining = [word for word in query_words if word != first]
+            for word in sorted(remaining, key=estimates.get):
+                positions = self._filter(positions, word, estimates[word])
+            self.last_words, self.last_positions = query_words, positions
+
+            movies = [
+                Match(self.titles[position], self.years[position])
+                for position in self._ranked(positions, " ".join(query_words), limit)
+            ]
+        return SearchResult(len(positions), movies)
+
+    def _estimate(self, word: str) -> int:
+        """Returns about the number of movies which _mask will mark for a
+        word. The caller holds the lock."""
+        if len(word) <= PREFIX_LENGTH:
+            return len(self.prefixes.get(word, ()))
+        grams = _grams(word)
+        titles = min(len(self.title_grams.get(gram, ())) for gram in grams)
+        names = min(len(self.name_grams.get(gram, ())) for gram in grams)
+        return titles + int(names * self.movies_per_person)
+
+    def _lookup(self, word: str) -> list[int]:
+        """Returns the positions of the movies which match a word. The
+        caller holds the lock."""
+        if len(word) <= PREFIX_LENGTH:
+            return list(self.prefixes.get(word, ()))
+        return list(itertools.compress(self.positions, self._mask(word)))
+
+    def _mask(self, word: str) -> bytearray:
+        """Returns a mask which is set at the positions of the movies which
+        match a word. The caller holds the lock.
+
+        Movies are marked in a mask which is read in position order. This is
+        faster than sorting a set of positions.
+        """
+        found = bytearray(len(self.titles))
+        if len(word) <= PREFIX_LENGTH:
+            for position in self.prefixes.get(word, ()):
+                found[position] = 1
+            return found
+
+        grams = _grams(word)
+        title_candidates = min(
+            (self.title_grams.get(gram, ()) for gram in grams), key=len
+        )
+        title_keys = self.title_keys
+        for position in title_candidates:
+            if word in title_keys[position]:
+                found[position] = 1
+        name_candidates = min(
+            (self.name_grams.get(gram, ()) for gram in grams), key=len
+        )
+        for ix in name_candidates:
+            if word in self.name_keys[ix]:
+                for position in self.person_movies[ix]:
+                    found[position] = 1
+        return found
+
+    def _filter(self, positions: list[int], word: str, estimate: int) -> list[int]:
+        """Returns the positions whose movies match a word. The caller holds
+        the lock.
+
+        A short list of positions is filtered by searching each movie's key.
+        A long one is filtered by a mask of the word's matches if it is
+        likely to be quicker to make.
+        """
+        if estimate < len(positions):
+            found = self._mask(word)
+            return [position for position in positions if found[position]]
+        if len(word) <= PREFIX_LENGTH:
+            word = f" {word}"
+        keys = self.keys
+        return [position for position in positions if word in keys[position]]
+
+    def _ranked(self, positions: list[int], prefix: str, limit: int) -> list[int]:
+        """Returns up to limit positions with titles starting with prefix
+        first. The caller holds the lock."""
+        low = bisect.bisect_left(self.title_keys, prefix)
+        high = bisect.bisect_left(self.title_keys, f"{prefix}\uffff")
+        start = bisect.bisect_left(positions, low)
+        stop = bisect.bisect_left(positions, high)
+        ranked = positions[start:stop][:limit]
+        if len(ranked) < limit:
+            ranked += positions[:start][: limit - len(ranked)]
+        if len(ranked) < limit:
+            ranked += positions[stop:][: limit - len(ranked)]
+        return ranked
+
+
+def _grams(key: str) -> set[str]:
+    """Returns the trigrams of a key without padding.
+
+    Args:
+        key:
+    """
+    return {key[ix : ix + 3] for ix in range(len(key) - 2)}
+
+
+def _narrows(last_words: list[str], query_words: list[str]) -> bool:
+    """Returns True if every movie which matches the query also matched the
+    last query.
+
+    This is so if each last word is implied by some word of the query. A
+    long word is implied by any word which contains it. A short word is
+    implied by a short word which starts with it.
+
+    Args:
+        last_words:
+        query_words:
+    """
+    return all(
+        any(
+            (
+                query_word.startswith(last_word)
+                if len(last_word) <= PREFIX_LENGTH
+                else last_word in query_word
+            )
+            and (len(last_word) > PREFIX_LENGTH or len(query_word) <= PREFIX_LENGTH)
+            for query_word in query_words
+        )
+        for last_word in last_words
+    )
+
+
+catalogue_index = CatalogueIndex()
+_load_future: concurrent.futures.Future | None = None
+_load_lock = threading.Lock()
+
+
+def search(text: str, *, limit: int = LIMIT) -> SearchResult:
+    """Returns the movies in the tables module's database which match text.
+
+    See CatalogueIndex.search.
+    """
+    return catalogue_index.search(text, limit=limit)
+
+
+def start_load() -> concurrent.futures.Future:
+    """Loads the index in a thread from the pool.
+
+    A load which is already running is not repeated.
+
+    Returns:
+        A future whose result is None.
+    """
+    global _load_future
+    with _load_lock:
+        if _load_future is None or _load_future.done():
+            executor = config.current.threadpool_executor
+            _load_future = executor.submit(catalogue_index.ensure_loaded)
+        return _load_future
+
+
+def invalidate():
+    """Discards the index after a write which bypassed the ORM."""
+    catalogue_index.invalidate()
+
+
+@event.listens_for(Session, "after_flush")
+def _note_changes(session: Session, _flush_context):
+    """Notes whether a flush changed a movie or a person.
+
+    Changes are noted even if the index is not loaded as it may be loaded
+    from the database file before they are committed.
+    """
+    if any(
+        isinstance(instance, (schema.Movie, schema.Person))
+        for instance in session.new | session.dirty | session.deleted
+    ):
+        tables._pending_changes(session, _CHANGED_KEY).append(True)
+
+
+@tables._on_commit(_CHANGED_KEY)
+def _discard_index(session: Session, _changes: list):
+    """Discards the index after a commit which changed a movie or a person."""
+    if session.bind is catalogue_index.bind:
+        catalogue_index.invalidate()
@@ -0,0 +1,360 @@
+"""Idle-time maintenance of the movie database.
+
+Over years of edits the query planner's statistics go stale and deleted rows
+leave free pages in the file. Four tasks put this right:
+    analyze     Gathers the statistics used by the query planner.
+    optimize    Runs PRAGMA optimize which refreshes any stale statistics.
+    vacuum      Returns free pages to the file system a chunk at a time.
+    integrity   Runs a quick integrity check.
+
+Each task has an interval and a time budget. A task which is still running
+when its budget is spent is interrupted by an SQLite progress handler. Its
+work is rolled back and it is tried again after RETRY_DELAY. The delay
+doubles with each further interruption up to the task's interval, so a task
+which cannot finish within its budget, such as the first VACUUM of a large
+database, is not restarted every time the user is idle.
+
+The outcome of the last run of each task is kept in MAINTENANCE_NAME.json in
+the data directory next to saved_version.json. run_due is called by the GUI
+when the user has been idle for a while and by the command line interface.
+"""
+
+#  Copyright© 2026. Stephen Rigden.
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import json
+import logging
+import sqlite3
+import time
+from collections.abc import Callable
+from contextlib import closing
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import NamedTuple
+
+from database import backup, environment, schema
+
+MAINTENANCE_NAME = "maintenance"
+PROGRESS_STEPS = 1000
+ANALYSIS_LIMIT = 1000
+VACUUM_PAGES = 256
+AUTO_VACUUM_INCREMENTAL = 2
+RETRY_DELAY = timedelta(hours=1)
+MAINTENANCE_MSG = "Database maintenance"
+INTERRUPTED_MSG = "Database maintenance ran out of time:"
+INTEGRITY_PROBLEMS_MSG = "The database failed its integrity check."
+
+# Queries whose speed depends on the planner's statistics. They are timed
+# before and after the statistics are refreshed.
+PROBES = (
+    "SELECT count(*) FROM movie "
+    "JOIN movie_star_table ON movie_star_table.movie_id = movie.id "
+    "JOIN person ON person.id = movie_star_table.person_id "
+    "WHERE person.name LIKE '%a%' AND movie.year > 1950",
+    "SELECT count(*) FROM movie "
+    "JOIN movie_tag_table ON movie_tag_table.movie_id = movie.id "
+    "JOIN tag ON tag.id = movie_tag_table.tag_id "
+    "WHERE tag.text LIKE '%e%'",
+    "SELECT count(*) FROM person "
+    "JOIN movie_director_table ON movie_director_table.person_id = person.id "
+    "WHERE person.name LIKE 'A%'",
+)
+
+
+class TaskReport(NamedTuple):
+    """The outcome of one maintenance task.
+
+    bytes_saved is the shrinkage of the database file. seconds_saved is the
+    change in the time taken by the PROBES queries. interruptions counts the
+    consecutive runs which ran out of time up to and including this one.
+    """
+
+    task: str
+    last_run: str
+    seconds: float
+    completed: bool
+    bytes_saved: int = 0
+    seconds_saved: float = 0.0
+    problems: tuple[str, ...] = ()
+    interruptions: int = 0
+
+    def __str__(self) -> str:
+        outcome = "done" if self.completed else "out of time"
+        text = f"{self.task}: {outcome} in {self.seconds:.3f} s"
+        if self.bytes_saved:
+            text += f", {self.bytes_saved:,} bytes saved"
+        if self.seconds_saved:
+            text += f", probe queries {self.seconds_saved * 1000:+.1f} ms faster"
+        if self.problems:
+            text += f", problems: {'; '.join(self.problems)}"
+        return text
+
+
+class Task(NamedTuple):
+    """A maintenance task.
+
+    run is called with a connection and returns its report's problems.
+    """
+
+    name: str
+    interval: timedelta
+    budget: float
+    run: Callable[[sqlite3.Connection], list[str]]
+    probe: bool = False
+
+
+def _analyze(conn: sqlite3.Connection) -> list[str]:
+    """Gathers the statistics used by the query planner."""
+    conn.execute(f"PRAGMA analysis_limit = {ANALYSIS_LIMIT}")
+    conn.execute("ANALYZE")
+    return []
+
+
+def _optimize(conn: sqlite3.Connection) -> list[str]:
+    """Refreshes any statistics which SQLite thinks are stale."""
+    conn.execute("PRAGMA optimize")
+    return []
+
+
+def _vacuum(conn: sqlite3.Connection) -> list[str]:
+    """Returns free pages to the file system.
+
+    Incremental vacuuming needs an auto_vacuum database. An older database is
+    converted with one full VACUUM. After that only the free pages are moved
+    and each step of VACUUM_PAGES pages is committed on its own, so an
+    interruption keeps the steps already taken.
+    """
+    if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != AUTO_VACUUM_INCREMENTAL:
+        conn.execute(f"PRAGMA auto_vacuum = {AUTO_VACUUM_INCREMENTAL}")
+        conn.execute("VACUUM")
+    while conn.execute("PRAGMA freelist_count").fetchone()[0]:
+        conn.execute(f"PRAGMA incremental_vacuum({VACUUM_PAGES})").fetchall()
+    return []
+
+
+def _integrity(conn: sqlite3.Connection) -> list[str]:
+    """Checks the structure of the database."""
+    return [row[0] for row in conn.execute("PRAGMA quick_check") if row[0] != "ok"]
+
+
+TASKS = (
+    Task("analyze", timedelta(days=7), 10.0, _analyze, probe=True),
+    Task("optimize", timedelta(days=1), 2.0, _optimize, probe=True),
+    Task("vacuum", timedelta(days=7), 10.0, _vacuum),
+    Task("integrity", timedelta(days=30), 30.0, _integrity),
+)
+
+
+def metadata_path(database: Path = None) -> Path:
+    """Returns the path of the maintenance record.
+
+    The record of the program's database is kept in the data directory next to
+    saved_version.json. Any other database's record is kept next to it.
+
+    Args:
+        database: Defaults to backup.database_path().
+    """
+    database = database or backup.database_path()
+    directory = database.parent
+    if directory.name == environment.DATABASE_STEM + schema.VERSION:
+        directory = directory.parent
+    return directory / (MAINTENANCE_NAME + ".json")
+
+
+def last_runs(database: Path = None) -> dict[str, dict]:
+    """Returns the reports of the last run of each task of a database.
+
+    Args:
+        database: Defaults to backup.database_path().
+
+    Returns:
+        A dict of task names and TaskReport dicts. Tasks which have never run
+        are missing.
+    """
+    database = database or backup.database_path()
+    return _read_metadata(metadata_path(database)).get(database.name, {})
+
+
+def due(database: Path = None, *, now: datetime = None) -> list[Task]:
+    """Returns the tasks whose interval has passed since they last completed
+    and the interrupted tasks whose retry delay has passed.
+
+    Args:
+        database: Defaults to backup.database_path().
+        now: Defaults to the current time.
+    """
+    now = now or datetime.now()
+    runs = last_runs(database)
+    return [
+        task
+        for task in TASKS
+        if not (last_run := runs.get(task.name))
+        or now - datetime.fromisoformat(last_run["last_run"]) >= _wait(task, last_run)
+    ]
+
+
+def _wait(task: Task, last_run: dict) -> timedelta:
+    """Returns the time to wait after a task's last run before it is due.
+
+    Args:
+        task:
+        last_run: The task's last TaskReport as a dict.
+    """
+    if last_run.get("completed"):
+        return task.interval
+    interruptions = last_run.get("interruptions", 1)
+    return min(RETRY_DELAY * 2 ** max(interruptions - 1, 0), task.interval)
+
+
+def run_due(
+    database: Path = None,
+    *,
+    budget: float = None,
+    force: bool = False,
+    should_stop: Callable[[], bool] = None,
+) -> list[TaskReport]:
+    """Runs the tasks which are due and records their outcome.
+
+    Args:
+        database: Defaults to backup.database_path().
+        budget: The time in seconds allowed for all the tasks. Each task also
+            has its own budget. None allows each task its own budget.
+        force: Runs every task whether it is due or not.
+        should_stop: Checked as the tasks run. They are interrupted and no more
+            are started once it returns True. The GUI uses this to give way
+            to the user.
+
+    Returns:
+        A report for each task which was started.
+    """
+    database = database or backup.database_path()
+    deadline = None if budget is None else time.monotonic() + budget
+    runs = last_runs(database)
+    reports = []
+    for task in TASKS if force else due(database):
+        task_deadline = time.monotonic() + task.budget
+        if deadline is not None:
+            task_deadline = min(task_deadline, deadline)
+        if time.monotonic() >= task_deadline or (should_stop and should_stop()):
+            break
+        report = run_task(
+            database, task, deadline=task_deadline, should_stop=should_stop
+        )
+        if not report.completed:
+            interruptions = runs.get(task.name, {}).get("interruptions", 0) + 1
+            report = report._replace(interruptions=interruptions)
+        reports.append(report)
+    if reports:
+        _write_metadata(database, reports)
+    return reports
+
+
+def run_task(
+    database: Path,
+    task: Task,
+    *,
+    deadline: float,
+    should_stop: Callable[[], bool] = None,
+) -> TaskReport:
+    """Runs one task until it finishes or its deadline passes.
+
+    Args:
+        database:
+        task:
+        deadline: A time.monotonic() value.
+        should_stop: Interrupts the task when it returns True.
+
+    Returns:
+        The task's report.
+
+    Logs:
+        An interrupted task. Integrity problems are logged as errors.
+    """
+
+    def interrupt() -> bool:
+        return time.monotonic() > deadline or bool(should_stop and should_stop())
+
+    last_run = datetime.now().isoformat(timespec="seconds")
+    size_before = database.stat().st_size
+    with closing(sqlite3.connect(database, isolation_level=None)) as conn:
+        probe_before = _time_probes(conn) if task.probe else 0.0
+        start = time.perf_counter()
+        conn.set_progress_handler(interrupt, PROGRESS_STEPS)
+        try:
+            problems = task.run(conn)
+            completed = True
+        except sqlite3.OperationalError as exc:
+            # An interrupted statement is rolled back by SQLite.
+            problems = []
+            completed = False
+            logging.info(f"{INTERRUPTED_MSG} {task.name} {exc}")
+        seconds = time.perf_counter() - start
+        conn.set_progress_handler(None, 0)
+        probe_after = _time_probes(conn) if task.probe and completed else probe_before
+
+    if problems:
+        logging.error(f"{INTEGRITY_PROBLEMS_MSG} {problems}")
+    report = TaskReport(
+        task=task.name,
+        last_run=last_run,
+        seconds=seconds,
+        completed=completed,
+        bytes_saved=size_before - database.stat().st_size,
+        seconds_saved=probe_before - probe_after,
+        problems=tuple(problems),
+    )
+    logging.info(f"{MAINTENANCE_MSG} {report}")
+    return report
+
+
+def _time_probes(conn: sqlite3.Connection) -> float:
+    """Returns the time in seconds taken by the PROBES queries.
+
+    The probes are skipped if the database has no movie tables.
+    """
+    start = time.perf_counter()
+    try:
+        for probe in PROBES:
+            conn.execute(probe).fetchall()
+    except sqlite3.OperationalError:
+        return 0.0
+    return time.perf_counter() - start
+
+
+def _read_metadata(path: Path) -> dict:
+    """Returns the maintenance record or an empty dict if there is none."""
+    try:
+        with open(path) as fp:
+            return json.load(fp)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def _write_metadata(database: Path, reports: list[TaskReport]):
+    """Adds reports to the maintenance record.
+
+    The record is written to a temporary file and renamed so it is never left
+    half written.
+
+    Args:
+        database:
+        reports:
+    """
+    path = metadata_path(database)
+    metadata = _read_metadata(path)
+    runs = metadata.setdefault(database.name, {})
+    for report in reports:
+        runs[report.task] = report._asdict()
+    partial = path.with_suffix(".partial")
+    with open(partial, "w") as fp:
+        json.dump(metadata, fp, indent=2)
+    partial.replace(path)
@@ -0,0 +1,198 @@
+"""An optional in-memory replica of the movie database.
+
+The catalogue fits easily in memory. When the replica is enabled the database
+file is copied into an in-memory SQLite database with SQLite's backup API and
+the tables module's sessions read from the copy. Writes still go to the file:
+a session switches to the file for good on its first flush, DML statement,
+textual statement, or unit of work. Once such a session commits, the file is
+copied again so the replica matches it exactly, including the timestamps and
+ids chosen by the write.
+
+Each copy is a new in-memory connection which replaces the old one in the
+replica engine's pool. Sessions which are still reading from the old copy
+finish undisturbed. The engine and its compiled statements are kept.
+
+The replica is disabled by default. It is enabled at startup by setting the
+environment variable MOVIEDB_REPLICA or by calling enable(). Its load time and
+size are logged and are returned by stats().
+"""
+
+#  Copyright© 2026. Stephen Rigden.
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import logging
+import sqlite3
+import time
+from contextlib import closing
+from pathlib import Path
+from typing import NamedTuple
+
+from sqlalchemy import Engine, create_engine, event
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
+from sqlalchemy.sql.elements import TextClause
+
+from database import tables
+
+ENVIRONMENT_VARIABLE = "MOVIEDB_REPLICA"
+REPLICA_LOADED_MSG = "The in-memory database replica was loaded:"
+REPLICA_FAILED_MSG = "The in-memory database replica could not be reloaded."
+
+_engine: Engine | None = None
+_connection: sqlite3.Connection | None = None
+_stats: "ReplicaStats | None" = None
+
+
+class ReplicaStats(NamedTuple):
+    """The cost of the last load of the replica.
+
+    size is the bytes held by the replica's pages. loads counts the loads
+    since the replica was enabled.
+    """
+
+    seconds: float
+    size: int
+    loads: int
+
+    def __str__(self) -> str:
+        return (
+            f"{self.size:,} bytes in {self.seconds * 1000:.1f} ms, "
+            f"{self.loads:,} loads"
+        )
+
+
+class ReplicaSession(Session):
+    """A session which reads from the replica until it first writes."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.writing = False
+
+    def get_bind(self, mapper=None, *, clause=None, **kwargs):
+        """Returns the replica's engine for reads and the file's for writes.
+
+        A call without a mapper or clause is made by Session.connection which
+        tables._begin uses to start a unit of work's transaction.
+        """
+        if not self.writing and (
+            _engine is None
+            or self._flushing
+            or (mapper is None and clause is None)
+            or getattr(clause, "is_dml", False)
+            or isinstance(clause, TextClause)
+        ):
+            self.writing = True
+        if self.writing:
+            return super().get_bind(mapper, clause=clause, **kwargs)
+        return _engine
+
+
+@event.listens_for(ReplicaSession, "after_commit")
+def _after_commit(session: ReplicaSession):
+    """Copies the file into a new replica after a session's writes commit.
+
+    This is also called when a savepoint is released. Only the outermost
+    commit copies the file. If the copy fails the replica is disabled so
+    reads are not served from a stale copy.
+
+    Logs:
+        A failed copy is logged as an error.
+    """
+    if session.writing and not session.in_nested_transaction() and is_enabled():
+        try:
+            reload()
+        except sqlite3.Error as exc:
+            logging.error(f"{REPLICA_FAILED_MSG} {exc}")
+            disable()
+
+
+@event.listens_for(ReplicaSession, "after_transaction_end")
+def _after_transaction_end(session: ReplicaSession, transaction):
+    """Returns the session to the replica once its transaction has ended."""
+    if transaction.parent is None:
+        session.writing = False
+
+
+def is_enabled() -> bool:
+    """Returns True if reads are served from the replica."""
+    return (
+        _engine is not None
+        and tables.session_factory is not None
+        and issubclass(tables.session_factory.class_, ReplicaSession)
+    )
+
+
+def enable(*, query_cache_size: int = None):
+    """Loads the replica and routes the tables module's reads to it.
+
+    tables.session_factory must already be bound to the database file.
+
+    Args:
+        query_cache_size: The number of compiled statements held by the
+            replica's engine. Defaults to SQLAlchemy's default.
+    """
+    global _engine
+    if is_enabled():
+        return
+    options = {} if query_cache_size is None else {"query_cache_size": query_cache_size}
+    # The engine of an earlier enable is replaced in case it was bound to
+    # another database file.
+    _engine = create_engine(
+        "sqlite+pysqlite://",
+        creator=lambda: _connection,
+        poolclass=StaticPool,
+        pool_reset_on_return=None,
+        **options,
+    )
+    tables.session_factory = sessionmaker(
+        tables.session_factory.kw["bind"], class_=ReplicaSession
+    )
+    reload()
+    logging.info(f"{REPLICA_LOADED_MSG} {_stats}")
+
+
+def disable():
+    """Routes the tables module's reads back to the database file."""
+    global _engine, _connection, _stats
+    _engine = _connection = _stats = None
+    if tables.session_factory and issubclass(
+        tables.session_factory.class_, ReplicaSession
+    ):
+        tables.session_factory = sessionmaker(tables.session_factory.kw["bind"])
+
+
+def reload():
+    """Copies the database file into a new replica connection."""
+    global _connection, _stats
+    start = time.perf_counter()
+    database_fn = Path(tables.session_factory.kw["bind"].url.database)
+    connection = sqlite3.connect(":memory:", check_same_thread=False)
+    with closing(sqlite3.connect(database_fn)) as database_conn:
+        database_conn.backup(connection)
+    (page_count,) = connection.execute("PRAGMA page_count").fetchone()
+    (page_size,) = connection.execute("PRAGMA page_size").fetchone()
+    # A write sent to the replica by mistake fails instead of being lost.
+    connection.execute("PRAGMA query_only = ON")
+
+    _connection = connection
+    # The old connection is left open for any session still reading it.
+    _engine.dispose(close=False)
+    _stats = ReplicaStats(
+        seconds=time.perf_counter() - start,
+        size=page_count * page_size,
+        loads=_stats.loads + 1 if _stats else 1,
+    )
+
+
+def stats() -> ReplicaStats | None:
+    """Returns the cost of the last load or None if the replica is disabled."""
+    return _stats
@@ -18,8 +18,12 @@ from sqlalchemy import (
     Table,
     Column,
     ForeignKey,
+    Index,
+    Integer,
+    String,
     UniqueConstraint,
     CheckConstraint,
+    event,
     func,
 )
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
@@ -69,8 +73,8 @@ class Movie(Base):
     notes: Mapped[str | None]
 
     title: Mapped[str]
-    year: Mapped[int]
-    duration: Mapped[int | None]
+    year: Mapped[int] = mapped_column(index=True)
+    duration: Mapped[int | None] = mapped_column(index=True)
     synopsis: Mapped[str | None]
 
     stars: Mapped[set["Person"]] = relationship(
@@ -138,3 +142,100 @@ class Tag(Base):
 
     def __repr__(self) -> str:  # pragma nocover
         return f"{self.__class__.__qualname__}(id={self.id!r}, text={self.text!r})"
+
+
+# A denormalised copy of the movie columns shown in lists. Directors and stars
+# are held as sorted, comma-delimited strings so a list needs no joins. The
+# rows are kept current by the triggers below.
+movie_summary_table = Table(
+    "movie_summary",
+    Base.metadata,
+    Column("movie_id", Integer, primary_key=True),
+    Column("title", String, nullable=False),
+    Column("year", Integer, nullable=False),
+    Column("duration", Integer),
+    Column("synopsis", String),
+    Column("directors", String, nullable=False),
+    Column("stars", String, nullable=False),
+    Index("ix_movie_summary_title_year", "title", "year"),
+)
+
+
+def _summary_names(link_table: str, movie_id: str) -> str:
+    """Returns SQL for the sorted, comma-delimited names of a movie's people.
+
+    Args:
+        link_table: movie_director_table or movie_star_table.
+        movie_id: An SQL expression for the movie's id.
+    """
+    return (
+        f"coalesce((SELECT group_concat(name, ', ') FROM "
+        f"(SELECT person.name AS name FROM {link_table} "
+        f"JOIN person ON person.id = {link_table}.person_id "
+        f"WHERE {link_table}.movie_id = {movie_id} ORDER BY person.name)), '')"
+    )
+
+
+def _summary_refresh(where: str) -> str:
+    """Returns SQL which rewrites the summaries of the selected movies.
+
+    Args:
+        where: An SQL condition on the movie table.
+    """
+    return (
+        "INSERT OR REPLACE INTO movie_summary "
+        "(movie_id, title, year, duration, synopsis, directors, stars) "
+        "SELECT id, title, year, duration, synopsis, "
+        f"{_summary_names('movie_director_table', 'movie.id')}, "
+        f"{_summary_names('movie_star_table', 'movie.id')} "
+        f"FROM movie WHERE {where}"
+    )
+
+
+SUMMARY_MOVIE_COLUMNS = ("id", "title", "year", "duration", "synopsis")
+SUMMARY_REBUILD = [
+    "DELETE FROM movie_summary",
+    _summary_refresh("1"),
+]
+SUMMARY_TRIGGERS = [
+    "CREATE TRIGGER IF NOT EXISTS movie_summary_insert AFTER INSERT ON movie "
+    f"BEGIN {_summary_refresh('id = NEW.id')}; END",
+    "CREATE TRIGGER IF NOT EXISTS movie_summary_update AFTER UPDATE ON movie "
+    "BEGIN DELETE FROM movie_summary WHERE movie_id = OLD.id; "
+    f"{_summary_refresh('id = NEW.id')}; END",
+    "CREATE TRIGGER IF NOT EXISTS movie_summary_delete AFTER DELETE ON movie "
+    "BEGIN DELETE FROM movie_summary WHERE movie_id = OLD.id; END",
+    "CREATE TRIGGER IF NOT EXISTS movie_summary_person AFTER UPDATE OF name "
+    "ON person BEGIN "
+    + _summary_refresh(
+        "id IN (SELECT movie_id FROM movie_director_table "
+        "WHERE person_id = NEW.id UNION SELECT movie_id FROM movie_star_table "
+        "WHERE person_id = NEW.id)"
+    )
+    + "; END",
+] + [
+    f"CREATE TRIGGER IF NOT EXISTS movie_summary_{link_table}_{action.lower()} "
+    f"AFTER {action} ON {link_table} "
+    f"BEGIN {_summary_refresh(f'id = {row}.movie_id')}; END"
+    for link_table in ("movie_director_table", "movie_star_table")
+    for action, row in (("INSERT", "NEW"), ("DELETE", "OLD"))
+]
+
+
+@event.listens_for(Base.metadata, "after_create")
+def _create_summary_triggers(_target, connection, *, tables=(), **_kwargs):
+    """Creates the summary triggers when the summary table is created.
+
+    The table is filled from the movies already in the database so an older
+    database gains its summaries when the table is first created. This waits
+    for create_all to finish because the triggers refer to other tables. A
+    movie table without the summarised columns is left alone.
+    """
+    movie_columns = {
+        row[1] for row in connection.exec_driver_sql("PRAGMA table_info(movie)")
+    }
+    if movie_summary_table in tables and movie_columns.issuperset(
+        SUMMARY_MOVIE_COLUMNS
+    ):
+        for statement in SUMMARY_TRIGGERS + SUMMARY_REBUILD:
+            connection.exec_driver_sql(statement)
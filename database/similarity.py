@@ -0,0 +1,350 @@
+"""Probable duplicate detection for movie titles.
+
+The movie table's UNIQUE constraint only rejects an exact title and year.
+This module keeps an in-memory index of every movie's normalised title so
+near misses can be found before they are added. "The Third Man" and
+"Third Man, The" have the same normalised key. Titles which differ by a
+word or a typing mistake share most of their trigrams.
+
+The index is partitioned by year, so a lookup only compares movies released
+within YEAR_TOLERANCE years of the candidate. It is loaded from the
+database on first use and kept current by session events which apply the
+movie changes of every committed session. Bulk writes which bypass the
+ORM must call invalidate.
+"""
+
+#  Copyright© 2026. Stephen Rigden.
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import concurrent.futures
+import logging
+import re
+import sys
+import threading
+import time
+import unicodedata
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import NamedTuple
+
+from sqlalchemy import event, select, Engine
+from sqlalchemy.orm import Session
+
+import config
+from database import schema, tables
+
+ARTICLES = ("the", "a", "an")
+YEAR_TOLERANCE = 1
+THRESHOLD = 0.4
+LIMIT = 5
+INDEX_LOADED_MSG = "The title similarity index was loaded."
+
+_PENDING_KEY = "similarity_pending"
+_TRAILING_ARTICLE = re.compile(rf",\s*(?:{'|'.join(ARTICLES)})\s*$")
+_WORD = re.compile(r"[^\W_]+")
+
+
+class Candidate(NamedTuple):
+    """A movie which is probably a duplicate."""
+
+    title: str
+    year: int
+    score: float
+
+
+def title_key(title: str) -> str:
+    """Returns the normalised form of a title.
+
+    Case, accents, punctuation, and a leading or trailing article are
+    removed. An ampersand becomes 'and'.
+
+    Args:
+        title:
+
+    Returns:
+        The words of the title in lower case separated by single spaces.
+    """
+    text = _TRAILING_ARTICLE.sub("", fold(title)).replace("&", " and ")
+    words = _WORD.findall(text)
+    if len(words) > 1 and words[0] in ARTICLES:
+        words = words[1:]
+    return " ".join(words)
+
+
+def fold(text: str) -> str:
+    """Returns text in lower case without accents.
+
+    Args:
+        text:
+    """
+    text = text.casefold()
+    if not text.isascii():
+        text = unicodedata.normalize("NFKD", text)
+        text = "".join(char for char in text if not unicodedata.combining(char))
+    return text
+
+
+def words(text: str) -> list[str]:
+    """Returns the words of folded text without punctuation.
+
+    Args:
+        text:
+    """
+    return _WORD.findall(fold(text))
+
+
+def trigrams(key: str) -> frozenset[str]:
+    """Returns the trigrams of a normalised title.
+
+    The key is padded so the first and last letters count as often as the
+    others.
+
+    Args:
+        key: A title_key.
+    """
+    padded = f"  {key} "
+    return frozenset(padded[ix : ix + 3] for ix in range(len(padded) - 2))
+
+
+@dataclass
+class TitleIndex:
+    """An index of the movie titles in a database partitioned by year.
+
+    A title's trigrams are computed the first time it is compared, or by
+    warm, and kept until the title is removed. Loading the index only reads
+    the titles and years.
+
+    All methods are thread safe.
+    """
+
+    year_tolerance: int = YEAR_TOLERANCE
+
+    # The engine of the database which was loaded. None if not loaded.
+    bind: Engine | None = field(default=None, init=False, repr=False)
+    # year: movie id: title
+    years: defaultdict[int, dict[int, str]] = field(
+        default_factory=lambda: defaultdict(dict), init=False, repr=False
+    )
+    # movie id: year
+    movie_years: dict[int, int] = field(default_factory=dict, init=False, repr=False)
+    # movie id: trigrams. Tuples of interned strings take a fraction of the
+    #  memory of frozensets.
+    grams: dict[int, tuple[str, ...]] = field(
+        default_factory=dict, init=False, repr=False
+    )
+    lock: threading.RLock = field(
+        default_factory=threading.RLock, init=False, repr=False
+    )
+
+    def load(self):
+        """Loads every movie in the database used by the tables module."""
+        start = time.perf_counter()
+        bind = tables.session_factory.kw["bind"]
+        with tables.session_factory() as session:
+            rows = session.execute(
+                select(schema.Movie.id, schema.Movie.title, schema.Movie.year)
+            ).all()
+        with self.lock:
+            self._clear()
+            for movie_id, title, year in rows:
+                self.years[year][movie_id] = title
+                self.movie_years[movie_id] = year
+            self.bind = bind
+        logging.info(
+            f"{INDEX_LOADED_MSG} {len(rows)} movies in "
+            f"{(time.perf_counter() - start) * 1000:.0f} ms."
+        )
+
+    def ensure_loaded(self):
+        """Loads the index if it is not loaded or if the tables module has
+        changed to another database."""
+        with self.lock:
+            if not self.is_current():
+                self.load()
+
+    def is_current(self) -> bool:
+        """Returns True if the index holds the tables module's database."""
+        return (
+            self.bind is not None
+            and tables.session_factory is not None
+            and self.bind is tables.session_factory.kw["bind"]
+        )
+
+    def invalidate(self):
+        """Discards the index. It will be reloaded when it is next used."""
+        with self.lock:
+            self.bind = None
+            self._clear()
+
+    def add(self, movie_id: int, title: str, year: int):
+        """Adds or replaces a movie.
+
+        Args:
+            movie_id:
+            title:
+            year:
+        """
+        with self.lock:
+            self.remove(movie_id)
+            self.years[year][movie_id] = title
+            self.movie_years[movie_id] = year
+
+    def remove(self, movie_id: int):
+        """Removes a movie. No action is taken if it is not in the index.
+
+        Args:
+            movie_id:
+        """
+        with self.lock:
+            if (year := self.movie_years.pop(movie_id, None)) is None:
+                return
+            del self.years[year][movie_id]
+            self.grams.pop(movie_id, None)
+
+    def probable_duplicates(
+        self,
+        title: str,
+        year: int,
+        *,
+        threshold: float = THRESHOLD,
+        limit: int = LIMIT,
+    ) -> list[Candidate]:
+        """Returns movies whose titles are similar to title.
+
+        The score is the Jaccard similarity of the trigram sets. It is 1.0
+        for titles with the same title_key.
+
+        Args:
+            title:
+            year: Movies within year_tolerance years are searched.
+            threshold: The lowest score returned.
+            limit: The largest number of candidates returned.
+
+        Returns:
+            Candidates ordered by descending score, closeness of year, and
+            title.
+        """
+        grams = trigrams(title_key(title))
+        candidates = []
+        with self.lock:
+            self.ensure_loaded()
+            for nearby_year in range(
+                year - self.year_tolerance, year + self.year_tolerance + 1
+            ):
+                for movie_id, other_title in self.years.get(nearby_year, {}).items():
+                    if (other_grams := self.grams.get(movie_id)) is None:
+                        other_grams = self._store_grams(movie_id, other_title)
+                    if not (shared := len(grams.intersection(other_grams))):
+                        continue
+                    score = shared / (len(grams) + len(other_grams) - shared)
+                    if score >= threshold:
+                        candidates.append(Candidate(other_title, nearby_year, score))
+        candidates.sort(
+            key=lambda item: (-item.score, abs(item.year - year), item.title)
+        )
+        return candidates[:limit]
+
+    def warm(self):
+        """Loads the index and computes the trigrams of every title.
+
+        The lock is released after each year so lookups are not held up for
+        long.
+        """
+        self.ensure_loaded()
+        for year in list(self.years):
+            with self.lock:
+                for movie_id, title in self.years.get(year, {}).items():
+                    if movie_id not in self.grams:
+                        self._store_grams(movie_id, title)
+
+    def _store_grams(self, movie_id: int, title: str) -> tuple[str, ...]:
+        """Computes and keeps the trigrams of a title. The caller holds the
+        lock."""
+        grams = tuple(map(sys.intern, trigrams(title_key(title))))
+        self.grams[movie_id] = grams
+        return grams
+
+    def _clear(self):
+        """Removes every movie. The caller holds the lock."""
+        self.years.clear()
+        self.movie_years.clear()
+        self.grams.clear()
+
+
+title_index = TitleIndex()
+_load_future: concurrent.futures.Future | None = None
+_load_lock = threading.Lock()
+
+
+def probable_duplicates(
+    title: str, year: int, *, threshold: float = THRESHOLD, limit: int = LIMIT
+) -> list[Candidate]:
+    """Returns movies in the tables module's database whose titles are
+    similar to title.
+
+    See TitleIndex.probable_duplicates.
+    """
+    return title_index.probable_duplicates(
+        title, year, threshold=threshold, limit=limit
+    )
+
+
+def start_load() -> concurrent.futures.Future:
+    """Loads and warms the index in a thread from the pool.
+
+    This lets a form prepare the index while the user is typing. A load which
+    is already running is not repeated.
+
+    Returns:
+        A future whose result is None.
+    """
+    global _load_future
+    with _load_lock:
+        if _load_future is None or _load_future.done():
+            executor = config.current.threadpool_executor
+            _load_future = executor.submit(title_index.warm)
+        return _load_future
+
+
+def invalidate():
+    """Discards the index after a write which bypassed the ORM."""
+    title_index.invalidate()
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changes(session: Session, _flush_context):
+    """Records the flushed movie changes until the session commits.
+
+    The session's new, dirty, and deleted collections still hold their
+    pre-flush state when this event is called. New movies have their ids.
+    Changes are recorded even if the index is not loaded as it may be loaded
+    from the database file before they are committed.
+    """
+    pending = tables._pending_changes(session, _PENDING_KEY)
+    for movie in session.new | session.dirty:
+        if isinstance(movie, schema.Movie):
+            pending.append((movie.id, movie.title, movie.year))
+    for movie in session.deleted:
+        if isinstance(movie, schema.Movie):
+            pending.append((movie.id, None, None))
+
+
+@tables._on_commit(_PENDING_KEY)
+def _apply_changes(session: Session, changes: list):
+    """Applies the committed movie changes to the index."""
+    if not title_index.is_current() or session.bind is not title_index.bind:
+        return
+    for movie_id, title, year in changes:
+        if title is None:
+            title_index.remove(movie_id)
+        else:
+            title_index.add(movie_id, title, year)
@@ -19,24 +19,238 @@ movies, tags, and people (directors and stars).
 #  You should have received a copy of the GNU General Public License
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+import contextlib
+import contextvars
+import functools
 import logging
-
-from sqlalchemy import select, intersect
+import string
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterator
+from datetime import datetime
+from typing import NamedTuple
+
+from sqlalchemy import (
+    bindparam,
+    delete,
+    exists,
+    insert,
+    literal,
+    select,
+    func,
+    intersect,
+    or_,
+    text,
+    event,
+    Column,
+    CompoundSelect,
+    Select,
+)
 from sqlalchemy.exc import NoResultFound, IntegrityError
-from sqlalchemy.orm import Session, sessionmaker
-
-from database import schema
+from sqlalchemy.orm import (
+    Session,
+    SessionTransaction,
+    sessionmaker,
+    InstrumentedAttribute,
+)
+from sqlalchemy.orm.exc import StaleDataError
+
+from database import schema, instrumentation
 from moviebag import *
+from movieresultset import MovieResultSet
 
 MOVIE_NOT_FOUND = "No matching movies were found."
 MOVIE_EXISTS = "This movie is already present in the database."
 INVALID_YEAR = "This year is likely incorrect."
 TAG_NOT_FOUND = "The tag was not found."
 TAG_EXISTS = "This tag is already present in the database."
+MOVIE_CHANGED = "The movie was changed after it was read."
+SUMMARY_MISSING = "Missing movie summary:"
+SUMMARY_STALE = "Stale movie summary:"
+SUMMARY_ORPHANED = "Movie summary without a movie:"
+FACET_CACHE_SECONDS = 5.0
+TOP_DIRECTORS = 8
+MATCH_TEMPLATES = 128
+IDENTITY_CACHE_SECONDS = 60.0
+IDENTITY_CACHE_SIZE = 1000
+MATCH_CACHE_SIZE = 64
+MATCH_CACHE_BYTES = 64 * 1024 * 1024
 
 session_factory: sessionmaker[Session] | None = None
 
+# criteria fingerprint: (monotonic time, facets)
+_facet_cache: dict[tuple, tuple[float, "Facets"]] = {}
+_facet_cache_lock = threading.Lock()
+
+# (engine, movie id): (monotonic time, movie bag)
+_identity_cache: dict[tuple, tuple[float, MovieBag]] = {}
+_identity_cache_lock = threading.Lock()
+_IDENTITY_CHANGED_KEY = "identity_changed"
+
+# Changes noted by flushes are held per transaction until the session's
+# outermost transaction ends. See _pending_changes.
+_TRANSACTIONS_KEY = "tables_transactions"
+# key: handler of the changes noted under key
+_commit_handlers: dict[str, Callable[[Session, list], None]] = {}
+
+# (engine, criteria fingerprint): movie bags, least recently used first
+_match_cache: OrderedDict[tuple, list[MovieBag]] = OrderedDict()
+_match_cache_lock = threading.Lock()
+_match_cache_bytes = 0
+_match_cache_hits = 0
+_match_cache_misses = 0
+_match_cache_evictions = 0
+# Advanced when the outermost transaction of a commit which changes a movie,
+# a person, or a tag ends. Releasing a unit of work's savepoint does not
+# advance it. A search is only cached if no such commit was made while it ran.
+_write_generation = 0
+_ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+# A rough size of a movie bag without its text, measured on Python 3.13.
+_MOVIE_BAG_BYTES = 3000
+
+# The session of the innermost unit_of_work of this thread or task.
+_unit_session: contextvars.ContextVar[Session | None] = contextvars.ContextVar(
+    "unit_session", default=None
+)
+
+
+# Statements which are run once per record by bulk paths are built once here.
+# Their values are passed as bound parameters so the compiled form of each is
+# found in the engine's compiled cache without rebuilding the construct.
+_SELECT_MOVIE = (
+    select(schema.Movie)
+    .where(schema.Movie.title == bindparam("title"))
+    .where(schema.Movie.year == bindparam("year"))
+)
+_SELECT_PERSON = select(schema.Person).where(schema.Person.name == bindparam("name"))
+_SELECT_TAG = select(schema.Tag).where(schema.Tag.text == bindparam("text"))
+_SELECT_SUMMARIES = select(schema.movie_summary_table).order_by(
+    schema.movie_summary_table.c.title, schema.movie_summary_table.c.year
+)
+
+
+class MatchCacheStats(NamedTuple):
+    """The use of the match_movies result cache since the program started.
+
+    The size is an estimate in bytes.
+    """
+
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    size: int
+
+
+class MovieSummary(NamedTuple):
+    """The columns of a movie which are shown in lists.
+
+    The directors and stars are sorted, comma-delimited names as given by
+    setstr_to_str.
+    """
+
+    id: int
+    title: str
+    year: int
+    duration: int | None
+    synopsis: str | None
+    directors: str
+    stars: str
+
+
+class Facets(NamedTuple):
+    """Movie counts of a search.
+
+    The tags and directors are lists of (value, count) tuples ordered by
+    descending count and value. The decades are in date order.
+    """
+
+    total: int
+    tags: list[tuple[str, int]]
+    decades: list[tuple[int, int]]
+    directors: list[tuple[str, int]]
+
+
+@contextlib.contextmanager
+def unit_of_work() -> Iterator[Session]:
+    """Groups tables operations into one session and one commit.
+
+    Every tables function called within the unit uses the unit's session.
+    Each call is run in its own savepoint so a call which raises has its
+    changes rolled back while the unit carries on. The unit is committed
+    when the with block ends. If the block raises, every change made
+    within it is rolled back.
+
+    Units may be nested. A nested unit is a savepoint of the enclosing unit.
+
+    Example:
+        with tables.unit_of_work():
+            tables.add_tags(tag_texts=tag_texts)
+            for movie_bag in movie_bags:
+                tables.add_movie(movie_bag=movie_bag)
+
+    Yields:
+        The unit's session.
+    """
+    if session := _unit_session.get():
+        with session.begin_nested():
+            yield session
+        return
+
+    with session_factory() as session:
+        _begin(session)
+        token = _unit_session.set(session)
+        try:
+            yield session
+            session.commit()
+        finally:
+            _unit_session.reset(token)
+
+
+@contextlib.contextmanager
+def _session() -> Iterator[Session]:
+    """Yields the session of a tables function.
+
+    Outside a unit of work this is a new session. Within a unit it is the
+    unit's session inside a savepoint for the function's changes.
+    """
+    if session := _unit_session.get():
+        with session.begin_nested():
+            yield session
+    else:
+        with session_factory() as session:
+            yield session
+
+
+def _commit(session: Session):
+    """Commits a tables function's changes.
+
+    Within a unit of work the changes are only flushed so that errors are
+    raised where they would be raised by a commit. The unit commits them.
+    """
+    if _unit_session.get():
+        session.flush()
+    else:
+        session.commit()
 
+
+def _begin(session: Session):
+    """Starts the session's database transaction now.
+
+    pysqlite does not emit BEGIN until the first INSERT, UPDATE, or DELETE.
+    A SAVEPOINT issued before then starts SQLite's transaction itself and
+    releasing it would commit everything written so far.
+    """
+    connection = session.connection()
+    if (
+        connection.dialect.name == "sqlite"
+        and not connection.connection.dbapi_connection.in_transaction
+    ):
+        connection.exec_driver_sql("BEGIN")
+
+
+@instrumentation.instrument
 def select_movie(*, movie_bag: MovieBag) -> MovieBag:
     """Selects and returns a single movie.
 
@@ -72,7 +286,7 @@ def select_movie(*, movie_bag: MovieBag) -> MovieBag:
         populate the movie bag with all fields in the database, including id,
         date created, and date updated.
     """
-    with session_factory() as session:
+    with _session() as session:
         try:
             movie = _select_movie(session, movie_bag=movie_bag)
 
@@ -90,9 +304,10 @@ def select_movie(*, movie_bag: MovieBag) -> MovieBag:
     return movie_bag
 
 
+@instrumentation.instrument
 def select_all_movies() -> list[MovieBag]:
     """Selects and returns all movies."""
-    with session_factory() as session:
+    with _session() as session:
         movies = _select_all_movies(session)
         movie_bags = [  # pragma no branch
             _convert_to_movie_bag(movie) for movie in movies
@@ -100,6 +315,7 @@ def select_all_movies() -> list[MovieBag]:
     return movie_bags
 
 
+@instrumentation.instrument
 def match_movies(match: MovieBag) -> list[MovieBag]:
     """Selects and returns the intersection of matching movies.
 
@@ -139,17 +355,313 @@ def match_movies(match: MovieBag) -> list[MovieBag]:
             Contains match. A movie.year of `1955 in MovieInteger('1950-1960')`
                 is a match.
 
+    Results are cached. A search is run again only if a commit has changed a
+    movie, a person, or a tag since it was cached. See match_cache_stats.
+
     Returns:
         The intersection of the records selected by each field's search criteria.
     """
-    with session_factory() as session:
+    key = (session_factory.kw["bind"], _criteria_fingerprint(match))
+    if (movie_bags := _cached_match(key)) is not None:
+        return movie_bags
+
+    generation = _write_generation
+    with _session() as session:
         movies = _match_movies(session, match=match)
         movie_bags = [  # pragma no branch
             _convert_to_movie_bag(movie) for movie in movies
         ]
+    _cache_match(key, generation, movie_bags)
+    if len(movie_bags) <= IDENTITY_CACHE_SIZE:
+        _cache_movie_bags(movie_bags)
     return movie_bags
 
 
+@instrumentation.instrument
+def select_movie_by_id(*, movie_id: int) -> MovieBag:
+    """Selects and returns a single movie by its primary key.
+
+    Movies read in the last IDENTITY_CACHE_SECONDS by this function or by a
+    small match_movies search are returned without a query. The cache is
+    cleared by any commit which changes a movie, a person, or a tag.
+
+    Args:
+        movie_id:
+
+    Returns:
+        A movie bag populated with every field in the database.
+
+    Raises and logs:
+        A NoResultFound exception will be raised if the movie
+        was not found. The added note list will contain:
+            MOVIE_NOT_FOUND literal,
+            movie id.
+    """
+    if movie_bag := _cached_movie_bag(movie_id):
+        return movie_bag
+
+    with _session() as session:
+        movie = _select_movie_by_id(session, movie_id=movie_id)
+        movie_bag = _convert_to_movie_bag(movie)
+    _cache_movie_bags([movie_bag])
+    return _copy_movie_bag(movie_bag)
+
+
+@instrumentation.instrument
+def edit_movie_by_id(
+    *, movie_id: int, updated: datetime | None, replacement_fields: MovieBag
+):
+    """Edits a movie found by its primary key.
+
+    This is edit_movie for a movie which was read with its id. The movie is
+    fetched once. If updated is given and the movie's updated time differs
+    the movie was changed by someone else since it was read and it is not
+    edited. The movie's updated time is set even if only its directors,
+    stars, or tags change.
+
+    Args:
+        movie_id:
+        updated: The movie's updated time when it was read or None to skip
+            the check.
+        replacement_fields: See edit_movie.
+
+    Raises and logs:
+        A NoResultFound exception will be raised if the movie was not
+        found. The added note list will contain:
+            MOVIE_NOT_FOUND literal,
+            movie id.
+        A StaleDataError will be raised if the movie was changed after it
+        was read. The added note list will contain:
+            MOVIE_CHANGED literal,
+            movie title,
+            movie year.
+        The NoResultFound and IntegrityError exceptions of edit_movie.
+    """
+    title = replacement_fields.get("title")
+    year = replacement_fields.get("year")
+
+    try:
+        with _session() as session:
+            movie = _select_movie_by_id(session, movie_id=movie_id)
+            if updated is not None and movie.updated != updated:
+                logging.error(f"{MOVIE_CHANGED} {movie.title}, {movie.year}.")
+                exc = StaleDataError(MOVIE_CHANGED)
+                exc.add_note(MOVIE_CHANGED)
+                exc.add_note(movie.title)
+                exc.add_note(str(movie.year))
+                raise exc
+
+            _edit_movie(movie=movie, edit_fields=replacement_fields)
+            removed_people = _edit_movie_relationships(
+                session, movie=movie, edit_fields=replacement_fields
+            )
+            movie.updated = func.now()
+            _delete_orphans(session, candidates=removed_people)
+            _commit(session)
+
+    except IntegrityError as exc:
+        _note_integrity_error(exc, title=title, year=year)
+        raise
+
+
+@instrumentation.instrument
+def delete_movie_by_id(*, movie_id: int):
+    """Deletes a movie found by its primary key and any orphaned people.
+
+    No exception will be raised if the movie has already been deleted.
+
+    Args:
+        movie_id:
+    """
+    with _session() as session:
+        movie = session.get(schema.Movie, movie_id)
+        if movie is not None:
+            candidate_orphans = movie.directors | movie.stars
+            _delete_movie(session, movie=movie)
+            _delete_orphans(session, candidates=candidate_orphans)
+            _commit(session)
+
+
+def clear_identity_cache():
+    """Discards every movie held by select_movie_by_id."""
+    with _identity_cache_lock:
+        _identity_cache.clear()
+
+
+def match_cache_stats() -> MatchCacheStats:
+    """Returns the use of the match_movies result cache."""
+    with _match_cache_lock:
+        return MatchCacheStats(
+            _match_cache_hits,
+            _match_cache_misses,
+            _match_cache_evictions,
+            len(_match_cache),
+            _match_cache_bytes,
+        )
+
+
+def clear_match_cache():
+    """Discards every search held by match_movies.
+
+    Searches which are running are not cached. This must be called after a
+    write which the session events do not see, such as a Core insert or a
+    restore.
+    """
+    with _match_cache_lock:
+        _advance_write_generation()
+
+
+@instrumentation.instrument
+def select_all_movies_compact() -> MovieResultSet:
+    """Selects and returns all movies as a compact result set.
+
+    This is a memory efficient alternative to select_all_movies for large
+    catalogues. Columns are read directly so no ORM objects are created.
+    """
+    with _session() as session:
+        return _select_result_set(session, movie_ids=select(schema.Movie.id))
+
+
+@instrumentation.instrument
+def match_movies_compact(match: MovieBag) -> MovieResultSet:
+    """Selects and returns the intersection of matching movies as a compact
+    result set.
+
+    This is a memory efficient alternative to match_movies for searches which
+    may return many movies.
+
+    Args:
+        match: See match_movies.
+
+    Returns:
+        The intersection of the records selected by each field's search criteria.
+    """
+    intersection = _match_statement(match=match)
+    if intersection is None:
+        return MovieResultSet()
+    with _session() as session:
+        movie_ids = select(intersection.subquery().c.id)
+        return _select_result_set(session, movie_ids=movie_ids)
+
+
+@instrumentation.instrument
+def select_movie_summaries(match: MovieBag = None) -> list[MovieSummary]:
+    """Selects the summaries of movies in title and year order.
+
+    Each summary is read from one row of the movie_summary table which the
+    schema's triggers keep current. No joins are made and no ORM objects are
+    created, so this is the fastest way to fill a list of movies.
+
+    Args:
+        match: See match_movies. None selects every movie.
+
+    Returns:
+        The summaries of the selected movies.
+    """
+    statement = _SELECT_SUMMARIES
+    if match is not None:
+        intersection = _match_statement(match=match)
+        if intersection is None:
+            return []
+        statement = statement.where(
+            schema.movie_summary_table.c.movie_id.in_(
+                select(intersection.subquery().c.id)
+            )
+        )
+    with _session() as session:
+        return [MovieSummary(*row) for row in session.execute(statement)]
+
+
+@instrumentation.instrument
+def check_movie_summaries() -> list[str]:
+    """Compares the movie summaries with the movies they summarise.
+
+    The expected summaries are built in Python from the movie, person, and
+    association tables so a fault in the triggers is found.
+
+    Returns:
+        A list of problems. It is empty if every summary is current.
+    """
+    with _session() as session:
+        movies = _select_result_set(session, movie_ids=select(schema.Movie.id))
+        summaries = {
+            row[0]: MovieSummary(*row)
+            for row in session.execute(select(schema.movie_summary_table))
+        }
+    problems = []
+    for movie in movies:
+        expected = _movie_summary(movie)
+        summary = summaries.pop(expected.id, None)
+        if summary is None:
+            problems.append(f"{SUMMARY_MISSING} {expected.title} ({expected.year})")
+        elif summary != expected:
+            problems.append(f"{SUMMARY_STALE} {expected.title} ({expected.year})")
+    problems += [f"{SUMMARY_ORPHANED} {movie_id}" for movie_id in sorted(summaries)]
+    return problems
+
+
+@instrumentation.instrument
+def rebuild_movie_summaries():
+    """Rebuilds every movie summary from the movies."""
+    with _session() as session:
+        for statement in schema.SUMMARY_REBUILD:
+            session.execute(text(statement))
+        _commit(session)
+
+
+@instrumentation.instrument
+def facet_counts(match: MovieBag, *, top_directors: int = TOP_DIRECTORS) -> Facets:
+    """Returns the number of matching movies per tag, decade, and director.
+
+    Each facet is one GROUP BY query over the movies which match. Results are
+    cached for FACET_CACHE_SECONDS so a search form can ask again as the user
+    types without repeating the queries. They may therefore miss a change
+    made within that time.
+
+    Args:
+        match: Partial match criteria. See match_movies. An empty match
+            counts every movie.
+        top_directors: The number of directors returned.
+
+    Returns:
+        The total and the per-facet counts.
+    """
+    key = (
+        session_factory.kw["bind"],
+        top_directors,
+        _criteria_fingerprint(match),
+    )
+    now = time.monotonic()
+    with _facet_cache_lock:
+        for stale_key in [  # pragma no branch
+            cache_key
+            for cache_key, (created, _) in _facet_cache.items()
+            if now - created > FACET_CACHE_SECONDS
+        ]:
+            del _facet_cache[stale_key]
+        if cached := _facet_cache.get(key):
+            return cached[1]
+
+    intersection = _match_statement(match=match)
+    movie_ids = None
+    if intersection is not None:
+        movie_ids = select(intersection.subquery().c.id)
+    with _session() as session:
+        facets = _facet_counts(
+            session, movie_ids=movie_ids, top_directors=top_directors
+        )
+    with _facet_cache_lock:
+        _facet_cache[key] = (now, facets)
+    return facets
+
+
+def clear_facet_cache():
+    """Discards every cached facet count."""
+    with _facet_cache_lock:
+        _facet_cache.clear()
+
+
+@instrumentation.instrument
 def add_movie(*, movie_bag: MovieBag):
     """Adds a movie.
 
@@ -186,11 +698,11 @@ def add_movie(*, movie_bag: MovieBag):
             movie year.
     """
     try:
-        with session_factory() as session:
+        with _session() as session:
             movie = _add_movie(movie_bag=movie_bag)
             session.add(movie)
             _update_movie_relationships(movie, movie_bag, session)
-            session.commit()
+            _commit(session)
 
     except IntegrityError as exc:
         if "UNIQUE constraint failed: movie.title, movie.year" in exc.args[0]:
@@ -210,6 +722,7 @@ def add_movie(*, movie_bag: MovieBag):
             raise
 
 
+@instrumentation.instrument
 def edit_movie(*, old_movie_bag: MovieBag, replacement_fields: MovieBag):
     """Edits a movie. Most often.
 
@@ -217,6 +730,10 @@ def edit_movie(*, old_movie_bag: MovieBag, replacement_fields: MovieBag):
     It adds new people to the person table and removes orphans. It links the
     people table to stars and directors.
 
+    Only the directors, stars, and tags which were added or removed are
+    changed. A relationship is left as it is if its field is missing from
+    replacement_fields.
+
     Args:
         old_movie_bag:
             id: ignored
@@ -268,7 +785,7 @@ def edit_movie(*, old_movie_bag: MovieBag, replacement_fields: MovieBag):
     year = replacement_fields.get("year")
 
     try:
-        with session_factory() as session:
+        with _session() as session:
             try:
                 movie = _select_movie(session, movie_bag=old_movie_bag)
 
@@ -279,30 +796,19 @@ def edit_movie(*, old_movie_bag: MovieBag, replacement_fields: MovieBag):
                 exc.add_note(str(int(year)))
                 raise
 
-            candidate_orphans = movie.directors | movie.stars
             _edit_movie(movie=movie, edit_fields=replacement_fields)
-            _update_movie_relationships(movie, replacement_fields, session)
-            _delete_orphans(session, candidates=candidate_orphans)
-            session.commit()
+            removed_people = _edit_movie_relationships(
+                session, movie=movie, edit_fields=replacement_fields
+            )
+            _delete_orphans(session, candidates=removed_people)
+            _commit(session)
 
     except IntegrityError as exc:
-        if "UNIQUE constraint failed: movie.title, movie.year" in exc.args[0]:
-            logging.error(f"{MOVIE_EXISTS} {title}, {year}.")
-            exc.add_note(MOVIE_EXISTS)
-            exc.add_note(title)
-            exc.add_note(str(int(year)))
-            raise
-
-        elif "CHECK constraint failed: year" in exc.args[0]:
-            logging.error(f"{INVALID_YEAR} {year}.")
-            exc.add_note(INVALID_YEAR)
-            exc.add_note(str(int(year)))
-            raise
-
-        else:  # pragma nocover
-            raise
+        _note_integrity_error(exc, title=title, year=year)
+        raise
 
 
+@instrumentation.instrument
 def delete_movie(*, movie_bag: MovieBag):
     """Deletes a movie.
 
@@ -330,7 +836,7 @@ def delete_movie(*, movie_bag: MovieBag):
     Raises:
 
     """
-    with session_factory() as session:
+    with _session() as session:
         try:
             movie = _select_movie(session, movie_bag=movie_bag)
         except NoResultFound:
@@ -344,9 +850,10 @@ def delete_movie(*, movie_bag: MovieBag):
             _delete_movie(session, movie=movie)
 
         _delete_orphans(session, candidates=candidate_orphans)
-        session.commit()
+        _commit(session)
 
 
+@instrumentation.instrument
 def delete_all_orphans():
     """Deletes all orphans.
 
@@ -355,7 +862,7 @@ def delete_all_orphans():
         handling orphan people. This function should be run at program
         termination to delete any orphans created in ths manner.
     """
-    with session_factory() as session:
+    with _session() as session:
         all_people = _select_all_people(session)
         count = _delete_orphans(session, candidates=all_people)
         if count:  # pragma no branch
@@ -363,16 +870,18 @@ def delete_all_orphans():
                 f"{count} Orphan(s) were removed. "
                 f"They should have been removed before now."
             )
-        session.commit()
+        _commit(session)
 
 
+@instrumentation.instrument
 def select_all_tags() -> set[str]:
     """Returns a list of all tag texts."""
-    with session_factory() as session:
+    with _session() as session:
         tags = _select_all_tags(session)
     return {tag.text for tag in tags}  # pragma no branch
 
 
+@instrumentation.instrument
 def match_tags(*, match: str) -> set[str]:
     """Returns tag texts which match the substring.
 
@@ -382,11 +891,12 @@ def match_tags(*, match: str) -> set[str]:
     Returns:
         A set of compliant tag texts.
     """
-    with session_factory() as session:
+    with _session() as session:
         tags = _match_tags(session, match=match)
     return {tag.text for tag in tags}  # pragma no branch
 
 
+@instrumentation.instrument
 def add_tag(*, tag_text: str):
     """Adds a tag.
 
@@ -394,14 +904,15 @@ def add_tag(*, tag_text: str):
         tag_text:
     """
     try:
-        with session_factory() as session:
+        with _session() as session:
             _add_tag(session, text=tag_text)
-            session.commit()
+            _commit(session)
     except IntegrityError:
         # Identical tags are silently suppressed.
         pass
 
 
+@instrumentation.instrument
 def add_tags(*, tag_texts: set[str]):
     """Adds a list of tags.
 
@@ -409,14 +920,15 @@ def add_tags(*, tag_texts: set[str]):
         tag_texts:
     """
     try:
-        with session_factory() as session:
+        with _session() as session:
             _add_tags(session, texts=tag_texts)
-            session.commit()
+            _commit(session)
     except IntegrityError:
         # Identical tags are silently suppressed.
         pass
 
 
+@instrumentation.instrument
 def edit_tag(*, old_tag_text: str, new_tag_text: str):
     """This function edits the text of an existing tag.
 
@@ -440,7 +952,7 @@ def edit_tag(*, old_tag_text: str, new_tag_text: str):
             new tag text.
     """
     try:
-        with session_factory() as session:
+        with _session() as session:
             try:
                 tag = _select_tag(session, text=old_tag_text)
             except NoResultFound as exc:
@@ -450,7 +962,7 @@ def edit_tag(*, old_tag_text: str, new_tag_text: str):
                 raise
             else:
                 _edit_tag(tag=tag, replacement_text=new_tag_text)
-            session.commit()
+            _commit(session)
 
     except IntegrityError as exc:
         logging.error(TAG_EXISTS, new_tag_text)
@@ -459,6 +971,7 @@ def edit_tag(*, old_tag_text: str, new_tag_text: str):
         raise
 
 
+@instrumentation.instrument
 def delete_tag(*, tag_text: str):
     """Delete a tag.
 
@@ -467,14 +980,109 @@ def delete_tag(*, tag_text: str):
     Args:
         tag_text:
     """
-    with session_factory() as session:
+    with _session() as session:
         try:
             tag = _select_tag(session, text=tag_text)
         except NoResultFound:
             pass
         else:
             _delete_tag(session, tag=tag)
-        session.commit()
+        _commit(session)
+
+
+@instrumentation.instrument
+def tag_movies(*, match: MovieBag, tag_text: str) -> int:
+    """Adds a tag to every movie which matches.
+
+    The links are added by one INSERT ... SELECT. Movies which already have
+    the tag are skipped.
+
+    Args:
+        match: See match_movies. An empty match tags no movies.
+        tag_text:
+
+    Returns:
+        The number of movies tagged.
+
+    Raises and logs:
+        A NoResultFound exception will be raised if the tag was not
+        found. The added note list will contain:
+            TAG_NOT_FOUND literal,
+            tag text.
+    """
+    intersection = _match_statement(match=match)
+    with _session() as session:
+        tag = _find_tag(session, text=tag_text)
+        if intersection is None:
+            return 0
+        movie_ids = select(intersection.subquery().c.id)
+        count = _tag_movies(session, movie_ids=movie_ids, tag_id=tag.id)
+        _commit(session)
+    return count
+
+
+@instrumentation.instrument
+def untag_movies(*, match: MovieBag, tag_text: str) -> int:
+    """Removes a tag from every movie which matches.
+
+    The links are removed by one DELETE.
+
+    Args:
+        match: See match_movies. An empty match untags no movies.
+        tag_text:
+
+    Returns:
+        The number of movies untagged.
+
+    Raises and logs:
+        A NoResultFound exception will be raised if the tag was not
+        found. The added note list will contain:
+            TAG_NOT_FOUND literal,
+            tag text.
+    """
+    intersection = _match_statement(match=match)
+    with _session() as session:
+        tag = _find_tag(session, text=tag_text)
+        if intersection is None:
+            return 0
+        movie_ids = select(intersection.subquery().c.id)
+        count = _untag_movies(session, movie_ids=movie_ids, tag_id=tag.id)
+        _commit(session)
+    return count
+
+
+@instrumentation.instrument
+def merge_tags(*, old_tag_text: str, new_tag_text: str) -> int:
+    """Merges one tag into another.
+
+    Every movie with the old tag is given the new tag by one INSERT ...
+    SELECT. The old tag and its links are then deleted.
+
+    Args:
+        old_tag_text: The tag which is merged and deleted.
+        new_tag_text: The tag which is kept.
+
+    Returns:
+        The number of movies which had the old tag.
+
+    Raises and logs:
+        A NoResultFound exception will be raised if either tag was not
+        found. The added note list will contain:
+            TAG_NOT_FOUND literal,
+            tag text.
+    """
+    with _session() as session:
+        old_tag = _find_tag(session, text=old_tag_text)
+        new_tag = _find_tag(session, text=new_tag_text)
+        if old_tag is new_tag:
+            return 0
+        link = schema.movie_tag_table
+        movie_ids = select(link.c.movie_id).where(link.c.tag_id == old_tag.id)
+        _tag_movies(session, movie_ids=movie_ids, tag_id=new_tag.id)
+        count = _untag_movies(session, movie_ids=movie_ids, tag_id=old_tag.id)
+        _delete_tag(session, tag=old_tag)
+        _commit(session)
+    return count
 
 
 def _select_movie(session: Session, *, movie_bag: MovieBag) -> schema.Movie:
@@ -499,14 +1107,284 @@ def _select_movie(session: Session, *, movie_bag: MovieBag) -> schema.Movie:
         NoResultFound
         MultipleResultsFound
     """
+    parameters = dict(title=movie_bag["title"], year=int(movie_bag["year"]))
+    movie = session.scalars(_SELECT_MOVIE, parameters).one()
+    return movie
+
+
+def _select_movie_by_id(session: Session, *, movie_id: int) -> schema.Movie:
+    """Returns the ORM movie with a primary key.
+
+    Args:
+        session:
+        movie_id:
+
+    Raises and logs:
+        NoResultFound. The added note list will contain:
+            MOVIE_NOT_FOUND literal,
+            movie id.
+    """
+    movie = session.get(schema.Movie, movie_id)
+    if movie is None:
+        logging.error(f"{MOVIE_NOT_FOUND} id={movie_id}.")
+        exc = NoResultFound(MOVIE_NOT_FOUND)
+        exc.add_note(MOVIE_NOT_FOUND)
+        exc.add_note(str(movie_id))
+        raise exc
+    return movie
+
+
+def _note_integrity_error(exc: IntegrityError, *, title: str, year: MovieInteger):
+    """Logs an edited movie's integrity error and adds notes to it.
+
+    Args:
+        exc:
+        title: The movie's new title.
+        year: The movie's new year.
+    """
+    if "UNIQUE constraint failed: movie.title, movie.year" in exc.args[0]:
+        logging.error(f"{MOVIE_EXISTS} {title}, {year}.")
+        exc.add_note(MOVIE_EXISTS)
+        exc.add_note(title)
+        exc.add_note(str(int(year)))
+
+    elif "CHECK constraint failed: year" in exc.args[0]:
+        logging.error(f"{INVALID_YEAR} {year}.")
+        exc.add_note(INVALID_YEAR)
+        exc.add_note(str(int(year)))
+
+
+def _cache_movie_bags(movie_bags: list[MovieBag]):
+    """Holds movie bags for select_movie_by_id.
+
+    The oldest movies are discarded when the cache is full. Movies read
+    within a unit of work are not held as the unit may yet be rolled back.
+
+    Args:
+        movie_bags: Fully populated movie bags.
+    """
+    if _unit_session.get():
+        return
+    bind = session_factory.kw["bind"]
+    now = time.monotonic()
+    with _identity_cache_lock:
+        for movie_bag in movie_bags:
+            key = (bind, movie_bag["id"])
+            _identity_cache.pop(key, None)
+            _identity_cache[key] = (now, movie_bag)
+        while len(_identity_cache) > IDENTITY_CACHE_SIZE:
+            del _identity_cache[next(iter(_identity_cache))]
+
+
+def _cached_match(key: tuple) -> list[MovieBag] | None:
+    """Returns copies of the movie bags of a cached search or None.
+
+    None is returned within a unit of work as the unit may have changed the
+    movies.
+
+    Args:
+        key: The engine and the criteria fingerprint.
+    """
+    global _match_cache_hits, _match_cache_misses
+    if _unit_session.get():
+        return None
+    with _match_cache_lock:
+        movie_bags = _match_cache.get(key)
+        if movie_bags is None:
+            _match_cache_misses += 1
+            return None
+        _match_cache.move_to_end(key)
+        _match_cache_hits += 1
+    return [_copy_movie_bag(movie_bag) for movie_bag in movie_bags]
+
+
+def _cache_match(key: tuple, generation: int, movie_bags: list[MovieBag]):
+    """Holds copies of a search's movie bags for match_movies.
+
+    The search is not held if a commit changed the catalogue while it ran,
+    if it ran within a unit of work, or if it is larger than
+    MATCH_CACHE_BYTES. The least recently used searches are discarded when
+    the cache has more than MATCH_CACHE_SIZE searches or MATCH_CACHE_BYTES.
+
+    Args:
+        key: The engine and the criteria fingerprint.
+        generation: The write generation when the search started.
+        movie_bags:
+    """
+    global _match_cache_bytes, _match_cache_evictions
+    size = _estimated_size(movie_bags)
+    if _unit_session.get() or size > MATCH_CACHE_BYTES:
+        return
+    copies = [_copy_movie_bag(movie_bag) for movie_bag in movie_bags]
+    with _match_cache_lock:
+        if generation != _write_generation:
+            return
+        if key in _match_cache:
+            _match_cache_bytes -= _estimated_size(_match_cache.pop(key))
+        _match_cache[key] = copies
+        _match_cache_bytes += size
+        while (
+            len(_match_cache) > MATCH_CACHE_SIZE
+            or _match_cache_bytes > MATCH_CACHE_BYTES
+        ):
+            _, evicted = _match_cache.popitem(last=False)
+            _match_cache_bytes -= _estimated_size(evicted)
+            _match_cache_evictions += 1
+
+
+def _advance_write_generation():
+    """Discards every cached search and stops running searches being cached.
+
+    The caller must hold _match_cache_lock.
+    """
+    global _match_cache_bytes, _write_generation
+    _write_generation += 1
+    _match_cache.clear()
+    _match_cache_bytes = 0
+
+
+def _estimated_size(movie_bags: list[MovieBag]) -> int:
+    """Returns a rough size in bytes of some movie bags.
+
+    Args:
+        movie_bags:
+    """
+    size = _MOVIE_BAG_BYTES * len(movie_bags)
+    for movie_bag in movie_bags:
+        for value in movie_bag.values():
+            if isinstance(value, str):
+                size += len(value)
+            elif type(value) is set:
+                size += sum(map(len, value))
+    return size
+
+
+def _cached_movie_bag(movie_id: int) -> MovieBag | None:
+    """Returns a copy of a recently read movie or None.
+
+    None is returned within a unit of work as the unit may have changed the
+    movie.
+
+    Args:
+        movie_id:
+    """
+    if _unit_session.get():
+        return None
+    key = (session_factory.kw["bind"], movie_id)
+    with _identity_cache_lock:
+        cached = _identity_cache.get(key)
+        if cached is None:
+            return None
+        created, movie_bag = cached
+        if time.monotonic() - created > IDENTITY_CACHE_SECONDS:
+            del _identity_cache[key]
+            return None
+    return _copy_movie_bag(movie_bag)
+
+
+def _copy_movie_bag(movie_bag: MovieBag) -> MovieBag:
+    """Returns a copy of a movie bag whose sets may be changed safely.
+
+    MovieIntegers are shared as they are not changed once made.
+    """
     # noinspection PyTypeChecker
-    statement = (
-        select(schema.Movie)
-        .where(schema.Movie.title == movie_bag["title"])
-        .where(schema.Movie.year == int(movie_bag["year"]))
+    return MovieBag(
+        **{
+            key: set(value) if type(value) is set else value
+            for key, value in movie_bag.items()
+        }
     )
-    movie = session.scalars(statement).one()
-    return movie
+
+
+class _TransactionChanges:
+    """The changes noted within a root transaction or a savepoint."""
+
+    def __init__(self, transaction: SessionTransaction):
+        self.transaction = transaction
+        self.committed = False
+        self.changes: dict[str, list] = {}
+
+
+def _pending_changes(session: Session, key: str) -> list:
+    """Returns the list of changes noted under key by the session's innermost
+    transaction, which must have begun.
+
+    A savepoint's changes are passed to the enclosing transaction when the
+    savepoint is released and discarded when it is rolled back. When the
+    outermost transaction commits, the changes are passed to the handler
+    registered for key by _on_commit. SQLAlchemy's after_commit and
+    after_rollback events are also fired by savepoints, so they cannot be
+    used for this directly.
+    """
+    return session.info[_TRANSACTIONS_KEY][-1].changes.setdefault(key, [])
+
+
+def _on_commit(key: str) -> Callable:
+    """Registers the decorated function as the handler of the changes noted
+    under key.
+
+    The handler is called with the session and the list of changes after the
+    outermost transaction commits.
+    """
+
+    def decorator(handler: Callable[[Session, list], None]):
+        _commit_handlers[key] = handler
+        return handler
+
+    return decorator
+
+
+@event.listens_for(Session, "after_transaction_create")
+def _begin_changes(session: Session, transaction: SessionTransaction):
+    """Starts a list of changes for a root transaction or a savepoint."""
+    if transaction.nested or transaction.parent is None:
+        session.info.setdefault(_TRANSACTIONS_KEY, []).append(
+            _TransactionChanges(transaction)
+        )
+
+
+@event.listens_for(Session, "after_commit")
+def _mark_changes_committed(session: Session):
+    """Marks the changes of the committed transaction or released savepoint."""
+    if transactions := session.info.get(_TRANSACTIONS_KEY):
+        transactions[-1].committed = True
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _end_changes(session: Session, transaction: SessionTransaction):
+    """Passes on or discards the changes of a transaction which has ended."""
+    transactions = session.info.get(_TRANSACTIONS_KEY)
+    if not transactions or transactions[-1].transaction is not transaction:
+        return
+    ended = transactions.pop()
+    if not ended.committed:
+        return
+    if transactions:
+        for key, changes in ended.changes.items():
+            transactions[-1].changes.setdefault(key, []).extend(changes)
+    else:
+        for key, changes in ended.changes.items():
+            if changes:
+                _commit_handlers[key](session, changes)
+
+
+@event.listens_for(Session, "after_flush")
+def _note_identity_changes(session: Session, _flush_context):
+    """Notes whether a flush changed a movie, a person, or a tag."""
+    if any(
+        isinstance(instance, (schema.Movie, schema.Person, schema.Tag))
+        for instance in session.new | session.dirty | session.deleted
+    ):
+        _pending_changes(session, _IDENTITY_CHANGED_KEY).append(True)
+
+
+@_on_commit(_IDENTITY_CHANGED_KEY)
+def _clear_identity_cache(_session: Session, _changes: list):
+    """Clears the identity cache and the match cache after a commit which
+    changed a movie, a person, or a tag."""
+    clear_identity_cache()
+    with _match_cache_lock:
+        _advance_write_generation()
 
 
 def _select_all_movies(session: Session) -> set[schema.Movie]:
@@ -555,73 +1433,336 @@ def _match_movies(session: Session, *, match: MovieBag) -> set[schema.Movie] | N
     Returns:
         The intersection of the ORM movies selected by each field's search criteria.
     """
-    statements = []
+    shape, parameters = _match_parameters(match=match)
+    if shape:
+        statement = _match_movies_template(shape)
+        matches = session.scalars(statement, parameters).all()
+        return set(matches)
+    else:
+        return None
+
+
+def _match_statement(*, match: MovieBag) -> CompoundSelect | None:
+    """Returns the intersection statement for the match criteria.
+
+    See _match_movies for the match patterns.
+
+    Args:
+        match:
+
+    Returns:
+        An intersection of movie selects or None if there are no criteria.
+    """
+    shape, parameters = _match_parameters(match=match)
+    if shape:
+        return _match_template(shape).params(parameters)
+    else:
+        return None
+
+
+def _match_parameters(*, match: MovieBag) -> tuple[tuple, dict]:
+    """Returns the shape of the match criteria and their bound parameters.
+
+    Criteria which differ only in their values have the same shape and so
+    share a statement template.
+
+    Args:
+        match: See _match_movies.
+
+    Returns:
+        A tuple of (column, detail) pairs in match order and a dict of
+        parameter values. The detail of a set column is the number of items.
+        The detail of an integer column is a tuple which is True for each
+        interval of a single integer.
+    """
+    shape = []
+    parameters = {}
     for column, criteria in match.items():
         match column:
-            case "notes":
-                statements.append(
-                    select(schema.Movie).where(schema.Movie.notes.like(f"%{criteria}%"))
-                )
-            case "title":
-                statements.append(
-                    select(schema.Movie).where(schema.Movie.title.like(f"%{criteria}%"))
-                )
-            case "year":
-                statements.append(
-                    select(schema.Movie).where(schema.Movie.year.in_(list(criteria)))
-                )
-            case "duration":
-                statements.append(
-                    select(schema.Movie).where(
-                        schema.Movie.duration.in_(list(criteria))
-                    )
-                )
-            case "synopsis":
+            case "notes" | "title" | "synopsis":
+                shape.append((column, 1))
+                parameters[f"{column}_0"] = f"%{criteria}%"
+            case "year" | "duration":
+                intervals = criteria.intervals
+                shape.append((column, tuple(low == high for low, high in intervals)))
+                for ix, (low, high) in enumerate(intervals):
+                    parameters[f"{column}_{ix}_low"] = low
+                    parameters[f"{column}_{ix}_high"] = high
+            case "stars" | "directors" | "tags" if criteria:
+                shape.append((column, len(criteria)))
+                for ix, item in enumerate(criteria):
+                    parameters[f"{column}_{ix}"] = f"%{item}%"
+    return tuple(shape), parameters
+
+
+@functools.lru_cache(maxsize=MATCH_TEMPLATES)
+def _match_template(shape: tuple) -> CompoundSelect:
+    """Returns the intersection of movie selects for a shape of criteria.
+
+    The values are unbound parameters named as in _match_parameters.
+
+    Args:
+        shape: See _match_parameters. It must not be empty.
+    """
+    statements = []
+    for column, detail in shape:
+        match column:
+            case "notes" | "title" | "synopsis":
+                attribute = getattr(schema.Movie, column)
                 statements.append(
-                    select(schema.Movie).where(
-                        schema.Movie.synopsis.like(f"%{criteria}%")
-                    )
+                    select(schema.Movie).where(attribute.like(bindparam(f"{column}_0")))
                 )
-            case "stars":
-                for star in criteria:
-                    statements.append(
-                        (
-                            select(schema.Movie)
-                            .select_from(schema.Movie)
-                            .join(schema.Movie.stars)
-                            .where(schema.Person.name.like(f"%{star}%"))
+            case "year" | "duration":
+                attribute = getattr(schema.Movie, column)
+                clauses = [  # pragma no branch
+                    (
+                        attribute == bindparam(f"{column}_{ix}_low")
+                        if single
+                        else attribute.between(
+                            bindparam(f"{column}_{ix}_low"),
+                            bindparam(f"{column}_{ix}_high"),
                         )
                     )
-            case "directors":
-                for director in criteria:
+                    for ix, single in enumerate(detail)
+                ]
+                statements.append(select(schema.Movie).where(or_(*clauses)))
+            case "stars" | "directors" | "tags":
+                relationship = getattr(schema.Movie, column)
+                text = schema.Tag.text if column == "tags" else schema.Person.name
+                for ix in range(detail):
                     statements.append(
-                        (
-                            select(schema.Movie)
-                            .select_from(schema.Movie)
-                            .join(schema.Movie.directors)
-                            .where(schema.Person.name.like(f"%{director}%"))
-                        )
-                    )
-            case "tags":
-                for movie_tag in criteria:
-                    statements.append(
-                        (
-                            select(schema.Movie)
-                            .select_from(schema.Movie)
-                            .join(schema.Movie.tags)
-                            .where(schema.Tag.text.like(f"%{movie_tag}%"))
-                        )
+                        select(schema.Movie)
+                        .select_from(schema.Movie)
+                        .join(relationship)
+                        .where(text.like(bindparam(f"{column}_{ix}")))
                     )
+    return intersect(*statements)
 
-    if statements:
-        # https://docs.sqlalchemy.org/en/20/orm/queryguide
-        # /select.html#selecting-entities-from-subqueries
-        intersection = intersect(*statements)
-        statement = select(schema.Movie).from_statement(intersection)
-        matches = session.scalars(statement).all()
-        return set(matches)
-    else:
-        return None
+
+@functools.lru_cache(maxsize=MATCH_TEMPLATES)
+def _match_movies_template(shape: tuple) -> Select:
+    """Returns an ORM movie select from the intersection for a shape of
+    criteria.
+
+    Args:
+        shape: See _match_parameters. It must not be empty.
+    """
+    # https://docs.sqlalchemy.org/en/20/orm/queryguide
+    # /select.html#selecting-entities-from-subqueries
+    return select(schema.Movie).from_statement(_match_template(shape))
+
+
+def _criteria_fingerprint(match: MovieBag) -> tuple:
+    """Returns a hashable key which is equal for equal match criteria.
+
+    Texts differing only in the case of ASCII letters are equal as they are
+    matched by SQLite's LIKE, which ignores that case.
+
+    Args:
+        match: See _match_movies.
+    """
+    return tuple(
+        sorted((column, _normalised(criteria)) for column, criteria in match.items())
+    )
+
+
+def _normalised(criteria: str | set) -> str | tuple:
+    """Returns a hashable form of a criterion with ASCII letters in lower case.
+
+    A MovieInteger is keyed by its intervals as a wide range holds too many
+    integers to list.
+
+    Args:
+        criteria: A text, a set of texts, or a MovieInteger.
+    """
+    if isinstance(criteria, MovieInteger):
+        return "MovieInteger", tuple(criteria.intervals)
+    if isinstance(criteria, set):
+        return tuple(
+            sorted(
+                _normalised(value) if isinstance(value, str) else value
+                for value in criteria
+            )
+        )
+    return str(criteria).translate(_ASCII_LOWER)
+
+
+def _facet_counts(
+    session: Session, *, movie_ids: Select | None, top_directors: int
+) -> Facets:
+    """Counts movies per tag, decade, and director.
+
+    Args:
+        session:
+        movie_ids: A select of the ids of the movies to be counted. None
+            counts every movie.
+        top_directors: The number of directors returned.
+    """
+
+    def restrict(statement: Select, column: Column) -> Select:
+        if movie_ids is None:
+            return statement
+        return statement.where(column.in_(movie_ids))
+
+    total = session.scalar(
+        restrict(select(func.count(schema.Movie.id)), schema.Movie.id)
+    )
+
+    count = func.count().label("count")
+    tag_table = schema.movie_tag_table
+    tags = session.execute(
+        restrict(
+            select(schema.Tag.text, count)
+            .join(tag_table, tag_table.c.tag_id == schema.Tag.id)
+            .group_by(schema.Tag.text)
+            .order_by(count.desc(), schema.Tag.text),
+            tag_table.c.movie_id,
+        )
+    ).all()
+
+    decade = (schema.Movie.year // 10 * 10).label("decade")
+    decades = session.execute(
+        restrict(
+            select(decade, count).group_by(decade).order_by(decade),
+            schema.Movie.id,
+        )
+    ).all()
+
+    director_table = schema.movie_director_table
+    directors = session.execute(
+        restrict(
+            select(schema.Person.name, count)
+            .join(director_table, director_table.c.person_id == schema.Person.id)
+            .group_by(schema.Person.id)
+            .order_by(count.desc(), schema.Person.name)
+            .limit(top_directors),
+            director_table.c.movie_id,
+        )
+    ).all()
+
+    return Facets(
+        total=total,
+        tags=[tuple(row) for row in tags],
+        decades=[tuple(row) for row in decades],
+        directors=[tuple(row) for row in directors],
+    )
+
+
+def _select_result_set(session: Session, *, movie_ids: Select) -> MovieResultSet:
+    """Selects movies into a compact result set.
+
+    The movie columns are read with one query and the names of directors, stars,
+    and tags with one query each.
+
+    Args:
+        session:
+        movie_ids: A select of the ids of the required movies.
+
+    Returns:
+        A result set in movie id order.
+    """
+    movie = schema.Movie
+    directors = _select_related_texts(
+        session,
+        secondary=schema.movie_director_table.c.person_id,
+        text=schema.Person.name,
+        movie_ids=movie_ids,
+    )
+    stars = _select_related_texts(
+        session,
+        secondary=schema.movie_star_table.c.person_id,
+        text=schema.Person.name,
+        movie_ids=movie_ids,
+    )
+    tags = _select_related_texts(
+        session,
+        secondary=schema.movie_tag_table.c.tag_id,
+        text=schema.Tag.text,
+        movie_ids=movie_ids,
+    )
+
+    statement = (
+        select(
+            movie.id,
+            movie.created,
+            movie.updated,
+            movie.title,
+            movie.year,
+            movie.duration,
+            movie.synopsis,
+            movie.notes,
+        )
+        .where(movie.id.in_(movie_ids))
+        .order_by(movie.id)
+    )
+    results = MovieResultSet()
+    for row in session.execute(statement):
+        results.append(
+            MovieBag(
+                id=row.id,
+                created=row.created,
+                updated=row.updated,
+                title=row.title,
+                year=row.year,
+                duration=row.duration,
+                synopsis=row.synopsis,
+                notes=row.notes,
+                directors=directors.get(row.id),
+                stars=stars.get(row.id),
+                tags=tags.get(row.id),
+            )
+        )
+    return results
+
+
+def _movie_summary(movie: MovieBag) -> MovieSummary:
+    """Returns the summary of a movie.
+
+    Args:
+        movie: A row of a MovieResultSet.
+    """
+    return MovieSummary(
+        int(movie["id"]),
+        movie["title"],
+        int(movie["year"]),
+        movie.get("duration") and int(movie["duration"]),
+        movie.get("synopsis"),
+        setstr_to_str(movie.get("directors")),
+        setstr_to_str(movie.get("stars")),
+    )
+
+
+def _select_related_texts(
+    session: Session,
+    *,
+    secondary: Column,
+    text: InstrumentedAttribute,
+    movie_ids: Select | list[int],
+) -> dict[int, list[str]]:
+    """Returns the names or texts related to each movie through an association
+    table.
+
+    Args:
+        session:
+        secondary: The association table column which refers to the related
+            table. For example, movie_director_table.c.person_id.
+        text: The related column. For example, Person.name.
+        movie_ids: A select or a list of the ids of the required movies.
+
+    Returns:
+        Lists of related texts indexed by movie id.
+    """
+    movie_id = secondary.table.c.movie_id
+    related_id = text.class_.id
+    statement = (
+        select(movie_id, text)
+        .join(text.class_, related_id == secondary)
+        .where(movie_id.in_(movie_ids))
+    )
+    texts = {}
+    for movie_id_, text_ in session.execute(statement):
+        texts.setdefault(movie_id_, []).append(text_)
+    return texts
 
 
 def _add_movie(*, movie_bag: MovieBag) -> schema.Movie:
@@ -708,6 +1849,7 @@ def _delete_movie(session: Session, *, movie: schema.Movie):
     session.delete(movie)
 
 
+@instrumentation.conversion
 def _convert_to_movie_bag(movie: schema.Movie) -> MovieBag:
     """Converts a Movie object into a movie_bag.
 
@@ -754,9 +1896,7 @@ def _select_person(session: Session, *, name: str) -> schema.Person:
         NoResultFound
         MultipleResultsFound
     """
-    # noinspection PyTypeChecker
-    statement = select(schema.Person).where(schema.Person.name == name)
-    return session.scalars(statement).one()
+    return session.scalars(_SELECT_PERSON, dict(name=name)).one()
 
 
 def _select_people(session: Session, *, names: set[str]) -> set[schema.Person]:
@@ -834,6 +1974,66 @@ def _update_movie_relationships(
     _getadd_stars(movie, movie_bag, session)
 
 
+def _edit_movie_relationships(
+    session: Session, *, movie: schema.Movie, edit_fields: MovieBag
+) -> set[schema.Person]:
+    """Adds and removes only the changed directors, stars, and tags.
+
+    A relationship whose field is not in edit_fields is neither loaded nor
+    changed. Added names are selected with one query per relationship and
+    new people are added to the person table.
+
+    Args:
+        session:
+        movie:
+        edit_fields: None or an empty set removes every name.
+
+    Returns:
+        The people who were removed from the movie. They may be orphans.
+
+    Raises:
+        A NoResultFound exception will be logged and raised if a tag was not
+        found. The added note list will contain:
+            TAG_NOT_FOUND literal,
+            tag text.
+    """
+    if "tags" in edit_fields:
+        texts = edit_fields["tags"] or set()
+        # noinspection PyUnresolvedReferences
+        current = {tag.text: tag for tag in movie.tags}
+        for text in current.keys() - texts:
+            movie.tags.remove(current[text])
+        if added := texts - current.keys():
+            tags = {tag.text: tag for tag in _select_tags(session, texts=added)}
+            if missing := added - tags.keys():
+                tag_text = min(missing)
+                logging.error(f"{TAG_NOT_FOUND}: {tag_text}")
+                exc = NoResultFound(TAG_NOT_FOUND)
+                exc.add_note(TAG_NOT_FOUND)
+                exc.add_note(tag_text)
+                raise exc
+            movie.tags.update(tags.values())
+
+    removed_people = set()
+    for field_name in ("directors", "stars"):
+        if field_name not in edit_fields:
+            continue
+        names = edit_fields[field_name] or set()
+        people = getattr(movie, field_name)
+        current = {person.name: person for person in people}
+        for name in current.keys() - names:
+            people.remove(current[name])
+            removed_people.add(current[name])
+        if added := names - current.keys():
+            found = {
+                person.name: person for person in _select_people(session, names=added)
+            }
+            people.update(found.values())
+            for name in added - found.keys():
+                people.add(_add_person(session, name=name))
+    return removed_people
+
+
 def _add_tags_to_movie(
     movie: schema.Movie,
     movie_bag: MovieBag,
@@ -961,9 +2161,18 @@ def _select_tag(session: Session, *, text: str) -> schema.Tag:
         NoResultFound
         MultipleResultsFound
     """
-    # noinspection PyTypeChecker
-    statement = select(schema.Tag).where(schema.Tag.text == text)
-    return session.scalars(statement).one()
+    return session.scalars(_SELECT_TAG, dict(text=text)).one()
+
+
+def _select_tags(session: Session, *, texts: set[str]) -> set[schema.Tag]:
+    """Selects and returns a set of ORM Tags matching the texts.
+
+    Args:
+        session: The current session.
+        texts: Full tag texts.
+    """
+    statement = select(schema.Tag).where(schema.Tag.text.in_(list(texts)))
+    return set(session.scalars(statement).all())
 
 
 def _match_tags(session: Session, *, match: str) -> set[schema.Tag]:
@@ -1027,3 +2236,75 @@ def _delete_tag(session: Session, *, tag: schema.Tag):
         tag:
     """
     session.delete(tag)
+
+
+def _find_tag(session: Session, *, text: str) -> schema.Tag:
+    """Selects and returns a single ORM Tag which must be present.
+
+    Args:
+        session:
+        text:
+
+    Raises and logs:
+        A NoResultFound exception will be raised if the tag was not
+        found. The added note list will contain:
+            TAG_NOT_FOUND literal,
+            tag text.
+    """
+    try:
+        return _select_tag(session, text=text)
+    except NoResultFound as exc:
+        logging.error(f"{TAG_NOT_FOUND}: {text}")
+        exc.add_note(TAG_NOT_FOUND)
+        exc.add_note(text)
+        raise
+
+
+def _tag_movies(session: Session, *, movie_ids: Select, tag_id: int) -> int:
+    """Links a tag to movies which do not already have it.
+
+    The statement is Core so no ORM movies are loaded. Session events do not
+    see it so the identity cache is marked for clearing on commit.
+
+    Args:
+        session:
+        movie_ids: A select of movie ids.
+        tag_id:
+
+    Returns:
+        The number of links added.
+    """
+    link = schema.movie_tag_table
+    statement = insert(link).from_select(
+        ["movie_id", "tag_id"],
+        select(schema.Movie.id, literal(tag_id))
+        .where(schema.Movie.id.in_(movie_ids))
+        .where(
+            ~exists().where(link.c.movie_id == schema.Movie.id, link.c.tag_id == tag_id)
+        ),
+    )
+    rowcount = session.execute(statement).rowcount
+    _pending_changes(session, _IDENTITY_CHANGED_KEY).append(True)
+    return rowcount
+
+
+def _untag_movies(session: Session, *, movie_ids: Select, tag_id: int) -> int:
+    """Unlinks a tag from movies.
+
+    See _tag_movies.
+
+    Args:
+        session:
+        movie_ids: A select of movie ids.
+        tag_id:
+
+    Returns:
+        The number of links deleted.
+    """
+    link = schema.movie_tag_table
+    statement = delete(link).where(
+        link.c.tag_id == tag_id, link.c.movie_id.in_(movie_ids)
+    )
+    rowcount = session.execute(statement).rowcount
+    _pending_changes(session, _IDENTITY_CHANGED_KEY).append(True)
+    return rowcount
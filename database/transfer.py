@@ -0,0 +1,459 @@
+"""Streaming export and import of the movie catalogue.
+
+The whole catalogue, movies with their directors, stars, and tags, is written
+to or read from JSON Lines or CSV text. Both directions work in chunks of
+movies so memory use does not grow with the size of the catalogue.
+
+JSON Lines: One JSON object per movie. Optional fields without a value are
+    omitted. People and tags are lists of strings.
+CSV: A header row of FIELDNAMES then one row per movie. Optional fields without
+    a value are empty. People and tags are joined with LIST_DELIMITER.
+"""
+
+#  Copyright© 2026. Stephen Rigden.
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import csv
+import itertools
+import json
+import logging
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from typing import TextIO
+
+from sqlalchemy import bindparam, insert, select, Table
+from sqlalchemy.orm import Session
+
+from database import livesearch, schema, similarity, tables
+from moviebag import MovieBag, MovieInteger
+
+CHUNK_SIZE = 1000
+FORMATS = ("jsonl", "csv")
+FIELDNAMES = (
+    "title",
+    "year",
+    "duration",
+    "directors",
+    "stars",
+    "synopsis",
+    "notes",
+    "tags",
+)
+LIST_FIELDS = ("directors", "stars", "tags")
+LIST_DELIMITER = "; "
+UNKNOWN_FORMAT = "The transfer format is not recognized."
+INVALID_ROW = "The row could not be read."
+MISSING_TITLE = "The title is missing."
+IMPORT_SUMMARY = "Catalogue import finished."
+
+
+class UnknownFormat(Exception):
+    """The transfer format is not one of FORMATS."""
+
+
+@dataclass
+class RowError:
+    """A row which could not be imported.
+
+    Attributes:
+        line: The row's line number in the source. The CSV header is line 1.
+        reason: One of the module's message literals or tables.MOVIE_EXISTS or
+            tables.INVALID_YEAR.
+        detail: Further information such as the title and year.
+    """
+
+    line: int
+    reason: str
+    detail: str = ""
+
+
+@dataclass
+class ImportReport:
+    """The outcome of an import."""
+
+    added: int = 0
+    errors: list[RowError] = field(default_factory=list)
+
+
+def iter_movies(*, chunk_size: int = CHUNK_SIZE) -> Iterator[MovieBag]:
+    """Yields every movie in id order.
+
+    Each chunk of movies is read by its own short session which pages on the
+    movie id. The directors, stars, and tags of the chunk are read with one
+    query each. No connection is held while the chunk is consumed, so a slow
+    consumer such as a server client cannot tie up the connection pool.
+
+    Args:
+        chunk_size: The number of movies read at a time.
+    """
+    movie = schema.Movie
+    statement = (
+        select(
+            movie.id,
+            movie.title,
+            movie.year,
+            movie.duration,
+            movie.synopsis,
+            movie.notes,
+        )
+        .where(movie.id > bindparam("last_id"))
+        .order_by(movie.id)
+        .limit(chunk_size)
+    )
+    last_id = 0
+    while True:
+        with tables.session_factory() as session:
+            partition = session.execute(statement, dict(last_id=last_id)).all()
+            if not partition:
+                return
+            movie_ids = [row.id for row in partition]
+            related = _select_chunk_related(session, movie_ids=movie_ids)
+        last_id = movie_ids[-1]
+        for row in partition:
+            movie_bag = MovieBag(title=row.title, year=MovieInteger(row.year))
+            if row.duration:
+                movie_bag["duration"] = MovieInteger(row.duration)
+            if row.synopsis:
+                movie_bag["synopsis"] = row.synopsis
+            if row.notes:
+                movie_bag["notes"] = row.notes
+            for key, texts in related.items():
+                if row.id in texts:
+                    movie_bag[key] = set(texts[row.id])
+            yield movie_bag
+
+
+def export_movies(fp: TextIO, *, fmt: str = "jsonl", chunk_size=CHUNK_SIZE) -> int:
+    """Writes the catalogue to a text file.
+
+    Args:
+        fp: A text file open for writing. CSV files should be opened with
+            newline="".
+        fmt: One of FORMATS.
+        chunk_size: The number of movies read at a time.
+
+    Returns:
+        The number of movies written.
+
+    Raises:
+        UnknownFormat
+    """
+    movies = iter_movies(chunk_size=chunk_size)
+    match fmt:
+        case "jsonl":
+            count = 0
+            for movie_bag in movies:
+                fp.write(json.dumps(_to_record(movie_bag)) + "\n")
+                count += 1
+        case "csv":
+            writer = csv.DictWriter(fp, fieldnames=FIELDNAMES)
+            writer.writeheader()
+            count = 0
+            for movie_bag in movies:
+                writer.writerow(_to_csv_row(movie_bag))
+                count += 1
+        case _:
+            logging.error(f"{UNKNOWN_FORMAT} {fmt}")
+            raise UnknownFormat(fmt)
+    return count
+
+
+def import_movies(
+    fp: TextIO, *, fmt: str = "jsonl", chunk_size=CHUNK_SIZE
+) -> ImportReport:
+    """Reads movies from a text file and adds them to the catalogue.
+
+    Each chunk of rows is added with bulk inserts in its own transaction.
+    People and tags which are not yet in the database are added. Rows which
+    cannot be added are reported and skipped. They do not stop the import.
+
+    Args:
+        fp: A text file in the format written by export_movies.
+        fmt: One of FORMATS.
+        chunk_size: The number of rows added per transaction.
+
+    Returns:
+        The number of movies added and the rows which could not be added.
+
+    Raises:
+        UnknownFormat
+    """
+    match fmt:
+        case "jsonl":
+            rows = _read_jsonl(fp)
+        case "csv":
+            rows = _read_csv(fp)
+        case _:
+            logging.error(f"{UNKNOWN_FORMAT} {fmt}")
+            raise UnknownFormat(fmt)
+
+    report = ImportReport()
+    while chunk := list(itertools.islice(rows, chunk_size)):
+        movie_bags = []
+        for line, movie_bag in chunk:
+            if isinstance(movie_bag, RowError):
+                report.errors.append(movie_bag)
+            else:
+                movie_bags.append((line, movie_bag))
+        with tables.unit_of_work() as session:
+            report.added += _bulk_add_movies(session, movie_bags, report.errors)
+    if report.added:
+        # Core inserts are not seen by the indexes' session events.
+        similarity.invalidate()
+        livesearch.invalidate()
+        tables.clear_match_cache()
+
+    for error in report.errors:
+        logging.error(f"Line {error.line}: {error.reason} {error.detail}")
+    logging.info(f"{IMPORT_SUMMARY} {report.added} added. {len(report.errors)} errors.")
+    return report
+
+
+def _select_chunk_related(
+    session: Session, *, movie_ids: list[int]
+) -> dict[str, dict[int, list[str]]]:
+    """Returns the directors, stars, and tags of a chunk of movies.
+
+    Args:
+        session:
+        movie_ids:
+
+    Returns:
+        Lists of texts indexed by movie bag key then by movie id.
+    """
+    return dict(
+        directors=tables._select_related_texts(
+            session,
+            secondary=schema.movie_director_table.c.person_id,
+            text=schema.Person.name,
+            movie_ids=movie_ids,
+        ),
+        stars=tables._select_related_texts(
+            session,
+            secondary=schema.movie_star_table.c.person_id,
+            text=schema.Person.name,
+            movie_ids=movie_ids,
+        ),
+        tags=tables._select_related_texts(
+            session,
+            secondary=schema.movie_tag_table.c.tag_id,
+            text=schema.Tag.text,
+            movie_ids=movie_ids,
+        ),
+    )
+
+
+def _to_record(movie_bag: MovieBag) -> dict:
+    """Returns the JSON compatible form of a movie bag."""
+    record = dict(title=movie_bag["title"], year=int(movie_bag["year"]))
+    if duration := movie_bag.get("duration"):
+        record["duration"] = int(duration)
+    for key in ("directors", "stars", "synopsis", "notes", "tags"):
+        if value := movie_bag.get(key):
+            record[key] = sorted(value) if key in LIST_FIELDS else value
+    return record
+
+
+def _to_csv_row(movie_bag: MovieBag) -> dict:
+    """Returns the CSV form of a movie bag."""
+    record = _to_record(movie_bag)
+    for key in LIST_FIELDS:
+        if key in record:
+            record[key] = LIST_DELIMITER.join(record[key])
+    return record
+
+
+def _read_jsonl(fp: TextIO) -> Iterator[tuple[int, MovieBag | RowError]]:
+    """Yields the line number and movie bag of each non-blank line."""
+    for line, text in enumerate(fp, 1):
+        if not text.strip():
+            continue
+        try:
+            record = json.loads(text)
+        except json.JSONDecodeError as exc:
+            yield line, RowError(line, INVALID_ROW, str(exc))
+        else:
+            yield line, _from_record(line, record)
+
+
+def _read_csv(fp: TextIO) -> Iterator[tuple[int, MovieBag | RowError]]:
+    """Yields the line number and movie bag of each data row."""
+    reader = csv.DictReader(fp)
+    for record in reader:
+        record = {key: value for key, value in record.items() if value}
+        for key in LIST_FIELDS:
+            if key in record:
+                record[key] = record[key].split(LIST_DELIMITER.strip())
+        yield reader.line_num, _from_record(reader.line_num, record)
+
+
+def _from_record(line: int, record: dict) -> MovieBag | RowError:
+    """Returns a movie bag or, if the record is invalid, a row error.
+
+    Args:
+        line: The record's line number.
+        record: A decoded JSON object or CSV row.
+    """
+    if not isinstance(record, dict):
+        return RowError(line, INVALID_ROW, repr(record))
+    if not (title := str(record.get("title", "")).strip()):
+        return RowError(line, MISSING_TITLE)
+    try:
+        movie_bag = MovieBag(title=title, year=MovieInteger(int(record["year"])))
+        if duration := record.get("duration"):
+            movie_bag["duration"] = MovieInteger(int(duration))
+    except (KeyError, TypeError, ValueError) as exc:
+        return RowError(line, INVALID_ROW, f"{title}. {exc!r}")
+
+    for key in ("synopsis", "notes"):
+        if value := record.get(key):
+            movie_bag[key] = str(value)
+    for key in LIST_FIELDS:
+        texts = record.get(key, ())
+        if isinstance(texts, str):
+            texts = [texts]
+        texts = {str(text).strip() for text in texts} - {""}
+        if texts:
+            movie_bag[key] = texts
+    return movie_bag
+
+
+def _bulk_add_movies(
+    session: Session,
+    movie_bags: list[tuple[int, MovieBag]],
+    errors: list[RowError],
+) -> int:
+    """Adds a chunk of movies with bulk inserts.
+
+    Movies which fail the schema's year check or are already in the database
+    are reported in errors and skipped. The caller commits the session.
+
+    Args:
+        session:
+        movie_bags: Line numbers and movie bags.
+        errors: Row errors are appended to this list.
+
+    Returns:
+        The number of movies added.
+    """
+    valid = {}
+    for line, movie_bag in movie_bags:
+        key = (movie_bag["title"], int(movie_bag["year"]))
+        if not schema.MUYBRIDGE < key[1] <= schema.MAX_YEAR:
+            errors.append(RowError(line, tables.INVALID_YEAR, f"{key[0]}, {key[1]}"))
+        elif key in valid:
+            errors.append(RowError(line, tables.MOVIE_EXISTS, f"{key[0]}, {key[1]}"))
+        else:
+            valid[key] = (line, movie_bag)
+    if not valid:
+        return 0
+
+    movie = schema.Movie
+    # SQLite scans the whole table for a row value IN clause but uses the
+    # unique index for a title IN clause. The years are compared here.
+    existing = session.execute(
+        select(movie.title, movie.year).where(
+            movie.title.in_({title for title, _ in valid})
+        )
+    )
+    for title, year in existing:
+        if (title, year) in valid:
+            line, _ = valid.pop((title, year))
+            errors.append(RowError(line, tables.MOVIE_EXISTS, f"{title}, {year}"))
+    if not valid:
+        return 0
+
+    # A Core insert of the table avoids the ORM's per-row bulk processing.
+    movie_table = movie.__table__
+    movie_ids = session.scalars(
+        insert(movie_table).returning(movie_table.c.id, sort_by_parameter_order=True),
+        [
+            dict(
+                title=movie_bag["title"],
+                year=int(movie_bag["year"]),
+                duration=(
+                    int(movie_bag["duration"]) if "duration" in movie_bag else None
+                ),
+                synopsis=movie_bag.get("synopsis"),
+                notes=movie_bag.get("notes"),
+            )
+            for _, movie_bag in valid.values()
+        ],
+    ).all()
+    movies = [
+        (movie_id, movie_bag)
+        for movie_id, (_, movie_bag) in zip(movie_ids, valid.values())
+    ]
+
+    person_ids = _getadd_ids(
+        session,
+        table=schema.Person.__table__,
+        column="name",
+        texts={
+            name
+            for _, movie_bag in movies
+            for key in ("directors", "stars")
+            for name in movie_bag.get(key, ())
+        },
+    )
+    tag_ids = _getadd_ids(
+        session,
+        table=schema.Tag.__table__,
+        column="text",
+        texts={text for _, movie_bag in movies for text in movie_bag.get("tags", ())},
+    )
+    for key, table, column, ids in (
+        ("directors", schema.movie_director_table, "person_id", person_ids),
+        ("stars", schema.movie_star_table, "person_id", person_ids),
+        ("tags", schema.movie_tag_table, "tag_id", tag_ids),
+    ):
+        links = [
+            {"movie_id": movie_id, column: ids[text]}
+            for movie_id, movie_bag in movies
+            for text in movie_bag.get(key, ())
+        ]
+        if links:
+            session.execute(insert(table), links)
+    return len(movies)
+
+
+def _getadd_ids(
+    session: Session, *, table: Table, column: str, texts: Iterable[str]
+) -> dict[str, int]:
+    """Returns the ids of people or tags adding any which are missing.
+
+    Args:
+        session:
+        table: The person or tag table.
+        column: The unique text column. For example, "name".
+        texts:
+
+    Returns:
+        Ids indexed by text.
+    """
+    texts = set(texts)
+    if not texts:
+        return {}
+    text_column = table.c[column]
+    ids = {
+        text: id_
+        for text, id_ in session.execute(
+            select(text_column, table.c.id).where(text_column.in_(texts))
+        )
+    }
+    if missing := texts - ids.keys():
+        added = session.execute(
+            insert(table).returning(text_column, table.c.id),
+            [{column: text} for text in missing],
+        )
+        ids.update((text, id_) for text, id_ in added)
+    return ids
@@ -120,6 +120,14 @@ class MainWindow:
             label="Settings for Moviedb…",
             command=handlers.sundries.settings_dialog,
         )
+        moviedb_menu.add_command(
+            label="Back Up Database",
+            command=handlers.database.gui_backup_database,
+        )
+        moviedb_menu.add_command(
+            label="Profile",
+            command=handlers.sundries.toggle_profile,
+        )
         moviedb_menu.add_separator()
         moviedb_menu.add_command(label="Quit Moviedb", command=self.tk_shutdown)
 
@@ -223,4 +231,5 @@ def run_tktcl():
     root.columnconfigure(0, weight=1)
     root.rowconfigure(0, weight=1)
     MainWindow(root)
+    handlers.database.IdleMaintenance(root)
     root.mainloop()
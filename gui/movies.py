@@ -13,6 +13,7 @@
 #  You should have received a copy of the GNU General Public License
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+import concurrent.futures
 import tkinter as tk
 import tkinter.ttk as ttk
 from tkinter import messagebox
@@ -32,9 +33,15 @@ from moviebag import (
 from gui import common, tk_facade
 from gui.constants import *
 
-
 MOVIE_DELETE_MESSAGE = "Do you want to delete this movie?"
 UNEXPECTED_KEY = "Unexpected key"
+PROBABLE_DUPLICATE_MSG = "This may duplicate:"
+LOCAL_MATCHES_MSG = "In this database:"
+FACET_TOTAL_MSG = "Matching movies:"
+FACET_DECADES_TEXT = "Decades:"
+FACET_TAGS_TEXT = "Tags:"
+FACET_FAILED_MSG = "The facet count failed."
+FACET_DIRECTORS_TEXT = "Directors:"
 
 
 @dataclass
@@ -48,6 +55,12 @@ class MovieGUI:
     tmdb_callback: Callable[[str, queue.LifoQueue], None]
     all_tags: Collection[str]
     prepopulate: MovieBag
+    # Called with the title field's text. Returns the number of local movies
+    #  which match and the titles and years of some of them, or None if the
+    #  local catalogue is not ready.
+    local_search_callback: Callable[[str], tuple[int, list[tuple[str, int]]] | None] = (
+        None
+    )
 
     entry_fields: dict[
         str,
@@ -55,6 +68,10 @@ class MovieGUI:
     ] = field(default_factory=dict, init=False, repr=False, compare=False)
     outer_frame: ttk.Frame = field(default=None, init=False, repr=False, compare=False)
     tmdb_treeview: ttk.Treeview = field(default=None, init=False, repr=False)
+    local_label: ttk.Label = field(default=None, init=False, repr=False, compare=False)
+    local_treeview: ttk.Treeview = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
     # TMDB Producer/consumer queue.
     tmdb_data_queue: queue.LifoQueue = field(
@@ -342,6 +359,35 @@ class MovieGUI:
         # Register the TMDB search function with the title field's observer.
         self.entry_fields[TITLE].observer.register(self.tmdb_search)
 
+        if self.local_search_callback:
+            self.create_local_search(tmdb_frame)
+
+    def create_local_search(self, tmdb_frame: ttk.Frame):
+        """Creates a table of the local movies which match the title field.
+
+        The table is refreshed on every change to the title field. There is
+        no pause because the local search is fast enough to keep up with
+        typing.
+
+        Args:
+            tmdb_frame: The frame into which the widgets will be placed.
+        """
+        self.local_label = ttk.Label(tmdb_frame, text=LOCAL_MATCHES_MSG)
+        self.local_label.grid(column=0, row=1, sticky="w", pady=(10, 0))
+        tview = self.local_treeview = ttk.Treeview(
+            tmdb_frame,
+            columns=(TITLE, YEAR),
+            show=["headings"],
+            height=8,
+            selectmode="none",
+        )
+        tview.column(TITLE, width=250, stretch=True)
+        tview.heading(TITLE, text=TITLE_TEXT, anchor="w")
+        tview.column(YEAR, width=40, stretch=True)
+        tview.heading(YEAR, text=YEAR_TEXT, anchor="w")
+        tview.grid(column=0, row=2, sticky="nsew")
+        self.entry_fields[TITLE].observer.register(self.local_search)
+
     # noinspection PyUnusedLocal
     def tmdb_treeview_callback(self, treeview: ttk.Treeview, *args, **kwargs):
         """Populates the input form with data from the selected TMDB movie.
@@ -402,6 +448,25 @@ class MovieGUI:
                 self.tmdb_data_queue,
             )
 
+    # noinspection PyUnusedLocal
+    def local_search(self, *args, **kwargs):
+        """Shows the local movies which match the title field.
+
+        The table is left unchanged if the local catalogue is not ready.
+
+        Args:
+            *args: Unused argument supplied by tkinter.
+            **kwargs: Unused argument supplied by tkinter.
+        """
+        result = self.local_search_callback(self.entry_fields[TITLE].current_value)
+        if result is None:
+            return
+        count, local_movies = result
+        self.local_label.configure(text=f"{LOCAL_MATCHES_MSG} {count:,}")
+        self.local_treeview.delete(*self.local_treeview.get_children())
+        for title, year in local_movies:
+            self.local_treeview.insert("", "end", values=(title, year))
+
     def tmdb_consumer(self):
         """Consumer of queued records of movies found on the TMDB website.
 
@@ -449,6 +514,80 @@ class MovieGUI:
 class AddMovieGUI(MovieGUI):
     """Create and manage a GUI form for entering a new movie."""
 
+    # Called with the title and year. Returns the titles and years of movies
+    #  already in the database which are probably the same movie.
+    duplicates_callback: Callable[[str, int], list[tuple[str, int]]] = None
+
+    duplicate_label: ttk.Label = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    # Used to pause the duplicate search while the user is still typing.
+    duplicate_pause: int = field(default=150, init=False, repr=False)
+    duplicate_pause_id: str = field(default="", init=False, repr=False)
+
+    def fill_body(self, body_frame: ttk.Frame):
+        """Adds a label for duplicate warnings below the standard entry form.
+
+        Args:
+            body_frame:
+        """
+        super().fill_body(body_frame)
+        if not self.duplicates_callback:
+            return
+        self.duplicate_label = ttk.Label(body_frame, justify="left")
+        self.duplicate_label.grid(
+            column=1, row=body_frame.grid_size()[1], sticky="w", pady=5
+        )
+        self.entry_fields[TITLE].observer.register(self.duplicate_search)
+        self.entry_fields[YEAR].observer.register(self.duplicate_search)
+
+    # noinspection PyUnusedLocal
+    def duplicate_search(self, *args, **kwargs):
+        """Schedules a delayed search for probable duplicates.
+
+        The search will not be made until no new title or year data has been
+        entered for self.duplicate_pause milliseconds.
+
+        Args:
+            *args: Unused argument supplied by tkinter.
+            **kwargs: Unused argument supplied by tkinter.
+        """
+        if self.duplicate_pause_id:
+            self.parent.after_cancel(self.duplicate_pause_id)
+        self.duplicate_pause_id = self.parent.after(
+            self.duplicate_pause, self.show_duplicates
+        )
+
+    def show_duplicates(self):
+        """Shows the movies which are probably the same as the entered title
+        and year. The warning is cleared if there are none."""
+        self.duplicate_pause_id = ""
+        title = self.entry_fields[TITLE].current_value
+        try:
+            year = int(self.entry_fields[YEAR].current_value)
+        except ValueError:
+            duplicates = []
+        else:
+            duplicates = self.duplicates_callback(title, year) if title else []
+
+        text = ""
+        if duplicates:
+            text = "\n".join(
+                [PROBABLE_DUPLICATE_MSG]
+                + [f"{title} ({year})" for title, year in duplicates]
+            )
+        self.duplicate_label.configure(text=text)
+
+    def destroy(self, *args):
+        """Cancels a pending duplicate search and destroys all widgets.
+
+        Args:
+            *args: Not used but needed to match external caller.
+        """
+        if self.duplicate_pause_id:
+            self.parent.after_cancel(self.duplicate_pause_id)
+        super().destroy(*args)
+
     def create_buttons(self, buttonbox: ttk.Frame, column_num: Iterator):
         """Adds a commit button and registers its enabler function with
         the observers of the title and year fields.
@@ -596,6 +735,109 @@ class EditMovieGUI(MovieGUI):
 class SearchMovieGUI(MovieGUI):
     """Create and manage a GUI form to search movies in the database."""
 
+    # Called with the partial search criteria. Returns a future whose result
+    #  is the number of matching movies and lists of (value, count) tuples for
+    #  tags, decades, and directors.
+    facets_callback: Callable[[MovieBag], concurrent.futures.Future] = None
+
+    facet_label: ttk.Label = field(default=None, init=False, repr=False, compare=False)
+    facet_future: concurrent.futures.Future = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    # Used to pause the facet counts while the user is still entering
+    #  search criteria.
+    facet_pause: int = field(default=500, init=False, repr=False)
+    # Polling frequency for the facet counts.
+    facet_poll: int = field(default=40, init=False, repr=False)
+    # ID of the pending pause or poll event.
+    facet_pause_id: str = field(default="", init=False, repr=False)
+
+    def fill_body(self, body_frame: ttk.Frame):
+        """Adds a label for the counts of matching movies below the standard
+        entry form.
+
+        Args:
+            body_frame:
+        """
+        super().fill_body(body_frame)
+        if not self.facets_callback:
+            return
+        self.facet_label = ttk.Label(body_frame, justify="left", wraplength=400)
+        self.facet_label.grid(
+            column=1, row=body_frame.grid_size()[1], sticky="w", pady=5
+        )
+        for name, entry_field in self.entry_fields.items():
+            if name != TIMESTAMP:
+                entry_field.observer.register(self.facet_search)
+        self.facet_search()
+
+    # noinspection PyUnusedLocal
+    def facet_search(self, *args, **kwargs):
+        """Schedules a delayed count of the movies which match the search
+        criteria.
+
+        The count will not be made until no new data has been entered for
+        self.facet_pause milliseconds. The result of a count which is still
+        running will be ignored.
+
+        Args:
+            *args: Unused argument supplied by tkinter.
+            **kwargs: Unused argument supplied by tkinter.
+        """
+        if self.facet_pause_id:
+            self.parent.after_cancel(self.facet_pause_id)
+        self.facet_pause_id = self.parent.after(self.facet_pause, self.count_facets)
+
+    def count_facets(self):
+        """Starts counting the movies which match the search criteria.
+
+        No count is made while the year or runtime is not a valid search
+        pattern.
+        """
+        self.facet_pause_id = ""
+        try:
+            criteria = self.as_movie_bag()
+        except ValueError:
+            return
+        self.facet_future = self.facets_callback(criteria)
+        self.show_facets()
+
+    def show_facets(self):
+        """Shows the number of matching movies per tag, decade, and director
+        when the count is complete."""
+        if not self.facet_future.done():
+            self.facet_pause_id = self.parent.after(self.facet_poll, self.show_facets)
+            return
+        self.facet_pause_id = ""
+        try:
+            total, tags, decades, directors = self.facet_future.result()
+        except Exception as exc:
+            logging.error(f"{FACET_FAILED_MSG} {exc!r}")
+            self.facet_label.configure(text="")
+            return
+
+        lines = [f"{FACET_TOTAL_MSG} {total:,}"]
+        for text, counts in (
+            (FACET_DECADES_TEXT, [(f"{decade}s", n) for decade, n in decades]),
+            (FACET_TAGS_TEXT, tags),
+            (FACET_DIRECTORS_TEXT, directors),
+        ):
+            if counts:
+                lines.append(
+                    f"{text} " + ", ".join(f"{value} ({n:,})" for value, n in counts)
+                )
+        self.facet_label.configure(text="\n".join(lines))
+
+    def destroy(self, *args):
+        """Cancels a pending facet count or poll and destroys all widgets.
+
+        Args:
+            *args: Not used but needed to match external caller.
+        """
+        if self.facet_pause_id:
+            self.parent.after_cancel(self.facet_pause_id)
+        super().destroy(*args)
+
     def create_buttons(self, buttonbox: ttk.Frame, column_num: Iterator):
         """Adds a search button and registers its enabler function with
         all field observers.
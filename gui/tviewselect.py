@@ -13,22 +13,26 @@
 #  You should have received a copy of the GNU General Public License
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+import itertools
 import tkinter as tk
 import tkinter.ttk as ttk
 from functools import partial
-from collections.abc import Callable
+from collections.abc import Callable, Iterator
 from dataclasses import dataclass, KW_ONLY, field
+from typing import Any
 
 from moviebag import (
     MovieBag,
     setstr_to_str,
 )
+from movieresultset import MovieResultSet
 from gui.constants import *
 from gui import common
 
 BAD_TITLES_AND_WIDTHS = (
     "Column titles and widths must be same length and greater than zero length."
 )
+TAG_ALL_TEXT = "Tag all…"
 
 
 @dataclass
@@ -38,6 +42,11 @@ class SelectGUI:
 
     It may not be called directly. Call subclasses which are specialized for
     different record types such as tags or movies.
+
+    Clicking a column heading sorts the table by that column. Clicking it
+    again reverses the order. The existing treeview items are reordered so
+    the table is not rebuilt. Rows with equal keys keep their order, so a
+    sort by year leaves the movies of each year in title order.
     """
 
     parent: tk.Tk
@@ -49,6 +58,12 @@ class SelectGUI:
     rows: list[str | dict[str, MovieBag]]
 
     outer_frame: ttk.Frame = None
+    # Rows are populated in order of column 0 using the key of sort_by.
+    sort_column: int = 0
+    sort_reverse: bool = False
+    # Sort keys in treeview index order. They are computed for a column when
+    # it is first sorted.
+    sort_keys: dict[int, list] = field(default_factory=dict, init=False, repr=False)
 
     def __post_init__(self):
         """Contains common methods for specialized selection subclasses."""
@@ -66,10 +81,13 @@ class SelectGUI:
         tree = self.treeview(body_frame)
         self.columns(tree)
         self.populate(tree)
+        self.bind_headings(tree)
+        column_num = itertools.count()
+        self.create_buttons(buttonbox, column_num)
         cancel_button = common.create_button(
             buttonbox,
             text=CANCEL_TEXT,
-            column=0,
+            column=next(column_num),
             command=self.destroy,
             default="active",
         )
@@ -117,6 +135,52 @@ class SelectGUI:
         """Adds data from self.rows to the displayed table."""
         raise NotImplementedError
 
+    def create_buttons(self, buttonbox: ttk.Frame, column_num: Iterator[int]):
+        """Creates the buttons which are placed before the cancel button.
+
+        There are none unless a subclass adds them.
+
+        Args:
+            buttonbox:
+            column_num: The buttonbox column of each new button.
+        """
+
+    def sort_key(self, column: int) -> Callable[[Any], Any]:
+        """Returns the function which gives a row's sort key for a column.
+
+        Args:
+            column: The treeview column number.
+        """
+        raise NotImplementedError
+
+    def bind_headings(self, tree: ttk.Treeview):
+        """Binds each column heading to sort the table by that column.
+
+        Args:
+            tree:
+        """
+        for ix in range(len(self.titles)):
+            tree.heading(f"#{ix}", command=partial(self.sort_by, tree, ix))
+
+    def sort_by(self, tree: ttk.Treeview, column: int):
+        """Reorders the existing treeview items by a column.
+
+        Args:
+            tree:
+            column: The treeview column number.
+        """
+        if column == self.sort_column:
+            self.sort_reverse = not self.sort_reverse
+        else:
+            self.sort_column, self.sort_reverse = column, False
+        if (keys := self.sort_keys.get(column)) is None:
+            key = self.sort_key(column)
+            keys = self.sort_keys[column] = [key(row) for row in self.rows]
+        order = sorted(
+            range(len(keys)), key=keys.__getitem__, reverse=self.sort_reverse
+        )
+        tree.set_children("", *map(str, order))
+
     def destroy(self):
         """Destroys this widget."""
         self.parent.unbind("<Escape>")
@@ -158,10 +222,18 @@ class SelectTagGUI(SelectGUI):
         Args:
             tree:
         """
-        self.rows.sort()
+        self.rows.sort(key=self.sort_key(self.sort_column))
         for ix, tag_text in enumerate(self.rows):
             tree.insert("", "end", iid=str(ix), text=tag_text, values=[])
 
+    def sort_key(self, column: int) -> Callable[[str], str]:
+        """Returns the function which gives a tag's sort key.
+
+        Args:
+            column: Always 0.
+        """
+        return str.casefold
+
 
 @dataclass
 class SelectMovieGUI(SelectGUI):
@@ -171,8 +243,12 @@ class SelectMovieGUI(SelectGUI):
     selection_callback: Callable[[MovieBag], None]
     titles: list[str] = field(default_factory=list)
     widths: list[int] = field(default_factory=list)
-    # The index of self.rows list is also the treeview index.
-    rows: list[MovieBag]
+    # The index of self.rows list is also the treeview index. A compact
+    # MovieResultSet may be used in place of a list for large results.
+    rows: list[MovieBag] | MovieResultSet
+    # Called by the 'Tag all' button to tag every movie in the table. The
+    # button is not shown if this is None.
+    tag_all_callback: Callable[[], None] | None = None
 
     def __post_init__(self):
         self.titles = [TITLE, YEAR, DIRECTORS, DURATION, SYNOPSIS]
@@ -192,13 +268,29 @@ class SelectMovieGUI(SelectGUI):
             tree.column(f"#{ix}", width=self.widths[ix])
             tree.heading(f"#{ix}", text=self.titles[ix].title())
 
+    def create_buttons(self, buttonbox: ttk.Frame, column_num: Iterator[int]):
+        """Creates the 'Tag all' button if there is a tag_all_callback.
+
+        Args:
+            buttonbox:
+            column_num: The buttonbox column of each new button.
+        """
+        if self.tag_all_callback:
+            common.create_button(
+                buttonbox,
+                text=TAG_ALL_TEXT,
+                column=next(column_num),
+                command=self.tag_all_callback,
+                default="normal",
+            )
+
     def populate(self, tree: ttk.Treeview):
         """Populates the treeview with data.
 
         Args:
             tree:
         """
-        self.rows.sort(key=lambda movie_bag: movie_bag["title"])
+        self.rows.sort(key=self.sort_key(self.sort_column))
         for ix, movie in enumerate(self.rows):
             duration = movie.get("duration")
             duration = int(duration) if duration else ""
@@ -214,3 +306,23 @@ class SelectMovieGUI(SelectGUI):
                     movie.get("synopsis", ""),
                 ),
             )
+
+    def sort_key(self, column: int) -> Callable[[MovieBag], Any]:
+        """Returns the function which gives a movie's sort key for a column.
+
+        Movies without a duration sort before the shortest movie.
+
+        Args:
+            column: The treeview column number.
+        """
+        title = self.titles[column]
+        if title == YEAR:
+            return lambda movie: int(movie["year"])
+        elif title == DURATION:
+            return lambda movie: int(movie.get("duration") or 0)
+        elif title == DIRECTORS:
+            return lambda movie: setstr_to_str(movie.get("directors")).casefold()
+        elif title == SYNOPSIS:
+            return lambda movie: movie.get("synopsis", "").casefold()
+        else:
+            return lambda movie: movie["title"].casefold()
@@ -13,21 +13,32 @@
 #  You should have received a copy of the GNU General Public License
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+import concurrent.futures
+from dataclasses import dataclass, field
 from functools import partial
 import logging
+import sqlite3
+import time
+import tkinter as tk
 
+import config
 from gui import movies, common, tags, tviewselect
 
-from database import tables
+from database import backup, livesearch, maintenance, similarity, tables
 from moviebag import MovieBag
 from handlers.sundries import _tmdb_io_handler
 
-
 TITLE_AND_YEAR_EXISTS_MSG = (
     "The title and release date clash with a movie already in the database"
 )
 INVALID_RELEASE_YEAR_MSG = "The release year is too early or too late."
 MOVIE_NO_LONGER_PRESENT = "The original movie is no longer present in the database."
+BACKUP_COMPLETE_MSG = "The database has been backed up."
+BACKUP_ERROR_MSG = "The database could not be backed up."
+MAINTENANCE_FAILED_MSG = "The database maintenance failed."
+MOVIES_TAGGED_MSG = "Movies newly tagged"
+IDLE_SECONDS = 300
+IDLE_POLL_MS = 30_000
 MISSING_EXPLANATORY_NOTES = (
     "Exception raised without explanatory notes needed for user alert."
 )
@@ -36,6 +47,10 @@ MISSING_EXPLANATORY_NOTES = (
 def gui_add_movie(*, prepopulate: MovieBag = None):
     """Presents a GUI form for adding a new movie.
 
+    The title similarity index and the live search index are loaded in the
+    background so the form can warn about probable duplicates and list
+    local movies as the title is typed.
+
     Args:
         prepopulate:
             This argument can be used to prepopulate the movie widget. This
@@ -47,12 +62,16 @@ def gui_add_movie(*, prepopulate: MovieBag = None):
     all_tags = tables.select_all_tags()
     if not prepopulate:
         prepopulate = MovieBag()
+    similarity.start_load()
+    livesearch.start_load()
     movies.AddMovieGUI(
         common.tk_root,
         tmdb_callback=_tmdb_io_handler,
         all_tags=all_tags,
         prepopulate=prepopulate,
         database_callback=db_add_movie,
+        duplicates_callback=db_probable_duplicates,
+        local_search_callback=db_local_search,
     )
 
 
@@ -70,25 +89,44 @@ def gui_search_movie(*, prepopulate: MovieBag = None):
     all_tags = tables.select_all_tags()
     if not prepopulate:
         prepopulate = MovieBag()
+    livesearch.start_load()
     movies.SearchMovieGUI(
         common.tk_root,
         database_callback=db_match_movies,
         tmdb_callback=_tmdb_io_handler,
         all_tags=all_tags,
         prepopulate=prepopulate,
+        local_search_callback=db_local_search,
+        facets_callback=db_facet_counts,
     )
 
 
-def gui_select_movie(*, movie_bags: list[MovieBag]):
+def gui_select_movie(*, movie_bags: list[MovieBag], criteria: MovieBag = None):
     """Presents a user dialog for selecting a movie from a list.
 
     Args:
         movie_bags:
+        criteria: The search which found the movies. If given, the dialog
+            lets the user tag every movie which matches it.
     """
     tviewselect.SelectMovieGUI(
         common.tk_root,
         selection_callback=db_select_movie,
         rows=movie_bags,
+        tag_all_callback=partial(gui_tag_movies, criteria) if criteria else None,
+    )
+
+
+def gui_tag_movies(criteria: MovieBag):
+    """Presents a user dialog for choosing a tag for every matching movie.
+
+    Args:
+        criteria:
+    """
+    tviewselect.SelectTagGUI(
+        common.tk_root,
+        selection_callback=partial(db_tag_movies, criteria),
+        rows=list(tables.select_all_tags()),
     )
 
 
@@ -144,6 +182,49 @@ def db_add_movie(movie_bag: MovieBag):
         gui_add_movie()
 
 
+def db_probable_duplicates(title: str, year: int) -> list[tuple[str, int]]:
+    """Returns movies which are probably the same as a new movie.
+
+    The title index is loaded in a thread from the pool if it is not ready
+    so Tk is not held up by the load.
+
+    Args:
+        title:
+        year:
+
+    Returns:
+        The titles and years of the probable duplicates or an empty list if
+        the index is not ready.
+    """
+    if not similarity.title_index.is_current():
+        similarity.start_load()
+        return []
+    return [
+        (candidate.title, candidate.year)
+        for candidate in similarity.probable_duplicates(title, year)
+    ]
+
+
+def db_local_search(text: str) -> tuple[int, list[tuple[str, int]]] | None:
+    """Returns the local movies which match text.
+
+    The local catalogue index is loaded in a thread from the pool if it is
+    not ready.
+
+    Args:
+        text: Words to match in titles and the names of directors and stars.
+
+    Returns:
+        The number of matching movies and the titles and years of some of
+        them, or None if the index is not ready.
+    """
+    if not livesearch.catalogue_index.is_current():
+        livesearch.start_load()
+        return None
+    result = livesearch.search(text)
+    return result.count, [(movie.title, movie.year) for movie in result.movies]
+
+
 def db_match_movies(criteria: MovieBag):
     """Selects movies from the database which match user-entered
     criteria and tags.
@@ -177,7 +258,23 @@ def db_match_movies(criteria: MovieBag):
 
         case _:
             # Presents a selection window showing the multiple compliant movies.
-            gui_select_movie(movie_bags=movies_found)
+            gui_select_movie(movie_bags=movies_found, criteria=MovieBag(**criteria))
+
+
+def db_facet_counts(criteria: MovieBag) -> concurrent.futures.Future:
+    """Counts the movies which match partial search criteria in a thread
+    from the pool.
+
+    Args:
+        criteria:
+
+    Returns:
+        A future whose result is a tables.Facets.
+    """
+    # Removes empty items because SQL treats them as meaningful.
+    criteria = {k: v for k, v in criteria.items() if v != ""}
+    executor = config.current.threadpool_executor
+    return executor.submit(tables.facet_counts, MovieBag(**criteria))
 
 
 def db_select_movie(movie_bag: MovieBag):
@@ -187,10 +284,14 @@ def db_select_movie(movie_bag: MovieBag):
     by another process. A user alert is given and the process aborts.
 
     Args:
-        movie_bag: The movie title and year are used to select a movie.
+        movie_bag: The movie id is used to select a movie. The title and
+            year are used if there is no id.
     """
     try:
-        movie_bag = tables.select_movie(movie_bag=movie_bag)
+        if "id" in movie_bag:
+            movie_bag = tables.select_movie_by_id(movie_id=movie_bag["id"])
+        else:
+            movie_bag = tables.select_movie(movie_bag=movie_bag)
 
     except tables.NoResultFound as exc:
         if exc.__notes__[0] == tables.MOVIE_NOT_FOUND:
@@ -202,6 +303,29 @@ def db_select_movie(movie_bag: MovieBag):
         gui_edit_movie(movie_bag, prepopulate=movie_bag)
 
 
+def db_tag_movies(criteria: MovieBag, tag_text: str):
+    """Tags every movie which matches the criteria.
+
+    The user is told how many movies were tagged. The user is alerted if
+    the tag has been deleted by another process.
+
+    Args:
+        criteria:
+        tag_text:
+    """
+    try:
+        count = tables.tag_movies(match=criteria, tag_text=tag_text)
+
+    except tables.NoResultFound as exc:
+        if exc.__notes__[0] == tables.TAG_NOT_FOUND:
+            _exc_messagebox(exc)
+        else:  # pragma nocover
+            raise
+
+    else:
+        common.showinfo(f"{MOVIES_TAGGED_MSG} {tag_text}: {count}")
+
+
 def db_edit_movie(old_movie: MovieBag, new_movie: MovieBag):
     """Changes a movie and its links in database with new user supplied data.
 
@@ -209,12 +333,32 @@ def db_edit_movie(old_movie: MovieBag, new_movie: MovieBag):
     module rejects the addition. Then the user is presented with an
     'edit movie' input screen populated with previously entered data.
 
+    If the movie was read with its id it is found by its id. If it has been
+    changed by someone else since it was read, the user is alerted and the
+    edit form is presented again with the movie as it is now.
+
     Args:
         old_movie: The old movie key.
         new_movie: Fields with either original values or values modified by the user.
     """
     try:
-        tables.edit_movie(old_movie_bag=old_movie, replacement_fields=new_movie)
+        if "id" in old_movie:
+            tables.edit_movie_by_id(
+                movie_id=old_movie["id"],
+                updated=old_movie.get("updated"),
+                replacement_fields=new_movie,
+            )
+        else:
+            tables.edit_movie(old_movie_bag=old_movie, replacement_fields=new_movie)
+
+    except tables.StaleDataError as exc:
+        _exc_messagebox(exc)
+        try:
+            current_movie = tables.select_movie_by_id(movie_id=old_movie["id"])
+        except tables.NoResultFound as exc:
+            _exc_messagebox(exc)
+        else:
+            gui_edit_movie(current_movie, prepopulate=new_movie)
 
     except (tables.NoResultFound, tables.IntegrityError) as exc:
         if exc.__notes__[0] in (
@@ -235,10 +379,14 @@ def db_delete_movie(old_movie: MovieBag):
     No action will be taken if the movie does not exist.
 
     Args:
-        old_movie: The old movie. Directors and stars must be included to
-        ensure correct deletion of related and 'orphaned' records.
+        old_movie: The old movie. If there is no id, directors and stars
+        must be included to ensure correct deletion of related and
+        'orphaned' records.
     """
-    tables.delete_movie(movie_bag=old_movie)
+    if "id" in old_movie:
+        tables.delete_movie_by_id(movie_id=old_movie["id"])
+    else:
+        tables.delete_movie(movie_bag=old_movie)
 
 
 def gui_add_tag():
@@ -319,6 +467,99 @@ def db_edit_tag(old_tag_text: str, new_tag_text: str):
         _exc_messagebox(exc)
 
 
+def gui_backup_database():
+    """Backs up the database in a thread from the pool.
+
+    The user is alerted when the backup is complete or if it failed.
+    """
+    fut = backup.start_snapshot()
+    fut.add_done_callback(_backup_done_callback)
+
+
+def _backup_done_callback(fut: concurrent.futures.Future):
+    """Reports the outcome of a backup.
+
+    Args:
+        fut: The future of backup.create_snapshot.
+    """
+    try:
+        snapshot = fut.result()
+    except backup.BackupIntegrityError as exc:
+        _exc_messagebox(exc)
+    except (sqlite3.Error, OSError) as exc:
+        logging.error(f"{BACKUP_ERROR_MSG} {exc!r}")
+        exc.add_note(BACKUP_ERROR_MSG)
+        exc.add_note(str(exc))
+        _exc_messagebox(exc)
+    else:
+        common.showinfo(BACKUP_COMPLETE_MSG, detail=str(snapshot))
+
+
+@dataclass
+class IdleMaintenance:
+    """Runs database maintenance when the user has been idle for a while.
+
+    Key presses, mouse clicks, and mouse movement in any window count as
+    activity. Every poll_ms the scheduler checks whether the user has been
+    idle for idle_seconds and if so runs the maintenance tasks which are due
+    in a thread from the pool. A task is interrupted as soon as the user
+    returns.
+    """
+
+    parent: tk.Tk
+    idle_seconds: float = IDLE_SECONDS
+    poll_ms: int = IDLE_POLL_MS
+    last_activity: float = field(default_factory=time.monotonic, init=False)
+    fut: concurrent.futures.Future | None = field(default=None, init=False)
+
+    def __post_init__(self):
+        for sequence in ("<KeyPress>", "<ButtonPress>", "<Motion>"):
+            self.parent.bind_all(sequence, self.note_activity, add="+")
+        self.parent.after(self.poll_ms, self.poll)
+
+    # noinspection PyUnusedLocal
+    def note_activity(self, *args):
+        """Records the time of the user's latest activity.
+
+        Args:
+            *args: Not used. Required for compatibility with caller
+        """
+        self.last_activity = time.monotonic()
+
+    def user_active(self) -> bool:
+        """Returns True if the user has been active within idle_seconds."""
+        return time.monotonic() - self.last_activity < self.idle_seconds
+
+    def poll(self):
+        """Starts the maintenance if the user is idle and it is not running."""
+        if (self.fut is None or self.fut.done()) and not self.user_active():
+            executor = config.current.threadpool_executor
+            self.fut = executor.submit(
+                maintenance.run_due, should_stop=self.user_active
+            )
+            self.fut.add_done_callback(_maintenance_done_callback)
+        self.parent.after(self.poll_ms, self.poll)
+
+
+def _maintenance_done_callback(fut: concurrent.futures.Future):
+    """Alerts the user if the maintenance found integrity problems.
+
+    A failed maintenance run is logged. It is retried when the user is next
+    idle.
+
+    Args:
+        fut: The future of maintenance.run_due.
+    """
+    try:
+        reports = fut.result()
+    except Exception:
+        logging.exception(MAINTENANCE_FAILED_MSG)
+        return
+    problems = [problem for report in reports for problem in report.problems]
+    if problems:
+        common.showinfo(maintenance.INTEGRITY_PROBLEMS_MSG, detail="; ".join(problems))
+
+
 def _exc_messagebox(exc):
     """This helper presents a GUI user alert with exception information.
 
@@ -19,6 +19,7 @@ import queue
 from typing import Optional
 
 import config
+import profiling
 import tmdb
 from gui import common, settings
 
@@ -26,6 +27,7 @@ TMDB_UNREACHABLE = "TMDB database cannot be reached."
 INVALID_API_KEY = "Invalid API key for TMDB."
 SET_API_KEY = "Do you want to set the TMDB API key?"
 VERSION = "Version"
+PROFILE_STARTED_DETAIL = "Choose Profile again to stop and save the profile."
 
 
 def about_dialog():
@@ -36,6 +38,17 @@ def about_dialog():
     )
 
 
+def toggle_profile():
+    """Starts profiling or stops it and tells the user where the profile is."""
+    paths = profiling.toggle()
+    if paths:
+        common.showinfo(
+            profiling.PROFILE_SAVED_MSG, detail="\n".join(str(path) for path in paths)
+        )
+    else:
+        common.showinfo(profiling.PROFILE_STARTED_MSG, detail=PROFILE_STARTED_DETAIL)
+
+
 def settings_dialog():
     """Display the 'preferences' dialog."""
     try:
@@ -0,0 +1,153 @@
+"""A non-blocking logging pipeline.
+
+Log records are put on a queue by the thread which logs them. A single
+listener thread takes records from the queue and writes them to a size rotated
+log file. Tk callbacks and worker threads therefore never wait for file I/O.
+"""
+
+#  Copyright© 2026. Stephen Rigden.
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import json
+import logging
+import queue
+from contextlib import AbstractContextManager
+from dataclasses import dataclass, field
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from pathlib import Path
+from types import TracebackType
+from typing import Type
+
+TEXT_FORMAT = "{asctime} {levelname:8} {lineno:4d} {module:20} {message}"
+JSON_ENVIRONMENT_VARIABLE = "MOVIEDB_LOG_JSON"
+MAX_BYTES = 1_048_576
+BACKUP_COUNT = 5
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """Formats each log record as a single line JSON object."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        """Returns the JSON text of the record.
+
+        Any exception text has already been merged into the message by the
+        queue handler.
+        """
+        return json.dumps(
+            dict(
+                time=datetime.fromtimestamp(record.created).isoformat(),
+                level=record.levelname,
+                module=record.module,
+                lineno=record.lineno,
+                thread=record.threadName,
+                message=record.getMessage(),
+            )
+        )
+
+
+@dataclass
+class LogPipeline(AbstractContextManager):
+    """A context manager for queued logging to a rotating file.
+
+    Usage:
+        with LogPipeline(filename):
+            logging.info(text)
+
+    While the pipeline is running a QueueHandler is added to the root logger.
+    The handler formats the message on the logging thread, which keeps
+    arguments from being shared between threads, and puts the record on the
+    queue. The QueueListener thread is the consumer. It is the
+    only thread which writes to the log file.
+
+    An existing log file is rolled over when the pipeline starts so each run
+    begins with a fresh file and the previous runs are kept as backups.
+    """
+
+    filename: Path
+    json_lines: bool = False
+    level: str = "INFO"
+    max_bytes: int = MAX_BYTES
+    backup_count: int = BACKUP_COUNT
+
+    _log_q: queue.Queue = field(default_factory=queue.Queue, init=False, repr=False)
+    _file_handler: RotatingFileHandler | None = field(
+        default=None, init=False, repr=False
+    )
+    _queue_handler: QueueHandler | None = field(default=None, init=False, repr=False)
+    _listener: QueueListener | None = field(default=None, init=False, repr=False)
+
+    def __enter__(self):
+        """Start the pipeline.
+
+        Returns:
+            The pipeline.
+        """
+        self.start()
+        return self
+
+    def __exit__(
+        self,
+        __exc_type: Type[BaseException] | None,
+        __exc_value: BaseException | None,
+        __traceback: TracebackType | None,
+    ) -> bool | None:
+        """Stop the pipeline.
+
+        Returns:
+            False to indicate that any exception raised in the context has not
+            been handled.
+        """
+        self.stop()
+        return False
+
+    def start(self):
+        """Adds a queue handler to the root logger and starts the listener
+        thread."""
+        self._file_handler = RotatingFileHandler(
+            self.filename,
+            maxBytes=self.max_bytes,
+            backupCount=self.backup_count,
+            delay=True,
+        )
+        if self._has_content():
+            self._file_handler.doRollover()
+        if self.json_lines:
+            self._file_handler.setFormatter(JsonLinesFormatter())
+        else:
+            self._file_handler.setFormatter(logging.Formatter(TEXT_FORMAT, style="{"))
+
+        self._queue_handler = QueueHandler(self._log_q)
+        self._listener = QueueListener(self._log_q, self._file_handler)
+
+        root = logging.getLogger()
+        root.addHandler(self._queue_handler)
+        root.setLevel(self.level)
+        self._listener.start()
+
+    def stop(self):
+        """Writes all queued records, stops the listener thread, and closes
+        the log file."""
+        if self._listener is None:
+            return
+        logging.getLogger().removeHandler(self._queue_handler)
+        self._listener.stop()
+        self._queue_handler.close()
+        self._file_handler.close()
+        self._listener = None
+
+    def _has_content(self) -> bool:
+        """Returns True if the log file exists and is not empty."""
+        try:
+            return Path(self.filename).stat().st_size > 0
+        except FileNotFoundError:
+            return False
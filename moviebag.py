@@ -12,12 +12,12 @@
 #  GNU General Public License for more details.
 #  You should have received a copy of the GNU General Public License
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+from bisect import bisect_right
 from collections.abc import Iterator
 from dataclasses import dataclass, field
 from datetime import datetime
 from typing import TypedDict
 
-
 NO_INTEGER_VALUE = "This object cannot provide an integer value"
 
 
@@ -72,6 +72,8 @@ class MovieInteger(set):
         >> mint = MovieInteger('2020-2022, 2021, 2029, 2025-2027')
         >> list(mint)
         [2020, 2021, 2022, 2025, 2026, 2027, 2029]
+        >> mint.intervals
+        [(2020, 2022), (2025, 2027), (2029, 2029)]
         >> 2021 in mint
         True
 
@@ -81,7 +83,7 @@ class MovieInteger(set):
 
         >> mint = MovieInteger("2042-2044")
         >> int(mint)
-        TypeError: Not a single integer value: {2042, 2043, 2044}
+        TypeError: Not a single integer value: [(2042, 2044)]
 
         >> mint = MovieInteger("2042-wxyz")
         ValueError: invalid literal for int() with base 10: 'wxyz'
@@ -89,15 +91,23 @@ class MovieInteger(set):
     Use case:
         This simplifies the layout of the GUI, otherwise movie search and
         movie display movies require separate layouts and support code.
+
+    Implementation note:
+        The pattern is held as a sorted list of merged, inclusive intervals
+        rather than as a set of every integer in every range. A search such as
+        '1878-10000' is two integers instead of eight thousand. Membership
+        is tested with a binary search of the interval lower bounds.
     """
 
     _value: str | int
-    _values: set = field(default_factory=set, init=False)
+    _intervals: list[tuple[int, int]] = field(default_factory=list, init=False)
+    _lows: list[int] = field(default_factory=list, init=False, repr=False)
 
     element_delimiter = ","
     max_min_delimiter = "-"
 
     def __post_init__(self):
+        intervals = []
         elements = str(self._value).split(self.element_delimiter)
 
         for element in elements:
@@ -110,30 +120,58 @@ class MovieInteger(set):
                         f"Expected a range in the format '<low int>-<high int>'. Got:"
                         f" {element}"
                     )
-                self._values |= set(
-                    i for i in range(int(min(min_max)), int(max(min_max)) + 1)
-                )
+                low, high = sorted(int(limit) for limit in min_max)
+                intervals.append((low, high))
 
             else:
-                self._values.add(int(element))
+                value = int(element)
+                intervals.append((value, value))
+
+        self._intervals = self._merge(intervals)
+        self._lows = [low for low, _ in self._intervals]
+
+    @staticmethod
+    def _merge(intervals: list[tuple[int, int]]) -> list[tuple[int, int]]:
+        """Sorts and merges overlapping or adjacent intervals.
+
+        Args:
+            intervals: Inclusive (low, high) pairs in any order.
+
+        Returns:
+            A sorted list of disjoint inclusive intervals.
+        """
+        merged = []
+        for low, high in sorted(intervals):
+            if merged and low <= merged[-1][1] + 1:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], high))
+            else:
+                merged.append((low, high))
+        return merged
+
+    @property
+    def intervals(self) -> list[tuple[int, int]]:
+        """Returns the sorted, merged, and inclusive (low, high) intervals."""
+        return list(self._intervals)
 
     def __str__(self):
         return str(self._value)
 
     def __len__(self) -> int:
-        return len(self._values)
+        return sum(high - low + 1 for low, high in self._intervals)
 
     def __iter__(self) -> Iterator:
-        return iter(self._values)
+        for low, high in self._intervals:
+            yield from range(low, high + 1)
 
     def __contains__(self, item: int) -> bool:
-        return item in self._values
+        ix = bisect_right(self._lows, item) - 1
+        return ix >= 0 and item <= self._intervals[ix][1]
 
     def __int__(self) -> int:
-        if len(self._values) == 1:
-            return list(self._values)[0]
+        if len(self._intervals) == 1 and self._intervals[0][0] == self._intervals[0][1]:
+            return self._intervals[0][0]
         else:
-            raise TypeError(f"{NO_INTEGER_VALUE}: {self._values}")
+            raise TypeError(f"{NO_INTEGER_VALUE}: {self._intervals}")
 
 
 def setstr_to_str(setstr: set[str] | None) -> str:
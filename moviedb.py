@@ -24,12 +24,15 @@ from typing import Any
 
 import config
 import database
+import profiling
 from gui import mainwindow
+from logpipeline import LogPipeline, JSON_ENVIRONMENT_VARIABLE
 from threadsafe_printer import SafePrinter
 
-
 PROGRAM_VERSION = "1.0.0"
 
+log_pipeline: LogPipeline | None = None
+
 
 def main():
     """Initializes the program, runs it, and executes close down actions."""
@@ -47,6 +50,8 @@ def start_up():
     """Initialize the program."""
     program_path = Path(__file__)
     start_logger(program_path.cwd(), program_path)
+    if os.environ.get(profiling.ENVIRONMENT_VARIABLE):
+        profiling.start(program_path.cwd())
     config.current = config.CurrentConfig()
     load_config_file(program_path)
     database.environment.start_engine()
@@ -57,24 +62,41 @@ def close_down():
     # Check the database for orphans.
     database.tables.delete_all_orphans()
 
+    # Report the statistics of an instrumented run.
+    if database.instrumentation.enabled:
+        database.instrumentation.log_report()
+
+    # Write the profile of a profiled run.
+    profiling.stop()
+
     # Save the config.Config pickle file
     save_config_file()
 
     logging.info("The program is ending.")
+    stop_logger()
     logging.shutdown()
 
 
 def start_logger(root_dir: Path, program: Path):
-    """Start the logger."""
+    """Start the logger.
+
+    Records are written by a background thread. Set the environment variable
+    MOVIEDB_LOG_JSON to write JSON lines instead of text.
+    """
+    global log_pipeline
     q_name = os.path.normpath(os.path.join(root_dir, f"{program.stem}.log"))
-    # noinspection PyArgumentList
-    logging.basicConfig(
-        format="{asctime} {levelname:8} {lineno:4d} {module:20} {message}",
-        style="{",
-        level="INFO",
-        filename=q_name,
-        filemode="w",
+    log_pipeline = LogPipeline(
+        Path(q_name), json_lines=bool(os.environ.get(JSON_ENVIRONMENT_VARIABLE))
     )
+    log_pipeline.start()
+
+
+def stop_logger():
+    """Write any queued log records and stop the logger's thread."""
+    global log_pipeline
+    if log_pipeline is not None:
+        log_pipeline.stop()
+        log_pipeline = None
 
 
 def load_config_file(program: Path):
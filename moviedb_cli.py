@@ -0,0 +1,449 @@
+"""Headless command line interface to the movie database.
+
+This runs the database.tables functions without Tk so bulk work can be
+scripted or run from cron. Neither tkinter nor any gui or handlers module is
+imported.
+
+Usage:
+    python moviedb_cli.py [--database FILE] [--timing] COMMAND ...
+
+Commands:
+    match        Print the movies which match the criteria.
+    add          Add a movie.
+    bulk-import  Add the movies in a JSON Lines or CSV file.
+    export       Write the catalogue as JSON Lines or CSV.
+    tag          List, add, rename, delete, or merge tags, or tag or untag
+                 the movies which match.
+    maintenance  Delete orphans, back up, verify, list backups, restore,
+                 find and merge duplicates, run the analyze, optimize,
+                 vacuum, and integrity tasks, or check the movie summaries.
+
+Results are written as they are produced so large outputs can be piped. Errors
+are written to stderr and give an exit status of 1. Set the environment
+variable MOVIEDB_PROFILE to write a profile of the command next to the log.
+"""
+
+#  Copyright© 2026. Stephen Rigden.
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import time
+
+# Measured before the other imports so the start-up time includes them.
+START_TIME = time.perf_counter()
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+from typing import TextIO
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from database import (
+    backup,
+    dedupe,
+    environment,
+    maintenance,
+    schema,
+    tables,
+    transfer,
+)
+from logpipeline import LogPipeline
+from moviebag import MovieBag, MovieInteger, setstr_to_str
+import profiling
+
+NO_MATCH_CRITERIA = "At least one match criterion is required."
+INVALID_NUMBER_MSG = (
+    "Years and durations must be a number or a range such as 1950-1959:"
+)
+INVALID_SINGLE_NUMBER_MSG = "A movie's year and duration must be a number such as 1950:"
+TIMING_MSG = "Start up {startup:.1f} ms. Command {command:.1f} ms."
+
+
+def main(argv: list[str] = None) -> int:
+    """Runs a command.
+
+    Args:
+        argv: The command line arguments. Defaults to sys.argv[1:].
+
+    Returns:
+        The exit status.
+    """
+    args = _parser().parse_args(argv)
+    program_path = Path(__file__)
+    with LogPipeline(Path.cwd() / f"{program_path.stem}.log"):
+        start_engine(args.database)
+        ready_time = time.perf_counter()
+        if os.environ.get(profiling.ENVIRONMENT_VARIABLE):
+            profiling.start(Path.cwd())
+        try:
+            status = args.command(args)
+        except (
+            tables.IntegrityError,
+            tables.NoResultFound,
+            backup.BackupIntegrityError,
+            transfer.UnknownFormat,
+            ValueError,
+        ) as exc:
+            notes = getattr(exc, "__notes__", [str(exc)])
+            print(" ".join(notes), file=sys.stderr)
+            return 1
+        finally:
+            profiling.stop()
+            if args.timing:
+                print(
+                    TIMING_MSG.format(
+                        startup=(ready_time - START_TIME) * 1000,
+                        command=(time.perf_counter() - ready_time) * 1000,
+                    ),
+                    file=sys.stderr,
+                )
+    return status or 0
+
+
+def start_engine(database_fn: Path | None):
+    """Starts the database engine.
+
+    Args:
+        database_fn: A database file to use instead of the program's database
+            in the standard location. It is created if it does not exist.
+    """
+    if database_fn is None:
+        environment.start_engine()
+    else:
+        engine = create_engine(
+            f"sqlite+pysqlite:///{database_fn}",
+            echo=False,
+            query_cache_size=environment.QUERY_CACHE_SIZE,
+        )
+        tables.session_factory = sessionmaker(engine)
+        schema.Base.metadata.create_all(engine)
+        environment._create_indexes(engine)
+
+
+def cmd_match(args: argparse.Namespace) -> int | None:
+    """Prints the movies which match the criteria.
+
+    Returns:
+        1 if no criteria were given.
+    """
+    if not (criteria := _criteria(args)):
+        print(NO_MATCH_CRITERIA, file=sys.stderr)
+        return 1
+    _write_movies(tables.match_movies_compact(criteria), args.format, sys.stdout)
+
+
+def cmd_add(args: argparse.Namespace):
+    """Adds a movie."""
+    movie_bag = MovieBag(title=args.title, year=_movie_integer(args.year, single=True))
+    if args.duration:
+        movie_bag["duration"] = _movie_integer(args.duration, single=True)
+    for key in ("synopsis", "notes"):
+        if value := getattr(args, key):
+            movie_bag[key] = value
+    for key in ("directors", "stars", "tags"):
+        if value := getattr(args, key):
+            movie_bag[key] = set(value)
+    tables.add_movie(movie_bag=movie_bag)
+
+
+def cmd_bulk_import(args: argparse.Namespace):
+    """Adds the movies in a file and reports rows which were not added."""
+    with open(args.file, newline="") as fp:
+        report = transfer.import_movies(fp, fmt=args.format, chunk_size=args.chunk)
+    for error in report.errors:
+        print(f"Line {error.line}: {error.reason} {error.detail}", file=sys.stderr)
+    print(f"{report.added} added. {len(report.errors)} not added.")
+
+
+def cmd_export(args: argparse.Namespace):
+    """Writes the catalogue to a file or to stdout."""
+    if args.file == "-":
+        transfer.export_movies(sys.stdout, fmt=args.format, chunk_size=args.chunk)
+    else:
+        with open(args.file, "w", newline="") as fp:
+            count = transfer.export_movies(fp, fmt=args.format, chunk_size=args.chunk)
+        print(f"{count} movies exported.")
+
+
+def cmd_tag(args: argparse.Namespace) -> int | None:
+    """Runs a tag subcommand.
+
+    Returns:
+        1 if apply or remove was given no criteria.
+    """
+    match args.action:
+        case "list":
+            texts = tables.match_tags(match=args.match) if args.match else None
+            for text in sorted(
+                texts if texts is not None else tables.select_all_tags()
+            ):
+                print(text)
+        case "add":
+            tables.add_tags(tag_texts=set(args.texts))
+        case "rename":
+            tables.edit_tag(old_tag_text=args.old, new_tag_text=args.new)
+        case "delete":
+            with tables.unit_of_work():
+                for text in args.texts:
+                    tables.delete_tag(tag_text=text)
+        case "apply" | "remove":
+            if not (criteria := _criteria(args)):
+                print(NO_MATCH_CRITERIA, file=sys.stderr)
+                return 1
+            if args.action == "apply":
+                count = tables.tag_movies(match=criteria, tag_text=args.text)
+            else:
+                count = tables.untag_movies(match=criteria, tag_text=args.text)
+            print(f"{count} movies changed.")
+        case "merge":
+            count = tables.merge_tags(old_tag_text=args.old, new_tag_text=args.new)
+            print(f"{count} movies changed.")
+
+
+def cmd_maintenance(args: argparse.Namespace):
+    """Runs a maintenance subcommand."""
+    match args.action:
+        case "orphans":
+            tables.delete_all_orphans()
+        case "backup":
+            print(backup.create_snapshot())
+        case "list-backups":
+            for snapshot in backup.list_snapshots():
+                print(snapshot)
+        case "verify":
+            snapshots = [args.snapshot] if args.snapshot else backup.list_snapshots()
+            for snapshot in snapshots:
+                problems = backup.verify(snapshot)
+                print(f"{snapshot}: {'; '.join(problems) if problems else 'ok'}")
+        case "restore":
+            backup.restore(args.snapshot)
+        case "duplicates":
+            pairs = dedupe.find_duplicates(
+                threshold=args.threshold, workers=args.workers
+            )
+            if args.file == "-":
+                dedupe.write_report(sys.stdout, pairs)
+            else:
+                with open(args.file, "w", newline="") as fp:
+                    count = dedupe.write_report(fp, pairs)
+                print(f"{count} probable duplicates reported.")
+        case "merge-people":
+            dedupe.merge_people(keep=args.keep, duplicates=set(args.duplicates))
+        case "merge-movies":
+            dedupe.merge_movies(
+                keep=MovieBag(
+                    title=args.keep_title,
+                    year=_movie_integer(args.keep_year, single=True),
+                ),
+                duplicate=MovieBag(
+                    title=args.duplicate_title,
+                    year=_movie_integer(args.duplicate_year, single=True),
+                ),
+            )
+        case "run":
+            for report in maintenance.run_due(budget=args.budget, force=args.force):
+                print(report)
+        case "summaries":
+            if args.rebuild:
+                tables.rebuild_movie_summaries()
+            problems = tables.check_movie_summaries()
+            for problem in problems:
+                print(problem)
+            print(f"{len(problems)} movie summary problems.")
+
+
+def _write_movies(movies, fmt: str, fp: TextIO):
+    """Writes movies one line at a time.
+
+    Args:
+        movies: Movie bags or MovieRow views.
+        fmt: "text" or "jsonl".
+        fp:
+    """
+    for movie in movies:
+        if fmt == "jsonl":
+            fp.write(json.dumps(transfer._to_record(movie)) + "\n")
+        else:
+            line = f"{movie['title']} ({int(movie['year'])})"
+            if directors := movie.get("directors"):
+                line += f" {setstr_to_str(directors)}"
+            fp.write(line + "\n")
+
+
+def _parser() -> argparse.ArgumentParser:
+    """Returns the command line parser."""
+    parser = argparse.ArgumentParser(
+        prog="moviedb_cli", description="Headless movie database commands."
+    )
+    parser.add_argument(
+        "--database", type=Path, help="Use this SQLite file instead of the default."
+    )
+    parser.add_argument(
+        "--timing",
+        action="store_true",
+        help="Report start-up and command times on stderr.",
+    )
+    subparsers = parser.add_subparsers(required=True, metavar="COMMAND")
+
+    match = subparsers.add_parser("match", help="Print matching movies.")
+    match.set_defaults(command=cmd_match)
+    _add_movie_arguments(match, required=False)
+    match.add_argument("--format", choices=("text", "jsonl"), default="text")
+
+    add = subparsers.add_parser("add", help="Add a movie.")
+    add.set_defaults(command=cmd_add)
+    _add_movie_arguments(add, required=True)
+
+    for name, command, help_text in (
+        ("bulk-import", cmd_bulk_import, "Add the movies in a file."),
+        ("export", cmd_export, "Write the catalogue. FILE may be - for stdout."),
+    ):
+        subparser = subparsers.add_parser(name, help=help_text)
+        subparser.set_defaults(command=command)
+        subparser.add_argument("file", metavar="FILE")
+        subparser.add_argument("--format", choices=transfer.FORMATS, default="jsonl")
+        subparser.add_argument("--chunk", type=int, default=transfer.CHUNK_SIZE)
+
+    tag = subparsers.add_parser("tag", help="Manage tags.")
+    tag.set_defaults(command=cmd_tag)
+    tag_actions = tag.add_subparsers(dest="action", required=True)
+    tag_list = tag_actions.add_parser("list", help="Print tags.")
+    tag_list.add_argument("--match", help="Print tags containing this text.")
+    tag_actions.add_parser("add", help="Add tags.").add_argument("texts", nargs="+")
+    rename = tag_actions.add_parser("rename", help="Rename a tag.")
+    rename.add_argument("old")
+    rename.add_argument("new")
+    tag_actions.add_parser("delete", help="Delete tags.").add_argument(
+        "texts", nargs="+"
+    )
+    for name, help_text in (
+        ("apply", "Tag every matching movie."),
+        ("remove", "Untag every matching movie."),
+    ):
+        subparser = tag_actions.add_parser(name, help=help_text)
+        subparser.add_argument("text")
+        _add_movie_arguments(subparser, required=False)
+    merge = tag_actions.add_parser("merge", help="Merge a tag into another tag.")
+    merge.add_argument("old")
+    merge.add_argument("new")
+
+    maintenance = subparsers.add_parser("maintenance", help="Maintain the database.")
+    maintenance.set_defaults(command=cmd_maintenance)
+    actions = maintenance.add_subparsers(dest="action", required=True)
+    actions.add_parser("orphans", help="Delete people without movies.")
+    actions.add_parser("backup", help="Take a snapshot of the database.")
+    actions.add_parser("list-backups", help="Print the snapshots oldest first.")
+    verify = actions.add_parser("verify", help="Check snapshots.")
+    verify.add_argument("snapshot", nargs="?", type=Path)
+    restore = actions.add_parser("restore", help="Restore a snapshot.")
+    restore.add_argument("snapshot", type=Path)
+    duplicates = actions.add_parser(
+        "duplicates", help="Report probable duplicate movies and people."
+    )
+    duplicates.add_argument("file", metavar="FILE", help="A CSV file or - for stdout.")
+    duplicates.add_argument("--threshold", type=float, default=dedupe.THRESHOLD)
+    duplicates.add_argument(
+        "--workers", type=int, help="Worker processes. Defaults to one per CPU."
+    )
+    merge_people = actions.add_parser(
+        "merge-people", help="Merge duplicate people into one person."
+    )
+    merge_people.add_argument("keep")
+    merge_people.add_argument("duplicates", nargs="+")
+    merge_movies = actions.add_parser(
+        "merge-movies", help="Merge a duplicate movie into another movie."
+    )
+    for name in ("keep_title", "keep_year", "duplicate_title", "duplicate_year"):
+        merge_movies.add_argument(name)
+    run = actions.add_parser(
+        "run", help="Run the analyze, optimize, vacuum, and integrity tasks."
+    )
+    run.add_argument("--budget", type=float, help="Seconds allowed for all the tasks.")
+    run.add_argument(
+        "--force", action="store_true", help="Run tasks which are not yet due."
+    )
+    summaries = actions.add_parser(
+        "summaries", help="Check the movie summaries against the movies."
+    )
+    summaries.add_argument(
+        "--rebuild", action="store_true", help="Rebuild the summaries first."
+    )
+
+    return parser
+
+
+def _criteria(args: argparse.Namespace) -> MovieBag:
+    """Returns the match criteria given by the movie bag options.
+
+    Args:
+        args: The options added by _add_movie_arguments.
+    """
+    criteria = MovieBag()
+    for key in ("title", "synopsis", "notes"):
+        if value := getattr(args, key):
+            criteria[key] = value
+    for key in ("year", "duration"):
+        if value := getattr(args, key):
+            criteria[key] = _movie_integer(value)
+    for key in ("directors", "stars", "tags"):
+        if value := getattr(args, key):
+            criteria[key] = set(value)
+    return criteria
+
+
+def _movie_integer(value: str, *, single: bool = False) -> MovieInteger:
+    """Returns a year or duration given on the command line.
+
+    Args:
+        value:
+        single: A range is not accepted. Criteria may be ranges but the
+            fields of a movie may not.
+
+    Raises:
+        ValueError: If the value is not a number or a range of numbers.
+    """
+    try:
+        movie_integer = MovieInteger(value)
+        if single:
+            int(movie_integer)
+    except (TypeError, ValueError) as exc:
+        message = INVALID_SINGLE_NUMBER_MSG if single else INVALID_NUMBER_MSG
+        error = ValueError(value)
+        error.add_note(f"{message} {value!r}")
+        raise error from exc
+    return movie_integer
+
+
+def _add_movie_arguments(parser: argparse.ArgumentParser, *, required: bool):
+    """Adds the movie bag fields as options.
+
+    Args:
+        parser:
+        required: The title and year are required.
+    """
+    parser.add_argument("--title", required=required)
+    parser.add_argument(
+        "--year", required=required, help="For example, 1950 or 1950-1959."
+    )
+    parser.add_argument("--duration", help="Minutes. For example, 90 or 90-120.")
+    parser.add_argument("--director", dest="directors", action="append")
+    parser.add_argument("--star", dest="stars", action="append")
+    parser.add_argument("--synopsis")
+    parser.add_argument("--notes")
+    parser.add_argument("--tag", dest="tags", action="append")
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
@@ -0,0 +1,534 @@
+"""An optional HTTP/JSON server for the movie database.
+
+Other local programs can query and change the catalogue through this server
+while the Tk program is not running. It uses only asyncio from the standard
+library. The blocking database.tables calls run on a bounded thread pool whose
+size matches the engine's connection pool, so the event loop is never blocked
+by SQL and the database never has more connections than worker threads.
+
+Usage:
+    python moviedb_server.py [--database FILE] [--host HOST] [--port PORT]
+        [--workers N]
+
+Routes:
+    GET    /movies                    Stream every movie as JSON lines.
+    GET    /movies?title=T&year=Y     Select one movie.
+    POST   /movies/match              Stream the movies matching the JSON
+                                      criteria as JSON lines.
+    POST   /movies                    Add the JSON movie.
+    PUT    /movies                    Edit a movie. The JSON body is
+                                      {"old": {title, year}, "new": {fields}}.
+    DELETE /movies?title=T&year=Y     Delete a movie.
+    GET    /tags[?match=TEXT]         List tags.
+    POST   /tags                      Add a tag. The JSON body is {"text": T}.
+    PUT    /tags                      Rename a tag. The JSON body is
+                                      {"old": T1, "new": T2}.
+    DELETE /tags?text=T               Delete a tag.
+
+Movies are JSON objects in the form written by database.transfer. Match
+criteria may give year and duration as ranges such as "1950-1959" but the
+fields of an edit may not. Errors are returned as {"error": [message, detail,
+…]} with status 400, 404, or 409, or 500 for an unexpected failure. A streamed
+response which fails after its status is sent ends without its last chunk and
+the connection is closed.
+"""
+
+#  Copyright© 2026. Stephen Rigden.
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import argparse
+import asyncio
+import concurrent.futures
+import functools
+import itertools
+import json
+import logging
+import sys
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+from http import HTTPStatus
+from pathlib import Path
+from urllib.parse import parse_qsl, urlsplit
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from database import environment, schema, tables, transfer
+from logpipeline import LogPipeline
+from moviebag import MovieBag, MovieInteger
+
+HOST = "127.0.0.1"
+PORT = 8642
+WORKERS = 4
+STREAM_CHUNK = 500
+MAX_BODY = 1_048_576
+SERVER_STARTED_MSG = "The movie database server is listening on"
+INVALID_REQUEST = "The request could not be read."
+INVALID_JSON = "The request body is not a JSON object."
+NOT_FOUND = "There is no such resource."
+INTERNAL_ERROR = "The server failed to serve the request."
+STREAM_FAILED_MSG = "A streamed response failed after its status was sent."
+METHOD_NOT_ALLOWED = "The method is not allowed for this resource."
+JSON_TYPE = "application/json"
+JSON_LINES_TYPE = "application/x-ndjson"
+
+
+class RequestError(Exception):
+    """A request which cannot be served.
+
+    Attributes:
+        status:
+        messages: The error message and any details.
+    """
+
+    def __init__(self, status: HTTPStatus, *messages: str):
+        super().__init__(*messages)
+        self.status = status
+        self.messages = list(messages)
+
+
+@dataclass
+class Request:
+    """A parsed HTTP request."""
+
+    method: str
+    path: str
+    query: dict[str, str]
+    body: bytes = b""
+    keep_alive: bool = True
+
+    def json(self) -> dict:
+        """Returns the decoded JSON object of the body.
+
+        Raises:
+            RequestError with status 400 if the body is not a JSON object.
+        """
+        try:
+            body = json.loads(self.body or b"{}")
+        except ValueError as exc:
+            raise RequestError(HTTPStatus.BAD_REQUEST, INVALID_JSON, str(exc))
+        if not isinstance(body, dict):
+            raise RequestError(HTTPStatus.BAD_REQUEST, INVALID_JSON)
+        return body
+
+
+@dataclass
+class Response:
+    """A response with a complete JSON body or a stream of JSON lines.
+
+    A streamed response is sent with chunked transfer encoding. Its rows are
+    produced in the thread pool STREAM_CHUNK rows at a time.
+    """
+
+    status: HTTPStatus = HTTPStatus.OK
+    body: object = None
+    rows: Iterable | None = field(default=None, repr=False)
+
+
+@dataclass
+class MovieServer:
+    """Serves the routes listed in the module docstring.
+
+    Usage:
+        server = MovieServer(workers=4)
+        await server.serve(host, port)
+    """
+
+    workers: int = WORKERS
+    executor: concurrent.futures.ThreadPoolExecutor = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self.executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="moviedb-server"
+        )
+
+    async def start(self, host: str = HOST, port: int = PORT) -> asyncio.Server:
+        """Starts listening and returns the asyncio server."""
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        address = server.sockets[0].getsockname()
+        logging.info(f"{SERVER_STARTED_MSG} {address[0]}:{address[1]}")
+        return server
+
+    async def serve(self, host: str = HOST, port: int = PORT):
+        """Serves requests until cancelled."""
+        server = await self.start(host, port)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.executor.shutdown(wait=True)
+
+    async def handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ):
+        """Serves the requests of one keep-alive connection."""
+        try:
+            while request := await self._read_request(reader):
+                try:
+                    response = await self.dispatch(request)
+                except RequestError as exc:
+                    response = Response(exc.status, dict(error=exc.messages))
+                except Exception as exc:
+                    logging.exception(
+                        f"{INTERNAL_ERROR} {request.method} {request.path}"
+                    )
+                    response = Response(
+                        HTTPStatus.INTERNAL_SERVER_ERROR,
+                        dict(error=[INTERNAL_ERROR, repr(exc)]),
+                    )
+                completed = await self._write_response(
+                    writer, response, request.keep_alive
+                )
+                if not (completed and request.keep_alive):
+                    break
+        except RequestError as exc:
+            response = Response(exc.status, dict(error=exc.messages))
+            await self._write_response(writer, response, keep_alive=False)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def dispatch(self, request: Request) -> Response:
+        """Calls the route's handler.
+
+        Raises:
+            RequestError
+        """
+        routes = {
+            "/movies": dict(
+                GET=self.get_movies,
+                POST=self.add_movie,
+                PUT=self.edit_movie,
+                DELETE=self.delete_movie,
+            ),
+            "/movies/match": dict(POST=self.match_movies),
+            "/tags": dict(
+                GET=self.get_tags,
+                POST=self.add_tag,
+                PUT=self.edit_tag,
+                DELETE=self.delete_tag,
+            ),
+        }
+        try:
+            methods = routes[request.path.rstrip("/") or "/"]
+        except KeyError:
+            raise RequestError(HTTPStatus.NOT_FOUND, NOT_FOUND, request.path)
+        try:
+            handler = methods[request.method]
+        except KeyError:
+            raise RequestError(HTTPStatus.METHOD_NOT_ALLOWED, METHOD_NOT_ALLOWED)
+        return await handler(request)
+
+    async def get_movies(self, request: Request) -> Response:
+        """Selects one movie or streams every movie."""
+        if not request.query:
+            return Response(rows=transfer.iter_movies(chunk_size=STREAM_CHUNK))
+        movie_bag = await self.run(
+            tables.select_movie, movie_bag=_key_movie_bag(request.query)
+        )
+        return Response(body=transfer._to_record(movie_bag))
+
+    async def match_movies(self, request: Request) -> Response:
+        """Streams the movies which match the criteria."""
+        criteria = _criteria(request.json())
+        return Response(rows=await self.run(tables.match_movies_compact, criteria))
+
+    async def add_movie(self, request: Request) -> Response:
+        """Adds a movie."""
+        movie_bag = _movie_bag(request.json())
+        await self.run(tables.add_movie, movie_bag=movie_bag)
+        return Response(HTTPStatus.CREATED, transfer._to_record(movie_bag))
+
+    async def edit_movie(self, request: Request) -> Response:
+        """Edits a movie."""
+        body = request.json()
+        try:
+            old, new = body["old"], body["new"]
+        except KeyError as exc:
+            raise RequestError(HTTPStatus.BAD_REQUEST, INVALID_JSON, repr(exc))
+        await self.run(
+            tables.edit_movie,
+            old_movie_bag=_key_movie_bag(old),
+            replacement_fields=_criteria(new, single=True),
+        )
+        return Response(body={})
+
+    async def delete_movie(self, request: Request) -> Response:
+        """Deletes a movie."""
+        await self.run(tables.delete_movie, movie_bag=_key_movie_bag(request.query))
+        return Response(body={})
+
+    async def get_tags(self, request: Request) -> Response:
+        """Lists all tags or the tags which match a text."""
+        if match := request.query.get("match"):
+            texts = await self.run(tables.match_tags, match=match)
+        else:
+            texts = await self.run(tables.select_all_tags)
+        return Response(body=sorted(texts))
+
+    async def add_tag(self, request: Request) -> Response:
+        """Adds a tag."""
+        text = _required(request.json(), "text")
+        await self.run(tables.add_tag, tag_text=text)
+        return Response(HTTPStatus.CREATED, dict(text=text))
+
+    async def edit_tag(self, request: Request) -> Response:
+        """Renames a tag."""
+        body = request.json()
+        await self.run(
+            tables.edit_tag,
+            old_tag_text=_required(body, "old"),
+            new_tag_text=_required(body, "new"),
+        )
+        return Response(body={})
+
+    async def delete_tag(self, request: Request) -> Response:
+        """Deletes a tag."""
+        await self.run(tables.delete_tag, tag_text=_required(request.query, "text"))
+        return Response(body={})
+
+    async def run(self, func: Callable, *args, **kwargs):
+        """Runs a blocking tables function in the thread pool.
+
+        Raises:
+            RequestError with status 404 for NoResultFound and 409 for
+            IntegrityError.
+        """
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(
+                self.executor, functools.partial(func, *args, **kwargs)
+            )
+        except tables.NoResultFound as exc:
+            raise RequestError(HTTPStatus.NOT_FOUND, *_notes(exc))
+        except tables.IntegrityError as exc:
+            raise RequestError(HTTPStatus.CONFLICT, *_notes(exc))
+
+    @staticmethod
+    async def _read_request(reader: asyncio.StreamReader) -> Request | None:
+        """Reads a request. Returns None at the end of the connection.
+
+        Raises:
+            RequestError with status 400 if the request cannot be read.
+        """
+        request_line = await reader.readline()
+        if not request_line.strip():
+            return None
+        try:
+            method, target, version = request_line.decode("latin-1").split()
+        except ValueError:
+            raise RequestError(HTTPStatus.BAD_REQUEST, INVALID_REQUEST)
+
+        headers = {}
+        while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        try:
+            if (length := int(headers.get("content-length", 0))) < 0:
+                raise ValueError(length)
+        except ValueError:
+            raise RequestError(HTTPStatus.BAD_REQUEST, INVALID_REQUEST)
+        if length > MAX_BODY:
+            raise RequestError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, INVALID_REQUEST)
+        body = await reader.readexactly(length) if length else b""
+        url = urlsplit(target)
+        keep_alive = headers.get("connection", "").lower() != "close" and (
+            version == "HTTP/1.1"
+            or headers.get("connection", "").lower() == "keep-alive"
+        )
+        return Request(method, url.path, dict(parse_qsl(url.query)), body, keep_alive)
+
+    async def _write_response(
+        self, writer: asyncio.StreamWriter, response: Response, keep_alive: bool
+    ) -> bool:
+        """Writes a response. Streamed rows are written in chunks.
+
+        The status of a streamed response has been sent by the time its rows
+        are read so a failure cannot be reported as an error response. It is
+        logged and the response is left without its last chunk so the client
+        sees it is incomplete.
+
+        Returns:
+            False if a streamed response failed. The connection must then be
+            closed.
+        """
+        status = response.status
+        connection = "keep-alive" if keep_alive else "close"
+        if response.rows is None:
+            body = json.dumps(response.body).encode()
+            writer.write(
+                f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+                f"Content-Type: {JSON_TYPE}\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: {connection}\r\n\r\n".encode() + body
+            )
+            await writer.drain()
+            return True
+
+        writer.write(
+            f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            f"Content-Type: {JSON_LINES_TYPE}\r\n"
+            f"Transfer-Encoding: chunked\r\n"
+            f"Connection: {connection}\r\n\r\n".encode()
+        )
+        rows = iter(response.rows)
+        loop = asyncio.get_running_loop()
+        try:
+            while chunk := await loop.run_in_executor(
+                self.executor, _encode_chunk, rows
+            ):
+                writer.write(f"{len(chunk):x}\r\n".encode() + chunk + b"\r\n")
+                await writer.drain()
+            writer.write(b"0\r\n\r\n")
+            await writer.drain()
+        except ConnectionError:
+            raise
+        except Exception:
+            logging.exception(STREAM_FAILED_MSG)
+            return False
+        finally:
+            # Releases the session of an abandoned generator.
+            if close := getattr(rows, "close", None):
+                await loop.run_in_executor(self.executor, close)
+        return True
+
+
+def start_engine(database_fn: Path | None, *, pool_size: int):
+    """Starts the database engine with a connection pool for the workers.
+
+    Args:
+        database_fn: A database file to use instead of the program's database
+            in the standard location. It is created if it does not exist.
+        pool_size: The number of pooled connections.
+    """
+    if database_fn is None:
+        environment.start_engine()
+    else:
+        engine = create_engine(
+            f"sqlite+pysqlite:///{database_fn}",
+            echo=False,
+            pool_size=pool_size,
+            max_overflow=0,
+            query_cache_size=environment.QUERY_CACHE_SIZE,
+        )
+        tables.session_factory = sessionmaker(engine)
+        schema.Base.metadata.create_all(engine)
+        environment._create_indexes(engine)
+
+
+def _encode_chunk(rows: Iterable) -> bytes:
+    """Returns the JSON lines of the next STREAM_CHUNK rows."""
+    return b"".join(
+        json.dumps(transfer._to_record(row)).encode() + b"\n"
+        for row in itertools.islice(rows, STREAM_CHUNK)
+    )
+
+
+def _notes(exc: Exception) -> list[str]:
+    """Returns the explanatory notes added by the tables module."""
+    return [str(note) for note in getattr(exc, "__notes__", [str(exc)])]
+
+
+def _required(mapping: dict, key: str) -> str:
+    """Returns a required text value.
+
+    Raises:
+        RequestError with status 400 if the value is missing.
+    """
+    try:
+        return str(mapping[key])
+    except KeyError:
+        raise RequestError(HTTPStatus.BAD_REQUEST, INVALID_REQUEST, key)
+
+
+def _key_movie_bag(mapping: dict) -> MovieBag:
+    """Returns a movie bag holding the title and year of a movie.
+
+    Raises:
+        RequestError with status 400 if either is missing or invalid.
+    """
+    try:
+        return MovieBag(
+            title=str(mapping["title"]), year=MovieInteger(int(mapping["year"]))
+        )
+    except (KeyError, TypeError, ValueError) as exc:
+        raise RequestError(HTTPStatus.BAD_REQUEST, INVALID_REQUEST, repr(exc))
+
+
+def _movie_bag(record: dict) -> MovieBag:
+    """Returns the movie bag of a complete JSON movie.
+
+    Raises:
+        RequestError with status 400 if the movie is invalid.
+    """
+    movie_bag = transfer._from_record(0, record)
+    if isinstance(movie_bag, transfer.RowError):
+        raise RequestError(HTTPStatus.BAD_REQUEST, movie_bag.reason, movie_bag.detail)
+    return movie_bag
+
+
+def _criteria(record: dict, *, single: bool = False) -> MovieBag:
+    """Returns the movie bag of match criteria or replacement fields.
+
+    Args:
+        record:
+        single: Year and duration must be single numbers as they are for
+            replacement fields. Otherwise, they may be ranges such as
+            "1950-1959".
+
+    Raises:
+        RequestError with status 400 if a field is invalid.
+    """
+    criteria = MovieBag()
+    try:
+        for key, value in record.items():
+            match key:
+                case "title" | "synopsis" | "notes":
+                    criteria[key] = str(value)
+                case "year" | "duration" if single:
+                    criteria[key] = MovieInteger(int(str(value)))
+                case "year" | "duration":
+                    criteria[key] = MovieInteger(str(value))
+                case "directors" | "stars" | "tags":
+                    criteria[key] = {value} if isinstance(value, str) else set(value)
+                case _:
+                    raise ValueError(key)
+    except (TypeError, ValueError) as exc:
+        raise RequestError(HTTPStatus.BAD_REQUEST, INVALID_REQUEST, repr(exc))
+    return criteria
+
+
+def main(argv: list[str] = None) -> int:
+    """Runs the server until it is interrupted."""
+    parser = argparse.ArgumentParser(
+        prog="moviedb_server", description="Serve the movie database over HTTP."
+    )
+    parser.add_argument("--database", type=Path)
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--workers", type=int, default=WORKERS)
+    args = parser.parse_args(argv)
+
+    program_path = Path(__file__)
+    with LogPipeline(Path.cwd() / f"{program_path.stem}.log"):
+        start_engine(args.database, pool_size=args.workers)
+        try:
+            asyncio.run(MovieServer(workers=args.workers).serve(args.host, args.port))
+        except KeyboardInterrupt:
+            pass
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
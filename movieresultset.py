@@ -0,0 +1,247 @@
+"""A compact columnar container for large movie results."""
+
+#  Copyright© 2026. Stephen Rigden.
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import sys
+from array import array
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any
+
+from moviebag import MovieBag, MovieInteger
+
+# Sentinel stored in integer columns for an absent value.
+ABSENT = -(2**63)
+EPOCH = datetime(1970, 1, 1)
+MICROSECOND = timedelta(microseconds=1)
+UNEXPECTED_KEY = "Unexpected key"
+
+
+class _RaggedColumn:
+    """A column of variable length tuples of interned strings.
+
+    The strings of every row are stored end to end as indexes into the
+    owner's string pool. The offsets array marks where each row starts.
+    """
+
+    __slots__ = ("values", "offsets")
+
+    def __init__(self):
+        self.values = array("i")
+        self.offsets = array("i", [0])
+
+    def append(self, string_ids: Iterable[int]):
+        """Appends one row of string ids."""
+        self.values.extend(string_ids)
+        self.offsets.append(len(self.values))
+
+    def row(self, ix: int) -> array:
+        """Returns the string ids of row ix."""
+        return self.values[self.offsets[ix] : self.offsets[ix + 1]]
+
+
+@dataclass
+class MovieResultSet:
+    """A compact, read-only alternative to a list of movie bags.
+
+    A list of MovieBag objects holds a dict, several sets, and two
+    MovieInteger objects for every movie. This container holds each field as a
+    column. Integer and timestamp columns are arrays of machine integers. The
+    names of directors and stars and the texts of tags are interned into a
+    single string pool so that a name which appears in a thousand movies is
+    stored once.
+
+    Rows are presented as MovieRow views which support the read access used by
+    the GUI for movie bags. For example:
+        >> results = MovieResultSet.from_movie_bags(movie_bags)
+        >> row = results[0]
+        >> row["title"], int(row["year"]), row.get("directors", set())
+        >> row.to_movie_bag()
+
+    The row order can be changed with sort() without moving the columns.
+    """
+
+    ids: array = field(default_factory=lambda: array("q"), repr=False)
+    created: array = field(default_factory=lambda: array("q"), repr=False)
+    updated: array = field(default_factory=lambda: array("q"), repr=False)
+    titles: list[str] = field(default_factory=list, repr=False)
+    years: array = field(default_factory=lambda: array("q"), repr=False)
+    durations: array = field(default_factory=lambda: array("q"), repr=False)
+    synopses: list[str | None] = field(default_factory=list, repr=False)
+    notes: list[str | None] = field(default_factory=list, repr=False)
+    directors: _RaggedColumn = field(default_factory=_RaggedColumn, repr=False)
+    stars: _RaggedColumn = field(default_factory=_RaggedColumn, repr=False)
+    tags: _RaggedColumn = field(default_factory=_RaggedColumn, repr=False)
+
+    # The interned string pool for directors, stars, and tags.
+    strings: list[str] = field(default_factory=list, repr=False)
+    _string_ids: dict[str, int] = field(default_factory=dict, repr=False)
+
+    # View order of rows. None is insertion order.
+    _order: array | None = field(default=None, repr=False)
+
+    @classmethod
+    def from_movie_bags(cls, movie_bags: Iterable[MovieBag]) -> "MovieResultSet":
+        """Returns a result set holding the movie bags.
+
+        Args:
+            movie_bags:
+        """
+        results = cls()
+        for movie_bag in movie_bags:
+            results.append(movie_bag)
+        return results
+
+    def append(self, movie_bag: MovieBag):
+        """Appends a movie bag to the end of the result set.
+
+        Args:
+            movie_bag: title and year are required. All other fields are
+            optional.
+        """
+        self.ids.append(self._from_optional_int(movie_bag.get("id")))
+        self.created.append(self._from_datetime(movie_bag.get("created")))
+        self.updated.append(self._from_datetime(movie_bag.get("updated")))
+        self.titles.append(movie_bag["title"])
+        self.years.append(int(movie_bag["year"]))
+        self.durations.append(self._from_optional_int(movie_bag.get("duration")))
+        self.synopses.append(movie_bag.get("synopsis") or None)
+        self.notes.append(movie_bag.get("notes") or None)
+        self.directors.append(self._intern(movie_bag.get("directors")))
+        self.stars.append(self._intern(movie_bag.get("stars")))
+        self.tags.append(self._intern(movie_bag.get("tags")))
+        if self._order is not None:
+            self._order.append(len(self.titles) - 1)
+
+    def sort(self, *, key: Callable[["MovieRow"], Any] = None, reverse=False):
+        """Sorts the row views in place without moving the columns.
+
+        Args:
+            key: A function of one MovieRow. Defaults to the title.
+            reverse:
+        """
+        if key is None:
+            key = _title_key
+        self._order = array(
+            "q",
+            sorted(
+                self._order if self._order is not None else range(len(self.titles)),
+                key=lambda ix: key(MovieRow(self, ix)),
+                reverse=reverse,
+            ),
+        )
+
+    def __len__(self) -> int:
+        return len(self.titles)
+
+    def __getitem__(self, ix: int) -> "MovieRow":
+        if ix < 0:
+            ix += len(self.titles)
+        if not 0 <= ix < len(self.titles):
+            raise IndexError(ix)
+        return MovieRow(self, self._order[ix] if self._order is not None else ix)
+
+    def __iter__(self) -> Iterator["MovieRow"]:
+        order = self._order if self._order is not None else range(len(self.titles))
+        for ix in order:
+            yield MovieRow(self, ix)
+
+    def _intern(self, texts: Iterable[str] | None) -> list[int]:
+        """Returns the pool indexes of the texts adding new texts to the pool."""
+        string_ids = []
+        for text in sorted(texts or ()):
+            try:
+                string_id = self._string_ids[text]
+            except KeyError:
+                string_id = self._string_ids[text] = len(self.strings)
+                self.strings.append(sys.intern(text))
+            string_ids.append(string_id)
+        return string_ids
+
+    @staticmethod
+    def _from_optional_int(value: int | MovieInteger | None) -> int:
+        """Returns an integer column value, using ABSENT for a missing value."""
+        return int(value) if value else ABSENT
+
+    @staticmethod
+    def _from_datetime(value: datetime | None) -> int:
+        """Returns microseconds since the epoch, using ABSENT for a missing value."""
+        return (value - EPOCH) // MICROSECOND if value else ABSENT
+
+
+class MovieRow(Mapping):
+    """A lightweight read-only view of one row of a MovieResultSet.
+
+    It supports the same read access as a MovieBag. As with the movie bags
+    created by the database.tables module, optional fields without a value are
+    absent rather than empty.
+    """
+
+    __slots__ = ("_results", "_ix")
+
+    def __init__(self, results: MovieResultSet, ix: int):
+        self._results = results
+        self._ix = ix
+
+    def __getitem__(self, key: str) -> Any:
+        results, ix = self._results, self._ix
+        match key:
+            case "title":
+                return results.titles[ix]
+            case "year":
+                return MovieInteger(results.years[ix])
+            case "id" if results.ids[ix] != ABSENT:
+                return results.ids[ix]
+            case "created" if results.created[ix] != ABSENT:
+                return EPOCH + results.created[ix] * MICROSECOND
+            case "updated" if results.updated[ix] != ABSENT:
+                return EPOCH + results.updated[ix] * MICROSECOND
+            case "duration" if results.durations[ix] != ABSENT:
+                return MovieInteger(results.durations[ix])
+            case "synopsis" if results.synopses[ix] is not None:
+                return results.synopses[ix]
+            case "notes" if results.notes[ix] is not None:
+                return results.notes[ix]
+            case "directors" | "stars" | "tags":
+                string_ids = getattr(results, key).row(ix)
+                if string_ids:
+                    return {results.strings[string_id] for string_id in string_ids}
+        raise KeyError(f"{UNEXPECTED_KEY}: {key}")
+
+    def __iter__(self) -> Iterator[str]:
+        for key in MovieBag.__annotations__:
+            if key in self:
+                yield key
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __contains__(self, key: object) -> bool:
+        try:
+            self[key]
+        except KeyError:
+            return False
+        return True
+
+    def __repr__(self) -> str:  # pragma nocover
+        return f"{self.__class__.__qualname__}({dict(self)!r})"
+
+    def to_movie_bag(self) -> MovieBag:
+        """Returns a MovieBag copy of this row."""
+        return MovieBag(**self)
+
+
+def _title_key(row: MovieRow) -> str:
+    """Returns the default sort key of a MovieRow."""
+    return row["title"]
@@ -0,0 +1,165 @@
+"""Opt-in profiling of the program.
+
+While profiling is on, cProfile counts and times every call, and a sampling
+thread records the stack of every thread every SAMPLE_INTERVAL seconds. The
+samples give the whole stacks which cProfile does not keep, including those
+of work done in the thread pool. When profiling is turned off two files are
+written next to the log file in the working directory:
+    profile_<timestamp>.pstats      Loaded by pstats, snakeviz, or gprof2dot.
+    profile_<timestamp>.collapsed   Collapsed stacks for flamegraph.pl or
+                                    speedscope.
+
+Profiling is off by default and then costs nothing. It is turned on and off
+by the 'Profile' item of the Moviedb menu. Setting the environment variable
+MOVIEDB_PROFILE profiles a whole run of moviedb or moviedb_cli.
+"""
+
+#  Copyright© 2026. Stephen Rigden.
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import cProfile
+import logging
+import sys
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from types import FrameType
+
+ENVIRONMENT_VARIABLE = "MOVIEDB_PROFILE"
+FILE_STEM = "profile"
+SAMPLE_INTERVAL = 0.005
+PROFILE_STARTED_MSG = "Profiling has started."
+PROFILE_SAVED_MSG = "The profile has been saved."
+
+_profile: cProfile.Profile | None = None
+_sampler: "Sampler | None" = None
+_directory: Path | None = None
+
+
+@dataclass
+class Sampler:
+    """Samples the stacks of every thread but its own.
+
+    samples counts the collapsed stacks. Each is the thread name followed by
+    its frames outermost first, separated by semicolons.
+    """
+
+    interval: float = SAMPLE_INTERVAL
+    samples: Counter[str] = field(default_factory=Counter, init=False)
+    stop_event: threading.Event = field(default_factory=threading.Event, init=False)
+    thread: threading.Thread | None = field(default=None, init=False)
+
+    def start(self):
+        """Starts sampling in a daemon thread."""
+        self.thread = threading.Thread(
+            target=self.run, name="profiling sampler", daemon=True
+        )
+        self.thread.start()
+
+    def stop(self):
+        """Stops sampling and waits for the sampling thread to finish."""
+        self.stop_event.set()
+        self.thread.join()
+
+    def run(self):
+        """Takes a sample every interval until stopped."""
+        while not self.stop_event.wait(self.interval):
+            self.sample()
+
+    def sample(self):
+        """Records the current stack of each thread."""
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident != threading.get_ident():
+                stack = [names.get(ident, str(ident)), *_frame_names(frame)]
+                self.samples[";".join(stack)] += 1
+
+
+def is_running() -> bool:
+    """Returns True if the program is being profiled."""
+    return _profile is not None
+
+
+def start(directory: Path = None):
+    """Starts profiling.
+
+    Args:
+        directory: Where the profile is written. Defaults to the working
+            directory which holds the log file.
+    """
+    global _profile, _sampler, _directory
+    if is_running():
+        return
+    _directory = directory or Path.cwd()
+    _sampler = Sampler()
+    _sampler.start()
+    _profile = cProfile.Profile()
+    _profile.enable()
+    logging.info(PROFILE_STARTED_MSG)
+
+
+def stop() -> tuple[Path, Path] | None:
+    """Stops profiling and writes the profile.
+
+    Each line of the collapsed stack file is a stack and its number of
+    samples.
+
+    Returns:
+        The pstats path and the collapsed stack path or None if the program
+        was not being profiled.
+    """
+    global _profile, _sampler
+    if not is_running():
+        return None
+    profile, sampler = _profile, _sampler
+    _profile = _sampler = None
+    profile.disable()
+    sampler.stop()
+
+    timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+    stem = _directory / f"{FILE_STEM}_{timestamp}"
+    pstats_fn = stem.with_suffix(".pstats")
+    profile.dump_stats(pstats_fn)
+    collapsed_fn = stem.with_suffix(".collapsed")
+    with open(collapsed_fn, "w") as fp:
+        for stack, count in sorted(sampler.samples.items()):
+            fp.write(f"{stack} {count}\n")
+    logging.info(f"{PROFILE_SAVED_MSG} {pstats_fn} {collapsed_fn}")
+    return pstats_fn, collapsed_fn
+
+
+def toggle(directory: Path = None) -> tuple[Path, Path] | None:
+    """Starts profiling or stops it and writes the profile.
+
+    Args:
+        directory: Where the profile is written.
+
+    Returns:
+        The paths written by stop or None if profiling was started.
+    """
+    if is_running():
+        return stop()
+    start(directory)
+    return None
+
+
+def _frame_names(frame: FrameType) -> list[str]:
+    """Returns the names of a frame and its callers outermost first."""
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{code.co_qualname} ({Path(code.co_filename).name})")
+        frame = frame.f_back
+    names.reverse()
+    return names
@@ -0,0 +1,66 @@
+"""Test module."""
+
+#  Copyright© 2026. Stephen Rigden.
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from pytest_check import check
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from benchmarks import catalogue, suite
+from database import tables, update
+
+SPEC = catalogue.CatalogueSpec(movies=30, people=15, tags=4, seed=7)
+
+
+def test_generate_is_deterministic():
+    check.equal(catalogue.generate(SPEC), catalogue.generate(SPEC))
+    check.not_equal(
+        catalogue.generate(SPEC).movies,
+        catalogue.generate(catalogue.CatalogueSpec(movies=30, seed=8)).movies,
+    )
+
+
+def test_write_dbv1(tmp_path, monkeypatch):
+    database_fn = tmp_path / "test.sqlite3"
+    rows = catalogue.write_dbv1(database_fn, SPEC)
+    engine = create_engine(f"sqlite+pysqlite:///{database_fn}")
+    monkeypatch.setattr(tables, "session_factory", sessionmaker(engine))
+
+    movie_bags = tables.select_all_movies()
+
+    check.equal(len(movie_bags), SPEC.movies)
+    check.equal(tables.select_all_tags(), {tag["text"] for tag in rows.tags})
+    check.equal(
+        sum(len(movie_bag.get("stars", ())) for movie_bag in movie_bags),
+        len(rows.movie_stars),
+    )
+    engine.dispose()
+
+
+def test_write_dbv0(tmp_path, monkeypatch):
+    database_fn = tmp_path / "test.sqlite3"
+    rows = catalogue.write_dbv0(database_fn, SPEC)
+    monkeypatch.setattr(update.logging, "info", lambda *args, **kwargs: None)
+
+    movie_bags, tag_texts = update.update_old_database("DBv0", database_fn)
+
+    check.equal(len(movie_bags), SPEC.movies)
+    check.equal(tag_texts, {tag["text"] for tag in rows.tags})
+    update.engine.dispose()
+
+
+def test_compare():
+    baseline = dict(fast=dict(median=1.0), slow=dict(median=1.0))
+    results = dict(fast=dict(median=1.2), slow=dict(median=1.3), new=dict(median=9.0))
+
+    check.equal(suite.compare(results, baseline, tolerance=0.25), ["slow"])
@@ -0,0 +1,137 @@
+"""Test module."""
+
+#  Copyright© 2026. Stephen Rigden.
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+from pytest_check import check
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from database import backup, replica, schema, tables
+from moviebag import MovieBag, MovieInteger
+
+MOVIEBAG_1 = MovieBag(title="Backup Movie", year=MovieInteger(4241))
+MOVIEBAG_2 = MovieBag(title="Later Movie", year=MovieInteger(4242))
+
+
+def test_create_snapshot(test_database):
+    progress = MagicMock(name="progress")
+
+    snapshot = backup.create_snapshot(pages=1, pause=0, progress=progress)
+
+    check.equal(snapshot.parent, test_database.parent / backup.BACKUP_DIR_NAME)
+    check.equal(backup.list_snapshots(), [snapshot])
+    check.equal(backup.verify(snapshot), [])
+    check.greater(progress.call_count, 1)
+    remaining, total = progress.call_args.args
+    check.equal(remaining, 0)
+    check.greater(total, 1)
+
+
+def test_create_snapshot_rotates_old_snapshots(test_database):
+    snapshots = [backup.create_snapshot(keep=2, pause=0) for _ in range(3)]
+
+    check.equal(backup.list_snapshots(), snapshots[1:])
+
+
+def test_create_snapshot_failing_verification(test_database, monkeypatch):
+    monkeypatch.setattr(backup, "verify", lambda snapshot: ["Test problem"])
+
+    with check.raises(backup.BackupIntegrityError) as exc_info:
+        backup.create_snapshot(pause=0)
+
+    check.equal(exc_info.value.__notes__, [backup.BACKUP_FAILED_MSG, "Test problem"])
+    check.equal(list(backup.backup_dir().iterdir()), [])
+
+
+def test_start_snapshot(monkeypatch):
+    executor = MagicMock(name="executor")
+    monkeypatch.setattr(
+        backup.config, "current", MagicMock(threadpool_executor=executor)
+    )
+
+    fut = backup.start_snapshot(keep=3)
+
+    executor.submit.assert_called_once_with(backup.create_snapshot, keep=3)
+    check.equal(fut, executor.submit())
+
+
+def test_verify_reports_damaged_files(tmp_path):
+    not_a_database = tmp_path / "not_a_database.sqlite3"
+    not_a_database.write_bytes(b"Not a database" * 100)
+    empty_database = tmp_path / "empty.sqlite3"
+    create_engine(f"sqlite+pysqlite:///{empty_database}").connect().close()
+
+    check.equal(len(backup.verify(not_a_database)), 1)
+    check.is_in("Missing table: movie", backup.verify(empty_database))
+
+
+def test_restore(test_database):
+    snapshot = backup.create_snapshot(pause=0)
+    tables.add_movie(movie_bag=MOVIEBAG_2)
+
+    backup.restore(snapshot)
+
+    check.equal(
+        [movie["title"] for movie in tables.select_all_movies()], [MOVIEBAG_1["title"]]
+    )
+    # The database was saved before it was restored.
+    check.equal(len(backup.list_snapshots()), 2)
+
+
+def test_restore_reloads_replica(test_database):
+    snapshot = backup.create_snapshot(pause=0)
+    tables.add_movie(movie_bag=MOVIEBAG_2)
+    replica.enable()
+
+    backup.restore(snapshot)
+
+    check.equal(replica.stats().loads, 2)
+    check.equal(
+        [movie["title"] for movie in tables.select_all_movies()], [MOVIEBAG_1["title"]]
+    )
+    replica.disable()
+
+
+def test_restore_rejects_damaged_snapshot(test_database):
+    snapshot = backup.backup_dir() / "damaged.sqlite3"
+    snapshot.parent.mkdir()
+    snapshot.write_bytes(b"Not a database" * 100)
+
+    with check.raises(backup.BackupIntegrityError) as exc_info:
+        backup.restore(snapshot)
+
+    check.equal(exc_info.value.__notes__[0], backup.RESTORE_FAILED_MSG)
+    check.equal(len(tables.select_all_movies()), 1)
+
+
+@pytest.fixture(scope="function")
+def test_database(tmp_path) -> Path:
+    """Creates a database file holding MOVIEBAG_1.
+
+    Returns:
+        The database path.
+    """
+    hold_session_factory = tables.session_factory
+    database_fn = tmp_path / "movie_database_DBv1" / "movie_database_DBv1.sqlite3"
+    database_fn.parent.mkdir()
+    engine = create_engine(f"sqlite+pysqlite:///{database_fn}")
+    schema.Base.metadata.create_all(engine)
+    tables.session_factory = sessionmaker(engine)
+    tables.add_movie(movie_bag=MOVIEBAG_1)
+    yield database_fn
+    engine.dispose()
+    tables.session_factory = hold_session_factory
@@ -0,0 +1,219 @@
+"""Test module."""
+
+#  Copyright© 2026. Stephen Rigden.
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import csv
+import io
+
+import pytest
+from pytest_check import check
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from database import dedupe, schema, tables
+from moviebag import MovieBag, MovieInteger
+
+THIRD_MAN = MovieBag(
+    title="The Third Man",
+    year=MovieInteger(1949),
+    directors={"Carol Reed"},
+    stars={"Orson Welles"},
+    tags={"noir"},
+)
+THIRD_MAN_DUPLICATE = MovieBag(
+    title="Third Man, The",
+    year=MovieInteger(1950),
+    directors={"Reed, Carol"},
+    stars={"Joseph Cotten"},
+    tags={"noir", "vienna"},
+)
+RASHOMON = MovieBag(
+    title="Rashomon",
+    year=MovieInteger(1950),
+    directors={"Kurosawa, Akira"},
+    stars={"Toshiro Mifune"},
+)
+IKIRU = MovieBag(
+    title="Ikiru",
+    year=MovieInteger(1952),
+    directors={"Akira Kurosawa"},
+)
+
+
+@pytest.mark.parametrize(
+    "name, expected",
+    [
+        ("Akira Kurosawa", "akira kurosawa"),
+        ("Kurosawa, Akira", "akira kurosawa"),
+        ("KUROSAWA Akira", "akira kurosawa"),
+        ("Jean Renoir", "jean renoir"),
+    ],
+)
+def test_name_key(name, expected):
+    check.equal(dedupe.name_key(name), expected)
+
+
+def test_blocking_keys_join_near_misses():
+    check.is_true(
+        dedupe.movie_blocking_keys("The Third Man", 1949)
+        & dedupe.movie_blocking_keys("Third Man, The", 1950)
+    )
+    check.is_false(
+        dedupe.movie_blocking_keys("The Third Man", 1949)
+        & dedupe.movie_blocking_keys("The Third Man", 1951)
+    )
+    check.is_true(
+        dedupe.person_blocking_keys("Akira Kurosawa")
+        & dedupe.person_blocking_keys("Akira Kurosowa")
+    )
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_find_duplicates(test_database, workers):
+    # Act
+    pairs = dedupe.find_duplicates(workers=workers)
+
+    # Assert
+    check.equal(
+        {(pair.kind, pair.first, pair.second) for pair in pairs},
+        {
+            ("movie", "The Third Man (1949)", "Third Man, The (1950)"),
+            ("person", "Carol Reed", "Reed, Carol"),
+            ("person", "Kurosawa, Akira", "Akira Kurosawa"),
+        },
+    )
+    check.equal([pair.score for pair in pairs], [1.0, 1.0, 1.0])
+
+
+def test_find_duplicates_skips_large_blocks(test_database):
+    check.equal(dedupe.find_duplicates(workers=1, max_block=1), [])
+
+
+def test_write_report():
+    # Arrange
+    pairs = [
+        dedupe.Pair("person", 1.0, 1, "Carol Reed", 2, "Reed, Carol"),
+        dedupe.Pair("movie", 0.75, 3, "Rope (1948)", 4, "Rope! (1948)"),
+    ]
+    fp = io.StringIO(newline="")
+
+    # Act
+    count = dedupe.write_report(fp, pairs)
+
+    # Assert
+    check.equal(count, 2)
+    rows = list(csv.DictReader(io.StringIO(fp.getvalue())))
+    check.equal(
+        rows[1],
+        dict(
+            rank="2",
+            kind="movie",
+            score="0.750",
+            first_id="3",
+            first="Rope (1948)",
+            second_id="4",
+            second="Rope! (1948)",
+        ),
+    )
+
+
+def test_merge_people(test_database):
+    # Act
+    dedupe.merge_people(keep="Carol Reed", duplicates={"Reed, Carol"})
+    dedupe.merge_people(keep="Akira Kurosawa", duplicates={"Kurosawa, Akira"})
+
+    # Assert
+    check.equal(
+        tables.select_movie(movie_bag=THIRD_MAN_DUPLICATE)["directors"],
+        {"Carol Reed"},
+    )
+    check.equal(
+        tables.select_movie(movie_bag=RASHOMON)["directors"], {"Akira Kurosawa"}
+    )
+    with tables.session_factory() as session:
+        check.equal(
+            tables._select_people(session, names={"Reed, Carol", "Kurosawa, Akira"}),
+            set(),
+        )
+
+
+def test_merge_people_in_unit_of_work(test_database):
+    # Act
+    with tables.unit_of_work():
+        dedupe.merge_people(keep="Carol Reed", duplicates={"Reed, Carol"})
+        tables.add_tag(tag_text="merged")
+
+    # Assert
+    check.equal(
+        tables.select_movie(movie_bag=THIRD_MAN_DUPLICATE)["directors"],
+        {"Carol Reed"},
+    )
+    check.is_in("merged", tables.select_all_tags())
+
+
+def test_merge_movies_rolled_back_with_unit_of_work(test_database):
+    # Act
+    with pytest.raises(ZeroDivisionError):
+        with tables.unit_of_work():
+            dedupe.merge_movies(keep=THIRD_MAN, duplicate=THIRD_MAN_DUPLICATE)
+            1 / 0
+
+    # Assert
+    check.equal(
+        tables.select_movie(movie_bag=THIRD_MAN_DUPLICATE)["directors"],
+        {"Reed, Carol"},
+    )
+
+
+def test_merge_missing_person(test_database, caplog):
+    with pytest.raises(tables.NoResultFound) as exc_info:
+        dedupe.merge_people(keep="Carol Reed", duplicates={"Nobody"})
+
+    check.equal(exc_info.value.__notes__, [dedupe.PERSON_NOT_FOUND, "Nobody"])
+
+
+def test_merge_movies(test_database):
+    # Act
+    dedupe.merge_movies(keep=THIRD_MAN, duplicate=THIRD_MAN_DUPLICATE)
+
+    # Assert
+    movie = tables.select_movie(movie_bag=THIRD_MAN)
+    check.equal(movie["directors"], {"Carol Reed", "Reed, Carol"})
+    check.equal(movie["stars"], {"Orson Welles", "Joseph Cotten"})
+    check.equal(movie["tags"], {"noir", "vienna"})
+    with pytest.raises(tables.NoResultFound):
+        tables.select_movie(movie_bag=THIRD_MAN_DUPLICATE)
+
+
+def test_merge_missing_movie(test_database, caplog):
+    missing = MovieBag(title="Missing", year=MovieInteger(1960))
+
+    with pytest.raises(tables.NoResultFound) as exc_info:
+        dedupe.merge_movies(keep=THIRD_MAN, duplicate=missing)
+
+    check.equal(exc_info.value.__notes__, [tables.MOVIE_NOT_FOUND, "Missing", "1960"])
+
+
+@pytest.fixture(scope="function")
+def test_database(tmp_path):
+    """Creates a test database holding duplicate movies and people."""
+    hold_session_factory = tables.session_factory
+    engine = create_engine(f"sqlite+pysqlite:///{tmp_path / 'dedupe.sqlite3'}")
+    tables.session_factory = sessionmaker(engine)
+    schema.Base.metadata.create_all(engine)
+    tables.add_tags(tag_texts={"noir", "vienna"})
+    for movie_bag in (THIRD_MAN, THIRD_MAN_DUPLICATE, RASHOMON, IKIRU):
+        tables.add_movie(movie_bag=movie_bag)
+    yield
+    engine.dispose()
+    tables.session_factory = hold_session_factory
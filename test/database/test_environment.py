@@ -13,9 +13,12 @@
 #  You should have received a copy of the GNU General Public License
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+import time
+from unittest.mock import MagicMock
+
 import pytest
 from pytest_check import check
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, inspect
 
 from database import update, environment
 
@@ -49,6 +52,10 @@ def test_start_engine(monkeypatch, tmp_path, log_info):
     database_dir_name = environment.DATABASE_STEM + environment.schema.VERSION
     database_dir_path = data_dir_path / database_dir_name
     saved_version = environment.schema.VERSION
+    metadata = {
+        environment.SAVED_VERSION: saved_version,
+        environment.SCHEMA_FINGERPRINT: "fingerprint",
+    }
 
     getcreate_directories_calls = []
     monkeypatch.setattr(
@@ -63,15 +70,18 @@ def test_start_engine(monkeypatch, tmp_path, log_info):
     monkeypatch.setattr(
         environment,
         "_getcreate_metadata",
-        mock_getcreate_metadata(get_create_metadata_calls, saved_version),
+        mock_getcreate_metadata(get_create_metadata_calls, metadata),
     )
 
     register_session_factory_calls = []
     monkeypatch.setattr(
         environment,
         "_register_session_factory",
-        lambda *args, **kwargs: register_session_factory_calls.append((args, kwargs)),
+        lambda *args, **kwargs: register_session_factory_calls.append((args, kwargs))
+        or "fingerprint",
     )
+    write_metadata = MagicMock(name="write_metadata")
+    monkeypatch.setattr(environment, "_write_metadata", write_metadata)
 
     # Act
     environment.start_engine()
@@ -79,7 +89,12 @@ def test_start_engine(monkeypatch, tmp_path, log_info):
     # Assert
     check.equal(getcreate_directories_calls, [((data_dir_name, database_dir_name), {})])
     check.equal(get_create_metadata_calls, [((data_dir_path,), {})])
-    check.equal(register_session_factory_calls, [((database_dir_path,), {})])
+    check.equal(
+        register_session_factory_calls,
+        [((database_dir_path,), {"saved_fingerprint": "fingerprint"})],
+    )
+    with check:
+        write_metadata.assert_not_called()
     check.equal(
         log_info,
         (
@@ -124,7 +139,7 @@ def test_start_engine_with_update(monkeypatch, tmp_path):
     monkeypatch.setattr(
         environment,
         "_getcreate_metadata",
-        mock_getcreate_metadata(saved_version),
+        mock_getcreate_metadata({environment.SAVED_VERSION: saved_version}),
     )
 
     monkeypatch.setattr(
@@ -145,6 +160,36 @@ def test_start_engine_with_update(monkeypatch, tmp_path):
     assert update_database_calls == [((saved_version, data_dir_path), {})]
 
 
+def test_start_engine_with_replica(monkeypatch, tmp_path, log_info):
+    # Arrange
+    database_dir_path = tmp_path / (
+        environment.DATABASE_STEM + environment.schema.VERSION
+    )
+    database_dir_path.mkdir()
+    monkeypatch.setattr(
+        environment,
+        "_getcreate_directories",
+        lambda *args: (tmp_path, database_dir_path),
+    )
+    monkeypatch.setenv(environment.replica.ENVIRONMENT_VARIABLE, "1")
+    hold_session_factory = environment.tables.session_factory
+
+    # Act
+    environment.start_engine()
+
+    # Assert
+    check.is_true(environment.replica.is_enabled())
+    check.equal(environment.replica.stats().loads, 1)
+    environment.tables.add_tags(tag_texts={"replica tag"})
+    check.equal(environment.tables.select_all_tags(), {"replica tag"})
+
+    # Cleanup
+    engine = environment.tables.session_factory.kw["bind"]
+    environment.replica.disable()
+    engine.dispose()
+    environment.tables.session_factory = hold_session_factory
+
+
 def test__get_create_directories(monkeypatch):
     data_dir_name = "Movie Data Test"
     database_dir_name = "Movie Database Test"
@@ -204,15 +249,86 @@ def test__getcreate_metadata(tmp_path):
         # noinspection PyTypeChecker
         environment.json.dump(data, fp)
 
-    saved_version = environment._getcreate_metadata(tmp_path)
+    metadata = environment._getcreate_metadata(tmp_path)
 
-    assert saved_version == expected_version
+    assert metadata == data
 
 
 def test__getcreate_metadata_with_missing_metadata_file(tmp_path):
-    saved_version = environment._getcreate_metadata(tmp_path)
+    metadata = environment._getcreate_metadata(tmp_path)
+
+    expected = {environment.SAVED_VERSION: environment.schema.VERSION}
+    check.equal(metadata, expected)
+    check.equal(environment._getcreate_metadata(tmp_path), expected)
+
+
+def test_start_engine_records_fingerprint(monkeypatch, tmp_path, log_info):
+    # Arrange
+    database_dir_path = tmp_path / (
+        environment.DATABASE_STEM + environment.schema.VERSION
+    )
+    database_dir_path.mkdir()
+    monkeypatch.setattr(
+        environment,
+        "_getcreate_directories",
+        lambda *args: (tmp_path, database_dir_path),
+    )
+    hold_session_factory = environment.tables.session_factory
+
+    # Act
+    environment.start_engine()
 
-    assert saved_version == environment.schema.VERSION
+    # Assert
+    check.equal(
+        environment._getcreate_metadata(tmp_path),
+        {
+            environment.SAVED_VERSION: environment.schema.VERSION,
+            environment.SCHEMA_FINGERPRINT: environment.schema_fingerprint(),
+        },
+    )
+
+    # Cleanup
+    environment.tables.session_factory.kw["bind"].dispose()
+    environment.tables.session_factory = hold_session_factory
+
+
+def test_start_engine_warm_start(monkeypatch, tmp_path, log_info):
+    """A warm start neither creates tables nor connects to the database and
+    is faster than a cold start."""
+    # Arrange
+    database_dir_path = tmp_path / (
+        environment.DATABASE_STEM + environment.schema.VERSION
+    )
+    database_dir_path.mkdir()
+    monkeypatch.setattr(
+        environment,
+        "_getcreate_directories",
+        lambda *args: (tmp_path, database_dir_path),
+    )
+    hold_session_factory = environment.tables.session_factory
+    start = time.perf_counter()
+    environment.start_engine()
+    cold_seconds = time.perf_counter() - start
+    environment.tables.session_factory.kw["bind"].dispose()
+    create_all = MagicMock(name="create_all")
+    monkeypatch.setattr(environment.schema.Base.metadata, "create_all", create_all)
+
+    # Act
+    start = time.perf_counter()
+    environment.start_engine()
+    warm_seconds = time.perf_counter() - start
+
+    # Assert
+    engine = environment.tables.session_factory.kw["bind"]
+    with check:
+        create_all.assert_not_called()
+    check.equal(engine.pool.checkedin(), 0)
+    check.less(warm_seconds, cold_seconds)
+    check.equal(environment.tables.select_all_tags(), set())
+
+    # Cleanup
+    engine.dispose()
+    environment.tables.session_factory = hold_session_factory
 
 
 def test__register_session_factory(tmp_path, monkeypatch):
@@ -259,18 +375,102 @@ def test__register_session_factory(tmp_path, monkeypatch):
         "create_all",
         lambda *args, **kwargs: create_all_calls.append((args, kwargs)),
     )
+    create_indexes_calls = []
+    monkeypatch.setattr(
+        environment,
+        "_create_indexes",
+        lambda *args, **kwargs: create_indexes_calls.append((args, kwargs)),
+    )
 
-    environment._register_session_factory(tmp_path)
+    fingerprint = environment._register_session_factory(tmp_path)
 
+    check.equal(fingerprint, environment.schema_fingerprint())
     check.equal(
-        create_engine_calls, [((f"sqlite+pysqlite:///{database_fn}",), {"echo": False})]
+        create_engine_calls,
+        [
+            (
+                (f"sqlite+pysqlite:///{database_fn}",),
+                {"echo": False, "query_cache_size": environment.QUERY_CACHE_SIZE},
+            )
+        ],
     )
     check.equal(environment.tables.session_factory, expected_factory)
     check.equal(create_all_calls, [((expected_engine,), {})])
+    check.equal(create_indexes_calls, [((expected_engine,), {})])
 
     environment.tables.session_factory = hold_session_factory
 
 
+def test__register_session_factory_with_matching_fingerprint(tmp_path, monkeypatch):
+    # Arrange
+    hold_session_factory = environment.tables.session_factory
+    database_name = environment.DATABASE_STEM + environment.schema.VERSION + ".sqlite3"
+    (tmp_path / database_name).touch()
+    create_all = MagicMock(name="create_all")
+    monkeypatch.setattr(environment.schema.Base.metadata, "create_all", create_all)
+    create_indexes = MagicMock(name="create_indexes")
+    monkeypatch.setattr(environment, "_create_indexes", create_indexes)
+
+    # Act
+    environment._register_session_factory(
+        tmp_path, saved_fingerprint=environment.schema_fingerprint()
+    )
+
+    # Assert
+    with check:
+        create_all.assert_not_called()
+    with check:
+        create_indexes.assert_not_called()
+
+    # Cleanup
+    environment.tables.session_factory = hold_session_factory
+
+
+def test__register_session_factory_with_missing_database(tmp_path, monkeypatch):
+    # Arrange
+    hold_session_factory = environment.tables.session_factory
+    create_all = MagicMock(name="create_all")
+    monkeypatch.setattr(environment.schema.Base.metadata, "create_all", create_all)
+    monkeypatch.setattr(environment, "_create_indexes", MagicMock())
+
+    # Act
+    environment._register_session_factory(
+        tmp_path, saved_fingerprint=environment.schema_fingerprint()
+    )
+
+    # Assert
+    with check:
+        create_all.assert_called_once()
+
+    # Cleanup
+    environment.tables.session_factory = hold_session_factory
+
+
+def test_schema_fingerprint(monkeypatch):
+    fingerprint = environment.schema_fingerprint()
+    check.equal(environment.schema_fingerprint(), fingerprint)
+
+    monkeypatch.setattr(
+        environment.schema.Base.metadata.tables["tag"].c.text, "nullable", True
+    )
+    check.not_equal(environment.schema_fingerprint(), fingerprint)
+
+
+def test__create_indexes():
+    engine = create_engine("sqlite+pysqlite:///:memory:")
+    with engine.begin() as connection:
+        connection.exec_driver_sql(
+            "CREATE TABLE movie (id INTEGER PRIMARY KEY, year INTEGER, "
+            "duration INTEGER)"
+        )
+    environment.schema.Base.metadata.create_all(engine)
+
+    environment._create_indexes(engine)
+
+    index_names = {index["name"] for index in inspect(engine).get_indexes("movie")}
+    check.equal(index_names, {"ix_movie_year", "ix_movie_duration"})
+
+
 def test__update_database(monkeypatch, tmp_path, log_info):
     def mock_update_old_database(update_old_database_calls_, movies_, tags_):
         """..."""
@@ -307,6 +507,8 @@ def test__update_database(monkeypatch, tmp_path, log_info):
         "add_movie",
         lambda *args, **kwargs: add_movies_calls.append((args, kwargs)),
     )
+    unit_of_work = MagicMock(name="unit_of_work")
+    monkeypatch.setattr(environment.tables, "unit_of_work", unit_of_work)
 
     saved_version_fn = tmp_path / (environment.SAVED_VERSION + ".json")
     data = {environment.SAVED_VERSION: old_version}
@@ -333,6 +535,10 @@ def test__update_database(monkeypatch, tmp_path, log_info):
     # Assert tags added
     check.equal(add_tags_calls, [((), {"tag_texts": tags})])
 
+    # Assert one unit of work
+    unit_of_work.assert_called_once_with()
+    unit_of_work.return_value.__enter__.assert_called_once_with()
+
     # Assert metafile updated
     with open(saved_version_fn) as fp:
         data = environment.json.load(fp)
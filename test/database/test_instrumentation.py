@@ -0,0 +1,105 @@
+"""Test module."""
+
+#  Copyright© 2026. Stephen Rigden.
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from unittest.mock import MagicMock
+
+import pytest
+from pytest_check import check
+from sqlalchemy import create_engine, Engine, event
+from sqlalchemy.orm import sessionmaker
+
+from database import instrumentation, schema, tables
+from moviebag import MovieBag, MovieInteger
+
+MOVIE_COUNT = 3
+
+
+def test_instrumented_call_is_recorded(instrumented_database):
+    movie_bags = tables.select_all_movies()
+
+    stats = instrumentation.statistics["select_all_movies"]
+    check.equal(stats.calls, 1)
+    check.equal(stats.rows, len(movie_bags))
+    # One select plus lazy loads of stars, directors, and tags for each movie.
+    check.equal(stats.queries, 1 + 3 * MOVIE_COUNT)
+    check.equal(stats.conversion_queries, 3 * MOVIE_COUNT)
+    check.greater(stats.sql_time, 0)
+    check.greater(stats.conversion_time, 0)
+    check.greater_equal(stats.total_time, stats.sql_time + stats.conversion_time)
+    check.equal(sum(stats.total_histogram.buckets.values()), 1)
+
+
+def test_disabled_calls_are_not_recorded(instrumented_database):
+    instrumentation.disable()
+
+    tables.select_all_movies()
+
+    check.equal(instrumentation.statistics, {})
+    check.is_false(
+        event.contains(
+            Engine, "before_cursor_execute", instrumentation._before_cursor_execute
+        )
+    )
+
+
+def test_report(instrumented_database):
+    check.equal(instrumentation.report(), instrumentation.NO_CALLS_MSG)
+    tables.select_all_tags()
+
+    report = instrumentation.report()
+
+    check.is_true(report.startswith(instrumentation.REPORT_TITLE))
+    check.is_in("select_all_tags: 1 calls", report)
+
+
+def test_print_report(instrumented_database):
+    safeprint = MagicMock(name="safeprint")
+    tables.select_all_tags()
+
+    instrumentation.print_report(safeprint)
+
+    safeprint.assert_called_once_with(instrumentation.report(), timestamp=False)
+
+
+def test_histogram():
+    histogram = instrumentation.Histogram()
+
+    for seconds in (0.0005, 0.0015, 0.003, 0.0035, 0.1):
+        histogram.add(seconds)
+
+    check.equal(histogram.buckets, {0: 1, 1: 1, 2: 2, 7: 1})
+    check.equal(len(histogram.lines()), 4)
+
+
+@pytest.fixture(scope="function")
+def instrumented_database():
+    """Creates a small database and enables instrumentation."""
+    engine = create_engine("sqlite+pysqlite:///:memory:")
+    schema.Base.metadata.create_all(engine)
+    hold_session_factory = tables.session_factory
+    tables.session_factory = sessionmaker(engine)
+    for ix in range(MOVIE_COUNT):
+        tables.add_movie(
+            movie_bag=MovieBag(
+                title=f"Movie {ix}",
+                year=MovieInteger(4241 + ix),
+                stars={f"Star {ix}"},
+            )
+        )
+    instrumentation.reset()
+    instrumentation.enable()
+    yield
+    instrumentation.disable()
+    instrumentation.reset()
+    tables.session_factory = hold_session_factory
@@ -0,0 +1,174 @@
+"""Test module."""
+
+#  Copyright© 2026. Stephen Rigden.
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import pytest
+from pytest_check import check
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from database import livesearch, schema, tables
+from moviebag import MovieBag, MovieInteger
+
+THIRD_MAN = livesearch.Match("The Third Man", 1949)
+ROPE = livesearch.Match("Rope", 1948)
+REBECCA = livesearch.Match("Rebecca", 1940)
+MANCHURIAN = livesearch.Match("The Manchurian Candidate", 1962)
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("third", [THIRD_MAN]),
+        ("THIRD man", [THIRD_MAN]),
+        ("man", [MANCHURIAN, THIRD_MAN]),
+        ("hird", [THIRD_MAN]),
+        ("re", [REBECCA, THIRD_MAN]),
+        ("hitch", [REBECCA, ROPE]),
+        ("hitch rop", [ROPE]),
+        ("ca ree", [THIRD_MAN]),
+        ("ebe", [REBECCA]),
+        ("eb", []),
+        ("", []),
+        ("zzz", []),
+    ],
+)
+def test_search(text, expected, test_database):
+    # Act
+    result = livesearch.search(text)
+
+    # Assert
+    check.equal(result.count, len(expected))
+    check.equal(sorted(result.movies), sorted(expected))
+
+
+def test_search_ranks_title_prefix_first(test_database):
+    check.equal(livesearch.search("the").movies, [MANCHURIAN, THIRD_MAN])
+    check.equal(livesearch.search("re").movies, [REBECCA, THIRD_MAN])
+    check.equal(livesearch.search("r").movies, [REBECCA, ROPE, THIRD_MAN])
+
+
+def test_search_limit(test_database):
+    result = livesearch.search("r", limit=2)
+
+    check.equal(result.count, 3)
+    check.equal(result.movies, [REBECCA, ROPE])
+
+
+def test_typing_narrows_previous_result(test_database, monkeypatch):
+    # Arrange
+    index = livesearch.catalogue_index
+    livesearch.search("hit")
+    # Every lookup is made to look dearer than filtering the last result.
+    monkeypatch.setattr(index, "_estimate", lambda word: len(index.titles))
+    lookups = []
+    original_lookup = index._lookup
+    monkeypatch.setattr(
+        index, "_lookup", lambda word: lookups.append(word) or original_lookup(word)
+    )
+
+    # Act
+    for text in ("hitc", "hitch", "hitch r", "hitch ro"):
+        livesearch.search(text)
+
+    # Assert
+    check.equal(lookups, [])
+    check.equal(index.last_positions, [index.titles.index("Rope")])
+
+
+@pytest.mark.parametrize(
+    "last_words, query_words, expected",
+    [
+        (["hit"], ["hitc"], True),
+        (["itc"], ["hitch"], True),
+        (["h"], ["hi"], True),
+        (["hi"], ["hit"], False),
+        (["hit"], ["hi"], False),
+        (["man", "th"], ["the", "man"], False),
+        (["man", "th"], ["man", "th", "r"], True),
+    ],
+)
+def test_narrows(last_words, query_words, expected):
+    check.equal(livesearch._narrows(last_words, query_words), expected)
+
+
+def test_index_is_discarded_by_commit(test_database):
+    # Act
+    tables.add_movie(movie_bag=MovieBag(title="Notorious", year=MovieInteger(1946)))
+
+    # Assert
+    check.is_false(livesearch.catalogue_index.is_current())
+    check.equal(
+        livesearch.search("notorious").movies,
+        [livesearch.Match("Notorious", 1946)],
+    )
+
+
+def test_index_is_kept_after_rolled_back_unit_of_work(test_database):
+    # Act
+    with pytest.raises(ValueError):
+        with tables.unit_of_work():
+            tables.add_movie(movie_bag=MovieBag(title="Zulu", year=MovieInteger(1964)))
+            raise ValueError
+
+    # Assert
+    check.is_true(livesearch.catalogue_index.is_current())
+    check.equal(livesearch.search("zulu").count, 0)
+
+
+def test_index_loaded_during_unit_of_work_is_discarded(test_database):
+    # Act
+    with tables.unit_of_work():
+        tables.add_movie(movie_bag=MovieBag(title="Zulu", year=MovieInteger(1964)))
+        # The index is reloaded from the file without the uncommitted movie.
+        livesearch.invalidate()
+        check.equal(livesearch.search("zulu").count, 0)
+
+    # Assert
+    check.equal(livesearch.search("zulu").movies, [livesearch.Match("Zulu", 1964)])
+
+
+def test_index_is_kept_after_tag_change(test_database):
+    # Act
+    tables.add_tag(tag_text="noir")
+
+    # Assert
+    check.is_true(livesearch.catalogue_index.is_current())
+
+
+@pytest.fixture(scope="function")
+def test_database(tmp_path):
+    """Creates a test database holding four movies and loads the index."""
+    hold_session_factory = tables.session_factory
+    engine = create_engine(f"sqlite+pysqlite:///{tmp_path / 'livesearch.sqlite3'}")
+    tables.session_factory = sessionmaker(engine)
+    schema.Base.metadata.create_all(engine)
+    for movie, directors, stars in (
+        (THIRD_MAN, {"Carol Reed"}, {"Orson Welles", "Joseph Cotten"}),
+        (ROPE, {"Alfred Hitchcock"}, {"James Stewart"}),
+        (REBECCA, {"Alfred Hitchcock"}, {"Laurence Olivier"}),
+        (MANCHURIAN, {"John Frankenheimer"}, {"Frank Sinatra"}),
+    ):
+        tables.add_movie(
+            movie_bag=MovieBag(
+                title=movie.title,
+                year=MovieInteger(movie.year),
+                directors=directors,
+                stars=stars,
+            )
+        )
+    livesearch.catalogue_index.ensure_loaded()
+    yield
+    livesearch.invalidate()
+    engine.dispose()
+    tables.session_factory = hold_session_factory
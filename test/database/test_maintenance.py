@@ -0,0 +1,213 @@
+"""Test module."""
+
+#  Copyright© 2026. Stephen Rigden.
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import json
+import sqlite3
+import time
+from contextlib import closing
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+from pytest_check import check
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from database import maintenance, schema, tables
+from moviebag import MovieBag, MovieInteger
+
+TASK_NAMES = [task.name for task in maintenance.TASKS]
+
+
+def test_metadata_path(tmp_path):
+    data_dir = tmp_path / "Movies-Database"
+    database_fn = data_dir / "movie_database_DBv1" / "movie_database_DBv1.sqlite3"
+
+    check.equal(maintenance.metadata_path(database_fn), data_dir / "maintenance.json")
+    check.equal(
+        maintenance.metadata_path(tmp_path / "other.sqlite3"),
+        tmp_path / "maintenance.json",
+    )
+
+
+def test_run_due_runs_every_task(test_database):
+    # Act
+    reports = maintenance.run_due(test_database)
+
+    # Assert
+    check.equal([report.task for report in reports], TASK_NAMES)
+    check.is_true(all(report.completed for report in reports))
+    check.equal(maintenance.due(test_database), [])
+    check.equal(sorted(maintenance.last_runs(test_database)), sorted(TASK_NAMES))
+
+
+def test_run_due_returns_free_pages(test_database):
+    # Act
+    reports = maintenance.run_due(test_database)
+
+    # Assert
+    vacuum = next(report for report in reports if report.task == "vacuum")
+    check.greater(vacuum.bytes_saved, 0)
+    with closing(sqlite3.connect(test_database)) as conn:
+        check.equal(conn.execute("PRAGMA freelist_count").fetchone(), (0,))
+        check.equal(conn.execute("PRAGMA auto_vacuum").fetchone(), (2,))
+    check.equal(len(tables.select_all_movies()), 10)
+
+
+def test_run_due_gathers_statistics(test_database):
+    maintenance.run_due(test_database)
+
+    with closing(sqlite3.connect(test_database)) as conn:
+        check.is_true(conn.execute("SELECT count(*) FROM sqlite_stat1").fetchone()[0])
+
+
+def test_due_after_interval(test_database):
+    # Arrange
+    maintenance.run_due(test_database)
+    later = datetime.now() + timedelta(days=2)
+
+    # Act
+    due = maintenance.due(test_database, now=later)
+
+    # Assert
+    check.equal([task.name for task in due], ["optimize"])
+
+
+def test_run_due_with_force(test_database):
+    maintenance.run_due(test_database)
+
+    reports = maintenance.run_due(test_database, force=True)
+
+    check.equal([report.task for report in reports], TASK_NAMES)
+
+
+def test_run_task_out_of_time(test_database, monkeypatch):
+    # Arrange
+    monkeypatch.setattr(maintenance, "PROGRESS_STEPS", 1)
+    task = maintenance.TASKS[TASK_NAMES.index("vacuum")]
+
+    # Act
+    report = maintenance.run_task(test_database, task, deadline=time.monotonic() - 1)
+
+    # Assert
+    check.is_false(report.completed)
+    check.equal(report.bytes_saved, 0)
+
+
+def test_run_due_records_task_out_of_time(test_database, monkeypatch):
+    # Arrange
+    monkeypatch.setattr(maintenance, "PROGRESS_STEPS", 1)
+    tasks = iter([False, True])
+
+    # Act
+    reports = maintenance.run_due(test_database, should_stop=lambda: next(tasks, True))
+
+    # Assert
+    check.equal([report.task for report in reports], ["analyze"])
+    check.is_false(reports[0].completed)
+    check.equal(maintenance.last_runs(test_database)["analyze"]["completed"], False)
+    check.equal(maintenance.last_runs(test_database)["analyze"]["interruptions"], 1)
+    # The interrupted task waits for its retry delay.
+    check.equal([task.name for task in maintenance.due(test_database)], TASK_NAMES[1:])
+    later = datetime.now() + maintenance.RETRY_DELAY
+    check.equal(
+        [task.name for task in maintenance.due(test_database, now=later)], TASK_NAMES
+    )
+
+
+def test_retry_delay_doubles(test_database):
+    # Arrange
+    maintenance.run_due(test_database)
+    last_run = datetime(2026, 1, 1)
+    report = maintenance.TaskReport(
+        task="vacuum",
+        last_run=last_run.isoformat(),
+        seconds=10.0,
+        completed=False,
+        interruptions=3,
+    )
+    maintenance._write_metadata(test_database, [report])
+
+    # Act
+    due = [
+        [task.name for task in maintenance.due(test_database, now=last_run + delay)]
+        for delay in (maintenance.RETRY_DELAY * 3, maintenance.RETRY_DELAY * 4)
+    ]
+
+    # Assert
+    check.equal(due, [[], ["vacuum"]])
+
+
+def test_run_due_with_spent_budget(test_database):
+    check.equal(maintenance.run_due(test_database, budget=0), [])
+
+
+def test_metadata_keeps_other_databases(test_database):
+    # Arrange
+    metadata_fn = maintenance.metadata_path(test_database)
+    with open(metadata_fn, "w") as fp:
+        json.dump({"other.sqlite3": {"analyze": {"completed": True}}}, fp)
+
+    # Act
+    maintenance.run_due(test_database)
+
+    # Assert
+    with open(metadata_fn) as fp:
+        metadata = json.load(fp)
+    check.equal(sorted(metadata), sorted(["other.sqlite3", test_database.name]))
+
+
+def test_task_report_str():
+    report = maintenance.TaskReport(
+        task="vacuum",
+        last_run="2026-01-01T00:00:00",
+        seconds=0.25,
+        completed=True,
+        bytes_saved=4096,
+    )
+
+    check.equal(str(report), "vacuum: done in 0.250 s, 4,096 bytes saved")
+
+
+@pytest.fixture(scope="function")
+def test_database(tmp_path) -> Path:
+    """Creates a database file holding ten movies and free pages left by
+    deleting a hundred more.
+
+    Returns:
+        The database path.
+    """
+    hold_session_factory = tables.session_factory
+    database_fn = tmp_path / "movie_database_DBv1" / "movie_database_DBv1.sqlite3"
+    database_fn.parent.mkdir()
+    engine = create_engine(f"sqlite+pysqlite:///{database_fn}")
+    schema.Base.metadata.create_all(engine)
+    tables.session_factory = sessionmaker(engine)
+    with tables.unit_of_work():
+        for ix in range(110):
+            tables.add_movie(
+                movie_bag=MovieBag(
+                    title=f"Movie {ix}",
+                    year=MovieInteger(1950 + ix % 50),
+                    synopsis="A long synopsis. " * 100,
+                    stars={f"Person {ix}"},
+                )
+            )
+    with tables.unit_of_work():
+        for movie_id in range(11, 111):
+            tables.delete_movie_by_id(movie_id=movie_id)
+    engine.dispose()
+    yield database_fn
+    engine.dispose()
+    tables.session_factory = hold_session_factory
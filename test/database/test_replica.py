@@ -0,0 +1,183 @@
+"""Test module."""
+
+#  Copyright© 2026. Stephen Rigden.
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+
+import pytest
+from pytest_check import check
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from database import replica, schema, tables
+from moviebag import MovieBag, MovieInteger
+
+MOVIEBAG_1 = MovieBag(title="Replica Movie", year=MovieInteger(4241), stars={"Star"})
+MOVIEBAG_2 = MovieBag(title="Second Movie", year=MovieInteger(4242))
+
+
+def test_enable(test_database, log_info):
+    replica.enable()
+
+    check.is_true(replica.is_enabled())
+    stats = replica.stats()
+    check.equal(stats.loads, 1)
+    check.greater(stats.size, 0)
+    check.equal(log_info, [((f"{replica.REPLICA_LOADED_MSG} {stats}",), {})])
+
+
+def test_reads_are_served_from_replica(test_database):
+    # Arrange
+    replica.enable()
+    # A write made behind the tables module's back is not seen.
+    with closing(sqlite3.connect(test_database)) as conn, conn:
+        conn.execute("DELETE FROM movie")
+
+    # Act
+    movies = tables.select_all_movies()
+
+    # Assert
+    check.equal([movie["title"] for movie in movies], [MOVIEBAG_1["title"]])
+
+
+def test_writes_reach_file_and_replica(test_database):
+    # Arrange
+    replica.enable()
+
+    # Act
+    tables.add_movie(movie_bag=MOVIEBAG_2)
+
+    # Assert
+    check.equal(replica.stats().loads, 2)
+    with closing(sqlite3.connect(test_database)) as conn:
+        on_file = conn.execute("SELECT title, created FROM movie").fetchall()
+    check.equal(
+        replica._connection.execute("SELECT title, created FROM movie").fetchall(),
+        on_file,
+    )
+    check.equal(
+        sorted(movie.title for movie in tables.select_movie_summaries()),
+        [MOVIEBAG_1["title"], MOVIEBAG_2["title"]],
+    )
+
+
+def test_unit_of_work_reloads_once(test_database):
+    replica.enable()
+
+    with tables.unit_of_work():
+        tables.add_movie(movie_bag=MOVIEBAG_2)
+        # A unit reads its own uncommitted writes from the file.
+        check.equal(
+            tables.select_movie(movie_bag=MOVIEBAG_2)["title"], MOVIEBAG_2["title"]
+        )
+
+    check.equal(replica.stats().loads, 2)
+
+
+def test_rolled_back_unit_does_not_reload(test_database):
+    replica.enable()
+
+    with check.raises(ZeroDivisionError):
+        with tables.unit_of_work():
+            tables.add_movie(movie_bag=MOVIEBAG_2)
+            1 / 0
+
+    check.equal(replica.stats().loads, 1)
+    check.equal(len(tables.select_all_movies()), 1)
+
+
+def test_replica_is_read_only(test_database):
+    replica.enable()
+
+    with check.raises(sqlite3.OperationalError):
+        replica._connection.execute("DELETE FROM movie")
+
+
+def test_failed_reload_disables_replica(test_database, monkeypatch, log_error):
+    # Arrange
+    replica.enable()
+
+    def reload():
+        raise sqlite3.OperationalError("disk I/O error")
+
+    monkeypatch.setattr(replica, "reload", reload)
+
+    # Act
+    tables.add_movie(movie_bag=MOVIEBAG_2)
+
+    # Assert
+    check.is_false(replica.is_enabled())
+    check.equal(log_error, [((f"{replica.REPLICA_FAILED_MSG} disk I/O error",), {})])
+    check.equal(len(tables.select_all_movies()), 2)
+
+
+def test_disable(test_database):
+    replica.enable()
+
+    replica.disable()
+
+    check.is_false(replica.is_enabled())
+    check.is_none(replica.stats())
+    check.equal(tables.session_factory.kw["bind"].url.database, str(test_database))
+    check.equal(len(tables.select_all_movies()), 1)
+
+
+def test_replica_stats_str():
+    stats = replica.ReplicaStats(seconds=0.0125, size=81920, loads=3)
+
+    check.equal(str(stats), "81,920 bytes in 12.5 ms, 3 loads")
+
+
+@pytest.fixture(scope="function")
+def test_database(tmp_path) -> Path:
+    """Creates a database file holding MOVIEBAG_1.
+
+    Returns:
+        The database path.
+    """
+    hold_session_factory = tables.session_factory
+    database_fn = tmp_path / "replica.sqlite3"
+    engine = create_engine(f"sqlite+pysqlite:///{database_fn}")
+    schema.Base.metadata.create_all(engine)
+    tables.session_factory = sessionmaker(engine)
+    tables.add_movie(movie_bag=MOVIEBAG_1)
+    yield database_fn
+    replica.disable()
+    engine.dispose()
+    tables.session_factory = hold_session_factory
+
+
+@pytest.fixture(scope="function")
+def log_error(monkeypatch):
+    """Logs arguments of calls to logging.error."""
+    calls = []
+    monkeypatch.setattr(
+        replica.logging,
+        "error",
+        lambda *args, **kwargs: calls.append((args, kwargs)),
+    )
+    return calls
+
+
+@pytest.fixture(scope="function")
+def log_info(monkeypatch):
+    """Logs arguments of calls to logging.info."""
+    calls = []
+    monkeypatch.setattr(
+        replica.logging,
+        "info",
+        lambda *args, **kwargs: calls.append((args, kwargs)),
+    )
+    return calls
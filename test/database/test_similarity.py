@@ -0,0 +1,169 @@
+"""Test module."""
+
+#  Copyright© 2026. Stephen Rigden.
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import io
+import json
+
+import pytest
+from pytest_check import check
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from database import schema, similarity, tables, transfer
+from moviebag import MovieBag, MovieInteger
+
+
+@pytest.mark.parametrize(
+    "title, expected",
+    [
+        ("The Third Man", "third man"),
+        ("Third Man, The", "third man"),
+        ("THIRD   MAN!", "third man"),
+        ("Amélie", "amelie"),
+        ("Crime & Punishment", "crime and punishment"),
+        ("A", "a"),
+    ],
+)
+def test_title_key(title, expected):
+    check.equal(similarity.title_key(title), expected)
+
+
+def test_probable_duplicates(test_database):
+    # Act
+    exact = similarity.probable_duplicates("Third Man, The", 1949)
+    off_by_one = similarity.probable_duplicates("The Third Man", 1950)
+    typo = similarity.probable_duplicates("The Thrid Man", 1949)
+    too_late = similarity.probable_duplicates("The Third Man", 1951)
+    different = similarity.probable_duplicates("Brief Encounter", 1949)
+
+    # Assert
+    check.equal(exact, [similarity.Candidate("The Third Man", 1949, 1.0)])
+    check.equal([candidate.year for candidate in off_by_one], [1949])
+    check.equal([candidate.title for candidate in typo], ["The Third Man"])
+    check.equal(too_late, [])
+    check.equal(different, [])
+
+
+def test_index_follows_committed_changes(test_database):
+    # Act
+    tables.add_movie(
+        movie_bag=MovieBag(title="Brief Encounter", year=MovieInteger(1945))
+    )
+    tables.edit_movie(
+        old_movie_bag=MovieBag(title="The Third Man", year=MovieInteger(1949)),
+        replacement_fields=MovieBag(title="Third Man", year=MovieInteger(1960)),
+    )
+    tables.delete_movie(movie_bag=MovieBag(title="Rope", year=MovieInteger(1948)))
+
+    # Assert
+    check.equal(
+        [c.title for c in similarity.probable_duplicates("Brief Encounter", 1945)],
+        ["Brief Encounter"],
+    )
+    check.equal(similarity.probable_duplicates("The Third Man", 1949), [])
+    check.equal(
+        [c.year for c in similarity.probable_duplicates("The Third Man", 1960)],
+        [1960],
+    )
+    check.equal(similarity.probable_duplicates("Rope", 1948), [])
+
+
+def test_rolled_back_add_is_not_indexed(test_database):
+    # Arrange
+    movie_bag = MovieBag(title="Third Man, The", year=MovieInteger(1949), tags={"x"})
+
+    # Act
+    with pytest.raises(tables.NoResultFound):
+        tables.add_movie(movie_bag=movie_bag)
+
+    # Assert
+    check.equal(
+        [c.title for c in similarity.probable_duplicates("Third Man", 1949)],
+        ["The Third Man"],
+    )
+
+
+def test_rolled_back_unit_of_work_is_not_indexed(test_database):
+    # Act
+    with pytest.raises(ValueError):
+        with tables.unit_of_work():
+            tables.add_movie(
+                movie_bag=MovieBag(title="Phantom Movie", year=MovieInteger(1950))
+            )
+            raise ValueError
+
+    # Assert
+    check.equal(similarity.probable_duplicates("Phantom Movie", 1950), [])
+
+
+def test_committed_unit_of_work_is_indexed(test_database):
+    # Act
+    with tables.unit_of_work():
+        tables.add_movie(
+            movie_bag=MovieBag(title="Brief Encounter", year=MovieInteger(1945))
+        )
+        tables.delete_movie(movie_bag=MovieBag(title="Rope", year=MovieInteger(1948)))
+
+    # Assert
+    check.equal(
+        [c.title for c in similarity.probable_duplicates("Brief Encounter", 1945)],
+        ["Brief Encounter"],
+    )
+    check.equal(similarity.probable_duplicates("Rope", 1948), [])
+
+
+def test_import_invalidates_index(test_database):
+    # Arrange
+    fp = io.StringIO(json.dumps(dict(title="Rebecca", year=1940)) + "\n")
+
+    # Act
+    transfer.import_movies(fp)
+
+    # Assert
+    check.equal(
+        [c.title for c in similarity.probable_duplicates("Rebecca", 1940)],
+        ["Rebecca"],
+    )
+
+
+def test_warm(test_database):
+    # Arrange
+    similarity.invalidate()
+
+    # Act
+    similarity.title_index.warm()
+
+    # Assert
+    check.equal(
+        set(similarity.title_index.grams.values()),
+        {
+            tuple(similarity.trigrams("third man")),
+            tuple(similarity.trigrams("rope")),
+        },
+    )
+
+
+@pytest.fixture(scope="function")
+def test_database():
+    """Creates a test database holding two movies and loads the index."""
+    hold_session_factory = tables.session_factory
+    engine = create_engine("sqlite+pysqlite:///:memory:")
+    tables.session_factory = sessionmaker(engine)
+    schema.Base.metadata.create_all(engine)
+    for title, year in (("The Third Man", 1949), ("Rope", 1948)):
+        tables.add_movie(movie_bag=MovieBag(title=title, year=MovieInteger(year)))
+    similarity.title_index.ensure_loaded()
+    yield
+    similarity.invalidate()
+    tables.session_factory = hold_session_factory
@@ -13,11 +13,14 @@
 #  You should have received a copy of the GNU General Public License
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+import contextvars
+import threading
+import time
 from unittest.mock import MagicMock
 
 import pytest
 from pytest_check import check
-from sqlalchemy import create_engine, Engine
+from sqlalchemy import create_engine, event, Engine
 from sqlalchemy.exc import NoResultFound
 
 from database import schema, tables
@@ -143,6 +146,198 @@ def test_match_movies(test_database):
         )
 
 
+def test_select_all_movies_compact(test_database):
+    movie_bags = tables.select_all_movies()
+
+    results = tables.select_all_movies_compact()
+
+    check.equal(len(results), 4)
+    check.equal(
+        sorted([dict(row) for row in results], key=lambda bag: bag["id"]),
+        sorted(movie_bags, key=lambda bag: bag["id"]),
+    )
+
+
+def test_match_movies_compact(test_database):
+    criteria = MovieBag(stars={"full"}, year=MovieInteger("4242-4244"))
+
+    results = tables.match_movies_compact(criteria)
+
+    check.equal(
+        {row["notes"] for row in results}, {"I am MOVIEBAG_2", "I am MOVIEBAG_4"}
+    )
+    check.equal(results[0]["stars"], TEST_STARS)
+
+
+def test_match_movies_compact_without_criteria(test_database):
+    results = tables.match_movies_compact(MovieBag())
+
+    check.equal(len(results), 0)
+
+
+def test_facet_counts(test_database):
+    facets = tables.facet_counts(MovieBag())
+
+    check.equal(facets.total, 4)
+    check.equal(facets.tags, [(text, 1) for text in sorted(TAG_TEXTS)])
+    check.equal(facets.decades, [(4240, 4)])
+    check.equal(facets.directors, [("Donald Director", 1)])
+
+
+def test_select_movie_summaries(test_database):
+    summaries = tables.select_movie_summaries()
+
+    check.equal(
+        [summary.title for summary in summaries],
+        ["First Movie", "Fourth Movie", "Third Movie", "Transformer"],
+    )
+    transformer = summaries[-1]
+    check.equal(
+        transformer[1:],
+        (
+            "Transformer",
+            4242,
+            142,
+            "Synopsis for test",
+            "Donald Director",
+            "Edgar Ethelred, Fanny Fullworthy",
+        ),
+    )
+    check.equal(summaries[0][1:], ("First Movie", 4241, None, None, "", ""))
+
+
+def test_select_movie_summaries_with_match(test_database):
+    criteria = MovieBag(stars={"full"}, year=MovieInteger("4242-4244"))
+
+    summaries = tables.select_movie_summaries(criteria)
+
+    check.equal(
+        [summary.title for summary in summaries], ["Fourth Movie", "Transformer"]
+    )
+    check.equal(tables.select_movie_summaries(MovieBag()), [])
+
+
+def test_movie_summaries_follow_changes(test_database):
+    # Act
+    tables.add_movie(
+        movie_bag=MovieBag(
+            title="Added", year=MovieInteger(4250), directors={"Zed", "Abe"}
+        )
+    )
+    tables.edit_movie(
+        old_movie_bag=MOVIEBAG_2,
+        replacement_fields=MovieBag(
+            title="Transformed", directors={"Carol Reed"}, stars={"Orson Welles"}
+        ),
+    )
+    tables.delete_movie(movie_bag=MOVIEBAG_3)
+    with tables.session_factory() as session:
+        session.execute(
+            tables.text("UPDATE person SET name = 'Abel' WHERE name = 'Abe'")
+        )
+        session.commit()
+
+    # Assert
+    summaries = {summary.title: summary for summary in tables.select_movie_summaries()}
+    check.equal(
+        sorted(summaries), ["Added", "First Movie", "Fourth Movie", "Transformed"]
+    )
+    check.equal(summaries["Added"].directors, "Abel, Zed")
+    check.equal(summaries["Transformed"].directors, "Carol Reed")
+    check.equal(summaries["Transformed"].stars, "Orson Welles")
+    check.equal(tables.check_movie_summaries(), [])
+
+
+def test_check_movie_summaries(test_database):
+    # Arrange
+    with tables.session_factory() as session:
+        session.execute(
+            tables.text(
+                "UPDATE movie_summary SET stars = '' WHERE title = 'Transformer'"
+            )
+        )
+        session.execute(
+            tables.text("DELETE FROM movie_summary WHERE title = 'First Movie'")
+        )
+        session.execute(
+            tables.text(
+                "INSERT INTO movie_summary VALUES (99, 'Ghost', 4200, NULL, NULL, '', '')"
+            )
+        )
+        session.commit()
+
+    # Act
+    problems = tables.check_movie_summaries()
+
+    # Assert
+    check.equal(
+        problems,
+        [
+            f"{tables.SUMMARY_MISSING} First Movie (4241)",
+            f"{tables.SUMMARY_STALE} Transformer (4242)",
+            f"{tables.SUMMARY_ORPHANED} 99",
+        ],
+    )
+    tables.rebuild_movie_summaries()
+    check.equal(tables.check_movie_summaries(), [])
+
+
+def test_movie_summaries_filled_when_table_is_created(test_database):
+    # Arrange
+    engine = tables.session_factory.kw["bind"]
+    schema.movie_summary_table.drop(engine)
+
+    # Act
+    schema.Base.metadata.create_all(engine)
+
+    # Assert
+    check.equal(len(tables.select_movie_summaries()), 4)
+    check.equal(tables.check_movie_summaries(), [])
+
+
+def test_facet_counts_with_match(test_database):
+    facets = tables.facet_counts(MovieBag(stars={"Edgar"}, year=MovieInteger("4244")))
+
+    check.equal(facets, tables.Facets(1, [], [(4240, 1)], []))
+
+
+def test_facet_counts_cache(test_database, statements, monkeypatch):
+    # Arrange
+    now = 1000.0
+    monkeypatch.setattr(tables.time, "monotonic", lambda: now)
+    facets = tables.facet_counts(MovieBag(title="Movie"))
+    query_count = len(statements)
+
+    # Act and Assert
+    check.equal(tables.facet_counts(MovieBag(title="Movie")), facets)
+    check.equal(len(statements), query_count, msg="The cache was not used.")
+
+    now += tables.FACET_CACHE_SECONDS + 1
+    tables.facet_counts(MovieBag(title="Movie"))
+    check.equal(len(statements), 2 * query_count, msg="The cache did not expire.")
+
+    tables.clear_facet_cache()
+    tables.facet_counts(MovieBag(title="Movie"))
+    check.equal(len(statements), 3 * query_count, msg="The cache was not cleared.")
+
+
+def test_facet_counts_with_wide_year_range(test_database):
+    wide = MovieInteger("1-5000000")
+
+    start = time.perf_counter()
+    facets = tables.facet_counts(MovieBag(year=wide))
+    seconds = time.perf_counter() - start
+
+    check.equal(facets.total, len(tables.select_all_movies()))
+    check.less(seconds, 0.2)
+
+
+def test_criteria_fingerprint_keys_movie_integer_by_intervals():
+    key = tables._criteria_fingerprint(MovieBag(year=MovieInteger("1-5000000, 7")))
+
+    check.equal(key, (("year", ("MovieInteger", ((1, 5000000),))),))
+
+
 def test_add_movie(test_database):
     # Arrange
     extra_star = "Gerald Golightly"
@@ -287,6 +482,74 @@ def test_edit_movie(test_database):
 
 
 # noinspection PyPep8Naming
+def test_edit_movie_notes_only_query_count(test_database, statements):
+    replacement_fields = MovieBag(
+        title=MOVIEBAG_2["title"], year=MOVIEBAG_2["year"], notes="Edited notes"
+    )
+
+    tables.edit_movie(old_movie_bag=MOVIEBAG_2, replacement_fields=replacement_fields)
+
+    # One SELECT of the movie and one UPDATE of its row.
+    check.equal(len(statements), 2, msg=statements)
+    movie = tables.select_movie(movie_bag=MOVIEBAG_2)
+    check.equal(movie["notes"], "Edited notes")
+    check.equal(movie["directors"], MOVIEBAG_2["directors"])
+    check.equal(movie["stars"], MOVIEBAG_2["stars"])
+    check.equal(movie["tags"], MOVIEBAG_2["tags"])
+
+
+def test_edit_movie_with_unchanged_relationships(test_database, statements):
+    tables.edit_movie(old_movie_bag=MOVIEBAG_2, replacement_fields=MOVIEBAG_2)
+
+    check.equal(
+        [statement for statement in statements if " IN (" in statement],
+        [],
+        msg="Unchanged names were selected.",
+    )
+
+
+def test_edit_movie_changes_only_differences(test_database):
+    replacement_fields = MovieBag(
+        title=MOVIEBAG_2["title"],
+        year=MOVIEBAG_2["year"],
+        directors=set(),
+        stars={"Fanny Fullworthy", "New Star"},
+        tags={SOUGHT_TAG},
+    )
+
+    tables.edit_movie(old_movie_bag=MOVIEBAG_2, replacement_fields=replacement_fields)
+
+    movie = tables.select_movie(movie_bag=MOVIEBAG_2)
+    check.equal(movie.get("directors", set()), set())
+    check.equal(movie["stars"], {"Fanny Fullworthy", "New Star"})
+    check.equal(movie["tags"], {SOUGHT_TAG})
+    with tables.session_factory() as session:
+        people = tables._select_people(
+            session, names=TEST_DIRECTORS | {"Edgar Ethelred"}
+        )
+        check.equal(
+            {person.name for person in people},
+            {"Edgar Ethelred"},
+            msg="Either an orphan was not removed or a star of another "
+            "movie was removed.",
+        )
+
+
+def test_edit_movie_with_missing_tag(test_database, caplog):
+    tag_text = "Definitely not a tag"
+    replacement_fields = MovieBag(
+        title=MOVIEBAG_2["title"], year=MOVIEBAG_2["year"], tags={tag_text}
+    )
+    exc_notes = f"{tables.TAG_NOT_FOUND}\n{tag_text}"
+
+    with pytest.raises(NoResultFound, match=exc_notes):
+        tables.edit_movie(
+            old_movie_bag=MOVIEBAG_2, replacement_fields=replacement_fields
+        )
+
+    check.equal(caplog.messages, [f"{tables.TAG_NOT_FOUND}: {tag_text}"])
+
+
 def test_edit_movie_raises_NoResultFound(test_database, log_error):
     title = "Test Edit Movie Not Found"
     year = MovieInteger(5042)
@@ -440,6 +703,180 @@ def test_previously_deleted_movie(test_database):
         check.equal(len(people), 0, msg=f"People not removed from people table.")
 
 
+def test_select_movie_by_id(test_database, statements):
+    movie_bag = tables.select_movie(movie_bag=MOVIEBAG_2)
+    statements.clear()
+
+    first = tables.select_movie_by_id(movie_id=movie_bag["id"])
+    fetches = len(statements)
+    second = tables.select_movie_by_id(movie_id=movie_bag["id"])
+
+    check.equal(first, movie_bag)
+    check.equal(second, movie_bag)
+    check.greater(fetches, 0)
+    check.equal(len(statements), fetches, msg="The cached movie was fetched again.")
+
+
+def test_select_movie_by_id_after_match_movies(test_database, statements):
+    movie_bag = tables.match_movies(MovieBag(title="Transformer"))[0]
+    statements.clear()
+
+    selected = tables.select_movie_by_id(movie_id=movie_bag["id"])
+
+    check.equal(selected, movie_bag)
+    check.equal(statements, [])
+
+
+def test_select_movie_by_id_returns_copy(test_database):
+    movie_id = tables.select_movie(movie_bag=MOVIEBAG_2)["id"]
+
+    tables.select_movie_by_id(movie_id=movie_id)["tags"].clear()
+
+    check.equal(tables.select_movie_by_id(movie_id=movie_id)["tags"], TAG_TEXTS)
+
+
+def test_select_movie_by_id_with_missing_movie(test_database, log_error):
+    with pytest.raises(NoResultFound) as exc_info:
+        tables.select_movie_by_id(movie_id=4242)
+
+    check.equal(exc_info.value.__notes__, [tables.MOVIE_NOT_FOUND, "4242"])
+    check.equal(log_error, [((f"{tables.MOVIE_NOT_FOUND} id=4242.",), {})])
+
+
+def test_identity_cache_is_cleared_by_commit(test_database):
+    movie_id = tables.select_movie(movie_bag=MOVIEBAG_1)["id"]
+    tables.select_movie_by_id(movie_id=movie_id)
+
+    tables.edit_movie(
+        old_movie_bag=MOVIEBAG_1,
+        replacement_fields=MovieBag(notes="Edited notes"),
+    )
+
+    check.equal(tables.select_movie_by_id(movie_id=movie_id)["notes"], "Edited notes")
+
+
+def test_identity_cache_expires(test_database, statements, monkeypatch):
+    monkeypatch.setattr(tables, "IDENTITY_CACHE_SECONDS", -1.0)
+    movie_id = tables.select_movie(movie_bag=MOVIEBAG_1)["id"]
+    tables.select_movie_by_id(movie_id=movie_id)
+    statements.clear()
+
+    tables.select_movie_by_id(movie_id=movie_id)
+
+    check.greater(len(statements), 0)
+
+
+def test_identity_cache_discards_oldest(test_database, monkeypatch):
+    monkeypatch.setattr(tables, "IDENTITY_CACHE_SIZE", 2)
+    tables.clear_identity_cache()
+
+    movie_bags = tables.match_movies(MovieBag(notes="I am"))
+    tables._cache_movie_bags(movie_bags[:3])
+
+    check.equal(len(movie_bags), 4, msg="The search was too big to cache.")
+    check.equal(
+        [movie_id for _, movie_id in tables._identity_cache],
+        [movie_bags[1]["id"], movie_bags[2]["id"]],
+    )
+
+
+def test_edit_movie_by_id(test_database, statements):
+    old_movie = tables.select_movie_by_id(
+        movie_id=tables.select_movie(movie_bag=MOVIEBAG_2)["id"]
+    )
+    statements.clear()
+
+    tables.edit_movie_by_id(
+        movie_id=old_movie["id"],
+        updated=old_movie["updated"],
+        replacement_fields=MovieBag(notes="Edited notes"),
+    )
+
+    # One SELECT of the movie and one UPDATE of its row.
+    check.equal(len(statements), 2, msg=statements)
+    movie = tables.select_movie_by_id(movie_id=old_movie["id"])
+    check.equal(movie["notes"], "Edited notes")
+    check.equal(movie["tags"], MOVIEBAG_2["tags"])
+
+
+def test_edit_movie_by_id_relationships(test_database):
+    old_movie = tables.select_movie(movie_bag=MOVIEBAG_2)
+
+    tables.edit_movie_by_id(
+        movie_id=old_movie["id"],
+        updated=None,
+        replacement_fields=MovieBag(stars={"Sylvia Star"}, tags={SOUGHT_TAG}),
+    )
+
+    movie = tables.select_movie_by_id(movie_id=old_movie["id"])
+    check.equal(movie["stars"], {"Sylvia Star"})
+    check.equal(movie["tags"], {SOUGHT_TAG})
+
+
+def test_edit_movie_by_id_when_changed(test_database, log_error):
+    old_movie = tables.select_movie(movie_bag=MOVIEBAG_2)
+    stale = datetime(2000, 1, 1)
+
+    with pytest.raises(tables.StaleDataError) as exc_info:
+        tables.edit_movie_by_id(
+            movie_id=old_movie["id"],
+            updated=stale,
+            replacement_fields=MovieBag(notes="Edited notes"),
+        )
+
+    check.equal(
+        exc_info.value.__notes__,
+        [tables.MOVIE_CHANGED, MOVIEBAG_2["title"], str(MOVIEBAG_2["year"])],
+    )
+    check.equal(tables.select_movie(movie_bag=MOVIEBAG_2)["notes"], MOVIEBAG_2["notes"])
+
+
+def test_edit_movie_by_id_with_missing_movie(test_database, log_error):
+    with pytest.raises(NoResultFound) as exc_info:
+        tables.edit_movie_by_id(
+            movie_id=4242, updated=None, replacement_fields=MovieBag(notes="")
+        )
+
+    check.equal(exc_info.value.__notes__, [tables.MOVIE_NOT_FOUND, "4242"])
+
+
+def test_edit_movie_by_id_with_title_year_duplication_error(test_database, log_error):
+    old_movie = tables.select_movie(movie_bag=MOVIEBAG_1)
+
+    with pytest.raises(tables.IntegrityError) as exc_info:
+        tables.edit_movie_by_id(
+            movie_id=old_movie["id"],
+            updated=old_movie["updated"],
+            replacement_fields=MovieBag(
+                title=MOVIEBAG_2["title"], year=MOVIEBAG_2["year"]
+            ),
+        )
+
+    check.equal(
+        exc_info.value.__notes__,
+        [tables.MOVIE_EXISTS, MOVIEBAG_2["title"], str(MOVIEBAG_2["year"])],
+    )
+
+
+def test_delete_movie_by_id(test_database):
+    movie_bag = MovieBag(
+        title="Test Delete Movie",
+        year=MovieInteger(5042),
+        stars={"Sylvia Star", "Sidney Star"},
+    )
+    tables.add_movie(movie_bag=movie_bag)
+    movie_id = tables.select_movie(movie_bag=movie_bag)["id"]
+
+    tables.delete_movie_by_id(movie_id=movie_id)
+    tables.delete_movie_by_id(movie_id=movie_id)
+
+    with pytest.raises(NoResultFound):
+        tables.select_movie_by_id(movie_id=movie_id)
+    with tables.session_factory() as session:
+        people = tables._select_people(session, names=movie_bag["stars"])
+        check.equal(len(people), 0, msg=f"People not removed from people table.")
+
+
 def test_select_all_tags(test_database):
     tag_texts = tables.select_all_tags()
     assert tag_texts == TAG_TEXTS
@@ -520,6 +957,102 @@ def test_delete_missing_tag_suppresses_exception(test_database, log_error):
     tables.delete_tag(tag_text=SOUGHT_TAG)
 
 
+def test_tag_movies(test_database, statements):
+    # Act
+    count = tables.tag_movies(match=MovieBag(title="Movie"), tag_text=SOUGHT_TAG)
+
+    # Assert
+    check.equal(count, 3)
+    check.equal(
+        sum(
+            statement.startswith("INSERT INTO movie_tag_table")
+            for statement in statements
+        ),
+        1,
+    )
+    for movie in tables.match_movies(match=MovieBag(tags={SOUGHT_TAG})):
+        check.is_in(SOUGHT_TAG, movie["tags"])
+    check.equal(len(tables.match_movies(match=MovieBag(tags={SOUGHT_TAG}))), 4)
+
+
+def test_tag_movies_skips_tagged_movies(test_database):
+    count = tables.tag_movies(match=MovieBag(title="Trans"), tag_text=SOUGHT_TAG)
+
+    check.equal(count, 0)
+
+
+def test_tag_movies_clears_identity_cache(test_database):
+    # Arrange
+    tables.select_movie_by_id(movie_id=1)
+
+    # Act
+    tables.tag_movies(match=MovieBag(title="First"), tag_text=SOUGHT_TAG)
+
+    # Assert
+    check.equal(tables.select_movie_by_id(movie_id=1)["tags"], {SOUGHT_TAG})
+
+
+def test_tag_movies_with_missing_tag(test_database, log_error):
+    with pytest.raises(NoResultFound) as exc_info:
+        tables.tag_movies(match=MovieBag(title="Movie"), tag_text="missing")
+
+    check.equal(exc_info.value.__notes__, [tables.TAG_NOT_FOUND, "missing"])
+    check.equal(log_error, [((f"{tables.TAG_NOT_FOUND}: missing",), {})])
+
+
+def test_tag_movies_with_empty_match(test_database):
+    check.equal(tables.tag_movies(match=MovieBag(), tag_text=SOUGHT_TAG), 0)
+
+
+def test_untag_movies(test_database, statements):
+    # Act
+    count = tables.untag_movies(match=MovieBag(title="Trans"), tag_text=SOUGHT_TAG)
+
+    # Assert
+    check.equal(count, 1)
+    check.equal(
+        sum(
+            statement.startswith("DELETE FROM movie_tag_table")
+            for statement in statements
+        ),
+        1,
+    )
+    check.equal(
+        tables.select_movie(movie_bag=MOVIEBAG_2)["tags"], TAG_TEXTS - {SOUGHT_TAG}
+    )
+
+
+def test_merge_tags(test_database):
+    # Arrange
+    tables.add_tag(tag_text="merged")
+    tables.tag_movies(match=MovieBag(title="First"), tag_text="merged")
+    tables.tag_movies(match=MovieBag(title="Trans"), tag_text="merged")
+
+    # Act
+    count = tables.merge_tags(old_tag_text="merged", new_tag_text=SOUGHT_TAG)
+
+    # Assert
+    check.equal(count, 2)
+    check.equal(tables.select_all_tags(), TAG_TEXTS)
+    check.equal(
+        {movie["title"] for movie in tables.match_movies(MovieBag(tags={SOUGHT_TAG}))},
+        {MOVIEBAG_1["title"], MOVIEBAG_2["title"]},
+    )
+
+
+def test_merge_tags_into_itself(test_database):
+    check.equal(tables.merge_tags(old_tag_text=SOUGHT_TAG, new_tag_text=SOUGHT_TAG), 0)
+    check.equal(tables.select_all_tags(), TAG_TEXTS)
+
+
+def test_merge_tags_with_missing_tag(test_database, log_error):
+    with pytest.raises(NoResultFound) as exc_info:
+        tables.merge_tags(old_tag_text=SOUGHT_TAG, new_tag_text="missing")
+
+    check.equal(exc_info.value.__notes__, [tables.TAG_NOT_FOUND, "missing"])
+    check.equal(tables.select_all_tags(), TAG_TEXTS)
+
+
 def test_delete_all_orphans(test_database, log_info):
     names = {"Mona Marimba", "Nigel Nicholby"}
     with tables.session_factory() as session:
@@ -546,6 +1079,263 @@ def test_delete_all_orphans(test_database, log_info):
         )
 
 
+def test_match_movies_cache_hit(test_database, statements):
+    # Arrange
+    match = MovieBag(title="Transformer")
+    tables.match_movies(match)
+    before = tables.match_cache_stats()
+    statements.clear()
+
+    # Act
+    movies = tables.match_movies(MovieBag(title="tRANSFORMER"))
+
+    # Assert
+    check.equal([movie["title"] for movie in movies], [MOVIEBAG_2["title"]])
+    check.equal(statements, [])
+    after = tables.match_cache_stats()
+    check.equal(after.hits - before.hits, 1)
+    check.equal(after.misses, before.misses)
+
+
+def test_match_movies_with_wide_year_range(test_database):
+    wide = MovieBag(year=MovieInteger("1-5000000"))
+    count = len(tables.match_movies(wide))
+
+    start = time.perf_counter()
+    movies = tables.match_movies(wide)
+    seconds = time.perf_counter() - start
+
+    check.equal(len(movies), count)
+    check.less(seconds, 0.2)
+
+
+def test_match_movies_cache_returns_copies(test_database):
+    # Arrange
+    match = MovieBag(title="Transformer")
+    tables.match_movies(match)[0]["stars"].add("Intruder")
+
+    # Act
+    movie = tables.match_movies(match)[0]
+
+    # Assert
+    check.equal(movie["stars"], TEST_STARS)
+    check.equal(int(movie["year"]), int(MOVIEBAG_2["year"]))
+
+
+def test_match_movies_cache_is_cleared_by_commit(test_database, statements):
+    # Arrange
+    match = MovieBag(title="Movie")
+    tables.match_movies(match)
+
+    # Act
+    tables.add_movie(movie_bag=MovieBag(title="Fifth Movie", year=MovieInteger(4245)))
+
+    # Assert
+    statements.clear()
+    check.equal(len(tables.match_movies(match)), 4)
+    check.not_equal(statements, [])
+
+
+def test_match_movies_cache_skips_search_overtaken_by_commit(
+    test_database, monkeypatch
+):
+    # Arrange
+    match = MovieBag(title="Movie")
+    _match_movies = tables._match_movies
+
+    def match_movies_then_commit(session, *, match):
+        """Commits a change while the search is running."""
+        movies = _match_movies(session, match=match)
+        tables.add_movie(
+            movie_bag=MovieBag(title="Fifth Movie", year=MovieInteger(4245))
+        )
+        return movies
+
+    monkeypatch.setattr(tables, "_match_movies", match_movies_then_commit)
+
+    # Act
+    tables.match_movies(match)
+
+    # Assert
+    monkeypatch.setattr(tables, "_match_movies", _match_movies)
+    check.equal(len(tables.match_movies(match)), 4)
+
+
+def test_match_movies_cache_evicts_least_recently_used(test_database, monkeypatch):
+    # Arrange
+    monkeypatch.setattr(tables, "MATCH_CACHE_SIZE", 2)
+    tables.clear_match_cache()
+    before = tables.match_cache_stats()
+    tables.match_movies(MovieBag(title="First"))
+    tables.match_movies(MovieBag(title="Third"))
+    tables.match_movies(MovieBag(title="First"))
+
+    # Act
+    tables.match_movies(MovieBag(title="Fourth"))
+
+    # Assert
+    after = tables.match_cache_stats()
+    check.equal(after.evictions - before.evictions, 1)
+    check.equal(after.entries, 2)
+    tables.match_movies(MovieBag(title="First"))
+    check.equal(tables.match_cache_stats().hits - after.hits, 1)
+
+
+def test_match_movies_cache_is_bounded_by_size(test_database, monkeypatch):
+    # Arrange
+    monkeypatch.setattr(tables, "MATCH_CACHE_BYTES", tables._MOVIE_BAG_BYTES * 2)
+    tables.clear_match_cache()
+
+    # Act
+    tables.match_movies(MovieBag(title="Movie"))
+    tables.match_movies(MovieBag(title="First"))
+
+    # Assert
+    stats = tables.match_cache_stats()
+    check.equal(stats.entries, 1)
+    check.less_equal(stats.size, tables.MATCH_CACHE_BYTES)
+
+
+def test_match_movies_in_unit_of_work_skips_cache(test_database, statements):
+    # Arrange
+    match = MovieBag(title="Transformer")
+    tables.match_movies(match)
+    statements.clear()
+
+    # Act
+    with tables.unit_of_work():
+        tables.match_movies(match)
+
+    # Assert
+    check.not_equal(statements, [])
+
+
+def test_unit_of_work_commits_every_call(test_database, statements):
+    # Arrange
+    movie_bag = MovieBag(title="Unit Movie", year=MovieInteger(4245), tags={"unit"})
+
+    # Act
+    with tables.unit_of_work():
+        tables.add_tags(tag_texts={"unit"})
+        tables.add_movie(movie_bag=movie_bag)
+        check.equal(tables.select_movie(movie_bag=movie_bag)["tags"], {"unit"})
+
+    # Assert
+    check.equal(statements[0], "BEGIN")
+    check.equal(tables.select_movie(movie_bag=movie_bag)["tags"], {"unit"})
+
+
+def test_unit_of_work_rolls_back_on_exception(test_database, log_error):
+    # Arrange
+    movie_bag = MovieBag(title="Unit Movie", year=MovieInteger(4245))
+
+    # Act
+    with pytest.raises(ValueError):
+        with tables.unit_of_work():
+            tables.add_tags(tag_texts={"unit"})
+            tables.add_movie(movie_bag=movie_bag)
+            raise ValueError
+
+    # Assert
+    check.equal(tables.select_all_tags(), TAG_TEXTS)
+    with pytest.raises(NoResultFound):
+        tables.select_movie(movie_bag=movie_bag)
+    check.is_none(tables._unit_session.get())
+
+
+def test_unit_of_work_keeps_changes_after_failed_call(test_database, log_error):
+    # Arrange
+    movie_bag = MovieBag(title="Unit Movie", year=MovieInteger(4245))
+
+    # Act
+    with tables.unit_of_work():
+        tables.add_tag(tag_text="unit")
+        with pytest.raises(tables.IntegrityError):
+            tables.add_movie(movie_bag=MOVIEBAG_1)
+        tables.add_movie(movie_bag=movie_bag)
+
+    # Assert
+    check.equal(tables.select_all_tags(), TAG_TEXTS | {"unit"})
+    check.equal(tables.select_movie(movie_bag=movie_bag)["title"], "Unit Movie")
+
+
+def test_nested_unit_of_work_rolls_back_alone(test_database):
+    # Act
+    with tables.unit_of_work() as outer_session:
+        tables.add_tag(tag_text="outer")
+        with pytest.raises(ValueError):
+            with tables.unit_of_work() as inner_session:
+                check.is_(inner_session, outer_session)
+                tables.add_tag(tag_text="inner")
+                raise ValueError
+
+    # Assert
+    check.equal(tables.select_all_tags(), TAG_TEXTS | {"outer"})
+
+
+def test_unit_of_work_skips_identity_cache(test_database, statements):
+    # Arrange
+    movie_id = tables.select_movie_by_id(movie_id=1)["id"]
+    statements.clear()
+
+    # Act
+    with tables.unit_of_work():
+        tables.select_movie_by_id(movie_id=movie_id)
+        tables.match_movies(match=MovieBag(title="Third"))
+
+    # Assert
+    check.is_true(any(statement.startswith("SELECT") for statement in statements))
+    check.equal(list(tables._identity_cache), [(tables.session_factory.kw["bind"], 1)])
+
+
+def test_rolled_back_unit_of_work_keeps_caches(test_database):
+    # Arrange
+    match = MovieBag(title="Transformer")
+    tables.match_movies(match)
+    tables.select_movie_by_id(movie_id=1)
+
+    # Act
+    with pytest.raises(ValueError):
+        with tables.unit_of_work():
+            tables.add_movie(
+                movie_bag=MovieBag(title="Transformer Two", year=MovieInteger(4245))
+            )
+            raise ValueError
+
+    # Assert
+    check.equal(tables.match_cache_stats().entries, 1)
+    check.is_in((tables.session_factory.kw["bind"], 1), tables._identity_cache)
+
+
+def test_committed_unit_of_work_clears_match_cache(tmp_path):
+    """A search run by another thread while a unit of work is open is not
+    served after the unit commits."""
+    # Arrange
+    engine = create_engine(f"sqlite+pysqlite:///{tmp_path / 'unit.sqlite3'}")
+    schema.Base.metadata.create_all(engine)
+    tables.session_factory = sessionmaker(engine)
+    tables.add_movie(movie_bag=MovieBag(title="Alpha", year=MovieInteger(4241)))
+    match = MovieBag(title="Alpha")
+
+    # Act
+    with tables.unit_of_work():
+        tables.add_movie(movie_bag=MovieBag(title="Alpha Two", year=MovieInteger(4242)))
+        # pytest-check copies the test's context into new threads.
+        reader = threading.Thread(
+            target=contextvars.Context().run, args=(tables.match_movies, match)
+        )
+        reader.start()
+        reader.join()
+        check.equal(tables.match_cache_stats().entries, 1)
+
+    # Assert
+    check.equal(
+        sorted(movie["title"] for movie in tables.match_movies(match)),
+        ["Alpha", "Alpha Two"],
+    )
+    engine.dispose()
+
+
 def test_invalid_movie_regression(test_database):
     """Regression test.
 
@@ -807,6 +1597,20 @@ def test_database(session_engine):
         session.commit()
 
 
+@pytest.fixture(scope="function")
+def statements(test_database):
+    """Records the SQL statements executed after the test database is made."""
+    calls = []
+    engine = tables.session_factory.kw["bind"]
+
+    def before_cursor_execute(_conn, _cursor, statement, *_args):
+        calls.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    yield calls
+    event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
 @pytest.fixture(scope="function")
 def log_error(monkeypatch):
     """Logs arguments of calls to logging.error."""
@@ -186,6 +186,83 @@ def test__match_2_movie(load_movies, db_session: Session):
     assert {movie.notes for movie in movies} == {MOVIEBAG_2["notes"]}
 
 
+def test__match_parameters():
+    movie_bag = MovieBag(
+        id=2,
+        title="Movie",
+        year=MovieInteger("4241, 4243-4244"),
+        stars={"ethel"},
+        directors=set(),
+    )
+
+    shape, parameters = tables._match_parameters(match=movie_bag)
+
+    check.equal(shape, (("title", 1), ("year", (True, False)), ("stars", 1)))
+    check.equal(
+        parameters,
+        dict(
+            title_0="%Movie%",
+            year_0_low=4241,
+            year_0_high=4241,
+            year_1_low=4243,
+            year_1_high=4244,
+            stars_0="%ethel%",
+        ),
+    )
+
+
+@pytest.mark.parametrize(
+    "first, second, equal",
+    [
+        (MovieBag(title="Kwai"), MovieBag(title="kWAI"), True),
+        (MovieBag(title="Kwai"), MovieBag(title="Kwa"), False),
+        (MovieBag(stars={"A", "b"}), MovieBag(stars={"B", "a"}), True),
+        (MovieBag(title="Été"), MovieBag(title="été"), False),
+        (
+            MovieBag(title="A", year=MovieInteger("1950-1959")),
+            MovieBag(year=MovieInteger("1950-1959"), title="a"),
+            True,
+        ),
+    ],
+)
+def test__criteria_fingerprint(first, second, equal):
+    check.equal(
+        tables._criteria_fingerprint(first) == tables._criteria_fingerprint(second),
+        equal,
+    )
+
+
+def test__match_movies_reuses_template(load_movies, db_session: Session):
+    tables._match_template.cache_clear()
+
+    first = tables._match_movies(
+        db_session, match=MovieBag(title="Movie", year=MovieInteger("4241"))
+    )
+    second = tables._match_movies(
+        db_session, match=MovieBag(title="Trans", year=MovieInteger("4242"))
+    )
+
+    check.equal({movie.notes for movie in first}, {MOVIEBAG_1["notes"]})
+    check.equal({movie.notes for movie in second}, {MOVIEBAG_2["notes"]})
+    check.equal(tables._match_template.cache_info().misses, 1)
+
+
+def test__match_statement_binds_values(load_movies, db_session: Session):
+    intersection = tables._match_statement(match=MovieBag(notes="BAG_3"))
+
+    movies = db_session.scalars(
+        tables.select(schema.Movie).from_statement(intersection)
+    ).all()
+
+    check.equal({movie.notes for movie in movies}, {MOVIEBAG_3["notes"]})
+
+
+def test__match_movies_with_empty_set(load_movies, db_session: Session):
+    movies = tables._match_movies(db_session, match=MovieBag(stars=set()))
+
+    check.is_none(movies)
+
+
 def test__select_all_movies(load_movies, db_session: Session):
     movies = tables._select_all_movies(db_session)
 
@@ -0,0 +1,149 @@
+"""Test module."""
+
+#  Copyright© 2026. Stephen Rigden.
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import io
+import json
+
+import pytest
+from pytest_check import check
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from database import schema, tables, transfer
+from moviebag import MovieBag, MovieInteger
+
+MOVIEBAG_1 = MovieBag(
+    title="Transfer Movie",
+    year=MovieInteger(4241),
+    duration=MovieInteger(142),
+    directors={"Donald Director", "Dorothy Director"},
+    stars={"Edgar Ethelred", "Fanny Fullworthy"},
+    synopsis="Synopsis; with a semicolon",
+    notes="Notes",
+    tags={"alpha", "beta"},
+)
+MOVIEBAG_2 = MovieBag(title="Minimal Movie", year=MovieInteger(1999))
+MOVIEBAG_3 = MovieBag(
+    title="Shared Star Movie",
+    year=MovieInteger(2000),
+    stars={"Fanny Fullworthy"},
+    tags={"beta"},
+)
+
+
+def test_iter_movies(test_database):
+    movies = list(transfer.iter_movies(chunk_size=2))
+
+    check.equal(movies, [MOVIEBAG_1, MOVIEBAG_2, MOVIEBAG_3])
+
+
+@pytest.mark.parametrize("fmt", transfer.FORMATS)
+def test_export_import_round_trip(test_database, fmt):
+    fp = io.StringIO(newline="")
+    count = transfer.export_movies(fp, fmt=fmt, chunk_size=2)
+    _new_database()
+
+    fp.seek(0)
+    report = transfer.import_movies(fp, fmt=fmt, chunk_size=2)
+
+    check.equal(count, 3)
+    check.equal(report, transfer.ImportReport(added=3))
+    check.equal(list(transfer.iter_movies()), [MOVIEBAG_1, MOVIEBAG_2, MOVIEBAG_3])
+
+
+def test_export_jsonl_format(test_database):
+    fp = io.StringIO()
+
+    transfer.export_movies(fp)
+
+    records = [json.loads(line) for line in fp.getvalue().splitlines()]
+    check.equal(records[1], dict(title="Minimal Movie", year=1999))
+    check.equal(records[2]["stars"], ["Fanny Fullworthy"])
+
+
+def test_unknown_format_raises_exception(test_database):
+    with check.raises(transfer.UnknownFormat):
+        transfer.export_movies(io.StringIO(), fmt="xml")
+    with check.raises(transfer.UnknownFormat):
+        transfer.import_movies(io.StringIO(), fmt="xml")
+
+
+def test_import_reports_row_errors(test_database):
+    lines = [
+        json.dumps(dict(title="New Movie", year=2001, tags=["gamma"])),
+        "not json",
+        json.dumps(dict(year=2001)),
+        json.dumps(dict(title="Bad Year", year="soon")),
+        json.dumps(dict(title="Early Movie", year=1800)),
+        json.dumps(dict(title="Minimal Movie", year=1999)),
+        "",
+        json.dumps(dict(title="New Movie", year=2001)),
+    ]
+    fp = io.StringIO("\n".join(lines))
+
+    report = transfer.import_movies(fp, chunk_size=3)
+
+    check.equal(report.added, 1)
+    check.equal(
+        [(error.line, error.reason) for error in report.errors],
+        [
+            (2, transfer.INVALID_ROW),
+            (3, transfer.MISSING_TITLE),
+            (4, transfer.INVALID_ROW),
+            (5, tables.INVALID_YEAR),
+            (6, tables.MOVIE_EXISTS),
+            (8, tables.MOVIE_EXISTS),
+        ],
+    )
+    check.equal(tables.select_all_tags(), {"alpha", "beta", "gamma"})
+
+
+def test_import_csv_reports_line_numbers(test_database):
+    fp = io.StringIO(
+        "title,year,duration,directors,stars,synopsis,notes,tags\r\n"
+        "CSV Movie,2002,90,Ann Director; Bob Director,,,,\r\n"
+        "CSV Movie,2002,,,,,,\r\n"
+    )
+
+    report = transfer.import_movies(fp, fmt="csv")
+
+    check.equal(report.added, 1)
+    check.equal(
+        report.errors, [transfer.RowError(3, tables.MOVIE_EXISTS, "CSV Movie, 2002")]
+    )
+    check.equal(
+        tables.select_movie(
+            movie_bag=MovieBag(title="CSV Movie", year=MovieInteger(2002))
+        )["directors"],
+        {"Ann Director", "Bob Director"},
+    )
+
+
+def _new_database():
+    """Replaces the test database with an empty database."""
+    engine = create_engine("sqlite+pysqlite:///:memory:")
+    schema.Base.metadata.create_all(engine)
+    tables.session_factory = sessionmaker(engine)
+
+
+@pytest.fixture(scope="function")
+def test_database():
+    """Creates a test database holding MOVIEBAG_1, MOVIEBAG_2, and MOVIEBAG_3."""
+    hold_session_factory = tables.session_factory
+    _new_database()
+    tables.add_tags(tag_texts={"alpha", "beta"})
+    for movie_bag in (MOVIEBAG_1, MOVIEBAG_2, MOVIEBAG_3):
+        tables.add_movie(movie_bag=movie_bag)
+    yield
+    tables.session_factory = hold_session_factory
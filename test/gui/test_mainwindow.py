@@ -191,6 +191,14 @@ class TestMainWindow:
                         label="Settings for Moviedb…",
                         command=mainwindow.handlers.sundries.settings_dialog,
                     ),
+                    call.add_command(
+                        label="Back Up Database",
+                        command=mainwindow.handlers.database.gui_backup_database,
+                    ),
+                    call.add_command(
+                        label="Profile",
+                        command=mainwindow.handlers.sundries.toggle_profile,
+                    ),
                     call.add_separator(),
                     call.add_command(label="Quit Moviedb", command=tk_shutdown),
                 ],
@@ -303,6 +311,10 @@ def test_run_tktcl(monkeypatch):
     mainwindow.config.current = mainwindow.config.CurrentConfig()
     main_window = MagicMock(name="main_window", autospec=True)
     monkeypatch.setattr(mainwindow, "MainWindow", main_window)
+    idle_maintenance = MagicMock(name="idle_maintenance", autospec=True)
+    monkeypatch.setattr(
+        mainwindow.handlers.database, "IdleMaintenance", idle_maintenance
+    )
     hold_tk_root = mainwindow.common.tk_root
 
     # Act
@@ -321,6 +333,8 @@ def test_run_tktcl(monkeypatch):
     )
     with check:
         main_window.assert_called_once_with(root)
+    with check:
+        idle_maintenance.assert_called_once_with(root)
 
     # Cleanup
     mainwindow.config.current = hold_config_current
@@ -13,6 +13,7 @@
 #  You should have received a copy of the GNU General Public License
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+import concurrent.futures
 from unittest.mock import MagicMock, call
 
 import pytest
@@ -588,6 +589,104 @@ class TestMovieGUI:
         with check:
             entry.observer.register.assert_called_once_with(movie_gui_obj.tmdb_search)
 
+    def test_fill_tmdb_frame_with_local_search(self, ttk, movie_gui_obj, monkeypatch):
+        # Arrange
+        monkeypatch.setattr(movies, "ttk", MagicMock(name="ttk", autospec=True))
+        monkeypatch.setattr(movies.MovieGUI, "tmdb_consumer", MagicMock())
+        monkeypatch.setitem(movie_gui_obj.entry_fields, movies.TITLE, MagicMock())
+        create_local_search = MagicMock(name="create_local_search", autospec=True)
+        monkeypatch.setattr(movies.MovieGUI, "create_local_search", create_local_search)
+        tmdb_frame = MagicMock(name="tmdb_frame", autospec=True)
+
+        # Act
+        movie_gui_obj.fill_tmdb_frame(tmdb_frame)
+        movie_gui_obj.local_search_callback = MagicMock(name="local_search_callback")
+        movie_gui_obj.fill_tmdb_frame(tmdb_frame)
+
+        # Assert
+        with check:
+            create_local_search.assert_called_once_with(tmdb_frame)
+
+    def test_create_local_search(self, ttk, movie_gui_obj, monkeypatch):
+        # Arrange
+        ttk = MagicMock(name="ttk", autospec=True)
+        monkeypatch.setattr(movies, "ttk", ttk)
+        entry = MagicMock(name="entry", autospec=True)
+        monkeypatch.setitem(movie_gui_obj.entry_fields, movies.TITLE, entry)
+        tmdb_frame = MagicMock(name="tmdb_frame", autospec=True)
+
+        # Act
+        movie_gui_obj.create_local_search(tmdb_frame)
+
+        # Assert
+        with check:
+            ttk.Label.assert_called_once_with(tmdb_frame, text=movies.LOCAL_MATCHES_MSG)
+        with check:
+            ttk.Label().grid.assert_called_once_with(
+                column=0, row=1, sticky="w", pady=(10, 0)
+            )
+        with check:
+            ttk.Treeview.assert_called_once_with(
+                tmdb_frame,
+                columns=(movies.TITLE, movies.YEAR),
+                show=["headings"],
+                height=8,
+                selectmode="none",
+            )
+        with check:
+            ttk.Treeview().grid.assert_called_once_with(column=0, row=2, sticky="nsew")
+        with check:
+            entry.observer.register.assert_called_once_with(movie_gui_obj.local_search)
+
+    def test_local_search(self, movie_gui_obj, monkeypatch):
+        # Arrange
+        entry = MagicMock(name="entry", autospec=True)
+        entry.current_value = "hitch"
+        monkeypatch.setitem(movie_gui_obj.entry_fields, movies.TITLE, entry)
+        movie_gui_obj.local_search_callback = MagicMock(
+            name="local_search_callback",
+            return_value=(1234, [("Rope", 1948), ("Rebecca", 1940)]),
+        )
+        movie_gui_obj.local_label = MagicMock(name="local_label")
+        tview = movie_gui_obj.local_treeview = MagicMock(name="local_treeview")
+        tview.get_children.return_value = ("I001",)
+
+        # Act
+        movie_gui_obj.local_search()
+
+        # Assert
+        with check:
+            movie_gui_obj.local_search_callback.assert_called_once_with("hitch")
+        with check:
+            movie_gui_obj.local_label.configure.assert_called_once_with(
+                text=f"{movies.LOCAL_MATCHES_MSG} 1,234"
+            )
+        with check:
+            tview.delete.assert_called_once_with("I001")
+        with check:
+            tview.insert.assert_has_calls(
+                [
+                    call("", "end", values=("Rope", 1948)),
+                    call("", "end", values=("Rebecca", 1940)),
+                ]
+            )
+
+    def test_local_search_before_index_is_loaded(self, movie_gui_obj, monkeypatch):
+        # Arrange
+        monkeypatch.setitem(movie_gui_obj.entry_fields, movies.TITLE, MagicMock())
+        movie_gui_obj.local_search_callback = MagicMock(return_value=None)
+        movie_gui_obj.local_label = MagicMock(name="local_label")
+        tview = movie_gui_obj.local_treeview = MagicMock(name="local_treeview")
+
+        # Act
+        movie_gui_obj.local_search()
+
+        # Assert
+        with check:
+            movie_gui_obj.local_label.configure.assert_not_called()
+        with check:
+            tview.insert.assert_not_called()
+
     def test_tmdb_treeview_callback(self, movie_gui_obj, monkeypatch):
         # Arrange the partial callable with its preset part set to the treeview.
         item_id = "42"
@@ -856,6 +955,132 @@ class TestAddMovieGUI:
             state=entry.title.has_data() and entry.year.has_data(),
         )
 
+    def test_fill_body(self, add_movie_obj, monkeypatch):
+        # Arrange
+        super_fill_body = MagicMock(name="super_fill_body", autospec=True)
+        monkeypatch.setattr(movies.MovieGUI, "fill_body", super_fill_body)
+        label = MagicMock(name="label", autospec=True)
+        monkeypatch.setattr(movies.ttk, "Label", label)
+        body_frame = MagicMock(name="body_frame", autospec=True)
+        body_frame.grid_size.return_value = (3, 9)
+        add_movie_obj.duplicates_callback = MagicMock(name="duplicates_callback")
+        for name in (movies.TITLE, movies.YEAR):
+            add_movie_obj.entry_fields[name] = MagicMock(name=name, autospec=True)
+
+        # Act
+        add_movie_obj.fill_body(body_frame)
+
+        # Assert
+        with check:
+            super_fill_body.assert_called_once_with(body_frame)
+        with check:
+            label.assert_called_once_with(body_frame, justify="left")
+        with check:
+            label().grid.assert_called_once_with(column=1, row=9, sticky="w", pady=5)
+        for name in (movies.TITLE, movies.YEAR):
+            with check:
+                add_movie_obj.entry_fields[
+                    name
+                ].observer.register.assert_called_once_with(
+                    add_movie_obj.duplicate_search
+                )
+
+    def test_fill_body_without_duplicates_callback(self, add_movie_obj, monkeypatch):
+        # Arrange
+        monkeypatch.setattr(movies.MovieGUI, "fill_body", MagicMock())
+        label = MagicMock(name="label", autospec=True)
+        monkeypatch.setattr(movies.ttk, "Label", label)
+
+        # Act
+        add_movie_obj.fill_body(MagicMock(name="body_frame"))
+
+        # Assert
+        with check:
+            label.assert_not_called()
+
+    def test_duplicate_search(self, add_movie_obj, monkeypatch):
+        # Arrange
+        add_movie_obj.duplicate_pause_id = "41"
+        after = MagicMock(name="after", autospec=True, return_value="42")
+        monkeypatch.setattr(add_movie_obj.parent, "after", after)
+        after_cancel = MagicMock(name="after_cancel", autospec=True)
+        monkeypatch.setattr(add_movie_obj.parent, "after_cancel", after_cancel)
+
+        # Act
+        add_movie_obj.duplicate_search()
+
+        # Assert
+        with check:
+            after_cancel.assert_called_once_with("41")
+        with check:
+            after.assert_called_once_with(
+                add_movie_obj.duplicate_pause, add_movie_obj.show_duplicates
+            )
+        check.equal(add_movie_obj.duplicate_pause_id, "42")
+
+    @pytest.mark.parametrize(
+        "title, year, duplicates, expected",
+        [
+            (
+                "The Third Man",
+                "1950",
+                [("Third Man, The", 1949), ("The Third Man", 1950)],
+                f"{movies.PROBABLE_DUPLICATE_MSG}\n"
+                "Third Man, The (1949)\nThe Third Man (1950)",
+            ),
+            ("The Third Man", "1950", [], ""),
+            ("The Third Man", "", None, ""),
+            ("", "1950", None, ""),
+        ],
+    )
+    def test_show_duplicates(
+        self, title, year, duplicates, expected, add_movie_obj, monkeypatch
+    ):
+        # Arrange
+        add_movie_obj.duplicate_pause_id = "42"
+        add_movie_obj.duplicate_label = MagicMock(name="duplicate_label")
+        add_movie_obj.duplicates_callback = MagicMock(
+            name="duplicates_callback", return_value=duplicates
+        )
+        for name, value in ((movies.TITLE, title), (movies.YEAR, year)):
+            add_movie_obj.entry_fields[name] = MagicMock(name=name, autospec=True)
+            add_movie_obj.entry_fields[name].current_value = value
+
+        # Act
+        add_movie_obj.show_duplicates()
+
+        # Assert
+        with check:
+            add_movie_obj.duplicate_label.configure.assert_called_once_with(
+                text=expected
+            )
+        if duplicates is None:
+            with check:
+                add_movie_obj.duplicates_callback.assert_not_called()
+        else:
+            with check:
+                add_movie_obj.duplicates_callback.assert_called_once_with(
+                    title, int(year)
+                )
+        check.equal(add_movie_obj.duplicate_pause_id, "")
+
+    def test_destroy(self, add_movie_obj, monkeypatch):
+        # Arrange
+        add_movie_obj.duplicate_pause_id = "42"
+        after_cancel = MagicMock(name="after_cancel", autospec=True)
+        monkeypatch.setattr(add_movie_obj.parent, "after_cancel", after_cancel)
+        super_destroy = MagicMock(name="super_destroy", autospec=True)
+        monkeypatch.setattr(movies.MovieGUI, "destroy", super_destroy)
+
+        # Act
+        add_movie_obj.destroy()
+
+        # Assert
+        with check:
+            after_cancel.assert_called_once_with("42")
+        with check:
+            super_destroy.assert_called_once_with()
+
     @pytest.fixture(scope="function")
     def add_movie_obj(self, tk, moviegui_post_init, monkeypatch):
         """Creates an AddMovieGUI object without running the __post_init__
@@ -1167,6 +1392,195 @@ class TestSearchMovieGUI:
         with check:
             destroy.assert_called_once_with()
 
+    def test_fill_body(self, search_movie_obj, monkeypatch):
+        # Arrange
+        super_fill_body = MagicMock(name="super_fill_body", autospec=True)
+        monkeypatch.setattr(movies.MovieGUI, "fill_body", super_fill_body)
+        label = MagicMock(name="label", autospec=True)
+        monkeypatch.setattr(movies.ttk, "Label", label)
+        facet_search = MagicMock(name="facet_search", autospec=True)
+        monkeypatch.setattr(search_movie_obj, "facet_search", facet_search)
+        body_frame = MagicMock(name="body_frame", autospec=True)
+        body_frame.grid_size.return_value = (3, 9)
+        search_movie_obj.facets_callback = MagicMock(name="facets_callback")
+        for name in (movies.TITLE, movies.TIMESTAMP):
+            search_movie_obj.entry_fields[name] = MagicMock(name=name, autospec=True)
+
+        # Act
+        search_movie_obj.fill_body(body_frame)
+
+        # Assert
+        with check:
+            super_fill_body.assert_called_once_with(body_frame)
+        with check:
+            label.assert_called_once_with(body_frame, justify="left", wraplength=400)
+        with check:
+            label().grid.assert_called_once_with(column=1, row=9, sticky="w", pady=5)
+        with check:
+            search_movie_obj.entry_fields[
+                movies.TITLE
+            ].observer.register.assert_called_once_with(facet_search)
+        with check:
+            search_movie_obj.entry_fields[
+                movies.TIMESTAMP
+            ].observer.register.assert_not_called()
+        with check:
+            facet_search.assert_called_once_with()
+
+    def test_fill_body_without_facets_callback(self, search_movie_obj, monkeypatch):
+        # Arrange
+        monkeypatch.setattr(movies.MovieGUI, "fill_body", MagicMock())
+        label = MagicMock(name="label", autospec=True)
+        monkeypatch.setattr(movies.ttk, "Label", label)
+
+        # Act
+        search_movie_obj.fill_body(MagicMock(name="body_frame"))
+
+        # Assert
+        with check:
+            label.assert_not_called()
+
+    def test_facet_search(self, search_movie_obj, monkeypatch):
+        # Arrange
+        search_movie_obj.facet_pause_id = "41"
+        after = MagicMock(name="after", autospec=True, return_value="42")
+        monkeypatch.setattr(search_movie_obj.parent, "after", after)
+        after_cancel = MagicMock(name="after_cancel", autospec=True)
+        monkeypatch.setattr(search_movie_obj.parent, "after_cancel", after_cancel)
+
+        # Act
+        search_movie_obj.facet_search()
+
+        # Assert
+        with check:
+            after_cancel.assert_called_once_with("41")
+        with check:
+            after.assert_called_once_with(
+                search_movie_obj.facet_pause, search_movie_obj.count_facets
+            )
+        check.equal(search_movie_obj.facet_pause_id, "42")
+
+    def test_count_facets(self, search_movie_obj, monkeypatch):
+        # Arrange
+        criteria = MovieBag(title="Man")
+        monkeypatch.setattr(
+            search_movie_obj, "as_movie_bag", MagicMock(return_value=criteria)
+        )
+        show_facets = MagicMock(name="show_facets", autospec=True)
+        monkeypatch.setattr(search_movie_obj, "show_facets", show_facets)
+        search_movie_obj.facet_pause_id = "42"
+        search_movie_obj.facets_callback = MagicMock(name="facets_callback")
+
+        # Act
+        search_movie_obj.count_facets()
+
+        # Assert
+        with check:
+            search_movie_obj.facets_callback.assert_called_once_with(criteria)
+        check.equal(
+            search_movie_obj.facet_future,
+            search_movie_obj.facets_callback.return_value,
+        )
+        with check:
+            show_facets.assert_called_once_with()
+        check.equal(search_movie_obj.facet_pause_id, "")
+
+    def test_count_facets_with_invalid_year(self, search_movie_obj, monkeypatch):
+        # Arrange
+        monkeypatch.setattr(
+            search_movie_obj, "as_movie_bag", MagicMock(side_effect=ValueError)
+        )
+        search_movie_obj.facets_callback = MagicMock(name="facets_callback")
+
+        # Act
+        search_movie_obj.count_facets()
+
+        # Assert
+        with check:
+            search_movie_obj.facets_callback.assert_not_called()
+
+    def test_show_facets(self, search_movie_obj):
+        # Arrange
+        search_movie_obj.facet_pause_id = "42"
+        search_movie_obj.facet_label = MagicMock(name="facet_label")
+        search_movie_obj.facet_future = concurrent.futures.Future()
+        search_movie_obj.facet_future.set_result(
+            (
+                1200,
+                [("noir", 3), ("vienna", 1)],
+                [(1940, 1100), (1950, 100)],
+                [],
+            )
+        )
+
+        # Act
+        search_movie_obj.show_facets()
+
+        # Assert
+        with check:
+            search_movie_obj.facet_label.configure.assert_called_once_with(
+                text=f"{movies.FACET_TOTAL_MSG} 1,200\n"
+                f"{movies.FACET_DECADES_TEXT} 1940s (1,100), 1950s (100)\n"
+                f"{movies.FACET_TAGS_TEXT} noir (3), vienna (1)"
+            )
+        check.equal(search_movie_obj.facet_pause_id, "")
+
+    def test_show_facets_with_failed_count(self, search_movie_obj, monkeypatch):
+        # Arrange
+        logging_error = MagicMock(name="logging_error", autospec=True)
+        monkeypatch.setattr(movies.logging, "error", logging_error)
+        search_movie_obj.facet_pause_id = "42"
+        search_movie_obj.facet_label = MagicMock(name="facet_label")
+        search_movie_obj.facet_future = concurrent.futures.Future()
+        exc = RuntimeError("database is locked")
+        search_movie_obj.facet_future.set_exception(exc)
+
+        # Act
+        search_movie_obj.show_facets()
+
+        # Assert
+        with check:
+            logging_error.assert_called_once_with(f"{movies.FACET_FAILED_MSG} {exc!r}")
+        with check:
+            search_movie_obj.facet_label.configure.assert_called_once_with(text="")
+        check.equal(search_movie_obj.facet_pause_id, "")
+
+    def test_show_facets_polls_until_done(self, search_movie_obj, monkeypatch):
+        # Arrange
+        after = MagicMock(name="after", autospec=True, return_value="42")
+        monkeypatch.setattr(search_movie_obj.parent, "after", after)
+        search_movie_obj.facet_label = MagicMock(name="facet_label")
+        search_movie_obj.facet_future = concurrent.futures.Future()
+
+        # Act
+        search_movie_obj.show_facets()
+
+        # Assert
+        with check:
+            after.assert_called_once_with(
+                search_movie_obj.facet_poll, search_movie_obj.show_facets
+            )
+        with check:
+            search_movie_obj.facet_label.configure.assert_not_called()
+        check.equal(search_movie_obj.facet_pause_id, "42")
+
+    def test_destroy(self, search_movie_obj, monkeypatch):
+        # Arrange
+        search_movie_obj.facet_pause_id = "42"
+        after_cancel = MagicMock(name="after_cancel", autospec=True)
+        monkeypatch.setattr(search_movie_obj.parent, "after_cancel", after_cancel)
+        super_destroy = MagicMock(name="super_destroy", autospec=True)
+        monkeypatch.setattr(movies.MovieGUI, "destroy", super_destroy)
+
+        # Act
+        search_movie_obj.destroy()
+
+        # Assert
+        with check:
+            after_cancel.assert_called_once_with("42")
+        with check:
+            super_destroy.assert_called_once_with()
+
     @pytest.fixture(scope="function")
     def search_movie_obj(self, tk, moviegui_post_init, monkeypatch):
         """Creates a SearchMovieGUI object without running the __post_init__
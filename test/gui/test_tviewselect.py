@@ -19,6 +19,7 @@ from unittest.mock import MagicMock, call
 from pytest_check import check
 
 from moviebag import MovieBag, MovieInteger
+from movieresultset import MovieResultSet
 from gui import tviewselect as mut
 
 
@@ -60,6 +61,8 @@ class TestSelectGUI:
         monkeypatch.setattr(mut.SelectGUI, "columns", columns)
         populate = MagicMock(name="populate", autospec=True)
         monkeypatch.setattr(mut.SelectGUI, "populate", populate)
+        bind_headings = MagicMock(name="bind_headings", autospec=True)
+        monkeypatch.setattr(mut.SelectGUI, "bind_headings", bind_headings)
         create_button = MagicMock(name="create_button", autospec=True)
         monkeypatch.setattr(mut.common, "create_button", create_button)
         text = mut.CANCEL_TEXT
@@ -87,6 +90,8 @@ class TestSelectGUI:
             columns.assert_called_once_with(treeview())
         with check:
             populate.assert_called_once_with(treeview())
+        with check:
+            bind_headings.assert_called_once_with(treeview())
         with check:
             create_button.assert_called_once_with(
                 buttonbox,
@@ -194,6 +199,64 @@ class TestSelectGUI:
         with check.raises(NotImplementedError):
             select_gui.populate(MagicMock(name="treeview", autospec=True))
 
+    def test_sort_key(self, select_gui, ttk, monkeypatch):
+        # Act and assert
+        with check.raises(NotImplementedError):
+            select_gui.sort_key(0)
+
+    def test_bind_headings(self, select_gui, ttk, monkeypatch):
+        # Arrange
+        tree = MagicMock(name="tree", autospec=True)
+        partial = MagicMock(name="partial", autospec=True)
+        monkeypatch.setattr(mut, "partial", partial)
+        select_gui.titles = ["title", "year"]
+
+        # Act
+        select_gui.bind_headings(tree)
+
+        # Assert
+        check.equal(
+            partial.call_args_list,
+            [call(select_gui.sort_by, tree, 0), call(select_gui.sort_by, tree, 1)],
+        )
+        with check:
+            tree.heading.assert_has_calls(
+                [call("#0", command=partial()), call("#1", command=partial())]
+            )
+
+    def test_sort_by(self, select_gui, ttk, monkeypatch):
+        # Arrange
+        tree = MagicMock(name="tree", autospec=True)
+        sort_key = MagicMock(name="sort_key", return_value=lambda row: row[-1])
+        monkeypatch.setattr(select_gui, "sort_key", sort_key)
+        select_gui.rows = ["a 2", "b 1", "c 2", "d 0"]
+
+        # Act
+        select_gui.sort_by(tree, 1)
+        select_gui.sort_by(tree, 1)
+
+        # Assert
+        check.equal(
+            tree.set_children.call_args_list,
+            [call("", "3", "1", "0", "2"), call("", "0", "2", "1", "3")],
+        )
+        check.equal(select_gui.sort_keys, {1: ["2", "1", "2", "0"]})
+        with check:
+            sort_key.assert_called_once_with(1)
+
+    def test_sort_by_first_column_reverses(self, select_gui, ttk, monkeypatch):
+        # Arrange
+        tree = MagicMock(name="tree", autospec=True)
+        monkeypatch.setattr(select_gui, "sort_key", lambda column: str)
+
+        # Act
+        select_gui.sort_by(tree, 0)
+
+        # Assert
+        with check:
+            tree.set_children.assert_called_once_with("", "2", "1", "0")
+        check.is_true(select_gui.sort_reverse)
+
     def test_destroy(self, select_gui, ttk, monkeypatch):
         # Arrange
         outer_frame = MagicMock(name="outer_frame", autospec=True)
@@ -255,9 +318,61 @@ class TestSelectTagGUI:
                 ],
             )
 
+    def test_sort_key(self, select_tag_gui):
+        check.equal(select_tag_gui.sort_key(0)("Noir"), "noir")
+
+    def test_populate_ignores_case(self, select_tag_gui, ttk, monkeypatch):
+        # Arrange
+        tree = MagicMock(name="tree", autospec=True)
+        monkeypatch.setattr(mut.ttk, "Treeview", tree)
+        select_tag_gui.rows = ["noir", "Western", "comedy"]
+
+        # Act
+        select_tag_gui.populate(tree)
+
+        # Assert
+        check.equal(select_tag_gui.rows, ["comedy", "noir", "Western"])
+
 
 class TestSelectMovieGUI:
 
+    def test_create_buttons(self, select_movie_gui, monkeypatch):
+        # Arrange
+        create_button = MagicMock(name="create_button", autospec=True)
+        monkeypatch.setattr(mut.common, "create_button", create_button)
+        buttonbox = MagicMock(name="buttonbox", autospec=True)
+        tag_all_callback = MagicMock(name="tag_all_callback", autospec=True)
+        select_movie_gui.tag_all_callback = tag_all_callback
+        column_num = mut.itertools.count()
+
+        # Act
+        select_movie_gui.create_buttons(buttonbox, column_num)
+
+        # Assert
+        with check:
+            create_button.assert_called_once_with(
+                buttonbox,
+                text=mut.TAG_ALL_TEXT,
+                column=0,
+                command=tag_all_callback,
+                default="normal",
+            )
+        check.equal(next(column_num), 1)
+
+    def test_create_buttons_without_callback(self, select_movie_gui, monkeypatch):
+        # Arrange
+        create_button = MagicMock(name="create_button", autospec=True)
+        monkeypatch.setattr(mut.common, "create_button", create_button)
+        column_num = mut.itertools.count()
+
+        # Act
+        select_movie_gui.create_buttons(MagicMock(name="buttonbox"), column_num)
+
+        # Assert
+        with check:
+            create_button.assert_not_called()
+        check.equal(next(column_num), 0)
+
     def test_columns(self, select_movie_gui, ttk, monkeypatch):
         # Arrange
         tree = MagicMock(name="tree", autospec=True)
@@ -334,6 +449,87 @@ class TestSelectMovieGUI:
                 ]
             )
 
+    @pytest.mark.parametrize("result_set", [False, True])
+    def test_populate_ignores_case(
+        self, select_movie_gui, ttk, monkeypatch, result_set
+    ):
+        # Arrange
+        tree = MagicMock(name="tree", autospec=True)
+        monkeypatch.setattr(mut.ttk, "Treeview", tree)
+        rows = [
+            MovieBag(title=title, year=MovieInteger(4041))
+            for title in ("zulu", "alpha", "Beta")
+        ]
+        select_movie_gui.rows = (
+            MovieResultSet.from_movie_bags(rows) if result_set else rows
+        )
+
+        # Act
+        select_movie_gui.populate(tree)
+
+        # Assert
+        check.equal(
+            [movie["title"] for movie in select_movie_gui.rows],
+            ["alpha", "Beta", "zulu"],
+        )
+
+    def test_populate_with_result_set(self, select_movie_gui, ttk, monkeypatch):
+        # Arrange
+        tree = MagicMock(name="tree", autospec=True)
+        monkeypatch.setattr(mut.ttk, "Treeview", tree)
+        select_movie_gui.rows = MovieResultSet.from_movie_bags(select_movie_gui.rows)
+
+        # Act
+        select_movie_gui.populate(tree)
+
+        # Assert
+        with check:
+            tree.insert.assert_has_calls(
+                [
+                    call(
+                        "", "end", iid=0, text="Test Movie 1", values=(4041, "", "", "")
+                    ),
+                    call(
+                        "",
+                        "end",
+                        iid=1,
+                        text="Test Movie 2",
+                        values=(4042, "Dick Dir, Edgar Ebo", 42, "A synopsis"),
+                    ),
+                    call(
+                        "", "end", iid=2, text="Test Movie 3", values=(4043, "", "", "")
+                    ),
+                ]
+            )
+        check.equal(select_movie_gui.rows[1]["title"], "Test Movie 2")
+
+    @pytest.mark.parametrize("result_set", [False, True])
+    @pytest.mark.parametrize(
+        "column, expected",
+        [
+            (0, ("2", "1", "0")),
+            (1, ("0", "1", "2")),
+            (2, ("0", "2", "1")),
+            (3, ("0", "2", "1")),
+            (4, ("0", "2", "1")),
+        ],
+    )
+    def test_sort_by(self, column, expected, result_set, select_movie_gui):
+        # Arrange
+        tree = MagicMock(name="tree", autospec=True)
+        select_movie_gui.rows.sort(key=lambda movie_bag: movie_bag["title"])
+        if result_set:
+            select_movie_gui.rows = MovieResultSet.from_movie_bags(
+                select_movie_gui.rows
+            )
+
+        # Act
+        select_movie_gui.sort_by(tree, column)
+
+        # Assert
+        with check:
+            tree.set_children.assert_called_once_with("", *expected)
+
 
 @pytest.fixture(scope="function")
 def select_gui(tk, monkeypatch):
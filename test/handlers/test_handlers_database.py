@@ -13,6 +13,8 @@
 #  You should have received a copy of the GNU General Public License
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+import datetime
+import sqlite3
 from unittest.mock import MagicMock, call
 
 import pytest
@@ -24,6 +26,10 @@ import handlers
 
 def test_gui_add_movie_without_prepopulate(monkeypatch, test_tags):
     # Arrange
+    start_load = MagicMock(name="start_load", autospec=True)
+    monkeypatch.setattr(handlers.database.similarity, "start_load", start_load)
+    live_start_load = MagicMock(name="live_start_load", autospec=True)
+    monkeypatch.setattr(handlers.database.livesearch, "start_load", live_start_load)
     add_movie_gui = MagicMock(name="add_movie_gui", autospec=True)
     monkeypatch.setattr(
         handlers.database.movies,
@@ -37,17 +43,25 @@ def test_gui_add_movie_without_prepopulate(monkeypatch, test_tags):
     handlers.database.gui_add_movie()
 
     # Act
+    start_load.assert_called_once_with()
+    live_start_load.assert_called_once_with()
     add_movie_gui.assert_called_once_with(
         handlers.database.common.tk_root,
         tmdb_callback=handlers.sundries._tmdb_io_handler,
         all_tags=test_tags,
         prepopulate=movie_bag(),
         database_callback=handlers.database.db_add_movie,
+        duplicates_callback=handlers.database.db_probable_duplicates,
+        local_search_callback=handlers.database.db_local_search,
     )
 
 
 def test_gui_add_movie_with_prepopulate(monkeypatch, test_tags):
     # Arrange
+    start_load = MagicMock(name="start_load", autospec=True)
+    monkeypatch.setattr(handlers.database.similarity, "start_load", start_load)
+    live_start_load = MagicMock(name="live_start_load", autospec=True)
+    monkeypatch.setattr(handlers.database.livesearch, "start_load", live_start_load)
     add_movie_gui = MagicMock(name="add_movie_gui", autospec=True)
     monkeypatch.setattr(
         handlers.database.movies,
@@ -66,9 +80,132 @@ def test_gui_add_movie_with_prepopulate(monkeypatch, test_tags):
         all_tags=test_tags,
         prepopulate=movie_bag,
         database_callback=handlers.database.db_add_movie,
+        duplicates_callback=handlers.database.db_probable_duplicates,
+        local_search_callback=handlers.database.db_local_search,
     )
 
 
+def test_db_probable_duplicates(monkeypatch):
+    # Arrange
+    monkeypatch.setattr(
+        handlers.database.similarity.title_index,
+        "is_current",
+        MagicMock(return_value=True),
+    )
+    probable_duplicates = MagicMock(
+        name="probable_duplicates",
+        autospec=True,
+        return_value=[
+            handlers.database.similarity.Candidate("Third Man, The", 1949, 1.0)
+        ],
+    )
+    monkeypatch.setattr(
+        handlers.database.similarity, "probable_duplicates", probable_duplicates
+    )
+
+    # Act
+    duplicates = handlers.database.db_probable_duplicates("The Third Man", 1950)
+
+    # Assert
+    with check:
+        probable_duplicates.assert_called_once_with("The Third Man", 1950)
+    check.equal(duplicates, [("Third Man, The", 1949)])
+
+
+def test_db_probable_duplicates_before_load(monkeypatch):
+    # Arrange
+    monkeypatch.setattr(
+        handlers.database.similarity.title_index,
+        "is_current",
+        MagicMock(return_value=False),
+    )
+    start_load = MagicMock(name="start_load")
+    monkeypatch.setattr(handlers.database.similarity, "start_load", start_load)
+    probable_duplicates = MagicMock(name="probable_duplicates")
+    monkeypatch.setattr(
+        handlers.database.similarity, "probable_duplicates", probable_duplicates
+    )
+
+    # Act
+    duplicates = handlers.database.db_probable_duplicates("The Third Man", 1950)
+
+    # Assert
+    check.equal(duplicates, [])
+    with check:
+        start_load.assert_called_once_with()
+    with check:
+        probable_duplicates.assert_not_called()
+
+
+def test_db_local_search(monkeypatch):
+    # Arrange
+    monkeypatch.setattr(
+        handlers.database.livesearch.catalogue_index,
+        "is_current",
+        MagicMock(return_value=True),
+    )
+    search = MagicMock(
+        name="search",
+        return_value=handlers.database.livesearch.SearchResult(
+            42, [handlers.database.livesearch.Match("The Third Man", 1949)]
+        ),
+    )
+    monkeypatch.setattr(handlers.database.livesearch, "search", search)
+
+    # Act
+    result = handlers.database.db_local_search("third")
+
+    # Assert
+    with check:
+        search.assert_called_once_with("third")
+    check.equal(result, (42, [("The Third Man", 1949)]))
+
+
+def test_db_local_search_before_load(monkeypatch):
+    # Arrange
+    monkeypatch.setattr(
+        handlers.database.livesearch.catalogue_index,
+        "is_current",
+        MagicMock(return_value=False),
+    )
+    start_load = MagicMock(name="start_load")
+    monkeypatch.setattr(handlers.database.livesearch, "start_load", start_load)
+    search = MagicMock(name="search")
+    monkeypatch.setattr(handlers.database.livesearch, "search", search)
+
+    # Act
+    result = handlers.database.db_local_search("third")
+
+    # Assert
+    check.is_none(result)
+    with check:
+        start_load.assert_called_once_with()
+    with check:
+        search.assert_not_called()
+
+
+def test_db_facet_counts(monkeypatch):
+    # Arrange
+    executor = MagicMock(name="executor")
+    monkeypatch.setattr(
+        handlers.database.config,
+        "current",
+        MagicMock(name="current", threadpool_executor=executor),
+    )
+    criteria = MovieBag(title="Third", notes="", tags=set())
+
+    # Act
+    future = handlers.database.db_facet_counts(criteria)
+
+    # Assert
+    with check:
+        executor.submit.assert_called_once_with(
+            handlers.database.tables.facet_counts,
+            MovieBag(title="Third", tags=set()),
+        )
+    check.equal(future, executor.submit())
+
+
 def test_db_add_movie(monkeypatch):
     # Arrange
     movie_bag = MovieBag(title="Add movie test", year=MovieInteger("4242"))
@@ -185,6 +322,10 @@ def test_gui_search_movie_with_prepopulate(
         select_all_tags,
     )
 
+    # Arrange live search
+    start_load = MagicMock(name="start_load", autospec=True)
+    monkeypatch.setattr(handlers.database.livesearch, "start_load", start_load)
+
     # Arrange search_movie
     search_movie = MagicMock(name="search_movie", autospec=True)
     monkeypatch.setattr(
@@ -199,6 +340,8 @@ def test_gui_search_movie_with_prepopulate(
     # Assert
     with check:
         select_all_tags.assert_called_once_with()
+    with check:
+        start_load.assert_called_once_with()
     with check:
         search_movie.assert_called_once_with(
             handlers.database.common.tk_root,
@@ -206,6 +349,8 @@ def test_gui_search_movie_with_prepopulate(
             tmdb_callback=handlers.database._tmdb_io_handler,
             all_tags=test_tags,
             prepopulate=prepopulate,
+            local_search_callback=handlers.database.db_local_search,
+            facets_callback=handlers.database.db_facet_counts,
         )
 
 
@@ -222,6 +367,10 @@ def test_gui_search_movie_without_prepopulate(
         select_all_tags,
     )
 
+    # Arrange live search
+    start_load = MagicMock(name="start_load", autospec=True)
+    monkeypatch.setattr(handlers.database.livesearch, "start_load", start_load)
+
     # Arrange search_movie
     search_movie = MagicMock(name="search_movie", autospec=True)
     monkeypatch.setattr(
@@ -236,6 +385,8 @@ def test_gui_search_movie_without_prepopulate(
     # Assert
     with check:
         select_all_tags.assert_called_once_with()
+    with check:
+        start_load.assert_called_once_with()
     with check:
         search_movie.assert_called_once_with(
             handlers.database.common.tk_root,
@@ -243,6 +394,8 @@ def test_gui_search_movie_without_prepopulate(
             tmdb_callback=handlers.database._tmdb_io_handler,
             all_tags=test_tags,
             prepopulate={},
+            local_search_callback=handlers.database.db_local_search,
+            facets_callback=handlers.database.db_facet_counts,
         )
 
 
@@ -259,7 +412,86 @@ def test_gui_select_movie(monkeypatch):
         handlers.database.common.tk_root,
         selection_callback=handlers.database.db_select_movie,
         rows=movies,
+        tag_all_callback=None,
+    )
+
+
+def test_gui_select_movie_with_criteria(monkeypatch):
+    select_movie_gui = MagicMock(name="select_movie_gui")
+    monkeypatch.setattr(
+        handlers.database.tviewselect, "SelectMovieGUI", select_movie_gui
     )
+    partial = MagicMock(name="partial")
+    monkeypatch.setattr(handlers.database, "partial", partial)
+    movies = [MovieBag(title="", year=MovieInteger(0))]
+    criteria = MovieBag(title="Old")
+
+    handlers.database.gui_select_movie(movie_bags=movies, criteria=criteria)
+
+    with check:
+        partial.assert_called_once_with(handlers.database.gui_tag_movies, criteria)
+    with check:
+        select_movie_gui.assert_called_once_with(
+            handlers.database.common.tk_root,
+            selection_callback=handlers.database.db_select_movie,
+            rows=movies,
+            tag_all_callback=partial(),
+        )
+
+
+def test_gui_tag_movies(monkeypatch):
+    select_tag_gui = MagicMock(name="select_tag_gui")
+    monkeypatch.setattr(handlers.database.tviewselect, "SelectTagGUI", select_tag_gui)
+    partial = MagicMock(name="partial")
+    monkeypatch.setattr(handlers.database, "partial", partial)
+    monkeypatch.setattr(handlers.database.tables, "select_all_tags", lambda: {"noir"})
+    criteria = MovieBag(title="Old")
+
+    handlers.database.gui_tag_movies(criteria)
+
+    with check:
+        partial.assert_called_once_with(handlers.database.db_tag_movies, criteria)
+    with check:
+        select_tag_gui.assert_called_once_with(
+            handlers.database.common.tk_root,
+            selection_callback=partial(),
+            rows=["noir"],
+        )
+
+
+def test_db_tag_movies(monkeypatch):
+    tag_movies = MagicMock(name="tag_movies", return_value=42)
+    monkeypatch.setattr(handlers.database.tables, "tag_movies", tag_movies)
+    showinfo = MagicMock(name="showinfo", autospec=True)
+    monkeypatch.setattr(handlers.database.common, "showinfo", showinfo)
+    criteria = MovieBag(title="Old")
+
+    handlers.database.db_tag_movies(criteria, "noir")
+
+    with check:
+        tag_movies.assert_called_once_with(match=criteria, tag_text="noir")
+    with check:
+        showinfo.assert_called_once_with(
+            f"{handlers.database.MOVIES_TAGGED_MSG} noir: 42"
+        )
+
+
+def test_db_tag_movies_with_missing_tag(monkeypatch):
+    tag_movies = MagicMock(name="tag_movies")
+    tag_movies.side_effect = handlers.database.tables.NoResultFound()
+    tag_movies.side_effect.__notes__ = [handlers.database.tables.TAG_NOT_FOUND, "noir"]
+    monkeypatch.setattr(handlers.database.tables, "tag_movies", tag_movies)
+    exc_messagebox = MagicMock(name="exc_messagebox")
+    monkeypatch.setattr(handlers.database, "_exc_messagebox", exc_messagebox)
+    showinfo = MagicMock(name="showinfo", autospec=True)
+    monkeypatch.setattr(handlers.database.common, "showinfo", showinfo)
+
+    handlers.database.db_tag_movies(MovieBag(title="Old"), "noir")
+
+    with check:
+        exc_messagebox.assert_called_once_with(tag_movies.side_effect)
+    with check:
+        showinfo.assert_not_called()
 
 
 def test_db_match_movies(monkeypatch, new_movie):
@@ -355,7 +587,7 @@ def test_db_match_movies_returning_2_movies(monkeypatch):
 
     handlers.database.db_match_movies(criteria)
 
-    gui_select_movie.assert_called_once_with(movie_bags=movies_found)
+    gui_select_movie.assert_called_once_with(movie_bags=movies_found, criteria=criteria)
 
 
 def test_db_edit_movie(monkeypatch, old_movie_bag, new_movie):
@@ -372,6 +604,91 @@ def test_db_edit_movie(monkeypatch, old_movie_bag, new_movie):
     )
 
 
+def test_db_edit_movie_by_id(monkeypatch, new_movie):
+    # Arrange
+    updated = datetime.datetime(2026, 1, 2, 3, 4, 5)
+    old_movie = MovieBag(id=42, updated=updated, title="Old", year=MovieInteger(4200))
+    edit_movie_by_id = MagicMock(name="edit_movie_by_id")
+    monkeypatch.setattr(handlers.database.tables, "edit_movie_by_id", edit_movie_by_id)
+
+    # Act
+    handlers.database.db_edit_movie(old_movie, new_movie)
+
+    # Assert
+    edit_movie_by_id.assert_called_once_with(
+        movie_id=42, updated=updated, replacement_fields=new_movie
+    )
+
+
+# noinspection PyPep8Naming
+def test_db_edit_movie_handles_StaleDataError(monkeypatch, new_movie):
+    # Arrange
+    old_movie = MovieBag(id=42, title="Old", year=MovieInteger(4200))
+    current_movie = MovieBag(id=42, title="Changed", year=MovieInteger(4200))
+    exc = handlers.database.tables.StaleDataError()
+    exc.add_note(handlers.database.tables.MOVIE_CHANGED)
+    monkeypatch.setattr(
+        handlers.database.tables, "edit_movie_by_id", MagicMock(side_effect=exc)
+    )
+    select_movie_by_id = MagicMock(
+        name="select_movie_by_id", return_value=current_movie
+    )
+    monkeypatch.setattr(
+        handlers.database.tables, "select_movie_by_id", select_movie_by_id
+    )
+    showinfo = MagicMock(name="showinfo", autospec=True)
+    monkeypatch.setattr(handlers.database.common, "showinfo", showinfo)
+    gui_edit_movie = MagicMock(name="gui_edit_movie")
+    monkeypatch.setattr(handlers.database, "gui_edit_movie", gui_edit_movie)
+
+    # Act
+    handlers.database.db_edit_movie(old_movie, new_movie)
+
+    # Assert
+    with check:
+        showinfo.assert_called_once_with(message=handlers.database.tables.MOVIE_CHANGED)
+    with check:
+        select_movie_by_id.assert_called_once_with(movie_id=42)
+    with check:
+        gui_edit_movie.assert_called_once_with(current_movie, prepopulate=new_movie)
+
+
+# noinspection PyPep8Naming
+def test_db_edit_movie_handles_StaleDataError_for_deleted_movie(monkeypatch, new_movie):
+    # Arrange
+    old_movie = MovieBag(id=42, title="Old", year=MovieInteger(4200))
+    stale = handlers.database.tables.StaleDataError()
+    stale.add_note(handlers.database.tables.MOVIE_CHANGED)
+    monkeypatch.setattr(
+        handlers.database.tables, "edit_movie_by_id", MagicMock(side_effect=stale)
+    )
+    missing = handlers.database.tables.NoResultFound()
+    missing.add_note(handlers.database.tables.MOVIE_NOT_FOUND)
+    monkeypatch.setattr(
+        handlers.database.tables,
+        "select_movie_by_id",
+        MagicMock(side_effect=missing),
+    )
+    showinfo = MagicMock(name="showinfo", autospec=True)
+    monkeypatch.setattr(handlers.database.common, "showinfo", showinfo)
+    gui_edit_movie = MagicMock(name="gui_edit_movie")
+    monkeypatch.setattr(handlers.database, "gui_edit_movie", gui_edit_movie)
+
+    # Act
+    handlers.database.db_edit_movie(old_movie, new_movie)
+
+    # Assert
+    check.equal(
+        showinfo.call_args_list,
+        [
+            call(message=handlers.database.tables.MOVIE_CHANGED),
+            call(message=handlers.database.tables.MOVIE_NOT_FOUND),
+        ],
+    )
+    with check:
+        gui_edit_movie.assert_not_called()
+
+
 # noinspection PyPep8Naming
 def test_db_edit_movie_handles_NoResultFound_for_missing_tag(monkeypatch):
     exception = handlers.database.tables.NoResultFound()
@@ -484,6 +801,17 @@ def test_db_delete_movie_callback(monkeypatch, new_movie):
     delete_movie.assert_called_once_with(movie_bag=new_movie)
 
 
+def test_db_delete_movie_by_id(monkeypatch, new_movie):
+    delete_movie_by_id = MagicMock(name="delete_movie_by_id")
+    monkeypatch.setattr(
+        handlers.database.tables, "delete_movie_by_id", delete_movie_by_id
+    )
+
+    handlers.database.db_delete_movie(MovieBag(id=42, **new_movie))
+
+    delete_movie_by_id.assert_called_once_with(movie_id=42)
+
+
 def test_db_select_movies(monkeypatch):
     title = "test title for test_select_movie_callback"
     year = 42
@@ -504,6 +832,26 @@ def test_db_select_movies(monkeypatch):
         gui_edit_movie.assert_called_once_with(movie_bag, prepopulate=movie_bag)
 
 
+def test_db_select_movie_by_id(monkeypatch):
+    movie_bag = MovieBag(id=42, title="Rope", year=MovieInteger(1948))
+    current_movie = MovieBag(id=42, title="Rope", year=MovieInteger(1948), notes="")
+    select_movie_by_id = MagicMock(
+        name="select_movie_by_id", return_value=current_movie
+    )
+    monkeypatch.setattr(
+        handlers.database.tables, "select_movie_by_id", select_movie_by_id
+    )
+    gui_edit_movie = MagicMock(name="gui_edit_movie")
+    monkeypatch.setattr(handlers.database, "gui_edit_movie", gui_edit_movie)
+
+    handlers.database.db_select_movie(movie_bag)
+
+    with check:
+        select_movie_by_id.assert_called_once_with(movie_id=42)
+    with check:
+        gui_edit_movie.assert_called_once_with(current_movie, prepopulate=current_movie)
+
+
 def test_db_select_movies_handles_missing_movie_exception(monkeypatch):
     title = "test title for test_select_movie_callback"
     year = 42
@@ -613,7 +961,7 @@ def test_db_edit_tag_with_old_tag_not_found(monkeypatch):
     new_tag_text = notes_1 = "new_tag_text"
     db_edit_tag = MagicMock(name="db_edit_tag")
     monkeypatch.setattr(handlers.database.tables, "edit_tag", db_edit_tag)
-    db_edit_tag.side_effect = handlers.database.tables.NoResultFound
+    db_edit_tag.side_effect = handlers.database.tables.NoResultFound()
     notes_0 = handlers.database.tables.TAG_NOT_FOUND
     db_edit_tag.side_effect.__notes__ = [notes_0, notes_1]
     gui_select_all_tags = MagicMock(name="gui_select_all_tags")
@@ -702,6 +1050,166 @@ def test_gui_edit_movie(monkeypatch, test_tags):
     )
 
 
+def test_gui_backup_database(monkeypatch):
+    start_snapshot = MagicMock(name="start_snapshot")
+    monkeypatch.setattr(handlers.database.backup, "start_snapshot", start_snapshot)
+
+    handlers.database.gui_backup_database()
+
+    with check:
+        start_snapshot.assert_called_once_with()
+    with check:
+        start_snapshot().add_done_callback.assert_called_once_with(
+            handlers.database._backup_done_callback
+        )
+
+
+def test__backup_done_callback(monkeypatch):
+    showinfo = MagicMock(name="showinfo")
+    monkeypatch.setattr(handlers.database.common, "showinfo", showinfo)
+    fut = MagicMock(name="fut")
+    fut.result.return_value = "snapshot path"
+
+    handlers.database._backup_done_callback(fut)
+
+    showinfo.assert_called_once_with(
+        handlers.database.BACKUP_COMPLETE_MSG, detail="snapshot path"
+    )
+
+
+def test__backup_done_callback_with_failed_backup(monkeypatch):
+    exc_messagebox = MagicMock(name="exc_messagebox")
+    monkeypatch.setattr(handlers.database, "_exc_messagebox", exc_messagebox)
+    exc = handlers.database.backup.BackupIntegrityError
+    fut = MagicMock(name="fut")
+    fut.result.side_effect = exc
+
+    handlers.database._backup_done_callback(fut)
+
+    check.is_instance(exc_messagebox.call_args.args[0], exc)
+
+
+@pytest.mark.parametrize(
+    "exc",
+    [sqlite3.OperationalError("disk I/O error"), OSError(28, "No space left")],
+)
+def test__backup_done_callback_with_backup_error(monkeypatch, exc):
+    exc_messagebox = MagicMock(name="exc_messagebox")
+    monkeypatch.setattr(handlers.database, "_exc_messagebox", exc_messagebox)
+    logging_error = MagicMock(name="logging_error")
+    monkeypatch.setattr(handlers.database.logging, "error", logging_error)
+    fut = MagicMock(name="fut")
+    fut.result.side_effect = exc
+
+    handlers.database._backup_done_callback(fut)
+
+    with check:
+        exc_messagebox.assert_called_once_with(exc)
+    check.equal(exc.__notes__, [handlers.database.BACKUP_ERROR_MSG, str(exc)])
+    with check:
+        logging_error.assert_called_once_with(
+            f"{handlers.database.BACKUP_ERROR_MSG} {exc!r}"
+        )
+
+
+def test_idle_maintenance_binds_activity():
+    parent = MagicMock(name="parent")
+
+    idle = handlers.database.IdleMaintenance(parent)
+
+    check.equal(
+        parent.bind_all.call_args_list,
+        [
+            call(sequence, idle.note_activity, add="+")
+            for sequence in ("<KeyPress>", "<ButtonPress>", "<Motion>")
+        ],
+    )
+    with check:
+        parent.after.assert_called_once_with(handlers.database.IDLE_POLL_MS, idle.poll)
+
+
+def test_idle_maintenance_poll_when_idle(monkeypatch):
+    # Arrange
+    executor = MagicMock(name="executor")
+    monkeypatch.setattr(
+        handlers.database.config,
+        "current",
+        MagicMock(name="current", threadpool_executor=executor),
+    )
+    idle = handlers.database.IdleMaintenance(MagicMock(name="parent"), idle_seconds=0)
+
+    # Act
+    idle.poll()
+
+    # Assert
+    with check:
+        executor.submit.assert_called_once_with(
+            handlers.database.maintenance.run_due, should_stop=idle.user_active
+        )
+    with check:
+        executor.submit().add_done_callback.assert_called_once_with(
+            handlers.database._maintenance_done_callback
+        )
+    check.equal(idle.parent.after.call_count, 2)
+
+
+def test_idle_maintenance_poll_when_busy(monkeypatch):
+    # Arrange
+    executor = MagicMock(name="executor")
+    monkeypatch.setattr(
+        handlers.database.config,
+        "current",
+        MagicMock(name="current", threadpool_executor=executor),
+    )
+    idle = handlers.database.IdleMaintenance(MagicMock(name="parent"))
+    idle.note_activity()
+
+    # Act
+    idle.poll()
+
+    # Assert
+    check.is_true(idle.user_active())
+    with check:
+        executor.submit.assert_not_called()
+
+
+def test__maintenance_done_callback(monkeypatch):
+    showinfo = MagicMock(name="showinfo")
+    monkeypatch.setattr(handlers.database.common, "showinfo", showinfo)
+    fut = MagicMock(name="fut")
+    fut.result.return_value = [
+        handlers.database.maintenance.TaskReport("analyze", "", 0.1, True),
+        handlers.database.maintenance.TaskReport(
+            "integrity", "", 0.1, True, problems=("bad page", "bad index")
+        ),
+    ]
+
+    handlers.database._maintenance_done_callback(fut)
+
+    showinfo.assert_called_once_with(
+        handlers.database.maintenance.INTEGRITY_PROBLEMS_MSG,
+        detail="bad page; bad index",
+    )
+
+
+def test__maintenance_done_callback_with_failed_run(monkeypatch):
+    showinfo = MagicMock(name="showinfo")
+    monkeypatch.setattr(handlers.database.common, "showinfo", showinfo)
+    logging_exception = MagicMock(name="logging_exception")
+    monkeypatch.setattr(handlers.database.logging, "exception", logging_exception)
+    fut = MagicMock(name="fut")
+    fut.result.side_effect = sqlite3.OperationalError("database is locked")
+
+    handlers.database._maintenance_done_callback(fut)
+
+    with check:
+        logging_exception.assert_called_once_with(
+            handlers.database.MAINTENANCE_FAILED_MSG
+        )
+    with check:
+        showinfo.assert_not_called()
+
+
 @pytest.fixture(scope="function")
 def test_tags(monkeypatch):
     """This fixture mocks a call to handlers.database.tables.select_all_tags and
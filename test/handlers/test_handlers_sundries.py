@@ -98,3 +98,30 @@ def test_tmdb_search_exception_with_settings_update_declined(
     # Assert
     with check:
         settings_dialog.assert_not_called()
+
+
+def test_toggle_profile_starts(monkeypatch):
+    monkeypatch.setattr(sundries.profiling, "toggle", lambda: None)
+    showinfo = MagicMock(name="showinfo")
+    monkeypatch.setattr(sundries.common, "showinfo", showinfo)
+
+    sundries.toggle_profile()
+
+    showinfo.assert_called_once_with(
+        sundries.profiling.PROFILE_STARTED_MSG,
+        detail=sundries.PROFILE_STARTED_DETAIL,
+    )
+
+
+def test_toggle_profile_stops(monkeypatch):
+    monkeypatch.setattr(
+        sundries.profiling, "toggle", lambda: ("a.pstats", "a.collapsed")
+    )
+    showinfo = MagicMock(name="showinfo")
+    monkeypatch.setattr(sundries.common, "showinfo", showinfo)
+
+    sundries.toggle_profile()
+
+    showinfo.assert_called_once_with(
+        sundries.profiling.PROFILE_SAVED_MSG, detail="a.pstats\na.collapsed"
+    )
@@ -45,6 +45,16 @@ class TestMovieInteger:
         with check.raises(ValueError):
             MovieInteger("2022-2024-2026")
 
+    def test_intervals(self):
+        mint = MovieInteger("2029, 2022-2020, 2021, 2023, 2025-2027")
+        check.equal(mint.intervals, [(2020, 2023), (2025, 2027), (2029, 2029)])
+        check.equal(len(mint), 8)
+        check.is_true(2020 in mint)
+        check.is_true(2023 in mint)
+        check.is_false(2024 in mint)
+        check.is_false(2019 in mint)
+        check.is_false(2030 in mint)
+
     def test_bad_range(self):
         with check.raises(ValueError):
             MovieInteger("2020-garbage")
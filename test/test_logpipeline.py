@@ -0,0 +1,100 @@
+"""Test module."""
+
+#  Copyright© 2026. Stephen Rigden.
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import json
+import logging
+import threading
+
+import pytest
+from pytest_check import check
+
+from logpipeline import LogPipeline
+
+
+def test_records_are_written_by_listener_thread(log_fn):
+    threads = []
+    with LogPipeline(log_fn) as pipeline:
+        pipeline._file_handler.emit = lambda record: threads.append(
+            threading.current_thread()
+        )
+        logging.info("Test message")
+
+    check.equal(len(threads), 1)
+    check.not_equal(threads[0], threading.current_thread())
+
+
+def test_text_format(log_fn):
+    with LogPipeline(log_fn):
+        logging.info("Test message %s", 42)
+
+    line = log_fn.read_text().splitlines()[-1]
+    check.is_in("INFO", line)
+    check.is_in("test_logpipeline", line)
+    check.is_true(line.endswith("Test message 42"))
+
+
+def test_json_lines_format(log_fn):
+    with LogPipeline(log_fn, json_lines=True):
+        logging.error("Test message %s", 42)
+        try:
+            raise ValueError("Test exception")
+        except ValueError:
+            logging.exception("Test exception message")
+
+    first, second = (json.loads(line) for line in log_fn.read_text().splitlines())
+    check.equal(first["level"], "ERROR")
+    check.equal(first["module"], "test_logpipeline")
+    check.equal(first["message"], "Test message 42")
+    check.equal(first["thread"], threading.current_thread().name)
+    check.is_in("ValueError: Test exception", second["message"])
+
+
+def test_existing_log_is_rolled_over_at_start(log_fn):
+    log_fn.write_text("Previous run\n")
+
+    with LogPipeline(log_fn):
+        logging.info("Test message")
+
+    check.equal(log_fn.with_suffix(".log.1").read_text(), "Previous run\n")
+    check.is_not_in("Previous run", log_fn.read_text())
+
+
+def test_log_is_rotated_by_size(log_fn):
+    with LogPipeline(log_fn, max_bytes=200, backup_count=2):
+        for ix in range(20):
+            logging.info(f"Test message {ix}")
+
+    check.is_true(log_fn.with_suffix(".log.1").exists())
+    check.is_true(log_fn.with_suffix(".log.2").exists())
+    check.is_false(log_fn.with_suffix(".log.3").exists())
+    check.less_equal(log_fn.stat().st_size, 200)
+
+
+def test_stop_removes_queue_handler(log_fn):
+    pipeline = LogPipeline(log_fn)
+    pipeline.start()
+    queue_handler = pipeline._queue_handler
+
+    pipeline.stop()
+    pipeline.stop()
+
+    check.is_not_in(queue_handler, logging.getLogger().handlers)
+
+
+@pytest.fixture(scope="function")
+def log_fn(tmp_path):
+    """Returns a log file name and restores the root logger's level."""
+    level = logging.getLogger().level
+    yield tmp_path / "test.log"
+    logging.getLogger().setLevel(level)
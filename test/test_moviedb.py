@@ -152,6 +152,15 @@ class TestStartUp:
         moviedb.start_up()
         assert connect_calls == [True]
 
+    def test_profiling_started_by_environment(self, monkeypatch_startup, monkeypatch):
+        monkeypatch.setenv(moviedb.profiling.ENVIRONMENT_VARIABLE, "1")
+        profiling_start = MagicMock(name="profiling_start")
+        monkeypatch.setattr(moviedb.profiling, "start", profiling_start)
+
+        moviedb.start_up()
+
+        profiling_start.assert_called_once_with(moviedb.Path(moviedb.__file__).cwd())
+
 
 # noinspection PyMissingOrEmptyDocstring
 class TestLoadConfigFile:
@@ -197,15 +206,23 @@ def test_close_down(monkeypatch):
     monkeypatch.setattr(moviedb, "save_config_file", save_config_file)
     logging = MagicMock(name="logging")
     monkeypatch.setattr(moviedb, "logging", logging)
+    stop_logger = MagicMock(name="stop_logger")
+    monkeypatch.setattr(moviedb, "stop_logger", stop_logger)
+    profiling_stop = MagicMock(name="profiling_stop")
+    monkeypatch.setattr(moviedb.profiling, "stop", profiling_stop)
 
     moviedb.close_down()
 
     with check:
         delete_all_orphans.assert_called_once_with()
+    with check:
+        profiling_stop.assert_called_once_with()
     with check:
         save_config_file.assert_called_once_with()
     with check:
         logging.info.assert_called_once_with("The program is ending.")
+    with check:
+        stop_logger.assert_called_once_with()
     with check:
         logging.shutdown.assert_called_once_with()
 
@@ -236,20 +253,42 @@ def test_save_config_file(monkeypatch):
 def test_start_logger(monkeypatch):
     log_root = moviedb.Path("log dir")
     log_fn = moviedb.Path("filename")
-    expected = dict(
-        format="{asctime} {levelname:8} {lineno:4d} {module:20} {message}",
-        style="{",
-        level="INFO",
-        filename=f"{log_root}/{log_fn}.log",
-        filemode="w",
-    )
-    calls = []
-    monkeypatch.setattr(
-        moviedb.logging, "basicConfig", lambda *args, **kwargs: calls.append(kwargs)
-    )
+    monkeypatch.delenv(moviedb.JSON_ENVIRONMENT_VARIABLE, raising=False)
+    log_pipeline = MagicMock(name="log_pipeline")
+    monkeypatch.setattr(moviedb, "LogPipeline", log_pipeline)
+    monkeypatch.setattr(moviedb, "log_pipeline", None)
+
     moviedb.start_logger(log_root, log_fn)
-    format_args = calls[0]
-    assert format_args == expected
+
+    with check:
+        log_pipeline.assert_called_once_with(
+            moviedb.Path(f"{log_root}/{log_fn}.log"), json_lines=False
+        )
+    with check:
+        log_pipeline().start.assert_called_once_with()
+    check.equal(moviedb.log_pipeline, log_pipeline())
+
+
+def test_start_logger_with_json_lines(monkeypatch):
+    monkeypatch.setenv(moviedb.JSON_ENVIRONMENT_VARIABLE, "1")
+    log_pipeline = MagicMock(name="log_pipeline")
+    monkeypatch.setattr(moviedb, "LogPipeline", log_pipeline)
+    monkeypatch.setattr(moviedb, "log_pipeline", None)
+
+    moviedb.start_logger(moviedb.Path("log dir"), moviedb.Path("filename"))
+
+    check.is_true(log_pipeline.call_args.kwargs["json_lines"])
+
+
+def test_stop_logger(monkeypatch):
+    log_pipeline = MagicMock(name="log_pipeline")
+    monkeypatch.setattr(moviedb, "log_pipeline", log_pipeline)
+
+    moviedb.stop_logger()
+
+    with check:
+        log_pipeline.stop.assert_called_once_with()
+    check.is_none(moviedb.log_pipeline)
 
 
 def test__json_load(monkeypatch, tmp_path):
@@ -0,0 +1,259 @@
+"""Test module."""
+
+#  Copyright© 2026. Stephen Rigden.
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from pytest_check import check
+
+import moviedb_cli
+from database import tables
+
+
+def test_cli_does_not_import_tkinter():
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys, moviedb_cli; "
+            "print([name for name in sys.modules "
+            "if name.split('.')[0] in ('tkinter', 'gui', 'handlers')])",
+        ],
+        cwd=Path(moviedb_cli.__file__).parent,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    check.equal(result.stdout.strip(), "[]")
+
+
+def test_add_and_match(cli, capsys):
+    cli("tag", "add", "alpha")
+    check.equal(
+        cli(
+            "add",
+            "--title=CLI Movie",
+            "--year=4241",
+            "--director=Donald Director",
+            "--tag=alpha",
+        ),
+        0,
+    )
+    check.equal(cli("add", "--title=Other Movie", "--year=4242"), 0)
+    capsys.readouterr()
+
+    check.equal(cli("match", "--year=4241-4242"), 0)
+    check.equal(
+        capsys.readouterr().out.splitlines(),
+        ["CLI Movie (4241) Donald Director", "Other Movie (4242)"],
+    )
+
+    check.equal(cli("match", "--tag=alpha", "--format=jsonl"), 0)
+    record = json.loads(capsys.readouterr().out)
+    check.equal(
+        record,
+        dict(
+            title="CLI Movie", year=4241, directors=["Donald Director"], tags=["alpha"]
+        ),
+    )
+
+
+def test_match_without_criteria(cli, capsys):
+    check.equal(cli("match"), 1)
+    check.equal(capsys.readouterr().err.strip(), moviedb_cli.NO_MATCH_CRITERIA)
+
+
+def test_database_error_gives_exit_status(cli, capsys):
+    cli("add", "--title=CLI Movie", "--year=4241")
+
+    check.equal(cli("add", "--title=CLI Movie", "--year=4241"), 1)
+    check.is_in(tables.MOVIE_EXISTS, capsys.readouterr().err)
+
+
+def test_invalid_year_gives_exit_status(cli, capsys):
+    check.equal(cli("add", "--title=CLI Movie", "--year=abc"), 1)
+    check.equal(
+        capsys.readouterr().err.strip(),
+        f"{moviedb_cli.INVALID_SINGLE_NUMBER_MSG} 'abc'",
+    )
+
+
+def test_year_range_is_not_added(cli, capsys):
+    check.equal(cli("add", "--title=CLI Movie", "--year=1950-1959"), 1)
+    check.equal(
+        capsys.readouterr().err.strip(),
+        f"{moviedb_cli.INVALID_SINGLE_NUMBER_MSG} '1950-1959'",
+    )
+    check.equal(cli("add", "--title=CLI Movie", "--year=1950", "--duration=90-95"), 1)
+
+
+def test_invalid_duration_gives_exit_status(cli, capsys):
+    check.equal(cli("match", "--duration=9o"), 1)
+    check.is_in(moviedb_cli.INVALID_NUMBER_MSG, capsys.readouterr().err)
+
+
+def test_export_and_bulk_import(cli, capsys, tmp_path):
+    cli("add", "--title=CLI Movie", "--year=4241", "--star=Edgar Ethelred")
+    export_fn = tmp_path / "export.csv"
+    check.equal(cli("export", str(export_fn), "--format=csv"), 0)
+    capsys.readouterr()
+    check.equal(cli("export", "-"), 0)
+    check.equal(json.loads(capsys.readouterr().out)["stars"], ["Edgar Ethelred"])
+
+    new_database = tmp_path / "new.sqlite3"
+    check.equal(
+        moviedb_cli.main(
+            [
+                "--database",
+                str(new_database),
+                "bulk-import",
+                str(export_fn),
+                "--format=csv",
+            ]
+        ),
+        0,
+    )
+    check.equal(capsys.readouterr().out.strip(), "1 added. 0 not added.")
+
+
+def test_tag_commands(cli, capsys):
+    check.equal(cli("tag", "add", "alpha", "beta", "gamma"), 0)
+    check.equal(cli("tag", "rename", "beta", "bravo"), 0)
+    check.equal(cli("tag", "delete", "gamma"), 0)
+    capsys.readouterr()
+
+    cli("tag", "list")
+    check.equal(capsys.readouterr().out.splitlines(), ["alpha", "bravo"])
+    cli("tag", "list", "--match=lph")
+    check.equal(capsys.readouterr().out.splitlines(), ["alpha"])
+
+
+def test_bulk_tag_commands(cli, capsys):
+    cli("tag", "add", "alpha", "beta")
+    cli("add", "--title=CLI Movie", "--year=4241", "--tag=beta")
+    cli("add", "--title=CLI Film", "--year=4242")
+    capsys.readouterr()
+
+    check.equal(cli("tag", "apply", "alpha", "--title=CLI"), 0)
+    check.equal(capsys.readouterr().out.strip(), "2 movies changed.")
+    check.equal(cli("tag", "remove", "alpha", "--year=4242"), 0)
+    check.equal(capsys.readouterr().out.strip(), "1 movies changed.")
+    check.equal(cli("tag", "merge", "beta", "alpha"), 0)
+    check.equal(capsys.readouterr().out.strip(), "1 movies changed.")
+    check.equal(cli("tag", "apply", "alpha"), 1)
+    check.equal(capsys.readouterr().err.strip(), moviedb_cli.NO_MATCH_CRITERIA)
+
+    cli("match", "--tag=alpha")
+    check.equal(capsys.readouterr().out.splitlines(), ["CLI Movie (4241)"])
+    cli("tag", "list")
+    check.equal(capsys.readouterr().out.splitlines(), ["alpha"])
+
+
+def test_maintenance_commands(cli, capsys):
+    cli("add", "--title=CLI Movie", "--year=4241")
+    check.equal(cli("maintenance", "orphans"), 0)
+    check.equal(cli("maintenance", "backup"), 0)
+    snapshot = capsys.readouterr().out.strip()
+
+    cli("maintenance", "list-backups")
+    check.equal(capsys.readouterr().out.strip(), snapshot)
+    cli("maintenance", "verify")
+    check.equal(capsys.readouterr().out.strip(), f"{snapshot}: ok")
+    check.equal(cli("maintenance", "restore", snapshot), 0)
+
+
+def test_maintenance_run(cli, tmp_path, capsys):
+    cli("add", "--title=CLI Movie", "--year=4241")
+    capsys.readouterr()
+
+    check.equal(cli("maintenance", "run"), 0)
+    check.equal(
+        [line.split(":")[0] for line in capsys.readouterr().out.splitlines()],
+        ["analyze", "optimize", "vacuum", "integrity"],
+    )
+    check.is_true((tmp_path / "maintenance.json").exists())
+    check.equal(cli("maintenance", "run"), 0)
+    check.equal(capsys.readouterr().out, "")
+    check.equal(cli("maintenance", "run", "--force", "--budget=60"), 0)
+    check.equal(len(capsys.readouterr().out.splitlines()), 4)
+
+
+def test_maintenance_summaries(cli, capsys):
+    cli("add", "--title=CLI Movie", "--year=4241")
+    capsys.readouterr()
+
+    check.equal(cli("maintenance", "summaries"), 0)
+    check.equal(capsys.readouterr().out, "0 movie summary problems.\n")
+    check.equal(cli("maintenance", "summaries", "--rebuild"), 0)
+    check.equal(capsys.readouterr().out, "0 movie summary problems.\n")
+
+
+def test_profile_environment_variable(cli, tmp_path, monkeypatch):
+    monkeypatch.setenv(moviedb_cli.profiling.ENVIRONMENT_VARIABLE, "1")
+
+    check.equal(cli("tag", "list"), 0)
+
+    check.is_false(moviedb_cli.profiling.is_running())
+    check.equal(len(list(tmp_path.glob("profile_*.pstats"))), 1)
+    check.equal(len(list(tmp_path.glob("profile_*.collapsed"))), 1)
+
+
+def test_duplicate_commands(cli, capsys):
+    cli("add", "--title=The Third Man", "--year=1949", "--director=Carol Reed")
+    cli("add", "--title=Third Man, The", "--year=1950", "--director=Reed, Carol")
+    capsys.readouterr()
+
+    check.equal(cli("maintenance", "duplicates", "-", "--workers=1"), 0)
+    check.equal(len(capsys.readouterr().out.splitlines()), 3)
+    check.equal(cli("maintenance", "merge-people", "Carol Reed", "Reed, Carol"), 0)
+    check.equal(
+        cli(
+            "maintenance",
+            "merge-movies",
+            "The Third Man",
+            "1949",
+            "Third Man, The",
+            "1950",
+        ),
+        0,
+    )
+    cli("maintenance", "duplicates", "-", "--workers=1")
+    check.equal(len(capsys.readouterr().out.splitlines()), 1)
+
+
+def test_timing(cli, capsys):
+    cli("--timing", "tag", "list")
+
+    check.is_true(capsys.readouterr().err.startswith("Start up "))
+
+
+@pytest.fixture(scope="function")
+def cli(tmp_path, monkeypatch):
+    """Returns a function which runs the CLI with a database in tmp_path."""
+    monkeypatch.chdir(tmp_path)
+    hold_session_factory = tables.session_factory
+    database_fn = tmp_path / "test.sqlite3"
+
+    def run(*args: str) -> int:
+        options = [arg for arg in args if arg == "--timing"]
+        command = [arg for arg in args if arg != "--timing"]
+        return moviedb_cli.main(["--database", str(database_fn), *options, *command])
+
+    yield run
+    tables.session_factory.kw["bind"].dispose()
+    tables.session_factory = hold_session_factory
@@ -0,0 +1,241 @@
+"""Test module."""
+
+#  Copyright© 2026. Stephen Rigden.
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import asyncio
+import json
+from collections.abc import Callable
+
+import pytest
+from pytest_check import check
+
+import moviedb_server
+from benchmarks.httpclient import Connection
+from database import tables
+
+MOVIE = dict(title="Server Movie", year=4241, stars=["Edgar Ethelred"], tags=["alpha"])
+
+
+def test_movie_routes(serve):
+    async def session(conn: Connection):
+        check.equal(
+            await conn.request("POST", "/tags", dict(text="alpha")),
+            (201, b'{"text": "alpha"}'),
+        )
+        status, _ = await conn.request("POST", "/movies", MOVIE)
+        check.equal(status, 201)
+        status, _ = await conn.request("POST", "/movies", MOVIE)
+        check.equal(status, 409)
+
+        status, body = await conn.request("GET", "/movies?title=Server+Movie&year=4241")
+        check.equal((status, json.loads(body)), (200, MOVIE))
+
+        status, body = await conn.request(
+            "POST", "/movies/match", dict(year="4200-4299", tags="alpha")
+        )
+        check.equal(
+            (status, [json.loads(line) for line in body.splitlines()]), (200, [MOVIE])
+        )
+
+        status, _ = await conn.request(
+            "PUT",
+            "/movies",
+            dict(old=dict(title="Server Movie", year=4241), new=dict(notes="Edited")),
+        )
+        check.equal(status, 200)
+        status, body = await conn.request("GET", "/movies")
+        check.equal(json.loads(body)["notes"], "Edited")
+
+        status, _ = await conn.request("DELETE", "/movies?title=Server+Movie&year=4241")
+        check.equal(status, 200)
+        status, body = await conn.request("GET", "/movies?title=Server+Movie&year=4241")
+        check.equal(status, 404)
+        check.equal(json.loads(body)["error"][0], tables.MOVIE_NOT_FOUND)
+
+    serve(session)
+
+
+def test_tag_routes(serve):
+    async def session(conn: Connection):
+        for text in ("alpha", "beta"):
+            await conn.request("POST", "/tags", dict(text=text))
+        check.equal(await conn.request("GET", "/tags"), (200, b'["alpha", "beta"]'))
+        check.equal(await conn.request("GET", "/tags?match=lph"), (200, b'["alpha"]'))
+
+        status, _ = await conn.request("PUT", "/tags", dict(old="beta", new="bravo"))
+        check.equal(status, 200)
+        status, _ = await conn.request("DELETE", "/tags?text=alpha")
+        check.equal(status, 200)
+        check.equal(await conn.request("GET", "/tags"), (200, b'["bravo"]'))
+
+    serve(session)
+
+
+def test_streams_large_results_in_chunks(serve, monkeypatch):
+    monkeypatch.setattr(moviedb_server, "STREAM_CHUNK", 2)
+    tables.add_tags(tag_texts={"alpha"})
+    for year in range(4241, 4246):
+        tables.add_movie(movie_bag=moviedb_server._movie_bag(dict(MOVIE, year=year)))
+
+    async def session(conn: Connection):
+        status, body = await conn.request("GET", "/movies")
+        check.equal(status, 200)
+        check.equal(
+            [json.loads(line)["year"] for line in body.splitlines()],
+            list(range(4241, 4246)),
+        )
+
+    serve(session)
+
+
+def test_request_errors(serve):
+    async def session(conn: Connection):
+        check.equal((await conn.request("GET", "/actors"))[0], 404)
+        check.equal((await conn.request("PATCH", "/tags"))[0], 405)
+        check.equal((await conn.request("POST", "/tags", ["alpha"]))[0], 400)
+        check.equal((await conn.request("POST", "/tags", {}))[0], 400)
+        check.equal((await conn.request("POST", "/movies", dict(year=4241)))[0], 400)
+        check.equal(
+            (await conn.request("POST", "/movies/match", dict(year="soon")))[0], 400
+        )
+        check.equal((await conn.request("GET", "/movies?title=No+Year"))[0], 400)
+
+    serve(session)
+
+
+def test_edit_with_year_range(serve):
+    tables.add_movie(movie_bag=moviedb_server._movie_bag(dict(title="Edit", year=4241)))
+
+    async def session(conn: Connection):
+        status, body = await conn.request(
+            "PUT",
+            "/movies",
+            dict(old=dict(title="Edit", year=4241), new=dict(year="4241-4242")),
+        )
+        check.equal(status, 400)
+        check.equal(json.loads(body)["error"][0], moviedb_server.INVALID_REQUEST)
+
+    serve(session)
+
+
+@pytest.mark.parametrize("length", ["many", "-1"])
+def test_invalid_content_length(serve, length):
+    async def session(conn: Connection):
+        conn.writer.write(
+            f"GET /tags HTTP/1.1\r\nContent-Length: {length}\r\n\r\n".encode()
+        )
+        await conn.writer.drain()
+        response = await conn.reader.read()
+        check.is_true(response.startswith(b"HTTP/1.1 400 Bad Request\r\n"))
+        check.is_in(moviedb_server.INVALID_REQUEST.encode(), response)
+
+    serve(session)
+
+
+@pytest.mark.parametrize(
+    "exc",
+    [
+        RuntimeError("disk on fire"),
+        moviedb_server.RequestError(moviedb_server.HTTPStatus.NOT_FOUND, "gone"),
+    ],
+)
+def test_failed_stream_closes_connection(serve, monkeypatch, exc):
+    monkeypatch.setattr(moviedb_server, "STREAM_CHUNK", 2)
+    tables.add_tags(tag_texts={"alpha"})
+    for year in range(4241, 4246):
+        tables.add_movie(movie_bag=moviedb_server._movie_bag(dict(MOVIE, year=year)))
+    encode_chunk = moviedb_server._encode_chunk
+    chunks = []
+
+    def fail_second_chunk(rows):
+        chunks.append(None)
+        if len(chunks) == 2:
+            raise exc
+        return encode_chunk(rows)
+
+    monkeypatch.setattr(moviedb_server, "_encode_chunk", fail_second_chunk)
+
+    async def session(conn: Connection):
+        conn.writer.write(b"GET /movies HTTP/1.1\r\n\r\n")
+        await conn.writer.drain()
+        response = await conn.reader.read()
+        check.equal(response.count(b"HTTP/1.1"), 1)
+        check.is_true(response.startswith(b"HTTP/1.1 200 OK\r\n"))
+        check.is_false(response.endswith(b"0\r\n\r\n"))
+        check.equal(response.count(b"Server Movie"), 2)
+
+    serve(session)
+
+
+def test_paused_stream_holds_no_connection(serve, monkeypatch):
+    monkeypatch.setattr(moviedb_server, "STREAM_CHUNK", 2)
+    tables.add_tags(tag_texts={"alpha"})
+    for year in range(4241, 4246):
+        tables.add_movie(movie_bag=moviedb_server._movie_bag(dict(MOVIE, year=year)))
+    request = moviedb_server.Request("GET", "/movies", {})
+    response = asyncio.run(moviedb_server.MovieServer(workers=1).get_movies(request))
+
+    rows = iter(response.rows)
+    check.equal(moviedb_server._encode_chunk(rows).count(b"\n"), 2)
+
+    check.equal(tables.session_factory.kw["bind"].pool.checkedout(), 0)
+    check.equal(len(moviedb_server._encode_chunk(rows).splitlines()), 2)
+
+
+def test_unexpected_error(serve, monkeypatch):
+    def select_all_tags():
+        raise RuntimeError("disk on fire")
+
+    monkeypatch.setattr(tables, "select_all_tags", select_all_tags)
+
+    async def session(conn: Connection):
+        status, body = await conn.request("GET", "/tags")
+        check.equal(status, 500)
+        check.equal(
+            json.loads(body)["error"],
+            [moviedb_server.INTERNAL_ERROR, "RuntimeError('disk on fire')"],
+        )
+        # The connection is still usable.
+        check.equal((await conn.request("GET", "/actors"))[0], 404)
+
+    serve(session)
+
+
+@pytest.fixture(scope="function")
+def serve(tmp_path) -> Callable:
+    """Returns a function which runs a client session against a server.
+
+    The server uses a new database in tmp_path and listens on a free port.
+    """
+    hold_session_factory = tables.session_factory
+    moviedb_server.start_engine(tmp_path / "test.sqlite3", pool_size=2)
+
+    def run(session: Callable):
+        async def main():
+            server = moviedb_server.MovieServer(workers=2)
+            listener = await server.start("127.0.0.1", 0)
+            port = listener.sockets[0].getsockname()[1]
+            conn = await Connection.open("127.0.0.1", port)
+            try:
+                await session(conn)
+            finally:
+                await conn.close()
+                listener.close()
+                await listener.wait_closed()
+                server.executor.shutdown(wait=True)
+
+        asyncio.run(main())
+
+    yield run
+    tables.session_factory.kw["bind"].dispose()
+    tables.session_factory = hold_session_factory
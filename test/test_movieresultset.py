@@ -0,0 +1,86 @@
+"""Test module."""
+
+#  Copyright© 2026. Stephen Rigden.
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from datetime import datetime
+
+import pytest
+from pytest_check import check
+
+from moviebag import MovieBag, MovieInteger
+from movieresultset import MovieResultSet, MovieRow
+
+MOVIEBAG_1 = MovieBag(
+    id=1,
+    created=datetime(2025, 1, 2, 3, 4, 5, 6),
+    updated=datetime(2025, 2, 3, 4, 5, 6, 7),
+    title="Zulu Movie",
+    year=MovieInteger(4241),
+    duration=MovieInteger(142),
+    directors={"Donald Director"},
+    stars={"Edgar Ethelred", "Fanny Fullworthy"},
+    synopsis="Synopsis for test",
+    notes="I am MOVIEBAG_1",
+    tags={"tag 1", "tag 2"},
+)
+MOVIEBAG_2 = MovieBag(
+    title="Alpha Movie",
+    year=MovieInteger(4242),
+    stars={"Fanny Fullworthy"},
+)
+
+
+class TestMovieResultSet:
+
+    def test_row_equals_movie_bag(self):
+        results = MovieResultSet.from_movie_bags([MOVIEBAG_1, MOVIEBAG_2])
+
+        check.equal(len(results), 2)
+        check.equal(dict(results[0]), MOVIEBAG_1)
+        check.equal(dict(results[1]), MOVIEBAG_2)
+        check.equal(results[1].to_movie_bag(), MOVIEBAG_2)
+
+    def test_absent_fields(self):
+        results = MovieResultSet.from_movie_bags([MOVIEBAG_2])
+        row = results[0]
+
+        check.is_instance(row, MovieRow)
+        check.equal(row.get("directors", set()), set())
+        check.is_none(row.get("duration"))
+        check.is_false("notes" in row)
+        with check.raises(KeyError):
+            row["synopsis"]
+
+    def test_strings_are_pooled(self):
+        results = MovieResultSet.from_movie_bags([MOVIEBAG_1, MOVIEBAG_2])
+
+        check.equal(
+            sorted(results.strings),
+            ["Donald Director", "Edgar Ethelred", "Fanny Fullworthy", "tag 1", "tag 2"],
+        )
+
+    def test_sort(self):
+        results = MovieResultSet.from_movie_bags([MOVIEBAG_1, MOVIEBAG_2])
+
+        results.sort(key=lambda row: row["title"])
+
+        check.equal([row["title"] for row in results], ["Alpha Movie", "Zulu Movie"])
+        check.equal(results[0]["title"], "Alpha Movie")
+        check.equal(results[-1]["title"], "Zulu Movie")
+        check.equal(results.titles, ["Zulu Movie", "Alpha Movie"])
+
+    def test_index_error(self):
+        results = MovieResultSet.from_movie_bags([MOVIEBAG_1])
+
+        with pytest.raises(IndexError):
+            results[1]
@@ -0,0 +1,122 @@
+"""Test module."""
+
+#  Copyright© 2026. Stephen Rigden.
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import pstats
+import threading
+
+import pytest
+from pytest_check import check
+
+import profiling
+
+
+def profiled_function():
+    """Does some work to be profiled."""
+    return sum(range(1000))
+
+
+def test_start_and_stop(tmp_path):
+    # Act
+    profiling.start(tmp_path)
+    check.is_true(profiling.is_running())
+    profiled_function()
+    pstats_fn, collapsed_fn = profiling.stop()
+
+    # Assert
+    check.is_false(profiling.is_running())
+    check.equal(pstats_fn.parent, tmp_path)
+    check.equal(pstats_fn.suffix, ".pstats")
+    check.equal(collapsed_fn.suffix, ".collapsed")
+    stats = pstats.Stats(str(pstats_fn))
+    check.is_true(
+        any(function == "profiled_function" for _, _, function in stats.stats)
+    )
+    check.is_true(collapsed_fn.exists())
+
+
+def test_stop_when_not_running():
+    check.is_none(profiling.stop())
+
+
+def test_toggle(tmp_path):
+    check.is_none(profiling.toggle(tmp_path))
+    check.is_true(profiling.is_running())
+
+    paths = profiling.toggle(tmp_path)
+
+    check.is_false(profiling.is_running())
+    check.equal([path.parent for path in paths], [tmp_path, tmp_path])
+
+
+def test_start_when_running(tmp_path):
+    profiling.start(tmp_path)
+    profile = profiling._profile
+
+    profiling.start(tmp_path)
+
+    check.is_(profiling._profile, profile)
+    profiling.stop()
+
+
+def test_sampler_records_other_threads():
+    # Arrange
+    sampler = profiling.Sampler()
+    ready = threading.Event()
+    finish = threading.Event()
+
+    def wait_here():
+        ready.set()
+        finish.wait()
+
+    thread = threading.Thread(target=wait_here, name="waiter")
+    thread.start()
+    ready.wait()
+
+    # Act
+    sampler.sample()
+    finish.set()
+    thread.join()
+
+    # Assert
+    stacks = [stack.split(";") for stack in sampler.samples]
+    waiter = [stack for stack in stacks if stack[0] == "waiter"]
+    check.equal(len(waiter), 1)
+    check.is_in(
+        "test_sampler_records_other_threads.<locals>.wait_here (test_profiling.py)",
+        waiter[0],
+    )
+    check.equal(
+        [stack for stack in stacks if stack[0] == threading.current_thread().name],
+        [],
+    )
+
+
+def test_collapsed_file(tmp_path):
+    # Arrange
+    profiling.start(tmp_path)
+    profiling._sampler.samples.update({"MainThread;f (a.py);g (a.py)": 3})
+
+    # Act
+    _, collapsed_fn = profiling.stop()
+
+    # Assert
+    check.is_in("MainThread;f (a.py);g (a.py) 3\n", collapsed_fn.read_text())
+
+
+@pytest.fixture(autouse=True)
+def stop_profiling():
+    """Stops any profile left running by a failed test."""
+    yield
+    if profiling.is_running():
+        profiling.stop()